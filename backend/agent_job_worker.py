@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import threading
+import time
+
+
+try:
+    from backend.services.agent_job_queue import AgentJobWorkerPool, agent_job_concurrency
+except ImportError:
+    from services.agent_job_queue import AgentJobWorkerPool, agent_job_concurrency
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def main() -> None:
+    concurrency = agent_job_concurrency()
+    pool = AgentJobWorkerPool(concurrency)
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+
+    print("[agent-job-worker] starting:", json.dumps(pool.concurrency))
+    pool.start()
+    stats_interval = max(30, _int_env("AGENT_JOB_WORKER_STATS_SECONDS", 300))
+    while not stop.wait(stats_interval):
+        print("[agent-job-worker] stats:", json.dumps(pool.stats))
+    print("[agent-job-worker] stopping…")
+    started = time.monotonic()
+    pool.stop(timeout=30)
+    print(f"[agent-job-worker] stopped in {time.monotonic() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Vectorized point-in-country lookup over the bundled country borders GeoJSON.
+
+``CountryPolygonIndex`` flattens every country ring into NumPy edge arrays once, then
+resolves whole batches of points with a per-country bbox prefilter followed by
+even-odd ray casting across all edges of that country at once. Points resolve to the
+first feature (in GeoJSON order) whose polygon contains them, outer ring minus holes,
+matching the scalar resolver it replaces.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+try:
+    from backend.country_borders import COUNTRY_NAME_KEYS, get_country_borders_geojson
+except ImportError:
+    from country_borders import COUNTRY_NAME_KEYS, get_country_borders_geojson
+
+COUNTRY_ISO2_KEYS = ("ISO_A2", "iso_a2", "ISO2", "iso2")
+UNKNOWN_COUNTRY: tuple[str, str] = ("Unknown", "")
+# Lookups are deduplicated on a ~1.1 km grid (2 decimal places), like the scalar cache.
+LOOKUP_DECIMALS = 2
+# Upper bound on points x edges evaluated per ray-casting block (bounds temp arrays).
+MAX_BLOCK_CELLS = 1_000_000
+
+
+def _clean_text(value: Any) -> str:
+    if value is None:
+        return ""
+    return " ".join(str(value).split())
+
+
+def _feature_name(properties: dict[str, Any]) -> str:
+    for key in COUNTRY_NAME_KEYS:
+        value = _clean_text(properties.get(key))
+        if value:
+            return value
+    return "Unknown"
+
+
+def _feature_iso2(properties: dict[str, Any]) -> str:
+    for key in COUNTRY_ISO2_KEYS:
+        value = _clean_text(properties.get(key)).upper()
+        if len(value) == 2:
+            return value
+    return ""
+
+
+def _parse_ring(raw_ring: Any) -> Optional[np.ndarray]:
+    if not isinstance(raw_ring, list):
+        return None
+    coords = [
+        (float(coord[0]), float(coord[1]))
+        for coord in raw_ring
+        if isinstance(coord, list)
+        and len(coord) >= 2
+        and isinstance(coord[0], (int, float))
+        and isinstance(coord[1], (int, float))
+    ]
+    if not coords:
+        return None
+    return np.asarray(coords, dtype=np.float64)
+
+
+def _parse_polygons(geometry: dict[str, Any]) -> list[list[np.ndarray]]:
+    geometry_type = geometry.get("type")
+    if geometry_type == "Polygon":
+        raw_polygons = [geometry.get("coordinates")]
+    elif geometry_type == "MultiPolygon":
+        raw_polygons = geometry.get("coordinates") or []
+    else:
+        return []
+    polygons: list[list[np.ndarray]] = []
+    for raw_polygon in raw_polygons:
+        if not isinstance(raw_polygon, list):
+            continue
+        rings = [ring for ring in (_parse_ring(raw) for raw in raw_polygon) if ring is not None]
+        if rings:
+            polygons.append(rings)
+    return polygons
+
+
+@dataclass
+class _CountryGeometry:
+    """Edges of one country, ring after ring; ``ring_bounds`` index into the edge arrays."""
+
+    xi: np.ndarray
+    yi: np.ndarray
+    xj: np.ndarray
+    yj: np.ndarray
+    dy: np.ndarray
+    ring_starts: np.ndarray
+    ring_ends: np.ndarray
+    outer_rings: np.ndarray
+    hole_to_polygon: Optional[np.ndarray]
+
+    @classmethod
+    def from_polygons(cls, polygons: list[list[np.ndarray]]) -> "_CountryGeometry":
+        xi_parts: list[np.ndarray] = []
+        yi_parts: list[np.ndarray] = []
+        xj_parts: list[np.ndarray] = []
+        yj_parts: list[np.ndarray] = []
+        starts: list[int] = []
+        ends: list[int] = []
+        outer_rings: list[int] = []
+        holes: list[tuple[int, int]] = []
+        cursor = 0
+        for polygon_idx, polygon in enumerate(polygons):
+            for ring_pos, ring in enumerate(polygon):
+                ring_idx = len(starts)
+                # Rings with fewer than three vertices never contain a point.
+                edge_count = len(ring) if len(ring) >= 3 else 0
+                starts.append(cursor)
+                ends.append(cursor + edge_count)
+                cursor += edge_count
+                if ring_pos == 0:
+                    outer_rings.append(ring_idx)
+                else:
+                    holes.append((ring_idx, polygon_idx))
+                if edge_count:
+                    previous = np.roll(ring, 1, axis=0)
+                    xi_parts.append(ring[:, 0])
+                    yi_parts.append(ring[:, 1])
+                    xj_parts.append(previous[:, 0])
+                    yj_parts.append(previous[:, 1])
+        empty = np.zeros(0, dtype=np.float64)
+        xi = np.concatenate(xi_parts) if xi_parts else empty
+        yi = np.concatenate(yi_parts) if yi_parts else empty
+        xj = np.concatenate(xj_parts) if xj_parts else empty
+        yj = np.concatenate(yj_parts) if yj_parts else empty
+        dy = yj - yi
+        dy = np.where(dy == 0, 1e-12, dy)
+        hole_to_polygon = None
+        if holes:
+            hole_to_polygon = np.zeros((len(starts), len(polygons)), dtype=np.int32)
+            for ring_idx, polygon_idx in holes:
+                hole_to_polygon[ring_idx, polygon_idx] = 1
+        return cls(
+            xi=xi,
+            yi=yi,
+            xj=xj,
+            yj=yj,
+            dy=dy,
+            ring_starts=np.asarray(starts, dtype=np.intp),
+            ring_ends=np.asarray(ends, dtype=np.intp),
+            outer_rings=np.asarray(outer_rings, dtype=np.intp),
+            hole_to_polygon=hole_to_polygon,
+        )
+
+    def contains(self, lngs: np.ndarray, lats: np.ndarray) -> np.ndarray:
+        inside = np.zeros(lngs.shape[0], dtype=bool)
+        edge_count = self.xi.shape[0]
+        if edge_count == 0 or lngs.shape[0] == 0:
+            return inside
+        block = max(1, MAX_BLOCK_CELLS // edge_count)
+        for start in range(0, lngs.shape[0], block):
+            x = lngs[start : start + block, None]
+            y = lats[start : start + block, None]
+            crosses = ((self.yi > y) != (self.yj > y)) & (
+                x < (self.xj - self.xi) * (y - self.yi) / self.dy + self.xi
+            )
+            running = np.zeros((crosses.shape[0], edge_count + 1), dtype=np.int32)
+            np.cumsum(crosses, axis=1, out=running[:, 1:])
+            ring_inside = ((running[:, self.ring_ends] - running[:, self.ring_starts]) & 1).astype(bool)
+            polygon_inside = ring_inside[:, self.outer_rings]
+            if self.hole_to_polygon is not None:
+                polygon_inside &= (ring_inside.astype(np.int32) @ self.hole_to_polygon) == 0
+            inside[start : start + block] = polygon_inside.any(axis=1)
+        return inside
+
+
+class CountryPolygonIndex:
+    """Country polygons prepared for batch point lookups (see module docstring)."""
+
+    def __init__(self, features: Sequence[dict[str, Any]]) -> None:
+        self.names: list[str] = []
+        self.iso2: list[str] = []
+        self._geometries: list[_CountryGeometry] = []
+        bboxes: list[tuple[float, float, float, float]] = []
+        for feature in features:
+            if not isinstance(feature, dict):
+                continue
+            polygons = _parse_polygons(feature.get("geometry") or {})
+            if not polygons:
+                continue
+            vertices = np.concatenate([ring for polygon in polygons for ring in polygon])
+            properties = feature.get("properties") or {}
+            self.names.append(_feature_name(properties))
+            self.iso2.append(_feature_iso2(properties))
+            self._geometries.append(_CountryGeometry.from_polygons(polygons))
+            bboxes.append(
+                (
+                    float(vertices[:, 0].min()),
+                    float(vertices[:, 1].min()),
+                    float(vertices[:, 0].max()),
+                    float(vertices[:, 1].max()),
+                )
+            )
+        bbox_array = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+        self._min_x, self._min_y, self._max_x, self._max_y = bbox_array.T
+
+    @classmethod
+    def from_geojson(cls, payload: dict[str, Any]) -> "CountryPolygonIndex":
+        return cls(payload.get("features") or [])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, lats: Any, lngs: Any) -> np.ndarray:
+        """Feature index per point (``-1`` when no country contains it)."""
+        lats = np.asarray(lats, dtype=np.float64).reshape(-1)
+        lngs = np.asarray(lngs, dtype=np.float64).reshape(-1)
+        result = np.full(lats.shape[0], -1, dtype=np.int32)
+        if not len(self) or not lats.shape[0]:
+            return result
+        pending = np.isfinite(lats) & np.isfinite(lngs)
+        if lats.shape[0] == 1:
+            # Single point: prefilter every bbox in one shot instead of per country.
+            if not pending[0]:
+                return result
+            candidates = np.nonzero(
+                (self._min_x <= lngs[0]) & (lngs[0] <= self._max_x) & (self._min_y <= lats[0]) & (lats[0] <= self._max_y)
+            )[0]
+            for feature_idx in candidates:
+                if self._geometries[feature_idx].contains(lngs, lats)[0]:
+                    result[0] = feature_idx
+                    break
+            return result
+        for feature_idx, geometry in enumerate(self._geometries):
+            in_bbox = (
+                pending
+                & (lngs >= self._min_x[feature_idx])
+                & (lngs <= self._max_x[feature_idx])
+                & (lats >= self._min_y[feature_idx])
+                & (lats <= self._max_y[feature_idx])
+            )
+            candidates = np.nonzero(in_bbox)[0]
+            if candidates.shape[0] == 0:
+                continue
+            hits = candidates[geometry.contains(lngs[candidates], lats[candidates])]
+            result[hits] = feature_idx
+            pending[hits] = False
+            if not pending.any():
+                break
+        return result
+
+    def resolve(
+        self, lats: Any, lngs: Any, *, decimals: Optional[int] = LOOKUP_DECIMALS
+    ) -> list[tuple[str, str]]:
+        """``(country name, ISO2)`` per point; coordinates are deduplicated after rounding."""
+        lats = np.asarray(lats, dtype=np.float64).reshape(-1)
+        lngs = np.asarray(lngs, dtype=np.float64).reshape(-1)
+        if not lats.shape[0]:
+            return []
+        if decimals is not None:
+            lats = np.round(lats, decimals)
+            lngs = np.round(lngs, decimals)
+        points, inverse = np.unique(np.stack([lats, lngs], axis=1), axis=0, return_inverse=True)
+        feature_ids = self.lookup(points[:, 0], points[:, 1])
+        labels = [
+            (self.names[idx], self.iso2[idx]) if idx >= 0 else UNKNOWN_COUNTRY
+            for idx in feature_ids.tolist()
+        ]
+        return [labels[idx] for idx in inverse.reshape(-1).tolist()]
+
+
+_index_lock = threading.Lock()
+_index_state: dict[str, Any] = {"payload": None, "index": None}
+
+
+def country_polygon_index() -> CountryPolygonIndex:
+    """Process-wide index over ``get_country_borders_geojson()``; rebuilt when the file reloads."""
+    payload, _ = get_country_borders_geojson()
+    with _index_lock:
+        if _index_state["index"] is None or _index_state["payload"] is not payload:
+            _index_state["index"] = CountryPolygonIndex.from_geojson(payload)
+            _index_state["payload"] = payload
+        return _index_state["index"]
+
+
+def resolve_countries(
+    lats: Any, lngs: Any, *, decimals: Optional[int] = LOOKUP_DECIMALS
+) -> list[tuple[str, str]]:
+    """Batch ``(country name, ISO2)`` lookup; ``("Unknown", "")`` outside every country."""
+    return country_polygon_index().resolve(lats, lngs, decimals=decimals)
+
+
+def resolve_country_point(lat: float, lng: float) -> tuple[str, str]:
+    index = country_polygon_index()
+    feature_idx = int(index.lookup([lat], [lng])[0])
+    if feature_idx < 0:
+        return UNKNOWN_COUNTRY
+    return index.names[feature_idx], index.iso2[feature_idx]
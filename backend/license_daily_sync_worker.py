@@ -7,8 +7,12 @@ from typing import Any
 
 
 try:
+    from backend.services import entity_derivation
+    from backend.services.db_pool import get_pooled_connection
     from backend.services.ingest import open_data_sync
 except ImportError:
+    from services import entity_derivation
+    from services.db_pool import get_pooled_connection
     from services.ingest import open_data_sync
 
 
@@ -19,11 +23,22 @@ def _int_env(name: str, default: int) -> int:
         return default
 
 
+def run_entity_derivation() -> dict[str, Any]:
+    """Incremental contacts/relationships pass for licenses changed outside the open-data sync."""
+    conn = get_pooled_connection()
+    try:
+        return entity_derivation.derive_license_entities(conn, incremental=True)
+    finally:
+        conn.close()
+
+
 def run_once() -> dict[str, Any]:
-    summary: dict[str, Any] = {"open_data": None}
+    summary: dict[str, Any] = {"open_data": None, "entity_derivation": None}
     print("[license-sync-worker] starting open-data sync…")
     summary["open_data"] = open_data_sync.sync_open_data_sources()
     print("[license-sync-worker] open-data sync:", json.dumps(summary["open_data"], default=str)[:2000])
+    summary["entity_derivation"] = run_entity_derivation()
+    print("[license-sync-worker] entity derivation:", json.dumps(summary["entity_derivation"], default=str))
     return summary
 
 
@@ -15,8 +15,8 @@ import csv
 import io
 import uuid
 import threading
-from pydantic import BaseModel
-from typing import Any, Optional
+from pydantic import BaseModel, Field
+from typing import Any, Iterable, Optional
 from urllib.parse import urlparse, urlunparse
 
 from country_borders import get_country_borders_geojson, parse_requested_countries
@@ -218,6 +218,23 @@ def _load_deal_room_services():
     return deal_rooms
 
 
+def _load_agent_job_queue():
+    try:
+        from backend.services import agent_job_queue
+    except ImportError:
+        from services import agent_job_queue  # type: ignore[no-redef]
+    return agent_job_queue
+
+
+def _agent_job_accepted(job: dict[str, Any]):
+    """Finished (cached) jobs return as before; queued/running ones as 202 for the client to poll."""
+    if job.get("status") in {"completed", "failed"}:
+        return job
+    from fastapi.encoders import jsonable_encoder
+
+    return JSONResponse(jsonable_encoder(job), status_code=202)
+
+
 def _serialize_entity_contact(row: dict) -> dict:
     return {
         "id": row.get("id"),
@@ -742,6 +759,7 @@ except ImportError:
 class RedisCache:
     def __init__(self):
         self._client = None
+        self._binary_client = None
 
     def get_client(self):
         if not REDIS_ENABLED or redis is None:
@@ -759,6 +777,40 @@ class RedisCache:
                 self._client = None
         return self._client
 
+    def get_binary_client(self):
+        """Client without response decoding, for pre-serialized (gzipped) payloads."""
+        if not REDIS_ENABLED or redis is None:
+            return None
+        if self._binary_client is None:
+            try:
+                try:
+                    from backend.services.redis_connection import redis_client_kwargs
+                except ImportError:
+                    from services.redis_connection import redis_client_kwargs
+
+                self._binary_client = redis.Redis(**{**redis_client_kwargs(), "decode_responses": False})
+            except Exception as exc:
+                print(f"[Redis] Binary client initialization failed: {exc}")
+                self._binary_client = None
+        return self._binary_client
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        client = self.get_binary_client()
+        if client:
+            try:
+                return client.get(key)
+            except Exception as exc:
+                print(f"[Redis] GET failed for {key}: {exc}")
+        return None
+
+    def set_bytes(self, key: str, value: bytes, ex_seconds: int = 3600):
+        client = self.get_binary_client()
+        if client:
+            try:
+                client.set(key, value, ex=ex_seconds)
+            except Exception as exc:
+                print(f"[Redis] SET failed for {key}: {exc}")
+
     def get(self, key: str) -> Optional[str]:
         client = self.get_client()
         if client:
@@ -788,16 +840,59 @@ class RedisCache:
 
 cache = RedisCache()
 
+try:
+    from backend.services.db_pool import PoolTimeout, db_connect_kwargs, get_pooled_connection, pool_stats as db_pool_stats
+except ImportError:
+    from services.db_pool import PoolTimeout, db_connect_kwargs, get_pooled_connection, pool_stats as db_pool_stats
+
+try:
+    from backend.services.async_db import async_pool_stats, close_async_pools
+    from backend.services.request_lanes import LaneSaturated, lane_stats, offload, run_in_lane, shutdown_lanes
+except ImportError:
+    from services.async_db import async_pool_stats, close_async_pools  # type: ignore[no-redef]
+    from services.request_lanes import (  # type: ignore[no-redef]
+        LaneSaturated,
+        lane_stats,
+        offload,
+        run_in_lane,
+        shutdown_lanes,
+    )
+
+
+@app.exception_handler(LaneSaturated)
+def _lane_saturated_response(request: Request, exc: LaneSaturated):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Server busy ({exc.lane} lane full); retry shortly."},
+        headers={"Retry-After": "1"},
+    )
+
+try:
+    from backend.services.schema_registry import (
+        format_schema_report,
+        reset_schema_registry,
+        schema_readiness_report,
+    )
+except ImportError:
+    from services.schema_registry import (  # type: ignore[no-redef]
+        format_schema_report,
+        reset_schema_registry,
+        schema_readiness_report,
+    )
+
+
 def _target_db_connect():
     if DATABASE_URL:
-        return psycopg2.connect(DATABASE_URL, connect_timeout=5)
-    return psycopg2.connect(
-        host=DB_HOST,
-        port=DB_PORT,
-        database=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        connect_timeout=5,
+        return get_pooled_connection({"dsn": DATABASE_URL, "connect_timeout": 5})
+    return get_pooled_connection(
+        {
+            "host": DB_HOST,
+            "port": DB_PORT,
+            "database": DB_NAME,
+            "user": DB_USER,
+            "password": DB_PASSWORD,
+            "connect_timeout": 5,
+        }
     )
 
 def _maintenance_db_connect():
@@ -859,6 +954,9 @@ def get_db_connection():
     while retries > 0:
         try:
             return _target_db_connect()
+        except PoolTimeout as e:
+            print(f"[db] connection pool saturated: {e}")
+            raise HTTPException(status_code=503, detail="Database connection pool saturated. Please retry shortly.")
         except psycopg2.OperationalError as e:
             if _database_missing_error(e) and not attempted_create_missing_db:
                 attempted_create_missing_db = True
@@ -1523,6 +1621,12 @@ def init_db(*, raise_on_error: bool = False) -> bool:
             cur.execute(
                 "ALTER TABLE license_sync_runs ADD COLUMN IF NOT EXISTS drift_warning JSONB;"
             )
+            cur.execute(
+                "ALTER TABLE license_sync_runs ADD COLUMN IF NOT EXISTS duration_ms INTEGER;"
+            )
+            cur.execute(
+                "ALTER TABLE license_sync_runs ADD COLUMN IF NOT EXISTS rows_per_sec DOUBLE PRECISION;"
+            )
             conn.commit()
             print("Schema migration successful (added new columns if missing).")
         except Exception as sync_runs_exc:
@@ -1617,6 +1721,32 @@ def init_db(*, raise_on_error: bool = False) -> bool:
                 ON oil_trade_flows (reporter, year);
         """)
 
+        try:
+            cur.execute("SAVEPOINT license_map_cells_schema")
+            try:
+                from backend.services.license_map_perf import ensure_license_map_cell_tables
+            except ImportError:
+                from services.license_map_perf import ensure_license_map_cell_tables
+            ensure_license_map_cell_tables(conn)
+            cur.execute("RELEASE SAVEPOINT license_map_cells_schema")
+        except Exception as map_cells_exc:
+            cur.execute("ROLLBACK TO SAVEPOINT license_map_cells_schema")
+            cur.execute("RELEASE SAVEPOINT license_map_cells_schema")
+            print(f"License map cell grid init skipped: {map_cells_exc}")
+
+        try:
+            cur.execute("SAVEPOINT license_country_origin_schema")
+            try:
+                from backend.services.license_map_perf import ensure_license_country_origin_summary
+            except ImportError:
+                from services.license_map_perf import ensure_license_country_origin_summary
+            ensure_license_country_origin_summary(conn)
+            cur.execute("RELEASE SAVEPOINT license_country_origin_schema")
+        except Exception as origin_summary_exc:
+            cur.execute("ROLLBACK TO SAVEPOINT license_country_origin_schema")
+            cur.execute("RELEASE SAVEPOINT license_country_origin_schema")
+            print(f"License country origin summary init skipped: {origin_summary_exc}")
+
         try:
             cur.execute("SAVEPOINT maritime_schema")
             try:
@@ -1772,7 +1902,12 @@ def ensure_schema_initialized(*, force: bool = False) -> bool:
         # Double-check inside the lock in case another thread just finished
         if _SCHEMA_READY and not force:
             return True
+        if force:
+            # Re-run every registered ensure_* helper even where schema_versions has a stamp.
+            reset_schema_registry(ignore_stamps=True)
+        started = time.perf_counter()
         initialized = init_db(raise_on_error=False)
+        print(f"{format_schema_report()} (init_db {(time.perf_counter() - started) * 1000.0:.1f} ms)")
         if initialized:
             _SCHEMA_READY = True
             return True
@@ -1856,6 +1991,33 @@ def _sync_eia_historic_reference() -> None:
         print(f"[EiaHistoric] Auto-ingest skipped or failed: {exc}")
 
 
+def _backfill_eia_historic_rollups() -> None:
+    """Roll up files ingested before eia_historic_rollup existed, whether or not EIA_DOWNLOADS_DIR is set."""
+    try:
+        try:
+            from backend.services.eia_historic_imports import backfill_eia_historic_rollups
+        except ImportError:
+            from services.eia_historic_imports import backfill_eia_historic_rollups
+
+        conn = get_db_connection()
+        try:
+            backfilled = backfill_eia_historic_rollups(conn)
+            if backfilled:
+                print(f"[EiaHistoric] Rollup backfill — files={backfilled}")
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    except Exception as exc:
+        print(f"[EiaHistoric] Rollup backfill skipped or failed: {exc}")
+
+
+def _graph_sync_connect():
+    """Unpooled connection per graph-sync step so a long DAG run cannot drain the request pool."""
+    return psycopg2.connect(**db_connect_kwargs())
+
+
 def _sync_oil_live_graph_reference() -> None:
     """Merge OSM terminals, licenses, trade, port calls, TED, USAspending into oil_commercial_events."""
     if not _oil_graph_sync_on_startup_enabled():
@@ -1871,7 +2033,7 @@ def _sync_oil_live_graph_reference() -> None:
 
         conn = get_db_connection()
         try:
-            summary = run_full_graph_sync(conn, rebuild_synthetic_bol=False)
+            summary = run_full_graph_sync(conn, rebuild_synthetic_bol=False, connect=_graph_sync_connect)
             print(
                 f"[OilGraph] Commercial graph sync complete — status={summary.get('status')}, "
                 f"steps={list((summary.get('steps') or {}).keys())}"
@@ -1901,13 +2063,10 @@ def _sync_opec_gulf_reference() -> None:
                 f"{opec_summary.get('entities_written', 0)} entities upserted, "
                 f"{opec_summary.get('eia_countries_enriched', 0)} countries enriched with live EIA data."
             )
-            if opec_summary.get("entities_written", 0) > 0:
-                try:
-                    cache.delete_pattern("licenses:*")
-                except Exception:
-                    pass
         finally:
             opec_conn.close()
+        if opec_summary.get("entities_written", 0) > 0:
+            _licenses_changed()
     except Exception as exc:
         print(f"[OPEC] Persian Gulf sync skipped or failed: {exc}")
 
@@ -1931,13 +2090,10 @@ def _sync_oil_products_licenses_reference() -> None:
                 f"{summary.get('entities_written', 0)} fuel/products marketers upserted "
                 f"(seed {summary.get('seed_count', 0)})."
             )
-            if summary.get("entities_written", 0) > 0:
-                try:
-                    cache.delete_pattern("licenses:*")
-                except Exception:
-                    pass
         finally:
             lic_conn.close()
+        if summary.get("entities_written", 0) > 0:
+            _licenses_changed()
     except Exception as exc:
         print(f"[OilProductsLic] Sync skipped or failed: {exc}")
 
@@ -2007,10 +2163,7 @@ def _bootstrap_open_data():
             )
             if geo_stats.updated > 0:
                 print("[OpenData] Geocoding changes written, invalidating licenses Redis cache...")
-                try:
-                    cache.delete_pattern("licenses:*")
-                except Exception as cache_exc:
-                    print(f"[OpenData] Cache invalidation skipped: {cache_exc}")
+                _licenses_changed()
         except Exception as ge_exc:
             print(f"[OpenData] Automatic geocoding skipped or failed: {ge_exc}")
 
@@ -2052,6 +2205,18 @@ def _warm_storage_terminal_cache() -> None:
         print(f"[startup] Storage terminal warmup skipped: {exc}")
 
 
+def _warm_unlocode_ports() -> None:
+    """Map the UN/LOCODE snapshot in the background so port lookups never wait on it."""
+    try:
+        try:
+            from backend.services.maritime_intel import warm_unlocode_ports
+        except ImportError:
+            from services.maritime_intel import warm_unlocode_ports  # type: ignore
+        warm_unlocode_ports()
+    except Exception as exc:
+        print(f"[startup] UN/LOCODE warmup skipped: {exc}")
+
+
 @app.on_event("startup")
 def startup_schema_bootstrap():
     """Bind the HTTP port before heavy DB work: init runs in a background thread."""
@@ -2060,6 +2225,7 @@ def startup_schema_bootstrap():
     except ImportError:
         from services.ai_providers import log_ai_provider_status  # type: ignore[no-redef]
     log_ai_provider_status()
+    _warm_unlocode_ports()
 
     def _warm():
         if not ensure_schema_initialized():
@@ -2068,6 +2234,7 @@ def startup_schema_bootstrap():
         _sync_opec_gulf_reference()
         _sync_oil_products_licenses_reference()
         _sync_eia_historic_reference()
+        _backfill_eia_historic_rollups()
         _sync_gov_procurement_reference()
         _sync_oil_live_graph_reference()
         _warm_storage_terminal_cache()
@@ -2075,6 +2242,20 @@ def startup_schema_bootstrap():
 
     threading.Thread(target=_warm, daemon=True).start()
 
+
+@app.on_event("startup")
+def startup_agent_job_workers():
+    _load_agent_job_queue().start_embedded_agent_workers()
+
+
+@app.on_event("shutdown")
+async def shutdown_request_lanes():
+    queue = _load_agent_job_queue()
+    queue.close_agent_job_events()
+    queue.stop_embedded_agent_workers()
+    close_async_pools()
+    shutdown_lanes()
+
 # --- Auth Endpoints ---
 
 @app.post("/auth/login")
@@ -2376,7 +2557,136 @@ def _fetch_license_rows_for_api(
     return rows, _load_cached_geo_fallbacks(c, rows)
 
 
+LICENSE_MAP_CELLS_ENABLED = (os.getenv("LICENSE_MAP_CELLS_ENABLED") or "true").strip().lower() not in {
+    "0",
+    "false",
+    "no",
+    "off",
+}
+LICENSE_MAP_CELLS_MAX_AGE_SEC = float(os.getenv("LICENSE_MAP_CELLS_MAX_AGE_SEC", "21600"))
+_license_map_cells_state: dict[str, Any] = {
+    "checked_at": 0.0,
+    "built_at": None,
+    "rebuilding": False,
+    "pending": False,
+    "last_attempt": 0.0,
+}
+_license_map_cells_lock = threading.Lock()
+
+
+def _license_map_cells_fresh(c) -> bool:
+    """True when the persisted cluster grid is built and younger than LICENSE_MAP_CELLS_MAX_AGE_SEC.
+
+    The meta row is re-read at most once a minute per worker.
+    """
+    if not LICENSE_MAP_CELLS_ENABLED:
+        return False
+    now = time.time()
+    state = _license_map_cells_state
+    if now - float(state["checked_at"]) > 60:
+        try:
+            from backend.services.license_map_perf import license_map_cells_age_seconds
+        except ImportError:
+            from services.license_map_perf import license_map_cells_age_seconds
+        age = license_map_cells_age_seconds(c)
+        state["built_at"] = None if age is None else now - age
+        state["checked_at"] = now
+    built_at = state["built_at"]
+    return built_at is not None and now - built_at <= LICENSE_MAP_CELLS_MAX_AGE_SEC
+
+
+def _schedule_license_map_cells_rebuild(*, force: bool = False) -> None:
+    """Rebuild the persisted cluster grid in the background (one rebuild per worker at a time).
+
+    ``force`` (after a licenses write) skips the retry throttle; a forced request that lands
+    mid-rebuild queues one more pass so the grid never settles on a pre-write snapshot.
+    """
+    if not LICENSE_MAP_CELLS_ENABLED:
+        return
+    with _license_map_cells_lock:
+        state = _license_map_cells_state
+        if state["rebuilding"]:
+            if force:
+                state["pending"] = True
+            return
+        if not force and time.time() - float(state["last_attempt"]) < 300:
+            return
+        state["rebuilding"] = True
+        state["last_attempt"] = time.time()
+
+    def _rebuild():
+        while True:
+            try:
+                try:
+                    from backend.services.license_map_perf import rebuild_license_map_cells
+                except ImportError:
+                    from services.license_map_perf import rebuild_license_map_cells
+
+                conn = get_db_connection()
+                try:
+                    stats = rebuild_license_map_cells(conn)
+                    print(f"[licenses] map cell grid rebuilt: {stats}")
+                finally:
+                    conn.close()
+                _license_map_cells_state["checked_at"] = 0.0
+            except Exception as exc:
+                print(f"[licenses] map cell grid rebuild failed: {exc}")
+            with _license_map_cells_lock:
+                if not _license_map_cells_state["pending"]:
+                    _license_map_cells_state["rebuilding"] = False
+                    return
+                _license_map_cells_state["pending"] = False
+
+    threading.Thread(target=_rebuild, daemon=True).start()
+
+
+def _licenses_changed(countries: Optional[Iterable[Any]] = None) -> None:
+    """Refresh everything derived from ``licenses`` after a committed write (best effort).
+
+    Drops cached payloads, recomputes license_country_origin_summary for ``countries`` (all
+    countries when None) and marks the cluster grid stale, so reads use the live GROUP BY until
+    the background rebuild commits.
+    """
+    try:
+        cache.delete_pattern("licenses:*")
+    except Exception:
+        pass
+    try:
+        from backend.services.license_map_perf import (
+            mark_license_map_cells_stale,
+            refresh_license_country_origin_summary,
+        )
+    except ImportError:
+        from services.license_map_perf import (
+            mark_license_map_cells_stale,
+            refresh_license_country_origin_summary,
+        )
+
+    try:
+        conn = get_db_connection()
+        try:
+            try:
+                refresh_license_country_origin_summary(conn, countries, commit=False)
+                conn.commit()
+            except Exception as exc:
+                print(f"[licenses] country origin summary refresh skipped: {exc}")
+                conn.rollback()
+            if LICENSE_MAP_CELLS_ENABLED:
+                with conn.cursor() as cur:
+                    mark_license_map_cells_stale(cur)
+                conn.commit()
+        finally:
+            conn.close()
+    except Exception as exc:
+        print(f"[licenses] map cell grid invalidation skipped: {exc}")
+    with _license_map_cells_lock:
+        _license_map_cells_state["built_at"] = None
+        _license_map_cells_state["checked_at"] = time.time()
+    _schedule_license_map_cells_rebuild(force=True)
+
+
 @app.get("/licenses")
+@offload("map")
 def read_licenses(
     sector: Optional[str] = None,
     prefer_open_data: bool = True,
@@ -2388,6 +2698,8 @@ def read_licenses(
     countries: Optional[str] = None,
     zoom: Optional[float] = None,
     map: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
 ):
     """Return licenses for the map and admin views.
 
@@ -2402,38 +2714,46 @@ def read_licenses(
 
     When a bbox is applied, responses are capped for safety: ``limit`` defaults to 5000 and is
     clamped to a maximum of 15000 regardless of the client value.
+
+    Successful responses are serialized once, gzipped and cached in Redis as final bytes with
+    an ``ETag``; hits are served without re-encoding and ``If-None-Match`` yields 304.
     """
     if not ensure_schema_initialized():
         return _schema_unavailable_response("initializing license schema")
 
+    try:
+        from backend.services.license_payload_cache import (
+            LicensePayload,
+            encode_license_payload,
+            license_payload_response,
+        )
+    except ImportError:
+        from services.license_payload_cache import (
+            LicensePayload,
+            encode_license_payload,
+            license_payload_response,
+        )
+
     map_mode = map or str(zoom or "").strip() != ""
     cache_key = (
-        f"licenses:sector:{sector}:prefer_open_data:{prefer_open_data}:bbox:{min_lat}_{max_lat}_{min_lng}_{max_lng}"
+        f"licenses:payload:sector:{sector}:prefer_open_data:{prefer_open_data}:bbox:{min_lat}_{max_lat}_{min_lng}_{max_lng}"
         f":limit:{limit}:countries:{countries}:zoom:{zoom}:map:{int(map_mode)}"
     )
-    cached_val = cache.get(cache_key)
-    if cached_val:
-        try:
-            return json.loads(cached_val)
-        except Exception:
-            pass
+    cached_payload = LicensePayload.from_blob(cache.get_bytes(cache_key))
+    if cached_payload is not None:
+        return license_payload_response(
+            cached_payload, if_none_match=if_none_match, accept_encoding=accept_encoding
+        )
 
-    def _cache_and_return(res):
-        if isinstance(res, list) or (isinstance(res, dict) and "error" not in res):
-            try:
-                cache.set(
-                    cache_key,
-                    json.dumps(
-                        res,
-                        default=lambda o: o.isoformat()
-                        if isinstance(o, datetime)
-                        else str(o),
-                    ),
-                    ex_seconds=1800,
-                )
-            except Exception as exc:
-                print(f"[Redis] Failed to cache response: {exc}")
-        return res
+    def _cache_and_respond(res, max_age: Optional[int] = None):
+        if not (isinstance(res, list) or (isinstance(res, dict) and "error" not in res)):
+            return res
+        prepared = encode_license_payload(res, max_age=max_age)
+        try:
+            cache.set_bytes(cache_key, prepared.to_blob(), ex_seconds=1800)
+        except Exception as exc:
+            print(f"[Redis] Failed to cache response: {exc}")
+        return license_payload_response(prepared, if_none_match=if_none_match, accept_encoding=accept_encoding)
 
     try:
         try:
@@ -2472,17 +2792,10 @@ def read_licenses(
         sector_sql, sector_params = _licenses_sector_sql_fragment(normalized_sector_key)
         country_sql, country_params = _licenses_countries_sql_fragment(requested_countries)
         open_clause = ""
+        open_params: list[Any] = []
         if prefer_open_data:
-            open_clause = f""" AND (
-                LOWER(TRIM(COALESCE(record_origin, ''))) <> 'bundled_json'
-                OR country IS NULL
-                OR country NOT IN (
-                    SELECT country FROM licenses 
-                    WHERE LOWER(TRIM(COALESCE(record_origin, ''))) IN ('open_data', 'global_open_fallback') 
-                    AND country IS NOT NULL
-                    AND {sector_sql}
-                )
-            ) """
+            open_clause = license_open_data_preference_sql(sector_sql)
+            open_params = list(sector_params)
         columns = _license_api_columns_sql()
         per_country_cap = len(requested_countries) > 1
         if per_country_cap:
@@ -2511,7 +2824,16 @@ def read_licenses(
                 ORDER BY id
                 LIMIT %s
             """
-        list_params: list[Any] = [*sector_params, *country_params, min_la, max_la, min_lo, max_lo, safe_limit]
+        list_params: list[Any] = [
+            *sector_params,
+            *country_params,
+            min_la,
+            max_la,
+            min_lo,
+            max_lo,
+            *open_params,
+            safe_limit,
+        ]
         c.execute(list_sql, tuple(list_params))
         rows = c.fetchall()
         cached_geo = _load_cached_geo_fallbacks(c, rows)
@@ -2524,13 +2846,17 @@ def read_licenses(
                 from backend.services.license_map_perf import (
                     license_cluster_limit_for_zoom,
                     license_grid_degrees,
+                    license_open_data_preference_sql,
                     query_license_clusters,
+                    query_license_clusters_from_cells,
                 )
             except ImportError:
                 from services.license_map_perf import (
                     license_cluster_limit_for_zoom,
                     license_grid_degrees,
+                    license_open_data_preference_sql,
                     query_license_clusters,
+                    query_license_clusters_from_cells,
                 )
 
             grid_deg = license_grid_degrees(zoom) if map_mode else None
@@ -2538,40 +2864,53 @@ def read_licenses(
             sector_sql, sector_params = _licenses_sector_sql_fragment(normalized_sector_key)
             country_sql, country_params = _licenses_countries_sql_fragment(requested_countries)
             open_clause = ""
+            open_params: list[Any] = []
             if prefer_open_data:
-                open_clause = f""" AND (
-                    LOWER(TRIM(COALESCE(record_origin, ''))) <> 'bundled_json'
-                    OR country IS NULL
-                    OR country NOT IN (
-                        SELECT country FROM licenses 
-                        WHERE LOWER(TRIM(COALESCE(record_origin, ''))) IN ('open_data', 'global_open_fallback') 
-                        AND country IS NOT NULL
-                        AND {sector_sql}
-                    )
-                ) """
+                open_clause = license_open_data_preference_sql(sector_sql)
+                open_params = list(sector_params)
             
             # Keep a dummy variable so later references don't break
             has_preferred_live_rows = False
 
             if grid_deg is not None:
-                clusters = query_license_clusters(
-                    c,
-                    sector_sql=sector_sql,
-                    sector_params=sector_params,
-                    country_sql=country_sql,
-                    country_params=country_params,
-                    min_lat=min_la,
-                    max_lat=max_la,
-                    min_lng=min_lo,
-                    max_lng=max_lo,
-                    grid_deg=grid_deg,
-                    open_clause=open_clause,
-                    limit=license_cluster_limit_for_zoom(zoom, int(limit or 800)),
-                    zoom=zoom,
-                )
+                cluster_limit = license_cluster_limit_for_zoom(zoom, int(limit or 800))
+                if _license_map_cells_fresh(c):
+                    clusters = query_license_clusters_from_cells(
+                        c,
+                        sector_sql=sector_sql,
+                        sector_params=sector_params,
+                        country_sql=country_sql,
+                        country_params=country_params,
+                        min_lat=min_la,
+                        max_lat=max_la,
+                        min_lng=min_lo,
+                        max_lng=max_lo,
+                        grid_deg=grid_deg,
+                        prefer_open_data=prefer_open_data,
+                        limit=cluster_limit,
+                        zoom=zoom,
+                    )
+                else:
+                    _schedule_license_map_cells_rebuild()
+                    clusters = query_license_clusters(
+                        c,
+                        sector_sql=sector_sql,
+                        sector_params=sector_params,
+                        country_sql=country_sql,
+                        country_params=country_params,
+                        min_lat=min_la,
+                        max_lat=max_la,
+                        min_lng=min_lo,
+                        max_lng=max_lo,
+                        grid_deg=grid_deg,
+                        open_clause=open_clause,
+                        open_params=open_params,
+                        limit=cluster_limit,
+                        zoom=zoom,
+                    )
                 conn.close()
                 payload = {"mode": "clusters", "clusters": clusters, "zoom": zoom, "grid_degrees": grid_deg}
-                return _licenses_json_response(_cache_and_return(payload), max_age=180)
+                return _cache_and_respond(payload, max_age=180)
 
             rows, cached_geo, has_preferred_live_rows = _bbox_query(c)
         except Exception as e:
@@ -2594,7 +2933,7 @@ def read_licenses(
                         f"sector={normalized_sector_key or 'all'} prefer_open_data={prefer_open_data} "
                         f"has_live_origin_signal={has_preferred_live_rows}"
                     )
-                return _cache_and_return(results)
+                return _cache_and_respond(results, max_age=120)
             print(f"[licenses] bbox query failed: {e}")
             return _schema_unavailable_response("reading licenses")
         conn.close()
@@ -2608,7 +2947,7 @@ def read_licenses(
                 f"sector={normalized_sector_key or 'all'} prefer_open_data={prefer_open_data} "
                 f"has_live_origin_signal={has_preferred_live_rows}"
             )
-        return _licenses_json_response(_cache_and_return(results), max_age=120)
+        return _cache_and_respond(results, max_age=120)
 
     start_time = time.time()
     c = conn.cursor(cursor_factory=RealDictCursor)
@@ -2658,7 +2997,102 @@ def read_licenses(
             f"has_live_origin_signal={has_preferred_live_rows} bbox_sql=0"
         )
 
-    return _cache_and_return(results)
+    return _cache_and_respond(results)
+
+
+@app.get("/api/licenses/tiles/{z}/{x}/{y}.pbf")
+def read_license_tile(
+    z: int,
+    x: int,
+    y: int,
+    sector: Optional[str] = None,
+    prefer_open_data: bool = True,
+    countries: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    """Mapbox vector tile of licenses for one XYZ tile.
+
+    Below z8 the ``license_clusters`` layer carries the same grid clusters as ``/licenses?zoom=``
+    (persisted cell grid when fresh); from z8 the ``licenses`` layer carries individual markers.
+    Encoded tiles are cached in Redis under ``licenses:tile:*`` (cleared with the other license
+    caches on writes) and served with an ``ETag``; ``If-None-Match`` yields 304.
+    """
+    try:
+        from backend.services.license_payload_cache import (
+            LicensePayload,
+            encode_license_bytes,
+            license_payload_response,
+        )
+        from backend.services.license_tiles import LICENSE_TILE_MEDIA_TYPE, build_license_tile, valid_tile
+        from backend.services.license_map_perf import license_grid_degrees
+    except ImportError:
+        from services.license_payload_cache import (
+            LicensePayload,
+            encode_license_bytes,
+            license_payload_response,
+        )
+        from services.license_tiles import LICENSE_TILE_MEDIA_TYPE, build_license_tile, valid_tile
+        from services.license_map_perf import license_grid_degrees
+
+    if not valid_tile(z, x, y):
+        raise HTTPException(status_code=400, detail=f"Invalid tile {z}/{x}/{y}")
+
+    requested_countries = parse_requested_countries(countries)
+    normalized_sector_key = (sector or "").strip().lower() or None
+    cache_key = (
+        f"licenses:tile:{z}/{x}/{y}:sector:{normalized_sector_key}:prefer_open_data:{prefer_open_data}"
+        f":countries:{','.join(sorted(requested_countries))}"
+    )
+
+    def _respond(prepared):
+        return license_payload_response(
+            prepared,
+            if_none_match=if_none_match,
+            accept_encoding=accept_encoding,
+            media_type=LICENSE_TILE_MEDIA_TYPE,
+        )
+
+    cached_tile = LicensePayload.from_blob(cache.get_bytes(cache_key))
+    if cached_tile is not None:
+        return _respond(cached_tile)
+
+    if not ensure_schema_initialized():
+        return _schema_unavailable_response("initializing license schema")
+
+    sector_sql, sector_params = _licenses_sector_sql_fragment(normalized_sector_key)
+    country_sql, country_params = _licenses_countries_sql_fragment(requested_countries)
+    clustered = license_grid_degrees(z) is not None
+    conn = get_db_connection()
+    try:
+        c = conn.cursor(cursor_factory=RealDictCursor)
+        use_cells = clustered and _license_map_cells_fresh(c)
+        if clustered and not use_cells:
+            _schedule_license_map_cells_rebuild()
+        pbf, _ = build_license_tile(
+            c,
+            z,
+            x,
+            y,
+            sector_sql=sector_sql,
+            sector_params=sector_params,
+            country_sql=country_sql,
+            country_params=country_params,
+            prefer_open_data=prefer_open_data,
+            use_cells=use_cells,
+        )
+    except Exception as exc:
+        print(f"[licenses] tile {z}/{x}/{y} failed: {exc}")
+        return _schema_unavailable_response("reading license tiles")
+    finally:
+        conn.close()
+
+    prepared = encode_license_bytes(pbf, max_age=180 if clustered else 120)
+    try:
+        cache.set_bytes(cache_key, prepared.to_blob(), ex_seconds=1800)
+    except Exception as exc:
+        print(f"[Redis] Failed to cache license tile: {exc}")
+    return _respond(prepared)
 
 
 @app.get("/entities/{entity_id:path}/contacts")
@@ -2883,6 +3317,7 @@ def read_gov_procurement_companies(
 
 
 @app.post("/api/admin/gov-procurement/sync")
+@offload("slow")
 def admin_gov_procurement_sync(x_admin_token: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None)):
     forbidden = _check_admin_token(x_admin_token, authorization)
@@ -3056,6 +3491,7 @@ def _agent_entity_id(payload: AgentEntityRequest) -> str:
 
 
 @app.post("/api/agents/route-intelligence")
+@offload("slow")
 def agent_route_intelligence(payload: AgentRouteIntelligenceRequest):
     (
         _ensure_agent_jobs_table,
@@ -3066,8 +3502,19 @@ def agent_route_intelligence(payload: AgentRouteIntelligenceRequest):
         _run_entity_data_validation,
         _run_data_validation_batch,
     ) = _load_agent_intelligence_services()
+    queue = _load_agent_job_queue()
     conn = get_db_connection()
     try:
+        if queue.agent_job_queue_enabled():
+            return _agent_job_accepted(
+                queue.agent_intelligence.enqueue_route_intelligence(
+                    conn,
+                    route_payload=payload.route,
+                    deterministic_warnings=payload.deterministic_warnings,
+                    route_hash=payload.route_hash,
+                    force_refresh=payload.force_refresh,
+                )
+            )
         return run_route_intelligence(
             conn,
             route_payload=payload.route,
@@ -3080,6 +3527,7 @@ def agent_route_intelligence(payload: AgentRouteIntelligenceRequest):
 
 
 @app.post("/api/agents/contact-enrichment")
+@offload("slow")
 def agent_contact_enrichment(payload: AgentEntityRequest):
     (
         _ensure_agent_jobs_table,
@@ -3091,8 +3539,19 @@ def agent_contact_enrichment(payload: AgentEntityRequest):
         _run_data_validation_batch,
     ) = _load_agent_intelligence_services()
     entity_id = _agent_entity_id(payload)
+    queue = _load_agent_job_queue()
     conn = get_db_connection()
     try:
+        if queue.agent_job_queue_enabled():
+            return _agent_job_accepted(
+                queue.agent_intelligence.enqueue_contact_enrichment(
+                    conn,
+                    entity_id=entity_id,
+                    entity_kind=payload.entity_kind,
+                    entity=payload.entity,
+                    force_refresh=payload.force_refresh,
+                )
+            )
         return run_contact_enrichment(
             conn,
             entity_id=entity_id,
@@ -3105,6 +3564,7 @@ def agent_contact_enrichment(payload: AgentEntityRequest):
 
 
 @app.post("/api/agents/operator-validation")
+@offload("slow")
 def agent_operator_validation(payload: AgentEntityRequest):
     (
         _ensure_agent_jobs_table,
@@ -3116,8 +3576,19 @@ def agent_operator_validation(payload: AgentEntityRequest):
         _run_data_validation_batch,
     ) = _load_agent_intelligence_services()
     entity_id = _agent_entity_id(payload)
+    queue = _load_agent_job_queue()
     conn = get_db_connection()
     try:
+        if queue.agent_job_queue_enabled():
+            return _agent_job_accepted(
+                queue.agent_intelligence.enqueue_operator_validation(
+                    conn,
+                    entity_id=entity_id,
+                    entity_kind=payload.entity_kind,
+                    entity=payload.entity,
+                    force_refresh=payload.force_refresh,
+                )
+            )
         return run_operator_validation(
             conn,
             entity_id=entity_id,
@@ -3130,6 +3601,7 @@ def agent_operator_validation(payload: AgentEntityRequest):
 
 
 @app.get("/api/agents/data-validation/entity/{entity_id:path}")
+@offload("slow")
 def agent_entity_data_validation(entity_id: str, entity_kind: str = "license", force_refresh: bool = False):
     (
         _ensure_agent_jobs_table,
@@ -3140,8 +3612,18 @@ def agent_entity_data_validation(entity_id: str, entity_kind: str = "license", f
         run_entity_data_validation,
         _run_data_validation_batch,
     ) = _load_agent_intelligence_services()
+    queue = _load_agent_job_queue()
     conn = get_db_connection()
     try:
+        if queue.agent_job_queue_enabled():
+            return _agent_job_accepted(
+                queue.agent_intelligence.enqueue_entity_data_validation(
+                    conn,
+                    entity_id=entity_id,
+                    entity_kind=entity_kind,
+                    force_refresh=force_refresh,
+                )
+            )
         return run_entity_data_validation(
             conn,
             entity_id=entity_id,
@@ -3153,6 +3635,7 @@ def agent_entity_data_validation(entity_id: str, entity_kind: str = "license", f
 
 
 @app.post("/api/agents/data-validation/run")
+@offload("slow")
 def agent_data_validation_run(payload: AgentDataValidationRunRequest):
     (
         _ensure_agent_jobs_table,
@@ -3163,8 +3646,17 @@ def agent_data_validation_run(payload: AgentDataValidationRunRequest):
         _run_entity_data_validation,
         run_data_validation_batch,
     ) = _load_agent_intelligence_services()
+    queue = _load_agent_job_queue()
     conn = get_db_connection()
     try:
+        if queue.agent_job_queue_enabled():
+            return _agent_job_accepted(
+                queue.agent_intelligence.enqueue_data_validation_batch(
+                    conn,
+                    limit=payload.limit,
+                    force_refresh=payload.force_refresh,
+                )
+            )
         return run_data_validation_batch(
             conn,
             limit=payload.limit,
@@ -3174,8 +3666,7 @@ def agent_data_validation_run(payload: AgentDataValidationRunRequest):
         conn.close()
 
 
-@app.get("/api/agents/jobs/{job_id}")
-def read_agent_job(job_id: str):
+def _read_agent_job(job_id: str) -> Optional[dict[str, Any]]:
     (
         _ensure_agent_jobs_table,
         get_agent_job,
@@ -3187,14 +3678,52 @@ def read_agent_job(job_id: str):
     ) = _load_agent_intelligence_services()
     conn = get_db_connection()
     try:
-        job = get_agent_job(conn, job_id)
-        if job is None:
-            raise HTTPException(status_code=404, detail=f"Agent job {job_id} not found")
-        return job
+        return get_agent_job(conn, job_id)
     finally:
         conn.close()
 
 
+async def _read_agent_job_in_lane(job_id: str) -> Optional[dict[str, Any]]:
+    return await run_in_lane("poll", _read_agent_job, job_id)
+
+
+@app.get("/api/agents/jobs/{job_id}")
+async def read_agent_job(job_id: str, wait: float = Query(0.0, ge=0.0, le=60.0)):
+    """Agent job state; ``wait`` > 0 long-polls until the job completes/fails (LISTEN/NOTIFY wake-up)."""
+    queue = _load_agent_job_queue()
+    if wait > 0:
+        job = await queue.wait_for_agent_job(job_id, _read_agent_job_in_lane, timeout=wait)
+    else:
+        job = await _read_agent_job_in_lane(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Agent job {job_id} not found")
+    return job
+
+
+@app.get("/api/agents/jobs/{job_id}/stream")
+async def stream_agent_job(job_id: str, request: Request):
+    """Server-sent ``job`` events on each status change until the job completes or fails."""
+    queue = _load_agent_job_queue()
+    first = await _read_agent_job_in_lane(job_id)
+    if first is None:
+        raise HTTPException(status_code=404, detail=f"Agent job {job_id} not found")
+    from fastapi.encoders import jsonable_encoder
+
+    async def events():
+        async for job in queue.watch_agent_job(
+            job_id, _read_agent_job_in_lane, timeout=queue.AGENT_JOB_STREAM_MAX_SEC
+        ):
+            if await request.is_disconnected():
+                return
+            yield f"event: job\ndata: {json.dumps(jsonable_encoder(job))}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 class DealRoomCreateRequest(BaseModel):
     entity_id: str
     entity_kind: str = "license"
@@ -3283,59 +3812,29 @@ def _mark_agent_job_failed(conn, job_id: str, error: str) -> dict[str, Any] | No
 
 def _execute_deal_room_agent_job(deal_room_id: str, job_id: str) -> None:
     services = _load_deal_room_services()
-    (
-        _ensure_agent_jobs_table,
-        get_agent_job,
-        run_route_intelligence,
-        run_contact_enrichment,
-        run_operator_validation,
-        _run_entity_data_validation,
-        _run_data_validation_batch,
-    ) = _load_agent_intelligence_services()
+    queue = _load_agent_job_queue()
     conn = get_db_connection()
     try:
-        job = get_agent_job(conn, job_id)
+        job = queue.agent_intelligence.get_agent_job(conn, job_id)
         if not job:
             return
         if job.get("status") == "completed":
             services.update_deal_room_evidence_from_job(conn, deal_room_id, job)
             return
-        agent_type = job.get("agent_type")
-        payload = job.get("input") if isinstance(job.get("input"), dict) else {}
-        if agent_type == "contact_enrichment":
-            result = run_contact_enrichment(
-                conn,
-                entity_id=str(payload.get("entity_id") or job.get("entity_id")),
-                entity_kind=str(payload.get("entity_kind") or "license"),
-            )
-        elif agent_type == "operator_validation":
-            result = run_operator_validation(
-                conn,
-                entity_id=str(payload.get("entity_id") or job.get("entity_id")),
-                entity_kind=str(payload.get("entity_kind") or "license"),
-            )
-        elif agent_type == "route_intelligence":
-            route = payload.get("route") if isinstance(payload.get("route"), dict) else {}
-            result = run_route_intelligence(
-                conn,
-                route_payload=route,
-                deterministic_warnings=payload.get("deterministic_warnings"),
-                route_hash=job.get("route_hash"),
-            )
-        elif agent_type == "due_diligence_summary":
-            result = services.run_due_diligence_summary(
-                conn,
-                entity_id=str(payload.get("entity_id") or job.get("entity_id")),
-                entity_kind=str(payload.get("entity_kind") or "license"),
-            )
-        elif agent_type == "procurement_summary":
-            result = services.run_procurement_summary(
-                conn,
-                entity_id=str(payload.get("entity_id") or job.get("entity_id")),
-                entity_kind=str(payload.get("entity_kind") or "license"),
-            )
-        else:
-            result = _mark_agent_job_failed(conn, job_id, f"Unsupported deal room agent: {agent_type}")
+        if queue.agent_job_queue_enabled():
+            # The row is queued and announced; run it here only after taking the same
+            # lease a worker would, otherwise the worker that claimed it finishes it
+            # (and copies its output into this room).
+            worker_id = f"inline:{os.getpid()}:{threading.get_ident()}"
+            claimed = queue.claim_agent_job_by_id(conn, job_id, worker_id)
+            if claimed:
+                with queue.AgentJobLeaseKeeper(get_db_connection, job_id, worker_id):
+                    queue.execute_claimed_agent_job(conn, claimed, worker_id=worker_id)
+            return
+        try:
+            result = queue.run_agent_job(conn, job)
+        except ValueError as exc:
+            result = _mark_agent_job_failed(conn, job_id, str(exc))
         if result:
             services.update_deal_room_evidence_from_job(conn, deal_room_id, result)
     except Exception as exc:
@@ -3526,8 +4025,10 @@ def run_deal_room_agents_endpoint(
                 services.update_deal_room_evidence_from_job(conn, deal_room_id, job)
             elif payload.run_sync:
                 _execute_deal_room_agent_job(deal_room_id, job["job_id"])
-            else:
+            elif not _load_agent_job_queue().agent_job_queue_enabled():
                 background_tasks.add_task(_execute_deal_room_agent_job, deal_room_id, job["job_id"])
+            # Otherwise the queued job is picked up by the agent job workers, which copy
+            # the output into this room's evidence when it finishes.
         refreshed = services.get_deal_room(conn, deal_room_id) or room
         return {"dealRoom": _decorate_deal_room(conn, refreshed), "jobs": jobs, "skipped": skipped}
     finally:
@@ -3646,6 +4147,7 @@ def create_license(item: LicenseCreate):
         print(f"Entity contact sync skipped for {new_id}: {contact_exc}")
     conn.commit()
     conn.close()
+    _licenses_changed([item.country])
     
     return {
         "id": new_id,
@@ -3784,6 +4286,7 @@ def update_license(license_id: str, item: LicenseUpdate):
             except Exception as contact_exc:
                 print(f"Entity contact sync skipped for {license_id}: {contact_exc}")
             conn.commit() # Commit the update first
+            _licenses_changed([existing["country"], item.country])
             
             c.execute("SELECT * FROM licenses WHERE id = %s", (license_id,))
             updated_row = c.fetchone()
@@ -3799,6 +4302,7 @@ def update_license(license_id: str, item: LicenseUpdate):
             except Exception as contact_exc:
                 print(f"Entity contact sync skipped for {license_id}: {contact_exc}")
             conn.commit()
+            _licenses_changed([existing["country"], item.country])
 
         return {"status": "updated", "exported": False}
         
@@ -3822,11 +4326,14 @@ def delete_license(license_id: str):
     if found:
         print(f"Record: {tuple(found)}")
 
-    c.execute("DELETE FROM licenses WHERE id = %s", (license_id,))
+    c.execute("DELETE FROM licenses WHERE id = %s RETURNING country", (license_id,))
+    deleted_countries = [row[0] for row in c.fetchall()]
     conn.commit()
     deleted = c.rowcount
     print(f"Rows deleted: {deleted}")
     conn.close()
+    if deleted:
+        _licenses_changed(deleted_countries)
     
     if deleted == 0:
         from fastapi import HTTPException
@@ -3849,10 +4356,11 @@ def batch_delete_licenses(request: BatchDeleteRequest):
     
     # Create placeholders for IN clause
     placeholders = ','.join(['%s'] * len(request.ids))
-    sql = f"DELETE FROM licenses WHERE id IN ({placeholders})"
+    sql = f"DELETE FROM licenses WHERE id IN ({placeholders}) RETURNING country"
     
     try:
         c.execute(sql, tuple(request.ids))
+        deleted_countries = {row[0] for row in c.fetchall()}
         conn.commit()
         deleted_count = c.rowcount
         print(f"Total rows deleted: {deleted_count}")
@@ -3864,6 +4372,8 @@ def batch_delete_licenses(request: BatchDeleteRequest):
         raise HTTPException(status_code=500, detail=str(e))
         
     conn.close()
+    if deleted_count:
+        _licenses_changed(deleted_countries)
     return {"status": "success", "deleted_count": deleted_count}
 
 # --- License bulk import (CSV): shared parsing + validation ----------------------------
@@ -4112,12 +4622,13 @@ def _insert_license_import_rows(rows: list[tuple]) -> int:
             rows,
         )
         conn.commit()
-        return len(rows)
     except Exception as e:
         conn.rollback()
         raise HTTPException(status_code=500, detail={"message": str(e)})
     finally:
         conn.close()
+    _licenses_changed({row[2] for row in rows})
+    return len(rows)
 
 
 class LicenseImportTextBody(BaseModel):
@@ -4137,128 +4648,146 @@ def import_licenses_text(body: LicenseImportTextBody):
     return {"status": "success", "imported_count": imported}
 
 
+try:
+    from backend.services.license_export import (
+        ADMIN_LICENSE_EXPORT_COLUMNS,
+        EXPORT_FORMATS,
+        LICENSE_EXPORT_SQL,
+        admin_license_export_query,
+        encode_license_export,
+        export_filename,
+        export_media_type,
+        iter_cursor_rows,
+        license_export_columns,
+        open_export_cursor,
+        parquet_export_available,
+    )
+except ImportError:
+    from services.license_export import (
+        ADMIN_LICENSE_EXPORT_COLUMNS,
+        EXPORT_FORMATS,
+        LICENSE_EXPORT_SQL,
+        admin_license_export_query,
+        encode_license_export,
+        export_filename,
+        export_media_type,
+        iter_cursor_rows,
+        license_export_columns,
+        open_export_cursor,
+        parquet_export_available,
+    )
+
+
+# Each download holds its own connection until the client has read the last byte; cap them
+# so a burst of slow exports cannot exhaust Postgres max_connections.
+LICENSE_EXPORT_MAX_CONNECTIONS = max(1, int(os.getenv("LICENSE_EXPORT_MAX_CONNECTIONS", "4")))
+LICENSE_EXPORT_SLOT_WAIT_SEC = float(os.getenv("LICENSE_EXPORT_SLOT_WAIT_SEC", "2"))
+_license_export_slots = threading.BoundedSemaphore(LICENSE_EXPORT_MAX_CONNECTIONS)
+
+
+class _LicenseExportConnection:
+    """psycopg2 connection that hands its export slot back when closed."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        try:
+            self._conn.close()
+        finally:
+            if not self._released:
+                self._released = True
+                _license_export_slots.release()
+
+
+def _license_export_connect():
+    """Unpooled connection per export download so a slow client cannot pin a request-pool slot.
+
+    At most LICENSE_EXPORT_MAX_CONNECTIONS are open at once; busy slots and database outages
+    answer 503 like get_db_connection.
+    """
+    if not _license_export_slots.acquire(timeout=LICENSE_EXPORT_SLOT_WAIT_SEC):
+        raise HTTPException(status_code=503, detail="Too many license exports in progress. Please retry shortly.")
+    retries = 3
+    while True:
+        try:
+            return _LicenseExportConnection(psycopg2.connect(**db_connect_kwargs()))
+        except psycopg2.OperationalError as e:
+            retries -= 1
+            if retries > 0:
+                time.sleep(1)
+                continue
+            _license_export_slots.release()
+            print(f"[db] license export connection failed: {e}")
+            raise HTTPException(status_code=503, detail="Database unavailable. Please retry shortly.")
+        except Exception:
+            _license_export_slots.release()
+            raise
+
+
+def _stream_license_export(
+    query: str,
+    params: Any,
+    columns: list[str],
+    *,
+    fmt: str,
+    gzip_output: bool,
+    stem: str,
+) -> Response:
+    """Stream an export from a server-side cursor as CSV (optionally gzipped) or Parquet."""
+    normalized_format = (fmt or "csv").strip().lower()
+    if normalized_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {fmt}")
+    if normalized_format == "parquet" and not parquet_export_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow on the server")
+
+    # The connection lives as long as the download; iter_cursor_rows closes it.
+    conn = _license_export_connect()
+    try:
+        cur = open_export_cursor(conn, query, params)
+    except Exception:
+        conn.close()
+        raise
+    body = encode_license_export(
+        iter_cursor_rows(conn, cur),
+        columns,
+        normalized_format,
+        gzip_output=gzip_output,
+    )
+    filename = export_filename(stem, normalized_format, gzip_output=gzip_output)
+    response = StreamingResponse(
+        body,
+        media_type=export_media_type(normalized_format, gzip_output=gzip_output),
+    )
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    return response
+
+
 @app.get("/licenses/export")
 def export_licenses(
     authorization: Optional[str] = Header(None),
     include_provenance: bool = False,
+    format: str = Query("csv", description="csv or parquet"),
+    gzip_output: bool = Query(False, alias="gzip", description="gzip the CSV body"),
 ):
     _, auth_err = _jwt_payload_from_authorization(authorization)
     if auth_err is not None:
         return auth_err
 
     with_provenance = bool(include_provenance)
-
-    conn = get_db_connection()
-    c = conn.cursor(cursor_factory=RealDictCursor)
-    c.execute(
-        """
-        SELECT
-            licenses.*,
-            public_phone.value AS public_business_phone,
-            public_phone.source_name AS public_business_phone_source,
-            public_phone.source_type AS public_business_phone_source_type
-        FROM licenses
-        LEFT JOIN LATERAL (
-            SELECT
-                value,
-                source_name,
-                source_type
-            FROM entity_contacts
-            WHERE entity_id = licenses.id
-              AND entity_kind = 'license'
-              AND contact_type = 'phone'
-              AND contact_scope = 'public_business'
-            ORDER BY
-                CASE source_type
-                    WHEN 'official_open_data' THEN 1
-                    WHEN 'source_backed_record' THEN 2
-                    WHEN 'llm_extracted_from_source' THEN 3
-                    ELSE 4
-                END,
-                confidence_score DESC NULLS LAST,
-                last_seen_at DESC NULLS LAST
-            LIMIT 1
-        ) AS public_phone ON TRUE
-        """
+    stem = "licenses_export_provenance" if with_provenance else "licenses_export"
+    return _stream_license_export(
+        LICENSE_EXPORT_SQL,
+        (),
+        license_export_columns(include_provenance=with_provenance),
+        fmt=format,
+        gzip_output=gzip_output,
+        stem=stem,
     )
-    rows = c.fetchall()
-    conn.close()
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    headers = [
-        "id",
-        "company",
-        "country",
-        "region",
-        "commodity",
-        "license_type",
-        "status",
-        "lat",
-        "lng",
-        "phone_number",
-        "contact_person",
-        "public_business_phone",
-        "public_business_phone_source",
-        "public_business_phone_source_type",
-        "date_issued",
-    ]
-    if with_provenance:
-        headers.extend(
-            [
-                "sector",
-                "record_origin",
-                "source_id",
-                "source_name",
-                "source_url",
-                "source_record_url",
-                "source_updated_at",
-                "last_synced_at",
-                "manually_edited",
-            ]
-        )
-    writer.writerow(headers)
-
-    for row in rows:
-        base = [
-            row["id"],
-            row["company"],
-            row["country"],
-            row["region"],
-            row["commodity"],
-            row["license_type"],
-            row["status"],
-            row["lat"],
-            row["lng"],
-            row["phone_number"],
-            row["contact_person"],
-            row["public_business_phone"],
-            row["public_business_phone_source"],
-            row["public_business_phone_source_type"],
-            row["date_issued"],
-        ]
-        if with_provenance:
-            base.extend(
-                [
-                    row.get("sector"),
-                    row.get("record_origin"),
-                    row.get("source_id"),
-                    row.get("source_name"),
-                    row.get("source_url"),
-                    row.get("source_record_url"),
-                    row.get("source_updated_at"),
-                    row.get("last_synced_at"),
-                    row.get("manually_edited"),
-                ]
-            )
-        writer.writerow(base)
-
-    output.seek(0)
-    response = StreamingResponse(iter([output.getvalue()]), media_type="text/csv")
-    filename = "licenses_export_provenance.csv" if with_provenance else "licenses_export.csv"
-    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
-    return response
 
 @app.get("/licenses/template")
 def get_template():
@@ -4423,6 +4952,7 @@ class AIRequest(BaseModel):
     context: Optional[dict] = None
 
 @app.post("/api/ai/analyze")
+@offload("slow")
 def analyze_with_ai(request: AIRequest):
     """
     Executes the AI DD pipeline.
@@ -4678,6 +5208,7 @@ class AIDocumentRequest(BaseModel):
 
 
 @app.post("/api/ai/analyze-document")
+@offload("slow")
 def analyze_document_with_ai(request: AIDocumentRequest):
     """
     Scans a contract document/PDF text dump and extracts structural legal parameters.
@@ -4777,93 +5308,34 @@ Execution Engine v1.0
 # Using requests (already available) against a public free API — no extra libraries needed.
 import requests as _requests
 
-FALLBACK_PRICES = [
-    {"symbol": "XAU/USD", "price": "—", "change": "—", "up": None},
-    {"symbol": "XAG/USD", "price": "—", "change": "—", "up": None},
-    {"symbol": "BTC/USD", "price": "103,200.00", "change": "+1.85%", "up": True},
-    {"symbol": "BRENT", "price": "64.20", "change": "+0.72%", "up": True},
-]
-
-_YAHOO_UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-
-
-def _yahoo_futures_spot(yahoo_symbol: str):
-    """Last price + prior close for a Yahoo Finance symbol (e.g. CL=F, BZ=F)."""
-    try:
-        r = _requests.get(
-            f"https://query1.finance.yahoo.com/v8/finance/chart/{yahoo_symbol}",
-            params={"interval": "1d", "range": "2d"},
-            headers={"User-Agent": _YAHOO_UA, "Accept": "application/json"},
-            timeout=10,
-        )
-        if r.status_code != 200:
-            return None
-        chart = r.json().get("chart", {})
-        res = chart.get("result") or []
-        if not res:
-            return None
-        meta = res[0].get("meta") or {}
-        price = meta.get("regularMarketPrice")
-        if price is None:
-            price = meta.get("previousClose")
-        prev = meta.get("chartPreviousClose") or meta.get("previousClose")
-        if price is None:
-            return None
-        price = float(price)
-        prev_f = float(prev) if prev is not None else None
-        chg_pct = None
-        if prev_f and prev_f > 0:
-            chg_pct = (price - prev_f) / prev_f * 100.0
-        return {"price": price, "chg_pct": chg_pct}
-    except Exception as ex:
-        print(f"[yahoo] {yahoo_symbol}: {ex}")
-        return None
+try:
+    from backend.services.market_data import (
+        MarketStreamFull,
+        current_market_snapshot,
+        get_market_poller,
+        market_event_stream,
+        market_quote,
+        start_market_poller,
+    )
+except ImportError:
+    from services.market_data import (  # type: ignore[no-redef]
+        MarketStreamFull,
+        current_market_snapshot,
+        get_market_poller,
+        market_event_stream,
+        market_quote,
+        start_market_poller,
+    )
 
 
-def _normalize_comex_usd_per_troy_oz(price: float, *, metal: str) -> float:
-    """
-    Yahoo GC=F / SI=F are COMEX continuous futures quoted in USD per troy ounce.
-    If an upstream ever returns cents-per-oz scale, pull it back to dollars.
-    """
-    p = float(price)
-    if metal == "gold" and p > 50_000:
-        p = p / 100.0
-    if metal == "silver" and p > 500:
-        p = p / 100.0
-    return p
-
-
-def _ticker_metal_row(label: str, category: str, yahoo_sym: str, metal: str, price_fmt):
-    """Ticker row for COMEX gold/silver futures (USD/troy oz), indicative / may be delayed."""
-    q = _yahoo_futures_spot(yahoo_sym)
-    if not q:
-        return None
-    adj = _normalize_comex_usd_per_troy_oz(q["price"], metal=metal)
-    up = True if q["chg_pct"] is None else q["chg_pct"] >= 0
-    chg = "LIVE" if q["chg_pct"] is None else f"{q['chg_pct']:+.2f}%"
-    return {
-        "symbol": label,
-        "price": price_fmt(adj),
-        "category": category,
-        "up": up,
-        "change": chg,
-    }
+@app.on_event("startup")
+def startup_market_poller():
+    start_market_poller()
 
 
-def _ticker_energy_row(label: str, category: str, yahoo_sym: str, price_fmt):
-    """price_fmt: callable(float) -> str for display."""
-    q = _yahoo_futures_spot(yahoo_sym)
-    if not q:
-        return None
-    up = True if q["chg_pct"] is None else q["chg_pct"] >= 0
-    chg = "LIVE" if q["chg_pct"] is None else f"{q['chg_pct']:+.2f}%"
-    return {
-        "symbol": label,
-        "price": price_fmt(q["price"]),
-        "category": category,
-        "up": up,
-        "change": chg,
-    }
+@app.on_event("shutdown")
+def shutdown_market_poller():
+    get_market_poller().stop()
 
 
 @app.get("/api/market-ticker")
@@ -4875,54 +5347,12 @@ def get_market_ticker():
     Gold/silver: COMEX continuous futures GC=F / SI=F in USD per troy ounce (standard
     spot-style screen convention). Indicative only; Yahoo can be exchange-delayed vs
     physical spot. If Yahoo blocks a symbol, the row shows an em dash (no demo numbers).
-    """
-    rows: list = []
 
-    gold_row = _ticker_metal_row("GOLD/oz", "Metal", "GC=F", "gold", lambda p: f"${p:,.2f}")
-    if gold_row:
-        rows.append(gold_row)
-    else:
-        rows.append({"symbol": "GOLD/oz", "price": "$—", "category": "Metal", "up": None, "change": "—"})
-    silver_row = _ticker_metal_row("SILVER/oz", "Metal", "SI=F", "silver", lambda p: f"${p:,.2f}")
-    if silver_row:
-        rows.append(silver_row)
-    else:
-        rows.append({"symbol": "SILVER/oz", "price": "$—", "category": "Metal", "up": None, "change": "—"})
-
-    try:
-        btc_res = _requests.get(
-            "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd&include_24hr_change=true",
-            timeout=6,
-        )
-        if btc_res.status_code == 200:
-            btc_data = btc_res.json().get("bitcoin", {})
-            btc_price = btc_data.get("usd", 0)
-            btc_change = btc_data.get("usd_24h_change", 0) or 0
-            rows.append({
-                "symbol": "BTC/USD",
-                "price": f"${float(btc_price):,.2f}",
-                "category": "Crypto",
-                "up": btc_change >= 0,
-                "change": f"{'+' if btc_change >= 0 else ''}{btc_change:.2f}%",
-            })
-    except Exception:
-        pass
-
-    # ICE / NYMEX continuous futures on Yahoo
-    for spec in (
-        ("BRENT", "Energy", "BZ=F", lambda p: f"${p:.2f}/bbl"),
-        ("WTI CRUDE", "Energy", "CL=F", lambda p: f"${p:.2f}/bbl"),
-        ("HEATING OIL", "Energy", "HO=F", lambda p: f"${p:.3f}/gal"),
-        ("COPPER", "Industrial", "HG=F", lambda p: f"${p:.3f}/lb"),
-        ("SUGAR #11", "Softs", "SB=F", lambda p: f"{p * 100:.2f}¢/lb"),
-        ("COFFEE", "Softs", "KC=F", lambda p: f"{p * 100:.2f}¢/lb"),
-    ):
-        label, cat, sym, fmt = spec
-        rrow = _ticker_energy_row(label, cat, sym, fmt)
-        if rrow:
-            rows.append(rrow)
-
-    return rows
+    Served from the background poller's snapshot; X-Market-* headers carry its
+    version, as-of time, age and staleness.
+    """
+    snapshot = current_market_snapshot()
+    return Response(snapshot.ticker_json, media_type="application/json", headers=snapshot.headers())
 
 
 @app.get("/market-prices")
@@ -4931,64 +5361,40 @@ def get_market_prices():
     Commodity benchmarks: gold/silver as COMEX GC=F / SI=F (USD/troy oz, indicative / may be delayed),
     BTC via CoinGecko, oil via Yahoo. Never returns 500.
     """
-    try:
-        results = []
+    snapshot = current_market_snapshot()
+    return Response(snapshot.prices_json, media_type="application/json", headers=snapshot.headers())
 
-        gq = _yahoo_futures_spot("GC=F")
-        if gq:
-            gp = _normalize_comex_usd_per_troy_oz(gq["price"], metal="gold")
-            up = True if gq["chg_pct"] is None else gq["chg_pct"] >= 0
-            chg = "LIVE" if gq["chg_pct"] is None else f"{'+' if gq['chg_pct'] >= 0 else ''}{gq['chg_pct']:.2f}%"
-            results.append({"symbol": "XAU/USD", "price": f"{gp:,.2f}", "change": chg, "up": up})
-        else:
-            results.append({"symbol": "XAU/USD", "price": "—", "change": "—", "up": None})
-
-        sq = _yahoo_futures_spot("SI=F")
-        if sq:
-            sp = _normalize_comex_usd_per_troy_oz(sq["price"], metal="silver")
-            up = True if sq["chg_pct"] is None else sq["chg_pct"] >= 0
-            chg = "LIVE" if sq["chg_pct"] is None else f"{'+' if sq['chg_pct'] >= 0 else ''}{sq['chg_pct']:.2f}%"
-            results.append({"symbol": "XAG/USD", "price": f"{sp:,.2f}", "change": chg, "up": up})
-        else:
-            results.append({"symbol": "XAG/USD", "price": "—", "change": "—", "up": None})
 
-        # BTC via CoinGecko (free, no auth)
-        btc_res = _requests.get(
-            "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd&include_24hr_change=true",
-            timeout=5
-        )
-        if btc_res.status_code == 200:
-            btc_data = btc_res.json().get("bitcoin", {})
-            btc_price = btc_data.get("usd", 103200)
-            btc_change = btc_data.get("usd_24h_change", 0)
-            results.append({
-                "symbol": "BTC/USD",
-                "price": f"{btc_price:,.2f}",
-                "change": f"{'+' if btc_change >= 0 else ''}{btc_change:.2f}%",
-                "up": btc_change >= 0
-            })
-        else:
-            results.append(FALLBACK_PRICES[2])
-
-        # Brent & WTI — Yahoo
-        bz = _yahoo_futures_spot("BZ=F")
-        cl = _yahoo_futures_spot("CL=F")
-        if bz:
-            up = True if bz["chg_pct"] is None else bz["chg_pct"] >= 0
-            chg = "LIVE" if bz["chg_pct"] is None else f"{'+' if bz['chg_pct'] >= 0 else ''}{bz['chg_pct']:.2f}%"
-            results.append({"symbol": "BRENT", "price": f"{bz['price']:.2f}", "change": chg, "up": up})
-        else:
-            results.append(FALLBACK_PRICES[3])
-        if cl:
-            up = True if cl["chg_pct"] is None else cl["chg_pct"] >= 0
-            chg = "LIVE" if cl["chg_pct"] is None else f"{'+' if cl['chg_pct'] >= 0 else ''}{cl['chg_pct']:.2f}%"
-            results.append({"symbol": "WTI", "price": f"{cl['price']:.2f}", "change": chg, "up": up})
+@app.get("/api/market-ticker/snapshot")
+def get_market_ticker_snapshot():
+    """Ticker and price rows with snapshot metadata (version, fetched_at, age, stale, missing symbols)."""
+    snapshot = current_market_snapshot()
+    return {
+        **snapshot.meta(),
+        "ticker": json.loads(snapshot.ticker_json),
+        "prices": json.loads(snapshot.prices_json),
+    }
 
-        return results if results else FALLBACK_PRICES
 
-    except Exception as e:
-        print(f"[market-prices] fetch error: {e}")
-        return FALLBACK_PRICES
+@app.get("/api/market-ticker/stream")
+async def stream_market_ticker(request: Request):
+    """Server-sent events: the current snapshot, then one ``ticker`` event per new snapshot version."""
+    try:
+        events = market_event_stream(request.is_disconnected)
+        first = await events.__anext__()
+    except MarketStreamFull:
+        return JSONResponse({"detail": "market stream is at capacity"}, status_code=503, headers={"Retry-After": "30"})
+
+    async def body():
+        yield first
+        async for event in events:
+            yield event
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ======================================================================
@@ -5470,9 +5876,11 @@ def _probe_oil_live_health() -> dict:
 def platform_health():
     """Lightweight platform status for UI banners (API, Redis, maritime worker)."""
     try:
+        from backend.services.bounded_cache import cache_stats
         from backend.services.platform_health import build_platform_health
         from backend.services.maritime_go_proxy import proxy_oil_live_get
     except ImportError:
+        from services.bounded_cache import cache_stats
         from services.platform_health import build_platform_health
         from services.maritime_go_proxy import proxy_oil_live_get
 
@@ -5481,6 +5889,10 @@ def platform_health():
         redis_ping=cache.get_client,
         get_maritime_stats=lambda: proxy_oil_live_get("/api/oil-live/maritime/stats"),
         get_oil_live_health=_probe_oil_live_health,
+        get_db_pool_stats=lambda: {**db_pool_stats(), "async": async_pool_stats()},
+        get_schema_stats=lambda: schema_readiness_report(include_tables=False),
+        get_cache_stats=cache_stats,
+        get_lane_stats=lane_stats,
     )
 
 
@@ -5522,6 +5934,7 @@ def proxy_api_licenses_country_summary(request: Request):
 
 
 @app.get("/api/licenses/map")
+@offload("map")
 def proxy_api_licenses_map(request: Request):
     """Go license clusters when UI hits backend:8000 directly."""
     return _oil_live_proxy_http_response("/api/oil-live/licenses/map", request)
@@ -5555,6 +5968,7 @@ def get_maritime_stats_endpoint(
 
 
 @app.get("/api/maritime/vessels")
+@offload("map")
 def get_maritime_vessels(
     max_vessels: int = 15000,
     south: Optional[float] = None,
@@ -5627,7 +6041,7 @@ def get_maritime_context(
 
 
 @app.get("/api/storage/terminals")
-def get_storage_terminals(
+async def get_storage_terminals(
     force_refresh: bool = False,
     south: Optional[float] = None,
     west: Optional[float] = None,
@@ -5640,17 +6054,19 @@ def get_storage_terminals(
         try:
             from backend.services.storage_terminals import (
                 _parse_storage_bbox,
-                get_storage_terminals as build_storage_terminals,
+                get_storage_terminals_async as build_storage_terminals,
             )
         except ImportError:
             from services.storage_terminals import (  # type: ignore
                 _parse_storage_bbox,
-                get_storage_terminals as build_storage_terminals,
+                get_storage_terminals_async as build_storage_terminals,
             )
         bbox = _parse_storage_bbox(south, west, north, east)
-        return build_storage_terminals(force_refresh=force_refresh, bbox=bbox, limit=limit)
+        return await build_storage_terminals(force_refresh=force_refresh, bbox=bbox, limit=limit)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
+    except LaneSaturated:
+        raise
     except Exception as exc:
         return {
             "entities": [],
@@ -5703,6 +6119,7 @@ def get_storage_coverage_report(
 
 
 @app.post("/api/admin/storage/coverage-audit")
+@offload("slow")
 def admin_storage_coverage_audit(x_admin_token: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None)):
     """Regenerate storage coverage audit JSON and gap queue (admin)."""
@@ -6237,6 +6654,7 @@ class OpenDataSyncRequest(BaseModel):
 
 
 @app.post("/api/admin/oil/ingest")
+@offload("slow")
 def admin_oil_ingest(request: OilIngestRequest):
     """
     Admin-triggered route to populate oil_trade_flows.
@@ -6270,6 +6688,7 @@ def admin_oil_ingest(request: OilIngestRequest):
 
 
 @app.post("/api/admin/open-data/sync")
+@offload("slow")
 def admin_open_data_sync(
     request: OpenDataSyncRequest,
     x_admin_token: Optional[str] = Header(None),
@@ -6459,6 +6878,7 @@ class ComtradeSyncRequest(BaseModel):
 
 
 @app.post("/api/admin/comtrade/sync")
+@offload("slow")
 def admin_comtrade_sync(
     request: ComtradeSyncRequest,
     x_admin_token: Optional[str] = Header(None),
@@ -6487,6 +6907,7 @@ def admin_comtrade_sync(
 
 
 @app.get("/api/admin/data-health")
+@offload("slow")
 def admin_data_health(
     x_admin_token: Optional[str] = Header(None),
     refresh_probes: bool = False,
@@ -6607,7 +7028,41 @@ def eia_historic_imports_map(
         conn.close()
 
 
+@app.get("/api/eia-historic-imports/rows")
+def eia_historic_imports_rows(
+    year: int,
+    importer: Optional[str] = None,
+    origin_country: Optional[str] = None,
+    port_code: Optional[str] = None,
+    commodity_family: Optional[str] = None,
+    limit: int = 200,
+    offset: int = 0,
+):
+    """Line-level EIA import rows for drill-down from a summary / map aggregate."""
+    conn = get_db_connection()
+    try:
+        try:
+            from backend.services.eia_historic_imports import query_rows
+        except ImportError:
+            from services.eia_historic_imports import query_rows
+        return query_rows(
+            conn,
+            year=year,
+            importer=importer,
+            origin_country=origin_country,
+            port_code=port_code,
+            commodity_family=commodity_family,
+            limit=limit,
+            offset=offset,
+        )
+    except Exception as exc:
+        return {"status": "error", "message": str(exc)}
+    finally:
+        conn.close()
+
+
 @app.post("/api/admin/gem-extraction-tracker/ingest")
+@offload("slow")
 def admin_gem_extraction_tracker_ingest(
     request: GemExtractionTrackerIngestRequest,
     x_admin_token: Optional[str] = Header(None),
@@ -6639,6 +7094,7 @@ def admin_gem_extraction_tracker_ingest(
 
 
 @app.post("/api/admin/gem-goit-pipelines/ingest")
+@offload("slow")
 def admin_gem_goit_pipelines_ingest(
     request: GemGoitPipelinesIngestRequest,
     x_admin_token: Optional[str] = Header(None),
@@ -6669,6 +7125,7 @@ def admin_gem_goit_pipelines_ingest(
 
 
 @app.post("/api/admin/gem-ggit-gas-pipelines/ingest")
+@offload("slow")
 def admin_gem_ggit_gas_pipelines_ingest(
     request: GemGgitGasPipelinesIngestRequest,
     x_admin_token: Optional[str] = Header(None),
@@ -6699,6 +7156,7 @@ def admin_gem_ggit_gas_pipelines_ingest(
 
 
 @app.post("/api/admin/bunker-fuel-suppliers/sync")
+@offload("slow")
 def admin_bunker_fuel_suppliers_sync(x_admin_token: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None)):
     """Index curated bunker/fuel supplier registers into oil_companies."""
@@ -6880,6 +7338,7 @@ def get_gem_pipelines_layer(
 
 
 @app.post("/api/admin/gem-gogpt-plants/ingest")
+@offload("slow")
 def admin_gem_gogpt_plants_ingest(
     request: GemGogptPlantsIngestRequest,
     x_admin_token: Optional[str] = Header(None),
@@ -6910,6 +7369,7 @@ def admin_gem_gogpt_plants_ingest(
 
 
 @app.post("/api/admin/gem-ggit-lng/ingest")
+@offload("slow")
 def admin_gem_ggit_lng_ingest(
     request: GemGogptPlantsIngestRequest,
     x_admin_token: Optional[str] = Header(None),
@@ -7008,6 +7468,7 @@ def get_gem_plants_layer(
 
 
 @app.post("/api/admin/eia-historic-imports/ingest")
+@offload("slow")
 def admin_eia_historic_imports_ingest(
     request: EiaHistoricIngestRequest,
     x_admin_token: Optional[str] = Header(None),
@@ -7046,6 +7507,7 @@ def admin_eia_historic_imports_ingest(
 
 
 @app.post("/api/admin/petroleum-osm/sync")
+@offload("slow")
 def admin_petroleum_osm_sync(
     x_admin_token: Optional[str] = Header(None),
     tiles: Optional[str] = None,
@@ -7088,6 +7550,7 @@ def admin_petroleum_osm_sync(
 
 
 @app.get("/api/admin/comtrade/sync-runs")
+@offload("slow")
 def admin_comtrade_sync_runs(
     x_admin_token: Optional[str] = Header(None),
     limit: int = 50,
@@ -7163,6 +7626,7 @@ def read_eu_procurement_cpv_buckets():
 
 
 @app.post("/api/admin/oil-live/enrich-contacts")
+@offload("slow")
 def admin_oil_live_enrich_contacts(
     x_admin_token: Optional[str] = Header(None),
     limit: int = 50,
@@ -7188,6 +7652,7 @@ def admin_oil_live_enrich_contacts(
 
 
 @app.post("/api/admin/oil-live/purge-demo-seed")
+@offload("slow")
 def admin_oil_live_purge_demo_seed(x_admin_token: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None)):
     """Delete demo opportunities and seed/demo port calls (MT DEMO STAR, seed_port_calls)."""
@@ -7253,6 +7718,7 @@ async def trade_manifest_upload(
 
 
 @app.post("/api/admin/trade-manifests/upload")
+@offload("slow")
 def admin_trade_manifest_upload(
     x_admin_token: Optional[str] = Header(None),
     file_path: str = "",
@@ -7322,7 +7788,7 @@ def commodity_benchmarks_panel(
         if prod in ("gold", "silver"):
             try:
                 ticker = "GC=F" if prod == "gold" else "SI=F"
-                snap = _yahoo_futures_spot(ticker)
+                snap = market_quote(ticker)
                 if snap:
                     out.append(
                         {
@@ -7340,32 +7806,49 @@ def commodity_benchmarks_panel(
 
 
 @app.post("/api/admin/oil-live/graph-sync")
+@offload("slow")
 def admin_oil_live_graph_sync(
     x_admin_token: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None),
     rebuild_synthetic_bol: bool = True,
+    only: Optional[str] = Query(None, description="Comma-separated step names to re-run"),
+    since: Optional[str] = Query(None, description="Re-run steps without a clean run since ISO time or 6h/2d"),
 ):
-    """Merge free sources into oil commercial graph + trigger synthetic BOL rebuild."""
+    """Merge free sources into oil commercial graph + trigger synthetic BOL rebuild.
+
+    Steps run as a DAG on their own connections; ``only`` / ``since`` re-run part of it.
+    """
     forbidden = _check_admin_token(x_admin_token, authorization)
     if forbidden is not None:
         return forbidden
     ensure_schema_initialized()
     try:
         try:
-            from backend.services.oil_live_graph_sync import run_full_graph_sync
+            from backend.services.oil_live_graph_sync import parse_graph_sync_since, run_full_graph_sync
         except ImportError:
-            from services.oil_live_graph_sync import run_full_graph_sync
+            from services.oil_live_graph_sync import parse_graph_sync_since, run_full_graph_sync
+        only_steps = [name.strip() for name in (only or "").split(",") if name.strip()] or None
         conn = get_db_connection()
         try:
-            result = run_full_graph_sync(conn, rebuild_synthetic_bol=rebuild_synthetic_bol)
+            result = run_full_graph_sync(
+                conn,
+                rebuild_synthetic_bol=rebuild_synthetic_bol,
+                connect=_graph_sync_connect,
+                only=only_steps,
+                since=parse_graph_sync_since(since) if since else None,
+            )
         finally:
             conn.close()
         return {"status": result.get("status", "ok"), **result}
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"status": "error", "message": str(exc)})
     except Exception as exc:
         logger.exception("oil-live graph-sync failed: %s", exc)
         return {"status": "error", "message": str(exc)}
 
 
 @app.post("/api/admin/eu-procurement/sync")
+@offload("slow")
 def admin_eu_procurement_sync(x_admin_token: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None)):
     """Refresh eu_procurement_notices from TED Search API (free, no API key)."""
@@ -7648,6 +8131,7 @@ def read_entity_eu_procurement(
 
 
 @app.post("/api/admin/poland-mining/sync")
+@offload("slow")
 def admin_poland_mining_sync(x_admin_token: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None)):
     """Pull Poland PGI MIDAS mining areas via ArcGIS MapServer into licenses."""
@@ -7669,13 +8153,14 @@ def admin_poland_mining_sync(x_admin_token: Optional[str] = Header(None),
         finally:
             conn.close()
         if result.get("records_written", 0):
-            cache.delete_pattern("licenses:*")
+            _licenses_changed()
         return {"status": "success", **result}
     except Exception as exc:
         return {"status": "error", "message": str(exc)}
 
 
 @app.post("/api/admin/sweden-mining/sync")
+@offload("slow")
 def admin_sweden_mining_sync(x_admin_token: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None)):
     """Pull Sweden SGU mineral permits via OGC API Features into licenses."""
@@ -7697,13 +8182,14 @@ def admin_sweden_mining_sync(x_admin_token: Optional[str] = Header(None),
         finally:
             conn.close()
         if result.get("records_written", 0):
-            cache.delete_pattern("licenses:*")
+            _licenses_changed()
         return {"status": "success", **result}
     except Exception as exc:
         return {"status": "error", "message": str(exc)}
 
 
 @app.post("/api/admin/kazakhstan-mining/sync")
+@offload("slow")
 def admin_kazakhstan_mining_sync(
     x_admin_token: Optional[str] = Header(None),
     max_rows: int = 5000,
@@ -7727,7 +8213,7 @@ def admin_kazakhstan_mining_sync(
         finally:
             conn.close()
         if result.get("records_written", 0) or result.get("written", 0):
-            cache.delete_pattern("licenses:*")
+            _licenses_changed()
         return {"status": "success", **result}
     except RuntimeError as exc:
         return {"status": "skipped", "message": str(exc)}
@@ -7736,6 +8222,7 @@ def admin_kazakhstan_mining_sync(
 
 
 @app.post("/api/admin/oil-products-licenses/sync")
+@offload("slow")
 def admin_oil_products_licenses_sync(
     x_admin_token: Optional[str] = Header(None),
 ):
@@ -7758,7 +8245,7 @@ def admin_oil_products_licenses_sync(
         finally:
             conn.close()
         if result.get("entities_written", 0):
-            cache.delete_pattern("licenses:*")
+            _licenses_changed()
         return {"status": "success", **result}
     except FileNotFoundError as exc:
         return {"status": "error", "message": str(exc)}
@@ -7800,6 +8287,7 @@ def patch_license_manual_edit(
                 manually_edited_by = CASE WHEN %s THEN %s ELSE manually_edited_by END,
                 manually_edited_fields = COALESCE(%s, manually_edited_fields)
             WHERE id = %s
+            RETURNING country
             """,
             (
                 body.manually_edited,
@@ -7810,8 +8298,9 @@ def patch_license_manual_edit(
                 license_id,
             ),
         )
+        edited_countries = [row["country"] for row in c.fetchall()]
         conn.commit()
-        cache.delete_pattern("licenses:*")
+        _licenses_changed(edited_countries)
         return {
             "status": "success",
             "id": license_id,
@@ -7981,83 +8470,44 @@ def get_world_open_data_coverage(
 
 
 @app.get("/api/admin/licenses/export")
+@offload("slow")
 def admin_export_licenses(
-    format: str = Query("csv", description="csv or json"),
+    format: str = Query("csv", description="csv, json or parquet"),
     sector: Optional[str] = None,
     country: Optional[str] = None,
+    gzip_output: bool = Query(False, alias="gzip", description="gzip the CSV body"),
     x_admin_token: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None),
 ):
     """Export licenses from Postgres for backup and re-import (source of truth)."""
     forbidden = _check_admin_token(x_admin_token, authorization)
     if forbidden is not None:
         return forbidden
 
-    conn = get_db_connection()
-    c = conn.cursor(cursor_factory=RealDictCursor)
-    query = """
-        SELECT
-            id, company, country, region, commodity, license_type, status,
-            lat, lng, phone_number, contact_person, date_issued,
-            sector, record_origin, source_id, source_name, source_url,
-            source_record_url, source_updated_at, last_synced_at,
-            manually_edited, manually_edited_at, manually_edited_by
-        FROM licenses
-        WHERE 1=1
-    """
-    params: list[Any] = []
-    if sector:
-        query += " AND lower(coalesce(sector, 'mining')) = lower(%s)"
-        params.append(sector.strip())
-    if country:
-        query += " AND lower(country) = lower(%s)"
-        params.append(country.strip())
-    query += " ORDER BY country, sector, company"
-    c.execute(query, tuple(params))
-    rows = c.fetchall()
-    conn.close()
-
-    headers = [
-        "id",
-        "company",
-        "country",
-        "region",
-        "commodity",
-        "license_type",
-        "status",
-        "lat",
-        "lng",
-        "phone_number",
-        "contact_person",
-        "date_issued",
-        "sector",
-        "record_origin",
-        "source_id",
-        "source_name",
-        "source_url",
-        "source_record_url",
-        "source_updated_at",
-        "last_synced_at",
-        "manually_edited",
-        "manually_edited_at",
-        "manually_edited_by",
-    ]
+    query, params = admin_license_export_query(sector=sector, country=country)
     normalized_format = (format or "csv").strip().lower()
     if normalized_format == "json":
-        payload = [{col: row.get(col) for col in headers} for row in rows]
+        conn = get_db_connection()
+        try:
+            c = conn.cursor(cursor_factory=RealDictCursor)
+            c.execute(query, tuple(params))
+            rows = c.fetchall()
+        finally:
+            conn.close()
+        payload = [{col: row.get(col) for col in ADMIN_LICENSE_EXPORT_COLUMNS} for row in rows]
         return JSONResponse(
             content={"count": len(payload), "licenses": payload},
             headers={"Content-Disposition": "attachment; filename=licenses_admin_export.json"},
         )
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(headers)
-    for row in rows:
-        writer.writerow([row.get(col) for col in headers])
-    output.seek(0)
-    response = StreamingResponse(iter([output.getvalue()]), media_type="text/csv")
-    response.headers["Content-Disposition"] = "attachment; filename=licenses_admin_export.csv"
-    return response
+    return _stream_license_export(
+        query,
+        params,
+        ADMIN_LICENSE_EXPORT_COLUMNS,
+        fmt=normalized_format,
+        gzip_output=gzip_output,
+        stem="licenses_admin_export",
+    )
 
 
 @app.post("/api/admin/licenses/import")
@@ -8097,6 +8547,7 @@ async def admin_import_licenses(
     imported = 0
     skipped_manual = 0
     errors: list[str] = []
+    imported_countries: set[str] = set()
     try:
         c = conn.cursor()
         for row_num, raw in enumerate(reader, start=2):
@@ -8176,6 +8627,7 @@ async def admin_import_licenses(
                 ),
             )
             imported += 1
+            imported_countries.add(row.get("country") or "Unknown")
         conn.commit()
     except Exception as exc:
         conn.rollback()
@@ -8183,7 +8635,7 @@ async def admin_import_licenses(
     finally:
         conn.close()
 
-    cache.delete_pattern("licenses:*")
+    _licenses_changed(imported_countries)
     return {
         "status": "success",
         "imported_count": imported,
@@ -8223,7 +8675,7 @@ async def admin_import_extracted_csv(
         
         # Invalidate Redis cache on new CSV data insertion/update
         if result.get("inserted_or_updated", 0) > 0:
-            cache.delete_pattern("licenses:*")
+            _licenses_changed()
             
         return {"status": "success", **result}
     except UnicodeDecodeError:
@@ -8277,6 +8729,7 @@ class GeocodeRevertRequest(BaseModel):
 
 
 @app.post("/api/admin/geocode-licenses")
+@offload("slow")
 def admin_geocode_licenses(request: GeocodeBackfillRequest, x_admin_token: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None)):
     """Run a backfill batch.
@@ -8313,6 +8766,8 @@ def admin_geocode_licenses(request: GeocodeBackfillRequest, x_admin_token: Optio
             allow_overwrite_user=request.allow_overwrite_user,
             country_filter=request.country,
         )
+        if stats.updated:
+            _licenses_changed()
         return {
             "status": "success",
             "dry_run": request.dry_run,
@@ -8338,6 +8793,7 @@ def admin_geocode_licenses(request: GeocodeBackfillRequest, x_admin_token: Optio
 
 
 @app.post("/api/admin/geocode-licenses/revert")
+@offload("slow")
 def admin_geocode_revert(request: GeocodeRevertRequest, x_admin_token: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None)):
     """Restore ``original_lat`` / ``original_lng`` for any row touched by a
@@ -8355,6 +8811,8 @@ def admin_geocode_revert(request: GeocodeRevertRequest, x_admin_token: Optional[
         from geocode_licenses import revert_geocoded  # type: ignore
     try:
         result = revert_geocoded(limit=request.limit, country_filter=request.country)
+        if result.get("reverted_count"):
+            _licenses_changed()
         return {"status": "success", **result}
     except Exception as exc:
         return {"status": "error", "message": str(exc)}
@@ -8365,6 +8823,7 @@ class ArcGISIngestRequest(BaseModel):
     batch_size: Optional[int] = 1000
 
 @app.post("/api/admin/ingest/arcgis")
+@offload("slow")
 def ingest_arcgis_cadastre(request: ArcGISIngestRequest, x_admin_token: Optional[str] = Header(None),
     authorization: Optional[str] = Header(None)):
     """
@@ -8446,6 +8905,8 @@ def ingest_arcgis_cadastre(request: ArcGISIngestRequest, x_admin_token: Optional
         conn.commit()
         cur.close()
         conn.close()
+        if inserted or updated:
+            _licenses_changed([request.country_map])
         
         return {
             "status": "success",
@@ -8532,6 +8993,15 @@ class LogisticsRoutePlanRequest(BaseModel):
     pipeline_layer_enabled: bool = False
 
 
+class LogisticsRoutePlanBatchItem(LogisticsRoutePlanRequest):
+    id: Optional[str] = None
+
+
+class LogisticsRoutePlanBatchRequest(BaseModel):
+    requests: list[LogisticsRoutePlanBatchItem]
+    max_workers: Optional[int] = Field(default=None, ge=1, le=32)
+
+
 def _route_service_base_url() -> str:
     return (os.getenv("ROUTE_SERVICE_URL") or "").strip().rstrip("/")
 
@@ -8577,6 +9047,65 @@ def plan_logistics_route(payload: LogisticsRoutePlanRequest):
         raise HTTPException(status_code=500, detail=f"Route planning failed: {exc}")
 
 
+@app.post("/api/logistics/route-plan/batch")
+def plan_logistics_route_batch(payload: LogisticsRoutePlanBatchRequest):
+    """Plan many lanes; streams NDJSON (one line per plan as it completes, then a summary)."""
+    max_requests = int(os.getenv("ROUTE_BATCH_MAX_REQUESTS", "500"))
+    if not payload.requests:
+        raise HTTPException(status_code=400, detail="requests must not be empty")
+    if len(payload.requests) > max_requests:
+        raise HTTPException(status_code=400, detail=f"At most {max_requests} requests per batch")
+    request_payloads = []
+    for item in payload.requests:
+        request_payload = item.model_dump()
+        transit = request_payload.get("transit_points") or []
+        request_payload["transit_points"] = [point for point in transit if isinstance(point, dict)]
+        request_payloads.append(request_payload)
+
+    route_service_url = _route_service_base_url()
+    if route_service_url:
+        import requests
+
+        try:
+            response = requests.post(
+                f"{route_service_url}/plan/batch",
+                json={"requests": request_payloads, "max_workers": payload.max_workers},
+                timeout=float(os.getenv("ROUTE_SERVICE_PROXY_TIMEOUT_SEC", "125")),
+                stream=True,
+            )
+            if response.status_code == 400:
+                raise HTTPException(status_code=400, detail=response.text)
+            response.raise_for_status()
+        except HTTPException:
+            raise
+        except requests.RequestException as exc:
+            raise HTTPException(
+                status_code=502,
+                detail=f"Route service unavailable at {route_service_url}: {exc}",
+            ) from exc
+
+        def proxied():
+            try:
+                for line in response.iter_lines():
+                    if line:
+                        yield line + b"\n"
+            finally:
+                response.close()
+
+        return StreamingResponse(proxied(), media_type="application/x-ndjson")
+
+    try:
+        from backend.services.route_planner import plan_route_batch
+    except ImportError:
+        from services.route_planner import plan_route_batch
+
+    def lines():
+        for result in plan_route_batch(request_payloads, max_workers=payload.max_workers):
+            yield json.dumps(result, default=str) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 class DDRequestPayload(BaseModel):
     """HTTP request body for POST /api/routing/due-diligence."""
 
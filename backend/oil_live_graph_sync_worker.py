@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import argparse
 import json
 import os
 import traceback
 import time
-from typing import Any
+from typing import Any, Optional, Sequence
 
 
 def _int_env(name: str, default: int) -> int:
@@ -26,23 +27,50 @@ def _db_connection() -> Any:
     )
 
 
-def run_once() -> dict[str, Any]:
+def run_once(only: Optional[Sequence[str]] = None, since: Optional[str] = None) -> dict[str, Any]:
     try:
-        from backend.services.oil_live_graph_sync import run_full_graph_sync
+        from backend.services.oil_live_graph_sync import parse_graph_sync_since, run_full_graph_sync
     except ImportError:
-        from services.oil_live_graph_sync import run_full_graph_sync
+        from services.oil_live_graph_sync import parse_graph_sync_since, run_full_graph_sync
 
     print("[oil-live-graph-sync-worker] starting Meridian commercial graph sync…")
     conn = _db_connection()
     try:
-        summary = run_full_graph_sync(conn, rebuild_synthetic_bol=True)
+        summary = run_full_graph_sync(
+            conn,
+            rebuild_synthetic_bol=True,
+            connect=_db_connection,
+            only=only,
+            since=parse_graph_sync_since(since) if since else None,
+        )
     finally:
         conn.close()
+    critical = summary.get("critical_path") or {}
+    if critical:
+        print(
+            f"[oil-live-graph-sync-worker] wall={critical.get('wall_ms')}ms "
+            f"serial={critical.get('serial_ms')}ms critical_path={' → '.join(critical.get('steps') or [])}"
+        )
     print("[oil-live-graph-sync-worker] done:", json.dumps(summary, default=str)[:2000])
     return summary
 
 
-def main() -> None:
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Meridian commercial graph sync worker")
+    parser.add_argument("--once", action="store_true", help="run one sync and exit")
+    parser.add_argument(
+        "--only",
+        help="comma-separated step names to re-run (implies --once), e.g. census_trade,gleif_batch",
+    )
+    parser.add_argument(
+        "--since",
+        help="re-run steps without a clean run since an ISO time or look-back like 6h (implies --once)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = _parse_args(argv)
     enabled = (os.getenv("OIL_GRAPH_SYNC_ENABLED") or "true").strip().lower() not in {
         "0",
         "false",
@@ -53,6 +81,11 @@ def main() -> None:
         print("[oil-live-graph-sync-worker] OIL_GRAPH_SYNC_ENABLED is off — exiting.")
         return
 
+    if args.once or args.only or args.since:
+        only = [name.strip() for name in (args.only or "").split(",") if name.strip()] or None
+        run_once(only=only, since=args.since)
+        return
+
     interval_seconds = max(3600, _int_env("OIL_GRAPH_SYNC_INTERVAL_SECONDS", 86_400))
     backoff_seconds = max(300, _int_env("OIL_GRAPH_SYNC_BACKOFF_SECONDS", 3600))
     while True:
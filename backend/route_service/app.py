@@ -2,27 +2,54 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import os
+import threading
 import time
 from contextlib import asynccontextmanager
 from typing import Any, Optional
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 # Defaults before importing route planner / geometry modules.
 os.environ.setdefault("ROUTE_PLAN_DEADLINE_SEC", "120")
 os.environ.setdefault("OSRM_GEOMETRY_CACHE_MAX", "8192")
 
+ROUTE_BATCH_MAX_REQUESTS = int(os.getenv("ROUTE_BATCH_MAX_REQUESTS", "500"))
+
 logger = logging.getLogger("route_service")
 
 try:
-    from backend.services.route_planner import AIR_HUBS, MARITIME_HUBS, RAIL_HUBS, plan_route
-    from backend.services.routing_geometry import configure_osrm_geometry_cache, osrm_cache_stats
+    from backend.services.route_planner import (
+        AIR_HUBS,
+        MARITIME_HUBS,
+        RAIL_HUBS,
+        plan_route,
+        plan_route_batch,
+        precompute_hub_geometry,
+    )
+    from backend.services.routing_geometry import (
+        configure_osrm_geometry_cache,
+        osrm_cache_stats,
+        route_geometry_cache_stats,
+    )
 except ImportError:
-    from services.route_planner import AIR_HUBS, MARITIME_HUBS, RAIL_HUBS, plan_route  # type: ignore[no-redef]
-    from services.routing_geometry import configure_osrm_geometry_cache, osrm_cache_stats  # type: ignore[no-redef]
+    from services.route_planner import (  # type: ignore[no-redef]
+        AIR_HUBS,
+        MARITIME_HUBS,
+        RAIL_HUBS,
+        plan_route,
+        plan_route_batch,
+        precompute_hub_geometry,
+    )
+    from services.routing_geometry import (  # type: ignore[no-redef]
+        configure_osrm_geometry_cache,
+        osrm_cache_stats,
+        route_geometry_cache_stats,
+    )
 
 
 class RoutePointPayload(BaseModel):
@@ -43,6 +70,22 @@ class RoutePlanRequest(BaseModel):
     pipeline_layer_enabled: bool = False
 
 
+class RoutePlanBatchItem(RoutePlanRequest):
+    id: Optional[str] = None
+
+
+class RoutePlanBatchRequest(BaseModel):
+    requests: list[RoutePlanBatchItem] = Field(default_factory=list)
+    max_workers: Optional[int] = Field(default=None, ge=1, le=32)
+
+
+def _request_payload(payload: RoutePlanRequest) -> dict[str, Any]:
+    request_payload = payload.model_dump()
+    transit = request_payload.get("transit_points") or []
+    request_payload["transit_points"] = [item for item in transit if isinstance(item, dict)]
+    return request_payload
+
+
 def _preload_hub_catalogs() -> dict[str, int]:
     """Warm hub tuples in memory at startup (ports, airports, rail)."""
     counts = {
@@ -57,12 +100,32 @@ def _preload_hub_catalogs() -> dict[str, int]:
     return counts
 
 
+def _start_hub_geometry_precompute() -> Optional[threading.Thread]:
+    """Warm hub-pair geometry in the background when ROUTE_GEOMETRY_PRECOMPUTE is set."""
+    if (os.getenv("ROUTE_GEOMETRY_PRECOMPUTE") or "").strip().lower() not in {"1", "true", "yes", "on"}:
+        return None
+
+    def run() -> None:
+        started = time.monotonic()
+        try:
+            summary = precompute_hub_geometry(workers=2)
+        except Exception:
+            logger.exception("hub geometry precompute failed")
+            return
+        logger.info("hub geometry precompute done in %.1fs: %s", time.monotonic() - started, summary)
+
+    thread = threading.Thread(target=run, name="hub-geometry-precompute", daemon=True)
+    thread.start()
+    return thread
+
+
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     logging.basicConfig(level=logging.INFO)
     max_entries = int(os.getenv("OSRM_GEOMETRY_CACHE_MAX", "8192"))
     configure_osrm_geometry_cache(max_entries=max_entries)
     hub_counts = _preload_hub_catalogs()
+    _start_hub_geometry_precompute()
     logger.info(
         "route-service ready hubs=%s osrm_cache_max=%s deadline_sec=%s",
         hub_counts,
@@ -86,6 +149,7 @@ def health() -> dict[str, Any]:
             "rail": len(RAIL_HUBS),
         },
         "osrm_cache": osrm_cache_stats(),
+        "geometry_cache": route_geometry_cache_stats(),
         "deadline_sec": float(os.getenv("ROUTE_PLAN_DEADLINE_SEC", "120")),
     }
 
@@ -93,9 +157,7 @@ def health() -> dict[str, Any]:
 @app.post("/plan")
 def create_plan(payload: RoutePlanRequest) -> dict[str, Any]:
     started = time.monotonic()
-    request_payload = payload.model_dump()
-    transit = request_payload.get("transit_points") or []
-    request_payload["transit_points"] = [item for item in transit if isinstance(item, dict)]
+    request_payload = _request_payload(payload)
     try:
         result = plan_route(request_payload)
     except ValueError as exc:
@@ -114,3 +176,24 @@ def create_plan(payload: RoutePlanRequest) -> dict[str, Any]:
             ],
         }
     return result
+
+
+@app.post("/plan/batch")
+def create_plan_batch(payload: RoutePlanBatchRequest) -> StreamingResponse:
+    """Plan many lanes; NDJSON lines stream back as each plan completes, then a summary."""
+    if not payload.requests:
+        raise HTTPException(status_code=400, detail="requests must not be empty")
+    if len(payload.requests) > ROUTE_BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {ROUTE_BATCH_MAX_REQUESTS} requests per batch",
+        )
+    request_payloads = [_request_payload(item) for item in payload.requests]
+
+    def lines():
+        for item in plan_route_batch(request_payloads, max_workers=payload.max_workers):
+            if "summary" in item:
+                logger.info("route batch done %s", item["summary"])
+            yield json.dumps(item, default=str) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Benchmark point-in-country lookup: pure-Python per-point loop vs CountryPolygonIndex batches.
+
+Usage (from repo root; no database needed):
+  python -m backend.scripts.bench_country_lookup
+  python -m backend.scripts.bench_country_lookup --points 80000 --synthetic
+
+Uses backend/data/country_borders.geojson when present (otherwise, or with --synthetic,
+a generated world of jagged polygons with holes). The "python" column is the per-point
+bbox + ray-casting loop that storage_terminals.resolve_country used before the index,
+timed without its coordinate cache. Both paths must agree on every point.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+import time
+from typing import Any
+
+
+def _synthetic_features(rng: random.Random, countries: int, vertices: int) -> list[dict[str, Any]]:
+    features = []
+    cols = int(math.ceil(math.sqrt(countries * 2)))
+    rows = int(math.ceil(countries / cols))
+    cell_w, cell_h = 360.0 / cols, 150.0 / rows
+    for idx in range(countries):
+        cx = -180.0 + (idx % cols + 0.5) * cell_w
+        cy = -60.0 + (idx // cols + 0.5) * cell_h
+
+        def ring(scale: float) -> list[list[float]]:
+            pts = []
+            for k in range(vertices):
+                angle = 2 * math.pi * k / vertices
+                radius = scale * (0.75 + 0.25 * rng.random())
+                pts.append([cx + radius * cell_w * 0.5 * math.cos(angle), cy + radius * cell_h * 0.5 * math.sin(angle)])
+            pts.append(pts[0])
+            return pts
+
+        features.append(
+            {
+                "properties": {"ADMIN": f"Country {idx}", "ISO_A2": f"{chr(65 + idx // 26 % 26)}{chr(65 + idx % 26)}"},
+                "geometry": {"type": "Polygon", "coordinates": [ring(1.0), ring(0.2)]},
+            }
+        )
+    return features
+
+
+def _python_rings(features: list[dict[str, Any]]) -> list[tuple[str, str, tuple[float, float, float, float], list]]:
+    prepared = []
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "Polygon":
+            polygons = [geometry.get("coordinates") or []]
+        elif geometry.get("type") == "MultiPolygon":
+            polygons = geometry.get("coordinates") or []
+        else:
+            continue
+        polygons = [[[(float(x), float(y)) for x, y, *_ in ring] for ring in polygon] for polygon in polygons if polygon]
+        xs = [x for polygon in polygons for ring in polygon for x, _ in ring]
+        ys = [y for polygon in polygons for ring in polygon for _, y in ring]
+        if not xs:
+            continue
+        props = feature.get("properties") or {}
+        name = next((str(props[k]).strip() for k in ("ADMIN", "name", "NAME", "formal_en") if props.get(k)), "Unknown")
+        iso2 = next((str(props[k]).strip().upper() for k in ("ISO_A2", "iso_a2", "ISO2", "iso2") if len(str(props.get(k) or "").strip()) == 2), "")
+        prepared.append((name, iso2, (min(xs), min(ys), max(xs), max(ys)), polygons))
+    return prepared
+
+
+def _point_in_ring(lng: float, lat: float, ring: list[tuple[float, float]]) -> bool:
+    inside = False
+    if len(ring) < 3:
+        return False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if ((yi > lat) != (yj > lat)) and (lng < (xj - xi) * (lat - yi) / ((yj - yi) or 1e-12) + xi):
+            inside = not inside
+        j = i
+    return inside
+
+
+def _python_resolve(prepared, lat: float, lng: float) -> tuple[str, str]:
+    for name, iso2, (min_x, min_y, max_x, max_y), polygons in prepared:
+        if lng < min_x or lng > max_x or lat < min_y or lat > max_y:
+            continue
+        for polygon in polygons:
+            if _point_in_ring(lng, lat, polygon[0]) and not any(_point_in_ring(lng, lat, hole) for hole in polygon[1:]):
+                return name, iso2
+    return "Unknown", ""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare per-point vs vectorized country lookup")
+    parser.add_argument("--points", type=int, default=50_000, help="Random points to resolve")
+    parser.add_argument("--synthetic", action="store_true", help="Ignore the bundled borders file")
+    parser.add_argument("--countries", type=int, default=200, help="Synthetic country count")
+    parser.add_argument("--vertices", type=int, default=400, help="Vertices per synthetic outer ring")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    try:
+        from backend.country_borders import get_country_borders_geojson
+        from backend.country_lookup import CountryPolygonIndex
+    except ImportError as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+
+    rng = random.Random(args.seed)
+    features = [] if args.synthetic else get_country_borders_geojson()[0].get("features") or []
+    source = "country_borders.geojson"
+    if not features:
+        features = _synthetic_features(rng, args.countries, args.vertices)
+        source = f"synthetic ({args.countries} countries x {args.vertices} vertices)"
+    lats = [round(rng.uniform(-60.0, 75.0), 2) for _ in range(args.points)]
+    lngs = [round(rng.uniform(-180.0, 180.0), 2) for _ in range(args.points)]
+
+    started = time.perf_counter()
+    index = CountryPolygonIndex(features)
+    build_ms = (time.perf_counter() - started) * 1000.0
+    prepared = _python_rings(features)
+    print(f"{source}: {len(index)} features, index build {build_ms:.1f} ms, {args.points} points")
+
+    started = time.perf_counter()
+    batch = index.resolve(lats, lngs, decimals=None)
+    batch_ms = (time.perf_counter() - started) * 1000.0
+
+    started = time.perf_counter()
+    scalar = [_python_resolve(prepared, lat, lng) for lat, lng in zip(lats, lngs)]
+    python_ms = (time.perf_counter() - started) * 1000.0
+
+    mismatches = sum(1 for a, b in zip(batch, scalar) if a != b)
+    print(f"{'path':<10}{'total ms':>12}{'us/point':>12}")
+    print(f"{'python':<10}{python_ms:>12.1f}{python_ms * 1000.0 / args.points:>12.2f}")
+    print(f"{'numpy':<10}{batch_ms:>12.1f}{batch_ms * 1000.0 / args.points:>12.2f}")
+    print(f"speedup {python_ms / max(batch_ms, 1e-6):.1f}x, mismatches {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Benchmark EIA historic workbook ingest: row-at-a-time vs columnar, rows/sec.
+
+Usage (from repo root):
+  python -m backend.scripts.bench_eia_historic_ingest --folder ~/Downloads/EIA_downloads
+  python -m backend.scripts.bench_eia_historic_ingest --synthesize --years 32 --rows-per-file 4000
+  python -m backend.scripts.bench_eia_historic_ingest --folder ... --db   # also time the load
+
+Parse paths time read + normalize over every impaYYd workbook in the folder:
+
+  row path       previous ingest (preview read + full read per sheet, iterrows, _row_to_record)
+  columnar       parse_eia_workbook in-process (one read per sheet, vectorized normalize)
+  columnar pool  parse_eia_workbook on a process pool (--workers)
+
+With --db (DATABASE_URL / DB_* env) the load is timed too: execute_batch of the row path's
+records vs COPY + merge, under a throwaway data_source that is deleted afterwards.
+--synthesize writes an impaYYd.xlsx per year with the EIA company-level column layout.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+_BENCH_SOURCE = "bench_eia_historic_ingest"
+
+
+def _synthesize(folder: Path, years: int, rows_per_file: int, seed: int) -> None:
+    import pandas as pd
+
+    rng = random.Random(seed)
+    importers = [f"IMPORTER {i} INC" for i in range(400)]
+    countries = ["CANADA", "MEXICO", "SAUDI ARABIA", "IRAQ", "COLOMBIA", "NIGERIA", "BRAZIL", "KUWAIT"]
+    products = [(51, "CRUDE OIL"), (403, "DISTILLATE FUEL OIL"), (120, "MOTOR GASOLINE"), (249, "PROPANE")]
+    for year in range(2024 - years + 1, 2025):
+        rows = []
+        for line in range(rows_per_file):
+            code, name = rng.choice(products)
+            rows.append(
+                {
+                    "RPT_PERIOD": pd.Timestamp(year, rng.randint(1, 12), 1) + pd.offsets.MonthEnd(0),
+                    "R_S_NAME": rng.choice(importers),
+                    "LINE_NUM": line + 1,
+                    "PROD_CODE": code,
+                    "PROD_NAME": name,
+                    "PORT_CODE": rng.randint(1000, 5999),
+                    "PORT_CITY": "HOUSTON, TX",
+                    "PORT_STATE": "TEXAS",
+                    "PORT_PADD": rng.randint(1, 5),
+                    "GCTRY_CODE": rng.randint(100, 999),
+                    "CNTRY_NAME": rng.choice(countries),
+                    "QUANTITY": rng.randint(0, 3000),
+                    "SULFUR": round(rng.random() * 3, 2),
+                    "APIGRAVITY": round(20 + rng.random() * 25, 1),
+                }
+            )
+        pd.DataFrame(rows).to_excel(folder / f"impa{year % 100:02d}d.xlsx", sheet_name="IMPORTS", index=False)
+
+
+def _row_path(path: Path, eia: Any) -> list[dict[str, Any]]:
+    import pandas as pd
+
+    engine = eia._excel_engine(path)
+    records = []
+    with pd.ExcelFile(path, engine=engine) as xl:
+        for sheet in eia._sheet_order(list(xl.sheet_names)):
+            preview = pd.read_excel(path, sheet_name=sheet, header=None, nrows=30, engine=engine)
+            header_row = eia._detect_header_row(preview)
+            df = pd.read_excel(path, sheet_name=sheet, header=header_row, engine=engine)
+            df.columns = [eia._normalize_header_cell(c) or f"COL_{i}" for i, c in enumerate(df.columns)]
+            for _, row in df.iterrows():
+                rec = eia._row_to_record(row, source_file=path.name, source_sheet=sheet, data_source=_BENCH_SOURCE)
+                if rec:
+                    records.append(rec)
+    return records
+
+
+def _timed(label: str, fn: Callable[[], int]) -> float:
+    started = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"{label:<22}{rows:>12}{elapsed:>12.2f}{rate:>14.0f}")
+    return rate
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure EIA historic workbook ingest throughput")
+    parser.add_argument("--folder", help="Folder of impaYYd.xls(x) files (default EIA_DOWNLOADS_DIR)")
+    parser.add_argument("--synthesize", action="store_true", help="Generate synthetic workbooks instead")
+    parser.add_argument("--years", type=int, default=32)
+    parser.add_argument("--rows-per-file", type=int, default=4_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--db", action="store_true", help="Also time execute_batch vs COPY + merge")
+    args = parser.parse_args()
+
+    try:
+        from backend.services import eia_historic_imports as eia
+    except ImportError as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+
+    scratch = tempfile.TemporaryDirectory() if args.synthesize else None
+    try:
+        if scratch is not None:
+            folder = Path(scratch.name)
+            print(f"writing {args.years} synthetic workbooks x {args.rows_per_file} rows…", flush=True)
+            _synthesize(folder, args.years, args.rows_per_file, args.seed)
+        else:
+            folder = Path(args.folder or eia.default_downloads_dir()).expanduser()
+        paths = eia._iter_import_files(folder) if folder.is_dir() else []
+        if not paths:
+            print(f"No impa*.xls(x) files in {folder}; pass --folder or --synthesize", file=sys.stderr)
+            return 1
+
+        print(f"{len(paths)} workbooks in {folder}")
+        print(f"{'path':<22}{'rows':>12}{'seconds':>12}{'rows/s':>14}")
+        row_records: dict[str, list[dict[str, Any]]] = {}
+
+        def row_path() -> int:
+            for path in paths:
+                row_records[path.name] = _row_path(path, eia)
+            return sum(len(records) for records in row_records.values())
+
+        parsed: list[dict[str, Any]] = []
+
+        def columnar() -> int:
+            parsed[:] = [eia.parse_eia_workbook(str(path), _BENCH_SOURCE) for path in paths]
+            return sum(item["rows_parsed"] for item in parsed)
+
+        def columnar_pool() -> int:
+            spawn = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=args.workers, mp_context=spawn) as pool:
+                results = list(pool.map(eia.parse_eia_workbook, [str(p) for p in paths], [_BENCH_SOURCE] * len(paths)))
+            return sum(item["rows_parsed"] for item in results)
+
+        before = _timed("row path", row_path)
+        _timed("columnar", columnar)
+        after = _timed(f"columnar pool x{args.workers}", columnar_pool)
+        print(f"parse speedup: {after / before:.1f}x" if before else "parse speedup: n/a")
+
+        if args.db:
+            _bench_load(eia, row_records, parsed)
+    finally:
+        if scratch is not None:
+            scratch.cleanup()
+    return 0
+
+
+def _bench_load(eia: Any, row_records: dict[str, list[dict[str, Any]]], parsed: list[dict[str, Any]]) -> None:
+    import psycopg2
+    from psycopg2.extras import execute_batch
+
+    from backend.services.db_pool import db_connect_kwargs
+
+    conn = psycopg2.connect(**db_connect_kwargs())
+    columns = ", ".join(eia._INSERT_COLUMNS)
+    placeholders = ", ".join(f"%({col})s" for col in eia._INSERT_COLUMNS)
+    try:
+        eia.ensure_eia_historic_imports_table(conn)
+
+        def clear() -> None:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM eia_historic_imports WHERE data_source = %s;", (_BENCH_SOURCE,))
+                cur.execute("DELETE FROM eia_historic_rollup WHERE data_source = %s;", (_BENCH_SOURCE,))
+            conn.commit()
+
+        def batch_load() -> int:
+            for name, records in row_records.items():
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "DELETE FROM eia_historic_imports WHERE source_file = %s AND data_source = %s;",
+                        (name, _BENCH_SOURCE),
+                    )
+                    execute_batch(
+                        cur,
+                        f"INSERT INTO eia_historic_imports ({columns}) VALUES ({placeholders}) ON CONFLICT DO NOTHING;",
+                        records,
+                        page_size=500,
+                    )
+                conn.commit()
+            return sum(len(records) for records in row_records.values())
+
+        def copy_load() -> int:
+            for item in parsed:
+                eia._load_parsed_workbook(conn, item, data_source=_BENCH_SOURCE)
+                conn.commit()
+            return sum(item["rows_parsed"] for item in parsed)
+
+        clear()
+        _timed("load execute_batch", batch_load)
+        clear()
+        _timed("load COPY + merge", copy_load)
+        clear()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Benchmark low-zoom /licenses cluster reads: live GROUP BY over licenses vs license_map_cells.
+
+Usage (from repo root, with DATABASE_URL or DB_* set):
+  python -m backend.scripts.bench_license_clusters
+  python -m backend.scripts.bench_license_clusters --runs 50 --sector mining --rebuild
+
+Viewports mirror the map views behind scripts/bench-licenses.sh (sector=mining,
+prefer_open_data=true) at the cluster zooms (z < 8). Prints p50/p95 per viewport in ms.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+
+VIEWPORTS: tuple[tuple[str, float, tuple[float, float, float, float]], ...] = (
+    # name, zoom, (min_lat, max_lat, min_lng, max_lng)
+    ("world", 2, (-60.0, 75.0, -180.0, 180.0)),
+    ("africa", 3, (-36.0, 38.0, -20.0, 55.0)),
+    ("south_america", 4, (-56.0, 13.0, -82.0, -34.0)),
+    ("west_africa", 5, (3.0, 18.0, -18.0, 5.0)),
+    ("ghana", 7, (4.5, 11.5, -3.5, 1.5)),
+)
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _time_runs(fn, runs: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare live vs persisted license cluster queries")
+    parser.add_argument("--runs", type=int, default=30, help="Timed runs per viewport and path")
+    parser.add_argument("--sector", default="mining", help="Sector filter (empty for all sectors)")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild license_map_cells before timing")
+    args = parser.parse_args()
+
+    try:
+        from backend.services.db_pool import get_pooled_connection
+        from backend.services.license_map_perf import (
+            LICENSE_SECTOR_KEY_SQL,
+            license_cluster_limit_for_zoom,
+            license_grid_degrees,
+            license_map_cells_age_seconds,
+            license_open_data_preference_sql,
+            query_license_clusters,
+            query_license_clusters_from_cells,
+            rebuild_license_map_cells,
+        )
+    except ImportError as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+
+    sector = (args.sector or "").strip().lower()
+    sector_sql, sector_params = (f"{LICENSE_SECTOR_KEY_SQL} = %s", [sector]) if sector else ("TRUE", [])
+
+    conn = get_pooled_connection()
+    try:
+        with conn.cursor() as cur:
+            live_open_clause = license_open_data_preference_sql(sector_sql)
+            if args.rebuild or license_map_cells_age_seconds(cur) is None:
+                print(f"Rebuilding license_map_cells: {rebuild_license_map_cells(conn)}")
+        print(f"{'viewport':<16}{'zoom':>5}{'live p50':>11}{'live p95':>11}{'grid p50':>11}{'grid p95':>11}{'speedup':>9}")
+        for name, zoom, (min_lat, max_lat, min_lng, max_lng) in VIEWPORTS:
+            grid_deg = license_grid_degrees(zoom)
+            limit = license_cluster_limit_for_zoom(zoom, 800)
+            common = {
+                "sector_sql": sector_sql,
+                "country_sql": "TRUE",
+                "country_params": [],
+                "min_lat": min_lat,
+                "max_lat": max_lat,
+                "min_lng": min_lng,
+                "max_lng": max_lng,
+                "grid_deg": grid_deg,
+                "limit": limit,
+                "zoom": zoom,
+            }
+            with conn.cursor() as cur:
+                live = _time_runs(
+                    lambda: query_license_clusters(
+                        cur,
+                        sector_params=sector_params,
+                        open_clause=live_open_clause,
+                        open_params=sector_params,
+                        **common,
+                    ),
+                    args.runs,
+                )
+                grid = _time_runs(
+                    lambda: query_license_clusters_from_cells(
+                        cur, sector_params=sector_params, prefer_open_data=True, **common
+                    ),
+                    args.runs,
+                )
+            conn.rollback()
+            live_p50, grid_p50 = statistics.median(live), statistics.median(grid)
+            print(
+                f"{name:<16}{zoom:>5}{live_p50:>11.2f}{_percentile(live, 95):>11.2f}"
+                f"{grid_p50:>11.2f}{_percentile(grid, 95):>11.2f}{live_p50 / max(grid_p50, 1e-6):>8.1f}x"
+            )
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
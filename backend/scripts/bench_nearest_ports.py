@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark nearest-port lookup: linear haversine scan vs the shared spherical index.
+
+Usage (from repo root; no database needed):
+  python -m backend.scripts.bench_nearest_ports
+  python -m backend.scripts.bench_nearest_ports --synthetic --rows 100000 --queries 2000
+
+Loads the UN/LOCODE port table the same way find_nearest_ports does (otherwise, or
+with --synthetic, generates port rows clustered along coastlines-ish bands). The
+"linear" column is the scan find_nearest_ports ran before the index over the old list
+of row dicts: copy every row, compute haversine, sort, slice. Both paths must return the same ports in the same
+order for every query, with and without a country filter.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import Any
+
+
+def _synthetic_rows(rng: random.Random, count: int) -> list[dict[str, Any]]:
+    countries = [f"{chr(65 + idx // 26)}{chr(65 + idx % 26)}" for idx in range(240)]
+    rows = []
+    for idx in range(count):
+        country = countries[idx % len(countries)]
+        anchor = random.Random(country)
+        lat = max(-85.0, min(85.0, anchor.uniform(-60.0, 70.0) + rng.gauss(0.0, 4.0)))
+        lng = (anchor.uniform(-180.0, 180.0) + rng.gauss(0.0, 6.0) + 180.0) % 360.0 - 180.0
+        name = f"Port {idx:06d}"
+        rows.append(
+            {
+                "unlocode": f"{country}{idx % 46656:03X}",
+                "country_iso2": country,
+                "name": name,
+                "lat": round(lat, 4),
+                "lng": round(lng, 4),
+                "role": "energy_port" if idx % 17 == 0 else "port",
+            }
+        )
+    return rows
+
+
+def _linear_nearest(rows, haversine_km, country_code: str, lat: float, lng: float, limit: int) -> list[dict[str, Any]]:
+    scoped = [row for row in rows if not country_code or row["country_iso2"] == country_code]
+    enriched = []
+    for row in scoped:
+        row_copy = dict(row)
+        row_copy["distance_km"] = round(haversine_km(lat, lng, row["lat"], row["lng"]), 1)
+        row_copy["confidence"] = 0.65 if row_copy["role"] == "energy_port" else 0.45
+        enriched.append(row_copy)
+    enriched.sort(key=lambda item: (item["distance_km"], item["name"]))
+    return enriched[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare linear vs indexed nearest-port lookup")
+    parser.add_argument("--queries", type=int, default=1000, help="Random query points")
+    parser.add_argument("--limit", type=int, default=5, help="Ports returned per query")
+    parser.add_argument("--synthetic", action="store_true", help="Skip the UN/LOCODE download")
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic port rows")
+    parser.add_argument("--linear-queries", type=int, default=200, help="Queries timed on the linear path")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    try:
+        from backend.services import maritime_intel
+        from backend.services.unlocode_snapshot import UnlocodePortTable
+    except ImportError as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+
+    rng = random.Random(args.seed)
+    table = None if args.synthetic else maritime_intel._cached_unlocode_ports()
+    source = "UN/LOCODE snapshot"
+    if not table:
+        table = UnlocodePortTable.from_rows(_synthetic_rows(rng, args.rows))
+        source = f"synthetic ({args.rows} rows)"
+        maritime_intel._unlocode_cache.set("ports", table)
+    rows = list(table)
+
+    countries = sorted({row["country_iso2"] for row in rows})
+    queries = []
+    for idx in range(args.queries):
+        country = rng.choice(countries) if idx % 4 == 0 else ""
+        queries.append((country, round(rng.uniform(-60.0, 75.0), 3), round(rng.uniform(-180.0, 180.0), 3)))
+
+    started = time.perf_counter()
+    table.spatial_index()
+    build_ms = (time.perf_counter() - started) * 1000.0
+    print(f"{source}: {len(rows)} ports, {len(countries)} countries, index build {build_ms:.1f} ms")
+
+    started = time.perf_counter()
+    indexed = [
+        maritime_intel.find_nearest_ports(country_iso2=country, lat=lat, lng=lng, limit=args.limit)
+        for country, lat, lng in queries
+    ]
+    indexed_ms = (time.perf_counter() - started) * 1000.0
+
+    linear_queries = queries[: max(1, min(args.linear_queries, len(queries)))]
+    started = time.perf_counter()
+    linear = [
+        _linear_nearest(rows, maritime_intel.haversine_km, country, lat, lng, args.limit)
+        for country, lat, lng in linear_queries
+    ]
+    linear_ms = (time.perf_counter() - started) * 1000.0
+
+    mismatches = sum(1 for a, b in zip(indexed, linear) if a != b)
+    linear_us = linear_ms * 1000.0 / len(linear_queries)
+    indexed_us = indexed_ms * 1000.0 / len(queries)
+    print(f"{'path':<10}{'queries':>10}{'total ms':>12}{'us/query':>12}")
+    print(f"{'linear':<10}{len(linear_queries):>10}{linear_ms:>12.1f}{linear_us:>12.1f}")
+    print(f"{'index':<10}{len(queries):>10}{indexed_ms:>12.1f}{indexed_us:>12.1f}")
+    print(f"speedup {linear_us / max(indexed_us, 1e-6):.0f}x, mismatches {mismatches}/{len(linear_queries)}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
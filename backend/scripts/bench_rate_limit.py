@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark RateLimitMiddleware's allow_request: per-request overhead by backend.
+
+Usage (from repo root):
+  python -m backend.scripts.bench_rate_limit
+  REDIS_HOST=localhost python -m backend.scripts.bench_rate_limit --requests 50000 --threads 8
+
+Always times the in-memory sliding window. With REDIS_HOST set it also times the
+pooled-client Lua path and, for comparison, the previous per-request client with
+separate INCR/EXPIRE round-trips. Clients are drawn from --clients distinct keys so
+the memory wheel sees realistic key churn.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from typing import Callable
+
+
+def _run(label: str, fn: Callable[[str], bool], keys: list[str], threads: int) -> None:
+    per_thread = len(keys) // threads
+    samples: list[float] = []
+    lock = threading.Lock()
+
+    def worker(chunk: list[str]) -> None:
+        local = []
+        for key in chunk:
+            started = time.perf_counter()
+            fn(key)
+            local.append(time.perf_counter() - started)
+        with lock:
+            samples.extend(local)
+
+    workers = [
+        threading.Thread(target=worker, args=(keys[i * per_thread:(i + 1) * per_thread],)) for i in range(threads)
+    ]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(
+        f"{label:<22}{len(samples) / elapsed:>12.0f}{statistics.mean(samples) * 1e6:>12.1f}"
+        f"{samples[len(samples) // 2] * 1e6:>12.1f}{p99 * 1e6:>12.1f}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure rate limiter overhead per request")
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--clients", type=int, default=5_000, help="Distinct client keys")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    try:
+        from backend.services import rate_limit
+        from backend.services.redis_connection import redis_client_kwargs
+    except ImportError as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+
+    rng = random.Random(args.seed)
+    keys = [f"ip:10.{rng.randrange(256)}.{rng.randrange(args.clients)}" for _ in range(args.requests)]
+    print(f"{args.requests} requests, {args.clients} clients, {args.threads} threads")
+    print(f"{'path':<22}{'req/s':>12}{'mean us':>12}{'p50 us':>12}{'p99 us':>12}")
+
+    rate_limit.reset_memory_store_for_tests()
+    _run("memory wheel", lambda key: rate_limit._memory_allow("rl:bench:" + key, 60, 60), keys, args.threads)
+
+    if not (os.getenv("REDIS_HOST") or "").strip():
+        print("REDIS_HOST not set; skipping Redis paths")
+        return 0
+    client = rate_limit._redis_client()
+    if client is None:
+        print("Redis unavailable; skipping Redis paths")
+        return 0
+    _run(
+        "redis lua (pooled)",
+        lambda key: bool(rate_limit._redis_allow(client, "rl:bench:" + key, 60, 60)),
+        keys,
+        args.threads,
+    )
+
+    import redis
+
+    def legacy(key: str) -> bool:
+        per_request = redis.Redis(**redis_client_kwargs())
+        window_key = f"rl:bench-legacy:{key}:{int(time.time()) // 60}"
+        count = per_request.incr(window_key)
+        if count == 1:
+            per_request.expire(window_key, 60)
+        return int(count) <= 60
+
+    _run("redis incr (per-req)", legacy, keys[: max(args.threads, len(keys) // 10)], args.threads)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark /api/storage/terminals viewport filtering: linear scan vs StorageSpatialIndex.
+
+Usage (from repo root; no database needed):
+  python -m backend.scripts.bench_storage_viewport
+  python -m backend.scripts.bench_storage_viewport --terminals 200000 --runs 30 --cell-deg 0.5
+
+Builds a synthetic global terminal list (clustered around petroleum hubs plus uniform
+noise, ~1% without coordinates) and times _apply_viewport_filter per viewport, with and
+without the grid index. Prints p50/p95 per viewport in ms and checks both paths agree.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+
+VIEWPORTS: tuple[tuple[str, tuple[float, float, float, float]], ...] = (
+    # name, (south, west, north, east)
+    ("world", (-60.0, -180.0, 75.0, 180.0)),
+    ("europe", (34.0, -12.0, 72.0, 40.0)),
+    ("gulf_coast", (27.0, -98.0, 31.5, -88.0)),
+    ("rotterdam", (51.8, 3.9, 52.0, 4.6)),
+    ("singapore", (1.15, 103.6, 1.5, 104.1)),
+    ("open_ocean", (-40.0, -140.0, -30.0, -130.0)),
+)
+
+HUBS: tuple[tuple[float, float], ...] = (
+    (51.9, 4.3),
+    (29.7, -95.1),
+    (1.27, 103.8),
+    (25.2, 55.3),
+    (35.4, 139.7),
+    (-23.9, -46.3),
+    (6.4, 3.4),
+    (59.9, 30.3),
+)
+
+
+def _synthetic_terminals(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    entities: list[dict] = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.01:
+            lat, lng = None, None
+        elif roll < 0.7:
+            hub_lat, hub_lng = rng.choice(HUBS)
+            lat, lng = hub_lat + rng.gauss(0, 1.5), hub_lng + rng.gauss(0, 1.5)
+        else:
+            lat, lng = rng.uniform(-60.0, 75.0), rng.uniform(-180.0, 180.0)
+        entities.append({"id": f"osm:node:{i}", "lat": lat, "lng": lng, "confidenceScore": rng.random()})
+    return entities
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _time_runs(fn, runs: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare linear vs indexed storage viewport filtering")
+    parser.add_argument("--terminals", type=int, default=200_000, help="Synthetic terminal count")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per viewport and path")
+    parser.add_argument("--limit", type=int, default=2000, help="Viewport limit (as /api/storage/terminals)")
+    parser.add_argument("--cell-deg", type=float, default=None, help="Grid cell size (default STORAGE_INDEX_CELL_DEG)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    try:
+        from backend.services.storage_terminals import (
+            STORAGE_INDEX_CELL_DEG,
+            StorageSpatialIndex,
+            _apply_viewport_filter,
+        )
+    except ImportError as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+
+    entities = _synthetic_terminals(args.terminals, args.seed)
+    cell_deg = args.cell_deg or STORAGE_INDEX_CELL_DEG
+    started = time.perf_counter()
+    index = StorageSpatialIndex(entities, cell_deg=cell_deg)
+    build_ms = (time.perf_counter() - started) * 1000.0
+    print(f"{len(entities)} terminals, {cell_deg:g} deg cells, index build {build_ms:.1f} ms")
+
+    print(f"{'viewport':<14}{'hits':>8}{'scan p50':>11}{'scan p95':>11}{'grid p50':>11}{'grid p95':>11}{'speedup':>9}")
+    for name, bbox in VIEWPORTS:
+        scan_result = _apply_viewport_filter(entities, bbox=bbox, limit=args.limit)
+        grid_result = _apply_viewport_filter(entities, bbox=bbox, limit=args.limit, index=index)
+        if scan_result != grid_result:
+            print(f"{name}: indexed result differs from linear scan", file=sys.stderr)
+            return 1
+        scan = _time_runs(lambda: _apply_viewport_filter(entities, bbox=bbox, limit=args.limit), args.runs)
+        grid = _time_runs(
+            lambda: _apply_viewport_filter(entities, bbox=bbox, limit=args.limit, index=index), args.runs
+        )
+        scan_p50, grid_p50 = statistics.median(scan), statistics.median(grid)
+        print(
+            f"{name:<14}{len(grid_result[0]):>8}{scan_p50:>11.2f}{_percentile(scan, 95):>11.2f}"
+            f"{grid_p50:>11.2f}{_percentile(grid, 95):>11.2f}{scan_p50 / max(grid_p50, 1e-6):>8.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Build the MARITIME_HUBS sea-lane distance/duration matrix used to rank export ports.
+
+Usage (from repo root; needs the searoute package, no database):
+  python -m backend.scripts.build_sea_lane_matrix
+  python -m backend.scripts.build_sea_lane_matrix --output /tmp/sea_lane_matrix.npy
+
+Every ordered hub pair is resolved with the same fetch_sea_route call plan_route makes
+(searoute trunk, offshore anchoring, Gibraltar guard), so matrix distances match the
+geometry returned for the winning alternative. Pairs where searoute fails keep the
+corridor estimate and are reported. Re-run and commit the output whenever MARITIME_HUBS
+or the sea-path post-processing changes; a stale file is ignored at load.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the maritime hub sea-lane matrix")
+    parser.add_argument("--output", type=Path, default=None, help="Matrix .npy path (sidecar .json alongside)")
+    args = parser.parse_args()
+
+    try:
+        from backend.services.route_planner import MARITIME_HUBS, _point_from_hub, _sea_path
+        from backend.services.routing_geometry import fetch_sea_route, route_network_version
+        from backend.services.sea_lane_matrix import (
+            SEA_LANE_MATRIX_PATH,
+            build_sea_lane_matrix,
+            chokepoint_flags,
+            decode_chokepoint_flags,
+            write_sea_lane_matrix,
+        )
+    except ImportError as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+
+    sources: Counter[str] = Counter()
+    chokepoints: Counter[str] = Counter()
+    fallbacks: list[str] = []
+
+    def resolve(a, b) -> tuple[float, float, int]:
+        pa, pb = _point_from_hub(a), _point_from_hub(b)
+        geometry = fetch_sea_route(pa.lat, pa.lng, pb.lat, pb.lng, corridor_fallback=lambda: _sea_path(pa, pb))
+        sources[geometry.source] += 1
+        if geometry.source != "searoute":
+            fallbacks.append(f"{a.name} -> {b.name} ({geometry.source})")
+        flags = chokepoint_flags(
+            geometry.path,
+            source=geometry.source,
+            gibraltar_guard=any("Gibraltar guard" in note for note in geometry.notes),
+        )
+        chokepoints.update(decode_chokepoint_flags(flags))
+        return geometry.distance_km, geometry.duration_hours, flags
+
+    started = time.monotonic()
+    matrix = build_sea_lane_matrix(MARITIME_HUBS, resolve)
+    path = write_sea_lane_matrix(
+        matrix,
+        MARITIME_HUBS,
+        args.output or SEA_LANE_MATRIX_PATH,
+        network_version=route_network_version("sea"),
+    )
+    pairs = sum(sources.values())
+    print(f"{len(MARITIME_HUBS)} hubs, {pairs} pairs in {time.monotonic() - started:.1f}s -> {path}")
+    print("sources: " + ", ".join(f"{name} {n}" for name, n in sources.most_common()))
+    print("chokepoints: " + ", ".join(f"{name} {n}" for name, n in chokepoints.most_common()))
+    for line in fallbacks:
+        print(f"  not searoute: {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Build the UN/LOCODE port snapshot that maritime_intel memory-maps at startup.
+
+Usage (from repo root; no database needed):
+  python -m backend.scripts.build_unlocode_snapshot
+  python -m backend.scripts.build_unlocode_snapshot --csv code-list.csv --output /tmp/unlocode_ports.npy
+
+Downloads UNLOCODE_CSV_URL (or parses a local copy of the same code-list.csv), keeps the
+port rows exactly as the runtime parser does and writes unlocode_ports.npy,
+unlocode_ports.text.npy and the unlocode_ports.json sidecar. Running services rebuild
+the snapshot in the background once it is older than UNLOCODE_SNAPSHOT_MAX_AGE_DAYS;
+re-run this and commit the output to ship a newer dataset with the image.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the UN/LOCODE port snapshot")
+    parser.add_argument("--csv", type=Path, default=None, help="Local code-list.csv instead of downloading")
+    parser.add_argument("--output", type=Path, default=None, help="Snapshot .npy path (text blob and sidecar alongside)")
+    args = parser.parse_args()
+
+    try:
+        from backend.services.maritime_intel import (
+            UNLOCODE_CSV_URL,
+            UNLOCODE_OFFICIAL_SOURCE_URL,
+            _fetch_text,
+            _parse_unlocode_ports,
+        )
+        from backend.services.unlocode_snapshot import (
+            UNLOCODE_SNAPSHOT_PATH,
+            load_unlocode_snapshot,
+            write_unlocode_snapshot,
+        )
+    except ImportError as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+
+    started = time.monotonic()
+    if args.csv is not None:
+        csv_text = args.csv.read_text(encoding="utf-8")
+    else:
+        try:
+            csv_text = _fetch_text(UNLOCODE_CSV_URL, timeout=120)
+        except OSError as exc:
+            print(f"Download failed: {exc}", file=sys.stderr)
+            return 1
+    rows = _parse_unlocode_ports(csv_text)
+    if not rows:
+        print("No port rows parsed; snapshot not written", file=sys.stderr)
+        return 1
+
+    path = write_unlocode_snapshot(
+        rows,
+        args.output or UNLOCODE_SNAPSHOT_PATH,
+        version=hashlib.sha256(csv_text.encode("utf-8")).hexdigest()[:16],
+        source_url=UNLOCODE_OFFICIAL_SOURCE_URL,
+        download_url=UNLOCODE_CSV_URL if args.csv is None else str(args.csv),
+    )
+    table = load_unlocode_snapshot(path)
+    if table is None or len(table) != len(rows):
+        print(f"Snapshot at {path} failed to load back", file=sys.stderr)
+        return 1
+    roles = Counter(table.role(pos) for pos in range(len(table)))
+    size_kb = sum(p.stat().st_size for p in path.parent.glob(path.stem + ".*")) / 1024.0
+    print(f"{len(table)} ports ({roles['energy_port']} energy) in {time.monotonic() - started:.1f}s -> {path}")
+    print(f"version {table.version}, {size_kb:.0f} KiB on disk")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Concurrent load test for the read-only map endpoints, with optional slow background traffic.
+
+Usage (from repo root, against a running API):
+  python -m backend.scripts.load_map_endpoints --base-url http://localhost:8000
+  python -m backend.scripts.load_map_endpoints --concurrency 64 --duration 30 --slow-path /api/admin/data-health \\
+      --slow-concurrency 16 --header "X-Admin-Token: $ADMIN_TOKEN"
+
+Fires --concurrency parallel clients at the map endpoints (storage terminals for
+random viewports, /licenses?map=true, /api/licenses/map) for --duration seconds
+while --slow-concurrency clients keep hitting --slow-path. Prints throughput and
+latency percentiles per endpoint plus the lane/async-pool stats from /api/health.
+
+To compare before/after, run it against the previous build (or a checkout of the
+commit before the request lanes) and this one with the same flags; the number to
+watch is map p95/p99 while slow traffic is running. Disable RATE_LIMIT_ENABLED on
+the target, or every client shares one IP budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Callable
+
+# Viewports around storage-heavy hubs (south, west, north, east).
+VIEWPORTS: tuple[tuple[float, float, float, float], ...] = (
+    (51.80, 3.90, 52.05, 4.60),  # Rotterdam
+    (1.15, 103.60, 1.40, 104.10),  # Singapore
+    (29.50, -95.40, 29.90, -94.80),  # Houston ship channel
+    (25.00, 56.20, 25.30, 56.45),  # Fujairah
+    (5.55, -0.10, 5.75, 0.10),  # Tema
+    (41.00, 28.60, 41.20, 29.20),  # Istanbul
+)
+
+
+def _map_requests(rng: random.Random) -> list[tuple[str, Callable[[], tuple[str, dict[str, Any]]]]]:
+    def storage() -> tuple[str, dict[str, Any]]:
+        south, west, north, east = rng.choice(VIEWPORTS)
+        return "/api/storage/terminals", {"south": south, "west": west, "north": north, "east": east, "limit": 2000}
+
+    def licenses() -> tuple[str, dict[str, Any]]:
+        south, west, north, east = rng.choice(VIEWPORTS)
+        return "/licenses", {
+            "map": "true",
+            "min_lat": south - 2,
+            "max_lat": north + 2,
+            "min_lng": west - 2,
+            "max_lng": east + 2,
+            "zoom": 6,
+        }
+
+    def licenses_map() -> tuple[str, dict[str, Any]]:
+        south, west, north, east = rng.choice(VIEWPORTS)
+        return "/api/licenses/map", {"bbox": f"{west - 2},{south - 2},{east + 2},{north + 2}"}
+
+    return [("storage", storage), ("licenses", licenses), ("licenses_map", licenses_map)]
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def _client_loop(client, deadline: float, pick, results, statuses) -> None:
+    while time.perf_counter() < deadline:
+        label, path, params = pick()
+        started = time.perf_counter()
+        try:
+            response = await client.get(path, params=params)
+            status = str(response.status_code)
+        except Exception as exc:
+            status = type(exc).__name__
+        results[label].append(time.perf_counter() - started)
+        statuses[label][status] += 1
+
+
+async def _run(args: argparse.Namespace) -> int:
+    try:
+        import httpx
+    except ImportError:
+        print("httpx is required: pip install httpx", file=sys.stderr)
+        return 1
+
+    headers = {}
+    for raw in args.header:
+        name, _, value = raw.partition(":")
+        headers[name.strip()] = value.strip()
+    rng = random.Random(args.seed)
+    map_requests = _map_requests(rng)
+
+    def pick_map():
+        label, build = rng.choice(map_requests)
+        path, params = build()
+        return label, path, params
+
+    def pick_slow():
+        return "slow", args.slow_path, {}
+
+    results: dict[str, list[float]] = defaultdict(list)
+    statuses: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    limits = httpx.Limits(max_connections=args.concurrency + args.slow_concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, headers=headers, timeout=args.timeout, limits=limits
+    ) as client:
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(_client_loop(client, deadline, pick_map, results, statuses))
+            for _ in range(args.concurrency)
+        ]
+        if args.slow_path:
+            tasks += [
+                asyncio.create_task(_client_loop(client, deadline, pick_slow, results, statuses))
+                for _ in range(args.slow_concurrency)
+            ]
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+        try:
+            health = (await client.get("/api/health")).json()
+        except Exception:
+            health = {}
+
+    print(
+        f"{args.base_url}: {args.concurrency} map clients"
+        + (f", {args.slow_concurrency} slow clients on {args.slow_path}" if args.slow_path else "")
+        + f", {elapsed:.1f}s"
+    )
+    print(f"{'endpoint':<14}{'requests':>10}{'req/s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  status")
+    map_samples: list[float] = []
+    for label in sorted(results):
+        samples = results[label]
+        if label != "slow":
+            map_samples.extend(samples)
+        codes = " ".join(f"{code}:{count}" for code, count in sorted(statuses[label].items()))
+        print(
+            f"{label:<14}{len(samples):>10}{len(samples) / elapsed:>10.1f}{statistics.mean(samples) * 1e3:>10.1f}"
+            f"{_percentile(samples, 0.5) * 1e3:>10.1f}{_percentile(samples, 0.95) * 1e3:>10.1f}"
+            f"{_percentile(samples, 0.99) * 1e3:>10.1f}  {codes}"
+        )
+    if map_samples:
+        print(
+            f"{'map total':<14}{len(map_samples):>10}{len(map_samples) / elapsed:>10.1f}"
+            f"{statistics.mean(map_samples) * 1e3:>10.1f}{_percentile(map_samples, 0.5) * 1e3:>10.1f}"
+            f"{_percentile(map_samples, 0.95) * 1e3:>10.1f}{_percentile(map_samples, 0.99) * 1e3:>10.1f}"
+        )
+    if health.get("lanes") is not None:
+        print(f"lanes: {health['lanes']}")
+    if isinstance(health.get("db_pool"), dict) and "async" in health["db_pool"]:
+        print(f"async db pool: {health['db_pool']['async']}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Concurrent map-endpoint load test")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32, help="Parallel map clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--slow-path", default="", help="Endpoint hammered in the background (e.g. an admin sync)")
+    parser.add_argument("--slow-concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--header", action="append", default=[], help="Extra 'Name: value' request header")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    return asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
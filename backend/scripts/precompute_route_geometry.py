@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Warm the persistent route geometry cache for every hub-to-hub pair.
+
+Usage (from repo root; needs DATABASE_URL or DB_* and network access to OSRM):
+  python -m backend.scripts.precompute_route_geometry
+  python -m backend.scripts.precompute_route_geometry --methods sea --workers 2
+  python -m backend.scripts.precompute_route_geometry --dry-run
+
+Sea pairs come from MARITIME_HUBS, road pairs from the port, airport and rail catalogs
+(within --max-road-km, overland only), rail pairs from RAIL_HUBS. Successful OSRM and
+searoute results land in route_geometry_cache, shared by the API and route-service, so
+plan_route on a cold worker reads hub legs instead of recomputing them. Pairs already
+stored are cache hits, so re-running only fills gaps (e.g. after OSRM was unreachable).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections import Counter
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Precompute hub-to-hub route geometry")
+    parser.add_argument("--methods", default="sea,road,rail", help="Comma-separated subset of sea,road,rail")
+    parser.add_argument("--max-road-km", type=float, default=None, help="Skip road/rail pairs farther apart")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent leg resolutions")
+    parser.add_argument("--dry-run", action="store_true", help="List pair counts without resolving")
+    parser.add_argument("--verbose", action="store_true", help="Print every resolved leg")
+    args = parser.parse_args()
+
+    try:
+        from backend.services.route_planner import (
+            HUB_PRECOMPUTE_MAX_ROAD_KM,
+            hub_geometry_pairs,
+            precompute_hub_geometry,
+        )
+        from backend.services.routing_geometry import route_geometry_cache_stats
+    except ImportError as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+
+    methods = tuple(m.strip().lower() for m in args.methods.split(",") if m.strip())
+    unknown = set(methods) - {"sea", "road", "rail"}
+    if unknown:
+        print(f"Unknown methods: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+    max_road_km = args.max_road_km if args.max_road_km is not None else HUB_PRECOMPUTE_MAX_ROAD_KM
+
+    counts = Counter(method for _, _, method in hub_geometry_pairs(methods, max_road_km=max_road_km))
+    print("pairs: " + ", ".join(f"{method} {counts.get(method, 0)}" for method in methods))
+    if args.dry_run:
+        return 0
+
+    def on_leg(from_point, to_point, method, geometry) -> None:
+        if args.verbose:
+            print(f"  {method:<5}{from_point.name} -> {to_point.name}: {geometry.source}, {geometry.distance_km:.0f} km")
+
+    started = time.monotonic()
+    summary = precompute_hub_geometry(methods, max_road_km=max_road_km, workers=args.workers, on_leg=on_leg)
+    elapsed = time.monotonic() - started
+    for method, by_source in summary.items():
+        sources = ", ".join(f"{source} {n}" for source, n in sorted(by_source.items()) if source != "pairs")
+        print(f"{method:<5}{by_source['pairs']:>5} pairs  ({sources})")
+    store = route_geometry_cache_stats()["store"]
+    print(
+        f"done in {elapsed:.1f}s; store hits {store['hits']}, writes {store['writes']}, errors {store['errors']}"
+        + (f" (last error: {store['last_error']})" if store["last_error"] else "")
+    )
+    return 0 if store["enabled"] and not store["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import contextvars
 import hashlib
 import json
 import math
@@ -9,6 +10,11 @@ import uuid
 from datetime import datetime
 from typing import Any, Optional
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 try:
     from psycopg2.extras import Json, RealDictCursor
 except ImportError:  # pragma: no cover - tests can import without psycopg2 extras.
@@ -40,6 +46,26 @@ AGENT_JOB_TYPES = {
     "procurement_summary",
 }
 
+# pg_notify channels: payload is the agent_type for new work, the job_id for status changes.
+AGENT_JOBS_QUEUED_CHANNEL = "agent_jobs_queued"
+AGENT_JOB_EVENTS_CHANNEL = "agent_job_events"
+AGENT_JOB_MAX_ATTEMPTS = max(1, int(os.getenv("AGENT_JOB_MAX_ATTEMPTS", "3") or 3))
+AGENT_JOB_COLUMNS = (
+    "job_id, agent_type, status, entity_id, route_hash, input_hash, input_json, output_json, error, "
+    "attempts, max_attempts, run_after, force_refresh, created_at, updated_at"
+)
+
+# Set by the queue worker while it runs a claimed job: producer errors for that job are
+# raised to the worker (which retries or fails it) instead of being recorded here.
+claimed_agent_job_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "claimed_agent_job_id", default=None
+)
+# Lease owner of that job: finishing it only lands while the lease is still ours, so a run
+# that was reaped and re-claimed cannot overwrite the new owner's result.
+claimed_agent_job_owner: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "claimed_agent_job_owner", default=None
+)
+
 CONTACT_TYPE_ORDER = {"phone": 0, "email": 1, "website": 2, "address": 3}
 URL_RE = re.compile(r"^https?://", re.IGNORECASE)
 
@@ -73,6 +99,7 @@ def _row_to_dict(row: Any) -> dict[str, Any]:
     return dict(row)
 
 
+@schema_ready("agent_jobs")
 def ensure_agent_jobs_table(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
@@ -104,6 +131,31 @@ def ensure_agent_jobs_table(conn: Any) -> None:
             ON agent_jobs (entity_id, agent_type, created_at DESC);
             """
         )
+        cur.execute(
+            """
+            ALTER TABLE agent_jobs
+                ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0,
+                ADD COLUMN IF NOT EXISTS max_attempts INTEGER NOT NULL DEFAULT 3,
+                ADD COLUMN IF NOT EXISTS run_after TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                ADD COLUMN IF NOT EXISTS lease_owner TEXT,
+                ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP,
+                ADD COLUMN IF NOT EXISTS force_refresh BOOLEAN NOT NULL DEFAULT FALSE;
+            """
+        )
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_agent_jobs_queued_claim
+            ON agent_jobs (agent_type, run_after, created_at)
+            WHERE status = 'queued';
+            """
+        )
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_agent_jobs_running_lease
+            ON agent_jobs (lease_expires_at)
+            WHERE status = 'running' AND lease_expires_at IS NOT NULL;
+            """
+        )
 
 
 def _serialize_job(row: dict[str, Any], *, cached: bool = False) -> dict[str, Any]:
@@ -117,12 +169,18 @@ def _serialize_job(row: dict[str, Any], *, cached: bool = False) -> dict[str, An
         "input": row.get("input_json"),
         "output": row.get("output_json"),
         "error": row.get("error"),
+        "attempts": row.get("attempts"),
         "created_at": row.get("created_at"),
         "updated_at": row.get("updated_at"),
         "cached": cached,
     }
 
 
+def notify_agent_job_event(cur: Any, job_id: str) -> None:
+    """Wake long-poll/SSE readers of ``job_id``; delivered when the transaction commits."""
+    cur.execute("SELECT pg_notify(%s, %s)", (AGENT_JOB_EVENTS_CHANNEL, job_id))
+
+
 def _select_job_by_type_hash(conn: Any, agent_type: str, input_hash: str) -> Optional[dict[str, Any]]:
     with conn.cursor(**_cursor_kwargs()) as cur:
         cur.execute(
@@ -146,15 +204,7 @@ def _select_job_by_type_hash(conn: Any, agent_type: str, input_hash: str) -> Opt
 def get_agent_job(conn: Any, job_id: str) -> Optional[dict[str, Any]]:
     ensure_agent_jobs_table(conn)
     with conn.cursor(**_cursor_kwargs()) as cur:
-        cur.execute(
-            """
-            SELECT job_id, agent_type, status, entity_id, route_hash, input_hash,
-                   input_json, output_json, error, created_at, updated_at
-            FROM agent_jobs
-            WHERE job_id = %s
-            """,
-            (job_id,),
-        )
+        cur.execute(f"SELECT {AGENT_JOB_COLUMNS} FROM agent_jobs WHERE job_id = %s", (job_id,))
         row = cur.fetchone()
     if not row:
         return None
@@ -191,18 +241,30 @@ def _insert_job(
     entity_id: Optional[str] = None,
     route_hash: Optional[str] = None,
     status: str = "running",
+    force_refresh: bool = False,
 ) -> str:
     job_id = str(uuid.uuid4())
     with conn.cursor() as cur:
         cur.execute(
             """
             INSERT INTO agent_jobs (
-                job_id, agent_type, status, entity_id, route_hash, input_hash, input_json, updated_at
+                job_id, agent_type, status, entity_id, route_hash, input_hash, input_json,
+                max_attempts, force_refresh, updated_at
             )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
             ON CONFLICT (agent_type, input_hash) DO NOTHING
             """,
-            (job_id, agent_type, status, entity_id, route_hash, input_hash, _jsonb(input_json)),
+            (
+                job_id,
+                agent_type,
+                status,
+                entity_id,
+                route_hash,
+                input_hash,
+                _jsonb(input_json),
+                AGENT_JOB_MAX_ATTEMPTS,
+                force_refresh,
+            ),
         )
         if cur.rowcount == 0:
             cur.execute(
@@ -242,10 +304,11 @@ def _requeue_job(
     input_json: dict[str, Any],
     entity_id: Optional[str] = None,
     route_hash: Optional[str] = None,
+    force_refresh: bool = False,
 ) -> dict[str, Any]:
     with conn.cursor(**_cursor_kwargs()) as cur:
         cur.execute(
-            """
+            f"""
             UPDATE agent_jobs
             SET status = 'queued',
                 entity_id = %s,
@@ -253,12 +316,16 @@ def _requeue_job(
                 input_json = %s,
                 output_json = NULL,
                 error = NULL,
+                attempts = 0,
+                run_after = CURRENT_TIMESTAMP,
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                force_refresh = %s,
                 updated_at = CURRENT_TIMESTAMP
             WHERE job_id = %s
-            RETURNING job_id, agent_type, status, entity_id, route_hash, input_hash,
-                      input_json, output_json, error, created_at, updated_at
+            RETURNING {AGENT_JOB_COLUMNS}
             """,
-            (entity_id, route_hash, _jsonb(input_json), job_id),
+            (entity_id, route_hash, _jsonb(input_json), force_refresh, job_id),
         )
         row = cur.fetchone()
     return _serialize_job(_row_to_dict(row))
@@ -290,6 +357,7 @@ def enqueue_agent_job(
         entity_id=entity_id,
         route_hash=route_hash,
         status="queued",
+        force_refresh=force_refresh,
     )
     existing = _select_job_by_type_hash(conn, agent_type, input_hash)
     if existing and (force_refresh or existing.get("status") == "failed"):
@@ -299,7 +367,11 @@ def enqueue_agent_job(
             input_json=input_json,
             entity_id=entity_id,
             route_hash=route_hash,
+            force_refresh=force_refresh,
         )
+    if not existing or existing.get("status") == "queued":
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_notify(%s, %s)", (AGENT_JOBS_QUEUED_CHANNEL, agent_type))
     conn.commit()
     return existing or get_agent_job(conn, job_id) or {
         "job_id": job_id,
@@ -315,43 +387,64 @@ def enqueue_agent_job(
     }
 
 
+def _lease_owner_clause(job_id: str) -> tuple[str, tuple[Any, ...]]:
+    """``AND lease_owner = %s`` while a queue worker holds ``job_id``; nothing for inline runs."""
+    owner = claimed_agent_job_owner.get() if claimed_agent_job_id.get() == job_id else None
+    if owner is None:
+        return "", ()
+    return " AND lease_owner = %s", (owner,)
+
+
+def _finished_job(conn: Any, cur: Any, job_id: str) -> dict[str, Any]:
+    row = cur.fetchone()
+    if row is not None:
+        notify_agent_job_event(cur, job_id)
+    conn.commit()
+    if row is None:
+        # Lease lost to the reaper: whoever holds the job now reports it.
+        return get_agent_job(conn, job_id) or _serialize_job({"job_id": job_id})
+    return _serialize_job(_row_to_dict(row))
+
+
 def _complete_job(conn: Any, job_id: str, output: dict[str, Any]) -> dict[str, Any]:
+    lease_clause, lease_params = _lease_owner_clause(job_id)
     with conn.cursor(**_cursor_kwargs()) as cur:
         cur.execute(
-            """
+            f"""
             UPDATE agent_jobs
             SET status = 'completed',
                 output_json = %s,
                 error = NULL,
+                lease_owner = NULL,
+                lease_expires_at = NULL,
                 updated_at = CURRENT_TIMESTAMP
-            WHERE job_id = %s
+            WHERE job_id = %s{lease_clause}
             RETURNING job_id, agent_type, status, entity_id, route_hash, input_hash,
                       input_json, output_json, error, created_at, updated_at
             """,
-            (_jsonb(output), job_id),
+            (_jsonb(output), job_id, *lease_params),
         )
-        row = cur.fetchone()
-    conn.commit()
-    return _serialize_job(_row_to_dict(row))
+        return _finished_job(conn, cur, job_id)
 
 
 def _fail_job(conn: Any, job_id: str, error: str) -> dict[str, Any]:
+    lease_clause, lease_params = _lease_owner_clause(job_id)
     with conn.cursor(**_cursor_kwargs()) as cur:
         cur.execute(
-            """
+            f"""
             UPDATE agent_jobs
             SET status = 'failed',
                 error = %s,
+                lease_owner = NULL,
+                lease_expires_at = NULL,
                 updated_at = CURRENT_TIMESTAMP
-            WHERE job_id = %s
+            WHERE job_id = %s{lease_clause}
             RETURNING job_id, agent_type, status, entity_id, route_hash, input_hash,
                       input_json, output_json, error, created_at, updated_at
             """,
-            (error[:2000], job_id),
+            (error[:2000], job_id, *lease_params),
         )
-        row = cur.fetchone()
-    conn.commit()
-    return _serialize_job(_row_to_dict(row))
+        return _finished_job(conn, cur, job_id)
 
 
 def _run_cached_agent(
@@ -387,6 +480,8 @@ def _run_cached_agent(
         conn.commit()
         output = producer(input_hash)
     except Exception as exc:
+        if claimed_agent_job_id.get() == job_id:
+            raise
         return _fail_job(conn, job_id, str(exc))
     return _complete_job(conn, job_id, output)
 
@@ -1271,12 +1366,7 @@ def run_entity_data_validation(
     else:
         source_entity = loaded
         relationships = build_license_relationship_candidates(loaded)
-    input_json = {
-        "entity_id": entity_id,
-        "entity_kind": entity_kind,
-        "entity": _compact_entity_for_input(source_entity),
-        "agent_version": "data_validation_v1",
-    }
+    input_json = build_entity_data_validation_input(entity_id, entity_kind, source_entity)
 
     def produce(input_hash: str) -> dict[str, Any]:
         warnings = deterministic_entity_warnings(source_entity, relationships)
@@ -1303,7 +1393,34 @@ def run_entity_data_validation(
     )
 
 
-def run_data_validation_batch(conn: Any, *, limit: int = 25, force_refresh: bool = False) -> dict[str, Any]:
+def build_entity_data_validation_input(entity_id: str, entity_kind: str, source_entity: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "entity_id": entity_id,
+        "entity_kind": entity_kind,
+        "entity": _compact_entity_for_input(source_entity),
+        "agent_version": "data_validation_v1",
+    }
+
+
+def enqueue_entity_data_validation(
+    conn: Any,
+    *,
+    entity_id: str,
+    entity_kind: str = "license",
+    force_refresh: bool = False,
+) -> dict[str, Any]:
+    loaded = load_license_agent_row(conn, entity_id) if entity_kind == "license" else None
+    source_entity = loaded or {"id": entity_id, "entity_kind": entity_kind}
+    return enqueue_agent_job(
+        conn,
+        agent_type="data_validation",
+        input_json=build_entity_data_validation_input(entity_id, entity_kind, source_entity),
+        entity_id=entity_id,
+        force_refresh=force_refresh,
+    )
+
+
+def _data_validation_batch_input(conn: Any, limit: int) -> dict[str, Any]:
     bounded_limit = max(1, min(int(limit or 25), 100))
     with conn.cursor(**_cursor_kwargs()) as cur:
         cur.execute(
@@ -1319,7 +1436,22 @@ def run_data_validation_batch(conn: Any, *, limit: int = 25, force_refresh: bool
             (bounded_limit,),
         )
         ids = [str((_row_to_dict(row).get("id") if hasattr(row, "keys") else row[0])) for row in cur.fetchall()]
-    input_json = {"limit": bounded_limit, "entity_ids": ids, "agent_version": "data_validation_batch_v1"}
+    return {"limit": bounded_limit, "entity_ids": ids, "agent_version": "data_validation_batch_v1"}
+
+
+def enqueue_data_validation_batch(conn: Any, *, limit: int = 25, force_refresh: bool = False) -> dict[str, Any]:
+    return enqueue_agent_job(
+        conn,
+        agent_type="data_validation",
+        input_json=_data_validation_batch_input(conn, limit),
+        force_refresh=force_refresh,
+    )
+
+
+def run_data_validation_batch(conn: Any, *, limit: int = 25, force_refresh: bool = False) -> dict[str, Any]:
+    input_json = _data_validation_batch_input(conn, limit)
+    bounded_limit = input_json["limit"]
+    ids = input_json["entity_ids"]
 
     def produce(input_hash: str) -> dict[str, Any]:
         results = [
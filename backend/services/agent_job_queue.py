@@ -0,0 +1,769 @@
+"""Durable agent job queue: SKIP LOCKED workers, leases, retries and LISTEN/NOTIFY wake-ups.
+
+``/api/agents/*`` and deal-room agent runs used to execute producers (AI calls with
+multi-second deadlines) inside the request. Now the API only enqueues an ``agent_jobs``
+row and returns; ``agent_job_worker.py`` (or ``AGENT_JOB_EMBEDDED_WORKERS`` threads in
+the API process) runs them:
+
+* each agent_type gets its own worker threads (``AGENT_JOB_CONCURRENCY``), claiming one
+  job at a time with ``FOR UPDATE SKIP LOCKED`` so workers never block on each other;
+* a claim sets ``lease_expires_at`` and the worker renews it while the producer runs; a
+  worker that dies mid-job leaves an expired lease that the reaper requeues (or fails once
+  ``max_attempts`` is spent), and finishing a job only lands while its lease is still held;
+* producer errors are retried with exponential backoff via ``run_after``;
+* ``pg_notify`` on ``agent_jobs_queued`` wakes idle workers immediately, and every status
+  change notifies ``agent_job_events`` so ``wait_for_agent_job`` (long-poll / SSE) can
+  answer as soon as a job finishes instead of polling.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import select
+import socket
+import threading
+import time
+import uuid
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+import psycopg2
+import psycopg2.extensions
+
+try:
+    from psycopg2.extras import RealDictCursor
+except ImportError:  # pragma: no cover
+    RealDictCursor = None
+
+try:
+    from backend.services import agent_intelligence, deal_rooms
+    from backend.services.agent_intelligence import (
+        AGENT_JOB_COLUMNS,
+        AGENT_JOB_EVENTS_CHANNEL,
+        AGENT_JOB_TYPES,
+        AGENT_JOBS_QUEUED_CHANNEL,
+        claimed_agent_job_id,
+        claimed_agent_job_owner,
+        ensure_agent_jobs_table,
+        notify_agent_job_event,
+    )
+    from backend.services.async_db import wait_psycopg2
+    from backend.services.db_pool import db_connect_kwargs, get_pooled_connection
+except ImportError:
+    from services import agent_intelligence, deal_rooms  # type: ignore[no-redef]
+    from services.agent_intelligence import (  # type: ignore[no-redef]
+        AGENT_JOB_COLUMNS,
+        AGENT_JOB_EVENTS_CHANNEL,
+        AGENT_JOB_TYPES,
+        AGENT_JOBS_QUEUED_CHANNEL,
+        claimed_agent_job_id,
+        claimed_agent_job_owner,
+        ensure_agent_jobs_table,
+        notify_agent_job_event,
+    )
+    from services.async_db import wait_psycopg2  # type: ignore[no-redef]
+    from services.db_pool import db_connect_kwargs, get_pooled_connection  # type: ignore[no-redef]
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(key, str(default))))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_bool(key: str, default: bool) -> bool:
+    raw = (os.getenv(key) or "").strip().lower()
+    if not raw:
+        return default
+    return raw in {"1", "true", "yes", "on"}
+
+
+def agent_job_queue_enabled() -> bool:
+    """When off, agent endpoints run producers inline as before (no worker deployed)."""
+    return _env_bool("AGENT_JOB_QUEUE_ENABLED", True)
+
+
+def agent_job_embedded_workers() -> bool:
+    """Worker threads in the API process unless a dedicated agent-job-worker is deployed.
+
+    Defaults on so a plain ``uvicorn`` / single-host deployment never queues jobs that nothing
+    claims; the compose files set it false on the API service next to ``agent-job-worker``.
+    """
+    return _env_bool("AGENT_JOB_EMBEDDED_WORKERS", True)
+
+
+# Renewed every third of the lease while a job runs, so this only bounds how long a dead
+# worker's job waits for the reaper.
+AGENT_JOB_LEASE_SEC = max(30.0, _env_float("AGENT_JOB_LEASE_SEC", 300.0))
+AGENT_JOB_RETRY_BASE_SEC = _env_float("AGENT_JOB_RETRY_BASE_SEC", 30.0)
+AGENT_JOB_POLL_SEC = max(0.5, _env_float("AGENT_JOB_POLL_SEC", 10.0))
+AGENT_JOB_MAX_WAIT_SEC = 60.0
+AGENT_JOB_STREAM_MAX_SEC = _env_float("AGENT_JOB_STREAM_MAX_SEC", 300.0)
+DEFAULT_AGENT_CONCURRENCY = 2
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+
+def agent_job_concurrency(raw: Optional[str] = None) -> dict[str, int]:
+    """Worker threads per agent_type from ``AGENT_JOB_CONCURRENCY=type=n,...`` (0 disables a type)."""
+    concurrency = {agent_type: DEFAULT_AGENT_CONCURRENCY for agent_type in sorted(AGENT_JOB_TYPES)}
+    raw = os.getenv("AGENT_JOB_CONCURRENCY", "") if raw is None else raw
+    for part in raw.split(","):
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in concurrency:
+            continue
+        try:
+            concurrency[name] = max(0, int(value))
+        except ValueError:
+            continue
+    return concurrency
+
+
+def _cursor_kwargs() -> dict[str, Any]:
+    return {"cursor_factory": RealDictCursor} if RealDictCursor is not None else {}
+
+
+def claim_agent_job(conn: Any, agent_type: str, worker_id: str, *, lease_sec: float = AGENT_JOB_LEASE_SEC) -> Optional[dict[str, Any]]:
+    """Claim the oldest runnable job of ``agent_type``; concurrent claimers skip locked rows."""
+    with conn.cursor(**_cursor_kwargs()) as cur:
+        cur.execute(
+            f"""
+            UPDATE agent_jobs
+            SET status = 'running',
+                attempts = attempts + 1,
+                lease_owner = %s,
+                lease_expires_at = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE job_id = (
+                SELECT job_id
+                FROM agent_jobs
+                WHERE agent_type = %s
+                  AND status = 'queued'
+                  AND COALESCE(run_after, created_at) <= CURRENT_TIMESTAMP
+                ORDER BY COALESCE(run_after, created_at), created_at
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
+            )
+            RETURNING {AGENT_JOB_COLUMNS}
+            """,
+            (worker_id, lease_sec, agent_type),
+        )
+        row = cur.fetchone()
+        if row:
+            notify_agent_job_event(cur, dict(row)["job_id"])
+    conn.commit()
+    return dict(row) if row else None
+
+
+def claim_agent_job_by_id(conn: Any, job_id: str, worker_id: str, *, lease_sec: float = AGENT_JOB_LEASE_SEC) -> Optional[dict[str, Any]]:
+    """Claim one specific queued job; None when a worker already holds or finished it."""
+    with conn.cursor(**_cursor_kwargs()) as cur:
+        cur.execute(
+            f"""
+            UPDATE agent_jobs
+            SET status = 'running',
+                attempts = attempts + 1,
+                lease_owner = %s,
+                lease_expires_at = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE job_id = (
+                SELECT job_id
+                FROM agent_jobs
+                WHERE job_id = %s
+                  AND status = 'queued'
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING {AGENT_JOB_COLUMNS}
+            """,
+            (worker_id, lease_sec, job_id),
+        )
+        row = cur.fetchone()
+        if row:
+            notify_agent_job_event(cur, dict(row)["job_id"])
+    conn.commit()
+    return dict(row) if row else None
+
+
+def renew_agent_job_lease(
+    conn: Any, job_id: str, worker_id: str, *, lease_sec: float = AGENT_JOB_LEASE_SEC
+) -> bool:
+    """Push a running job's lease ``lease_sec`` out; False once the reaper or another worker has it."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE agent_jobs
+            SET lease_expires_at = CURRENT_TIMESTAMP + make_interval(secs => %s)
+            WHERE job_id = %s
+              AND status = 'running'
+              AND lease_owner = %s
+            """,
+            (lease_sec, job_id, worker_id),
+        )
+        renewed = cur.rowcount == 1
+    conn.commit()
+    return renewed
+
+
+def retry_or_fail_agent_job(
+    conn: Any, job: dict[str, Any], error: str, *, worker_id: Optional[str] = None
+) -> str:
+    """Requeue with exponential backoff while attempts remain, else mark failed; returns the new status.
+
+    With ``worker_id`` the update only lands while that worker still holds the lease; otherwise
+    nothing changes and ``"lease_lost"`` is returned.
+    """
+    attempts = int(job.get("attempts") or 1)
+    max_attempts = int(job.get("max_attempts") or 1)
+    delay = AGENT_JOB_RETRY_BASE_SEC * (2 ** max(0, attempts - 1))
+    status = "queued" if attempts < max_attempts else "failed"
+    lease_clause = " AND lease_owner = %s" if worker_id is not None else ""
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            UPDATE agent_jobs
+            SET status = %s,
+                error = %s,
+                run_after = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE job_id = %s{lease_clause}
+            """,
+            (status, error[:2000], delay, job["job_id"], *((worker_id,) if worker_id is not None else ())),
+        )
+        if worker_id is not None and cur.rowcount == 0:
+            conn.commit()
+            return "lease_lost"
+        notify_agent_job_event(cur, job["job_id"])
+        if status == "queued":
+            cur.execute("SELECT pg_notify(%s, %s)", (AGENT_JOBS_QUEUED_CHANNEL, job["agent_type"]))
+    conn.commit()
+    return status
+
+
+def reap_expired_agent_jobs(conn: Any) -> list[tuple[str, str]]:
+    """Requeue (or fail, once attempts are spent) running jobs whose worker lease expired."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE agent_jobs
+            SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+                error = 'lease expired (worker ' || COALESCE(lease_owner, '?') || ')',
+                run_after = CURRENT_TIMESTAMP,
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE status = 'running'
+              AND lease_expires_at IS NOT NULL
+              AND lease_expires_at < CURRENT_TIMESTAMP
+            RETURNING job_id, status
+            """
+        )
+        reaped = [tuple(row) for row in cur.fetchall()]
+        for job_id, _status in reaped:
+            notify_agent_job_event(cur, job_id)
+    conn.commit()
+    return reaped
+
+
+def _payload_str(payload: dict[str, Any], job: dict[str, Any], key: str, default: str = "") -> str:
+    return str(payload.get(key) or job.get(key) or default)
+
+
+def run_agent_job(conn: Any, job: dict[str, Any]) -> dict[str, Any]:
+    """Run the producer for a stored job from its input_json; returns the finished job."""
+    agent_type = job.get("agent_type")
+    payload = job.get("input") if isinstance(job.get("input"), dict) else job.get("input_json") or {}
+    force_refresh = bool(job.get("force_refresh"))
+    entity_kind = _payload_str(payload, job, "entity_kind", "license")
+    if agent_type == "contact_enrichment":
+        return agent_intelligence.run_contact_enrichment(
+            conn,
+            entity_id=_payload_str(payload, job, "entity_id"),
+            entity_kind=entity_kind,
+            force_refresh=force_refresh,
+        )
+    if agent_type == "operator_validation":
+        return agent_intelligence.run_operator_validation(
+            conn,
+            entity_id=_payload_str(payload, job, "entity_id"),
+            entity_kind=entity_kind,
+            force_refresh=force_refresh,
+        )
+    if agent_type == "route_intelligence":
+        route = payload.get("route") if isinstance(payload.get("route"), dict) else {}
+        return agent_intelligence.run_route_intelligence(
+            conn,
+            route_payload=route,
+            deterministic_warnings=payload.get("deterministic_warnings"),
+            route_hash=job.get("route_hash"),
+            force_refresh=force_refresh,
+        )
+    if agent_type == "data_validation":
+        if "entity_ids" in payload:
+            return agent_intelligence.run_data_validation_batch(
+                conn, limit=int(payload.get("limit") or 25), force_refresh=force_refresh
+            )
+        return agent_intelligence.run_entity_data_validation(
+            conn,
+            entity_id=_payload_str(payload, job, "entity_id"),
+            entity_kind=entity_kind,
+            force_refresh=force_refresh,
+        )
+    if agent_type == "due_diligence_summary":
+        return deal_rooms.run_due_diligence_summary(
+            conn,
+            entity_id=_payload_str(payload, job, "entity_id"),
+            entity_kind=entity_kind,
+            force_refresh=force_refresh,
+        )
+    if agent_type == "procurement_summary":
+        return deal_rooms.run_procurement_summary(
+            conn,
+            entity_id=_payload_str(payload, job, "entity_id"),
+            entity_kind=entity_kind,
+            force_refresh=force_refresh,
+        )
+    raise ValueError(f"Unsupported agent_type: {agent_type}")
+
+
+def execute_claimed_agent_job(
+    conn: Any, job: dict[str, Any], *, worker_id: Optional[str] = None
+) -> dict[str, Any]:
+    """Run a claimed job, retrying or failing it on error, and fan the result out to deal rooms.
+
+    ``worker_id`` (the claimer) makes completion, retry and failure conditional on its lease.
+    """
+    job_id = job["job_id"]
+    token = claimed_agent_job_id.set(job_id)
+    owner_token = claimed_agent_job_owner.set(worker_id)
+    try:
+        result = run_agent_job(conn, {**job, "input": job.get("input_json")})
+        if result.get("job_id") != job_id:
+            # Inputs were rebuilt from current data and hashed differently; answer this
+            # job with that run's output so its waiters still get a result.
+            if result.get("status") != "completed":
+                raise RuntimeError(result.get("error") or f"agent run {result.get('job_id')} did not complete")
+            result = agent_intelligence._complete_job(conn, job_id, result.get("output") or {})
+    except Exception as exc:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        status = retry_or_fail_agent_job(conn, job, str(exc) or type(exc).__name__, worker_id=worker_id)
+        result = agent_intelligence.get_agent_job(conn, job_id) or {**job, "status": status, "error": str(exc)}
+    finally:
+        claimed_agent_job_owner.reset(owner_token)
+        claimed_agent_job_id.reset(token)
+    if result.get("status") in TERMINAL_STATUSES:
+        update_deal_rooms_for_job(conn, result)
+    return result
+
+
+class AgentJobLeaseKeeper:
+    """Renews a claimed job's lease on its own connection until the ``with`` block exits."""
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        job_id: str,
+        worker_id: str,
+        *,
+        lease_sec: float = AGENT_JOB_LEASE_SEC,
+    ) -> None:
+        self._connect = connect
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_sec = lease_sec
+        self.interval = max(1.0, lease_sec / 3)
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _renew_loop(self) -> None:
+        while not self._done.wait(self.interval):
+            try:
+                conn = self._connect()
+                try:
+                    renewed = renew_agent_job_lease(conn, self.job_id, self.worker_id, lease_sec=self.lease_sec)
+                finally:
+                    conn.close()
+            except Exception as exc:
+                print(f"[agent-jobs] {self.worker_id} lease renewal error: {exc}")
+                continue
+            if not renewed:
+                print(f"[agent-jobs] {self.worker_id} lost the lease on {self.job_id}")
+                return
+
+    def __enter__(self) -> "AgentJobLeaseKeeper":
+        self._thread = threading.Thread(
+            target=self._renew_loop, name=f"agent-lease-{self.job_id}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._done.set()
+        if self._thread is not None:
+            self._thread.join(self.interval)
+
+
+def update_deal_rooms_for_job(conn: Any, job: dict[str, Any]) -> None:
+    """Copy a finished job's output into the evidence of every deal room that attached it."""
+    deal_rooms.ensure_deal_rooms_table(conn)
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM deal_rooms WHERE agent_job_ids_json ? %s", (job["job_id"],))
+        room_ids = [row[0] for row in cur.fetchall()]
+    for room_id in room_ids:
+        deal_rooms.update_deal_room_evidence_from_job(conn, room_id, job)
+
+
+def _listen_connection(channel: str) -> Any:
+    conn = psycopg2.connect(**db_connect_kwargs())
+    conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+    with conn.cursor() as cur:
+        cur.execute(f"LISTEN {channel}")
+    return conn
+
+
+class AgentJobWorkerPool:
+    """Per-agent_type claim loops plus one LISTEN thread that wakes them and reaps leases."""
+
+    def __init__(
+        self,
+        concurrency: Optional[dict[str, int]] = None,
+        *,
+        connect: Callable[[], Any] = get_pooled_connection,
+        listen: Optional[Callable[[str], Any]] = _listen_connection,
+        poll_sec: float = AGENT_JOB_POLL_SEC,
+        lease_sec: float = AGENT_JOB_LEASE_SEC,
+    ) -> None:
+        self.concurrency = {k: v for k, v in (concurrency or agent_job_concurrency()).items() if v > 0}
+        self._connect = connect
+        self._listen = listen
+        self.poll_sec = poll_sec
+        self.lease_sec = lease_sec
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._wake = {agent_type: threading.Event() for agent_type in self.concurrency}
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self.stats = {"claimed": 0, "completed": 0, "retried": 0, "failed": 0, "reaped": 0}
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def run_one(self, agent_type: str, worker_id: str) -> Optional[dict[str, Any]]:
+        """Claim and execute at most one job; returns the job result or None when idle."""
+        conn = self._connect()
+        try:
+            ensure_agent_jobs_table(conn)
+            job = claim_agent_job(conn, agent_type, worker_id, lease_sec=self.lease_sec)
+            if job is None:
+                return None
+            self._count("claimed")
+            with AgentJobLeaseKeeper(self._connect, job["job_id"], worker_id, lease_sec=self.lease_sec):
+                result = execute_claimed_agent_job(conn, job, worker_id=worker_id)
+            status = result.get("status")
+            self._count("completed" if status == "completed" else "failed" if status == "failed" else "retried")
+            return result
+        finally:
+            conn.close()
+
+    def _worker_loop(self, agent_type: str, worker_id: str) -> None:
+        wake = self._wake[agent_type]
+        while not self._stop.is_set():
+            try:
+                if self.run_one(agent_type, worker_id) is not None:
+                    continue
+            except Exception as exc:
+                print(f"[agent-jobs] {worker_id} error: {exc}")
+            wake.wait(self.poll_sec)
+            wake.clear()
+
+    def reap_once(self) -> int:
+        conn = self._connect()
+        try:
+            ensure_agent_jobs_table(conn)
+            reaped = reap_expired_agent_jobs(conn)
+        finally:
+            conn.close()
+        for _job_id, status in reaped:
+            self._count("reaped")
+        if reaped:
+            self.wake_all()
+        return len(reaped)
+
+    def wake(self, agent_type: str) -> None:
+        event = self._wake.get(agent_type)
+        if event is not None:
+            event.set()
+
+    def wake_all(self) -> None:
+        for event in self._wake.values():
+            event.set()
+
+    def _listen_loop(self) -> None:
+        reap_every = max(5.0, self.lease_sec / 4)
+        next_reap = 0.0
+        conn = None
+        while not self._stop.is_set():
+            if time.monotonic() >= next_reap:
+                try:
+                    self.reap_once()
+                except Exception as exc:
+                    print(f"[agent-jobs] reaper error: {exc}")
+                next_reap = time.monotonic() + reap_every
+            if self._listen is None:
+                self._stop.wait(min(reap_every, self.poll_sec))
+                continue
+            try:
+                if conn is None:
+                    conn = self._listen(AGENT_JOBS_QUEUED_CHANNEL)
+                    self.wake_all()  # anything queued while we were not listening
+                readable, _, _ = select.select([conn], [], [], min(reap_every, self.poll_sec))
+                if readable:
+                    conn.poll()
+                    while conn.notifies:
+                        self.wake(conn.notifies.pop(0).payload)
+            except Exception as exc:
+                print(f"[agent-jobs] listen error: {exc}")
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                conn = None
+                self._stop.wait(self.poll_sec)
+        if conn is not None:
+            conn.close()
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        listener = threading.Thread(target=self._listen_loop, name="agent-jobs-listen", daemon=True)
+        self._threads.append(listener)
+        for agent_type, count in sorted(self.concurrency.items()):
+            for index in range(count):
+                worker_id = f"{self.worker_prefix}:{agent_type}:{index}:{uuid.uuid4().hex[:6]}"
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    args=(agent_type, worker_id),
+                    name=f"agent-{agent_type}-{index}",
+                    daemon=True,
+                )
+                self._threads.append(thread)
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self.wake_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+
+_embedded_pool: Optional[AgentJobWorkerPool] = None
+
+
+def start_embedded_agent_workers() -> Optional[AgentJobWorkerPool]:
+    """Run worker threads inside the API process (single-container/dev deployments)."""
+    global _embedded_pool
+    if not (agent_job_queue_enabled() and agent_job_embedded_workers()):
+        return None
+    if _embedded_pool is None:
+        _embedded_pool = AgentJobWorkerPool()
+        _embedded_pool.start()
+    return _embedded_pool
+
+
+def stop_embedded_agent_workers() -> None:
+    global _embedded_pool
+    if _embedded_pool is not None:
+        _embedded_pool.stop()
+        _embedded_pool = None
+
+
+class AgentJobEvents:
+    """One LISTEN connection per event loop fanning ``agent_job_events`` out to waiters.
+
+    Uses an async psycopg2 connection driven by the loop's reader callback, so waiting
+    requests hold no threads. If the connection cannot be opened or drops, waiters fall
+    back to re-reading the job every ``AGENT_JOB_POLL_FALLBACK_SEC``.
+    """
+
+    def __init__(self, connect: Optional[Callable[[], Any]] = None) -> None:
+        self._connect = connect or (lambda: psycopg2.connect(async_=True, **_async_connect_kwargs()))
+        self._conn: Any = None
+        self._waiters: dict[str, set[asyncio.Event]] = {}
+        self._opening: Optional[asyncio.Task] = None
+        self._retry_at = 0.0
+
+    @property
+    def listening(self) -> bool:
+        return self._conn is not None
+
+    async def _open(self) -> None:
+        conn = self._connect()
+        try:
+            await wait_psycopg2(conn)
+            cur = conn.cursor()
+            cur.execute(f"LISTEN {AGENT_JOB_EVENTS_CHANNEL}")
+            await wait_psycopg2(conn)
+            asyncio.get_running_loop().add_reader(conn.fileno(), self._drain)
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+            raise
+        self._conn = conn
+
+    async def ensure_listening(self) -> bool:
+        if self._conn is not None:
+            return True
+        if time.monotonic() < self._retry_at:
+            return False
+        if self._opening is None:
+            self._opening = asyncio.ensure_future(self._open())
+        try:
+            await asyncio.shield(self._opening)
+        except Exception as exc:
+            print(f"[agent-jobs] LISTEN unavailable, polling instead: {exc}")
+            self._retry_at = time.monotonic() + 30.0
+        finally:
+            self._opening = None
+        return self._conn is not None
+
+    def _drain(self) -> None:
+        conn = self._conn
+        try:
+            conn.poll()
+        except Exception:
+            self._drop()
+            return
+        while conn.notifies:
+            self.dispatch(conn.notifies.pop(0).payload)
+
+    def _drop(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(conn.fileno())
+        except Exception:
+            pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+        # Wake everyone so they re-read instead of sleeping out their timeout.
+        for events in self._waiters.values():
+            for event in events:
+                event.set()
+
+    def dispatch(self, job_id: str) -> None:
+        for event in self._waiters.get(job_id, ()):
+            event.set()
+
+    def subscribe(self, job_id: str) -> asyncio.Event:
+        event = asyncio.Event()
+        self._waiters.setdefault(job_id, set()).add(event)
+        return event
+
+    def unsubscribe(self, job_id: str, event: asyncio.Event) -> None:
+        events = self._waiters.get(job_id)
+        if events is None:
+            return
+        events.discard(event)
+        if not events:
+            self._waiters.pop(job_id, None)
+
+    def close(self) -> None:
+        self._drop()
+
+
+def _async_connect_kwargs() -> dict[str, Any]:
+    kwargs = dict(db_connect_kwargs())
+    kwargs.pop("connect_timeout", None)
+    return kwargs
+
+
+AGENT_JOB_POLL_FALLBACK_SEC = 2.0
+_events_lock = threading.Lock()
+_events: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AgentJobEvents]" = weakref.WeakKeyDictionary()
+
+
+def get_agent_job_events() -> AgentJobEvents:
+    loop = asyncio.get_running_loop()
+    with _events_lock:
+        hub = _events.get(loop)
+        if hub is None:
+            hub = _events[loop] = AgentJobEvents()
+        return hub
+
+
+def close_agent_job_events() -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    with _events_lock:
+        hub = _events.pop(loop, None)
+    if hub is not None:
+        hub.close()
+
+
+async def watch_agent_job(
+    job_id: str,
+    read: Callable[[str], Awaitable[Optional[dict[str, Any]]]],
+    *,
+    timeout: float,
+    events: Optional[AgentJobEvents] = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield the job now and again after each status change, until terminal or ``timeout``."""
+    hub = events or get_agent_job_events()
+    listening = await hub.ensure_listening() if timeout > 0 else False
+    wakeup = hub.subscribe(job_id)
+    deadline = time.monotonic() + timeout
+    try:
+        last_status = None
+        while True:
+            # Subscribed before reading, so a NOTIFY landing between the read and the wait is not lost.
+            wakeup.clear()
+            job = await read(job_id)
+            if job is None:
+                return
+            if job.get("status") != last_status:
+                last_status = job.get("status")
+                yield job
+            if job.get("status") in TERMINAL_STATUSES:
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            step = remaining if listening and hub.listening else min(remaining, AGENT_JOB_POLL_FALLBACK_SEC)
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=step)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        hub.unsubscribe(job_id, wakeup)
+
+
+async def wait_for_agent_job(
+    job_id: str,
+    read: Callable[[str], Awaitable[Optional[dict[str, Any]]]],
+    *,
+    timeout: float,
+    events: Optional[AgentJobEvents] = None,
+) -> Optional[dict[str, Any]]:
+    """Long-poll: the job once it is completed/failed, or its latest state after ``timeout``."""
+    latest = None
+    async for job in watch_agent_job(job_id, read, timeout=timeout, events=events):
+        latest = job
+    return latest
@@ -0,0 +1,297 @@
+"""Asyncio Postgres pool for read-only map queries, built on psycopg2's async connections.
+
+``db_pool`` serves blocking handlers that each hold a worker thread for the whole
+query. The read-only map endpoints instead await their rows on the event loop:
+connections are opened with ``async_=True`` and driven by ``conn.poll()`` plus
+``loop.add_reader``/``add_writer``, so a slow bbox query costs a socket wait rather
+than a thread. Same DATABASE_URL/DB_* settings as the sync pool; one pool per event
+loop and process.
+
+Async psycopg2 connections are always autocommit and cannot use server-side cursors,
+which is fine for the single SELECTs issued here. Anything that needs a transaction
+or DDL (``ensure_*_tables``) stays on the sync pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence
+
+import psycopg2
+import psycopg2.extensions
+
+try:
+    from backend.services.db_pool import _env_bool, _env_float, _env_int, db_connect_kwargs
+except ImportError:
+    from services.db_pool import _env_bool, _env_float, _env_int, db_connect_kwargs  # type: ignore[no-redef]
+
+
+def async_db_enabled() -> bool:
+    return _env_bool("ASYNC_DB_ENABLED", True)
+
+
+class AsyncPoolTimeout(psycopg2.OperationalError):
+    """Raised when no async connection frees up within the acquire timeout."""
+
+
+class AsyncDbUnavailable(psycopg2.OperationalError):
+    """The running event loop cannot watch sockets (e.g. Windows proactor loop)."""
+
+
+async def wait_psycopg2(conn: Any) -> None:
+    """Drive an async psycopg2 connection until its pending operation completes."""
+    loop = asyncio.get_running_loop()
+    while True:
+        state = conn.poll()
+        if state == psycopg2.extensions.POLL_OK:
+            return
+        if state == psycopg2.extensions.POLL_READ:
+            add, remove = loop.add_reader, loop.remove_reader
+        elif state == psycopg2.extensions.POLL_WRITE:
+            add, remove = loop.add_writer, loop.remove_writer
+        else:
+            raise psycopg2.OperationalError(f"unexpected poll state {state}")
+        ready = loop.create_future()
+        fd = conn.fileno()
+        try:
+            add(fd, lambda: ready.done() or ready.set_result(None))
+        except NotImplementedError as exc:
+            raise AsyncDbUnavailable("event loop does not support add_reader/add_writer") from exc
+        try:
+            await ready
+        finally:
+            remove(fd)
+
+
+def _hard_close(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class AsyncConnectionPool:
+    """Bounded LIFO pool of async connections with max-lifetime recycling.
+
+    ``connect`` returns a new, not yet established connection and ``wait`` drives it
+    (and every query) to completion; both are injectable so tests can use fakes.
+    A connection whose query errors or times out is discarded, never reused.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        wait: Callable[[Any], Awaitable[None]] = wait_psycopg2,
+        max_size: int = 10,
+        acquire_timeout: float = 5.0,
+        query_timeout: float = 15.0,
+        max_lifetime: float = 1800.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._connect = connect
+        self._wait = wait
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.query_timeout = query_timeout
+        self.max_lifetime = max_lifetime
+        self._clock = clock
+        self._slots = asyncio.Semaphore(max_size)
+        self._idle: deque[tuple[Any, float]] = deque()
+        self._born: dict[int, float] = {}
+        self._closed = False
+        self._stats = {
+            "acquired": 0,
+            "created": 0,
+            "discarded": 0,
+            "timeouts": 0,
+            "queries": 0,
+            "query_errors": 0,
+        }
+        self._in_use = 0
+        self._wait_ms_max = 0.0
+
+    async def _open(self) -> Any:
+        conn = self._connect()
+        try:
+            await asyncio.wait_for(self._wait(conn), timeout=self.acquire_timeout)
+        except BaseException:
+            _hard_close(conn)
+            raise
+        self._born[id(conn)] = self._clock()
+        self._stats["created"] += 1
+        return conn
+
+    async def acquire(self) -> Any:
+        if self._closed:
+            raise psycopg2.InterfaceError("async pool is closed")
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            raise AsyncPoolTimeout(
+                f"no async DB connection free within {self.acquire_timeout:.1f}s (max_size={self.max_size})"
+            ) from None
+        self._wait_ms_max = max(self._wait_ms_max, (time.perf_counter() - started) * 1000.0)
+        try:
+            conn = None
+            while self._idle:
+                candidate, born = self._idle.pop()
+                if candidate.closed or self._clock() - born > self.max_lifetime:
+                    self._discard(candidate)
+                    continue
+                conn = candidate
+                break
+            if conn is None:
+                conn = await self._open()
+        except BaseException:
+            self._slots.release()
+            raise
+        self._in_use += 1
+        self._stats["acquired"] += 1
+        return conn
+
+    def _discard(self, conn: Any) -> None:
+        self._born.pop(id(conn), None)
+        self._stats["discarded"] += 1
+        _hard_close(conn)
+
+    def release(self, conn: Any, *, discard: bool = False) -> None:
+        self._in_use -= 1
+        try:
+            if discard or self._closed or conn.closed:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, self._born.get(id(conn), self._clock())))
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        conn = await self.acquire()
+        broken = False
+        try:
+            yield conn
+        except BaseException:
+            broken = True
+            raise
+        finally:
+            self.release(conn, discard=broken)
+
+    async def _execute(self, conn: Any, sql: str, params: Optional[Sequence[Any]]) -> Any:
+        cur = conn.cursor()
+        self._stats["queries"] += 1
+        try:
+            cur.execute(sql, params)
+            await asyncio.wait_for(self._wait(conn), timeout=self.query_timeout)
+        except BaseException:
+            self._stats["query_errors"] += 1
+            try:
+                conn.cancel()
+            except Exception:
+                pass
+            raise
+        return cur
+
+    async def fetch(self, sql: str, params: Optional[Sequence[Any]] = None) -> list[tuple]:
+        async with self.connection() as conn:
+            cur = await self._execute(conn, sql, params)
+            return cur.fetchall() if cur.description else []
+
+    async def fetchrow(self, sql: str, params: Optional[Sequence[Any]] = None) -> Optional[tuple]:
+        async with self.connection() as conn:
+            cur = await self._execute(conn, sql, params)
+            return cur.fetchone() if cur.description else None
+
+    async def fetch_dicts(self, sql: str, params: Optional[Sequence[Any]] = None) -> list[dict[str, Any]]:
+        async with self.connection() as conn:
+            cur = await self._execute(conn, sql, params)
+            if not cur.description:
+                return []
+            names = [column[0] for column in cur.description]
+            return [dict(zip(names, row)) for row in cur.fetchall()]
+
+    def stats(self) -> dict[str, Any]:
+        body: dict[str, Any] = dict(self._stats)
+        body.update(
+            {
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "saturation": round(self._in_use / self.max_size, 3),
+                "wait_ms_max": round(self._wait_ms_max, 1),
+            }
+        )
+        return body
+
+    def close(self) -> None:
+        self._closed = True
+        while self._idle:
+            conn, _born = self._idle.pop()
+            self._discard(conn)
+
+
+_pools_lock = threading.Lock()
+# One pool per (event loop, pid, connect kwargs): asyncio primitives are loop-bound and
+# forked workers must not share sockets. Loops are held weakly so test loops go away.
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, AsyncConnectionPool]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_pool(connect_kwargs: Optional[dict[str, Any]] = None) -> AsyncConnectionPool:
+    """Pool bound to the running event loop; call from inside a coroutine."""
+    loop = asyncio.get_running_loop()
+    kwargs = dict(connect_kwargs or db_connect_kwargs())
+    kwargs.pop("connect_timeout", None)
+    key = (os.getpid(), tuple(sorted(kwargs.items())))
+    with _pools_lock:
+        per_loop = _pools.setdefault(loop, {})
+        pool = per_loop.get(key)
+        if pool is None:
+            pool = AsyncConnectionPool(
+                lambda: psycopg2.connect(async_=True, **kwargs),
+                max_size=_env_int("ASYNC_DB_POOL_MAX_SIZE", 10),
+                acquire_timeout=_env_float("ASYNC_DB_ACQUIRE_TIMEOUT_SEC", 5.0),
+                query_timeout=_env_float("ASYNC_DB_QUERY_TIMEOUT_SEC", 15.0),
+                max_lifetime=_env_float("DB_POOL_MAX_LIFETIME_SEC", 1800.0),
+            )
+            per_loop[key] = pool
+        return pool
+
+
+def async_pool_stats() -> dict[str, Any]:
+    pid = os.getpid()
+    with _pools_lock:
+        pools = [pool for per_loop in list(_pools.values()) for (owner, _), pool in per_loop.items() if owner == pid]
+    body: dict[str, Any] = {"enabled": async_db_enabled(), "pools": len(pools)}
+    for pool in pools:
+        for key, value in pool.stats().items():
+            if key == "saturation":
+                continue
+            if key == "wait_ms_max":
+                body[key] = max(body.get(key, 0.0), value)
+            else:
+                body[key] = body.get(key, 0) + value
+    if body.get("max_size"):
+        body["saturation"] = round(body["in_use"] / body["max_size"], 3)
+    return body
+
+
+def close_async_pools() -> None:
+    """Close pools owned by the running loop (call from a shutdown handler)."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    with _pools_lock:
+        per_loop = _pools.pop(loop, {})
+    for pool in per_loop.values():
+        pool.close()
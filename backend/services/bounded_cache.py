@@ -0,0 +1,478 @@
+"""Bounded in-process cache with an optional shared Redis tier.
+
+``BoundedCache`` replaces the ad-hoc module-level dict caches that used to grow without
+bound and let concurrent misses fan out into duplicate upstream fetches:
+
+* local tier: LRU over ``max_entries`` (and optionally ``max_bytes`` of estimated size),
+  per-entry TTL;
+* shared tier (``shared=True``): JSON payloads in Redis under ``bcache:<name>:<key>``
+  when ``REDIS_HOST`` is set, so workers warm each other;
+* ``get_or_load`` coalesces concurrent misses for a key into one loader call
+  (single-flight) and, within ``stale_seconds`` after expiry, serves the stale value
+  while one background refresh runs (stale-while-revalidate);
+* hit/miss/eviction counters per cache, aggregated by ``cache_stats()`` for
+  ``/api/health``.
+
+``single_flight`` applies the same coalescing to plain functions whose caching lives
+inside the function body.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+try:
+    from backend.services.redis_connection import drop_shared_redis_client, shared_redis_client
+except ImportError:
+    from services.redis_connection import drop_shared_redis_client, shared_redis_client  # type: ignore[no-redef]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+REDIS_KEY_PREFIX = "bcache"
+# Items sampled per container when estimating entry size.
+SIZE_SAMPLE_ITEMS = 64
+
+
+def _env_bool(key: str, default: bool) -> bool:
+    raw = (os.getenv(key) or "").strip().lower()
+    if raw == "":
+        return default
+    return raw in {"1", "true", "yes", "on"}
+
+
+def estimate_size(value: Any, *, _depth: int = 0) -> int:
+    """Approximate deep size in bytes; long containers are extrapolated from a sample."""
+    size = sys.getsizeof(value)
+    if _depth > 6:
+        return size
+    if isinstance(value, dict):
+        items = list(value.items()) if len(value) <= SIZE_SAMPLE_ITEMS else [
+            item for _, item in zip(range(SIZE_SAMPLE_ITEMS), value.items())
+        ]
+        sampled = sum(estimate_size(k, _depth=_depth + 1) + estimate_size(v, _depth=_depth + 1) for k, v in items)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(value) if len(value) <= SIZE_SAMPLE_ITEMS else [
+            item for _, item in zip(range(SIZE_SAMPLE_ITEMS), value)
+        ]
+        sampled = sum(estimate_size(item, _depth=_depth + 1) for item in items)
+    else:
+        return size
+    if not items:
+        return size
+    return size + int(sampled * len(value) / len(items))
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """``(result, shared)``; ``shared`` is True when another caller's run was reused."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+        try:
+            flight.value = fn()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return flight.value, False
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._flights
+
+    def wait(self, key: Hashable, timeout: Optional[float] = None) -> bool:
+        """Block until the current call for ``key`` (if any) finishes."""
+        with self._lock:
+            flight = self._flights.get(key)
+        return True if flight is None else flight.done.wait(timeout)
+
+
+def _shared_client() -> Any:
+    if not _env_bool("BOUNDED_CACHE_REDIS_ENABLED", True):
+        return None
+    return shared_redis_client()
+
+
+def _drop_shared_client() -> None:
+    drop_shared_redis_client()
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    stale_until: float
+    size: int
+
+
+_registry: "weakref.WeakValueDictionary[str, BoundedCache]" = weakref.WeakValueDictionary()
+_single_flight_groups: "weakref.WeakValueDictionary[str, SingleFlight]" = weakref.WeakValueDictionary()
+
+_MISSING = object()
+
+
+class BoundedCache:
+    """LRU + TTL cache with single-flight loads, stale-while-revalidate and metrics."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        stale_seconds: float = 0.0,
+        max_bytes: Optional[int] = None,
+        shared: bool = False,
+        encode: Optional[Callable[[Any], Any]] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self.stale_seconds = max(0.0, float(stale_seconds))
+        self.max_bytes = max_bytes
+        self.shared = shared
+        self._encode = encode or (lambda value: value)
+        self._decode = decode or (lambda value: value)
+        self._sizeof = sizeof
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._flights = SingleFlight()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "stale_hits": 0,
+            "redis_hits": 0,
+            "redis_errors": 0,
+            "loads": 0,
+            "load_errors": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+        _registry[name] = self
+
+    # -- local tier -------------------------------------------------------------
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes and len(self._entries) > 1
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._counters["evictions"] += 1
+
+    def _lookup(self, key: Hashable) -> tuple[Any, bool]:
+        """``(value, fresh)`` from the local tier; ``_MISSING`` when absent or past stale.
+
+        Expired entries stay in place (until LRU eviction or overwrite) so ``peek`` can
+        still serve them as an error fallback.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING, False
+            now = self._clock()
+            if now >= entry.stale_until:
+                self._counters["expirations"] += 1
+                return _MISSING, False
+            self._entries.move_to_end(key)
+            return entry.value, now < entry.expires_at
+
+    def _store_local(self, key: Hashable, value: Any, ttl: float, *, age: float = 0.0) -> None:
+        now = self._clock() - age
+        try:
+            size = int(self._sizeof(value))
+        except Exception:
+            size = 0
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = _Entry(value, now + ttl, now + ttl + self.stale_seconds, size)
+            self._bytes += size
+            self._evict()
+
+    # -- shared tier ------------------------------------------------------------
+
+    def _redis_key(self, key: Hashable) -> str:
+        return f"{REDIS_KEY_PREFIX}:{self.name}:{key}"
+
+    def _shared_get(self, key: Hashable) -> tuple[Any, float]:
+        client = _shared_client() if self.shared else None
+        if client is None:
+            return _MISSING, 0.0
+        try:
+            raw = client.get(self._redis_key(key))
+        except Exception:
+            self._count("redis_errors")
+            _drop_shared_client()
+            return _MISSING, 0.0
+        if not raw:
+            return _MISSING, 0.0
+        try:
+            payload = json.loads(raw)
+            age = max(0.0, time.time() - float(payload["t"]))
+            return self._decode(payload["v"]), age
+        except Exception:
+            self._count("redis_errors")
+            return _MISSING, 0.0
+
+    def _shared_set(self, key: Hashable, value: Any, ttl: float) -> None:
+        client = _shared_client() if self.shared else None
+        if client is None:
+            return
+        try:
+            raw = json.dumps({"t": time.time(), "v": self._encode(value)}, separators=(",", ":"), default=str)
+        except (TypeError, ValueError):
+            return
+        try:
+            client.set(self._redis_key(key), raw, ex=max(1, int(ttl + self.stale_seconds)))
+        except Exception:
+            self._count("redis_errors")
+            _drop_shared_client()
+
+    def _shared_delete(self, keys: list[Hashable]) -> None:
+        client = _shared_client() if self.shared else None
+        if client is None or not keys:
+            return
+        try:
+            client.delete(*(self._redis_key(key) for key in keys))
+        except Exception:
+            self._count("redis_errors")
+            _drop_shared_client()
+
+    # -- public API ---------------------------------------------------------------
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Fresh value from the local tier, then the shared tier; ``default`` on miss."""
+        value, fresh = self._lookup(key)
+        if value is not _MISSING and fresh:
+            self._count("hits")
+            return value
+        value, age = self._shared_get(key)
+        if value is not _MISSING and age < self.ttl_seconds:
+            self._store_local(key, value, self.ttl_seconds, age=age)
+            self._count("redis_hits")
+            return value
+        self._count("misses")
+        return default
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Last stored value even when stale (for error fallbacks); no counters touched."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return default if entry is None else entry.value
+
+    def set(self, key: Hashable, value: Any, *, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl is None else float(ttl)
+        self._store_local(key, value, ttl)
+        self._shared_set(key, value, ttl)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._remove(key)
+        self._shared_delete([key])
+
+    def clear(self) -> None:
+        """Drop every local entry (and this cache's shared keys for those entries)."""
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+        self._shared_delete(keys)
+
+    def resize(self, *, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max(1, int(max_entries))
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        value, fresh = self._lookup(key)
+        return value is not _MISSING and fresh
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        *,
+        ttl: Optional[float] = None,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        force: bool = False,
+    ) -> Any:
+        """Cached value for ``key``, calling ``loader`` once across concurrent misses.
+
+        Within ``stale_seconds`` after expiry the stale value is returned immediately and
+        a single background refresh runs. ``cache_if`` decides whether a loaded value is
+        stored (e.g. skip empty upstream responses). ``force`` bypasses cached values but
+        still coalesces with an in-flight load.
+        """
+        if not force:
+            value, fresh = self._lookup(key)
+            if value is not _MISSING:
+                if fresh:
+                    self._count("hits")
+                    return value
+                self._count("stale_hits")
+                self._refresh_in_background(key, loader, ttl, cache_if)
+                return value
+            value, age = self._shared_get(key)
+            if value is not _MISSING and age < self.ttl_seconds:
+                self._store_local(key, value, self.ttl_seconds, age=age)
+                self._count("redis_hits")
+                return value
+            self._count("misses")
+        value, _shared = self._flights.do(key, lambda: self._load(key, loader, ttl, cache_if))
+        return value
+
+    def _load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Optional[float],
+        cache_if: Optional[Callable[[Any], bool]],
+    ) -> Any:
+        self._count("loads")
+        try:
+            value = loader()
+        except Exception:
+            self._count("load_errors")
+            raise
+        if cache_if is None or cache_if(value):
+            self.set(key, value, ttl=ttl)
+        return value
+
+    def _refresh_in_background(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Optional[float],
+        cache_if: Optional[Callable[[Any], bool]],
+    ) -> None:
+        if self._flights.in_flight(key):
+            return
+
+        def run() -> None:
+            try:
+                self._flights.do(key, lambda: self._load(key, loader, ttl, cache_if))
+            except Exception as exc:
+                print(f"[cache] {self.name} background refresh failed for {key}: {exc}")
+
+        threading.Thread(target=run, name=f"cache-refresh-{self.name}", daemon=True).start()
+
+    def wait_for_refresh(self, key: Hashable, timeout: Optional[float] = None) -> bool:
+        return self._flights.wait(key, timeout)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+            size = self._bytes
+        lookups = counters["hits"] + counters["stale_hits"] + counters["redis_hits"] + counters["misses"]
+        served = counters["hits"] + counters["stale_hits"] + counters["redis_hits"]
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "shared": self.shared,
+            **counters,
+            "coalesced": self._flights.coalesced,
+            "hit_ratio": round(served / lookups, 4) if lookups else None,
+        }
+
+
+def single_flight(
+    fn: Optional[F] = None, *, key: Optional[Callable[..., Hashable]] = None
+) -> Any:
+    """Coalesce concurrent calls into one execution per key.
+
+    The key defaults to the (hashable) call arguments; pass ``key=`` to derive it from a
+    subset, e.g. rounded coordinates while ignoring per-call deadlines. Calls whose
+    arguments cannot be hashed run uncoalesced.
+    """
+
+    def decorator(func: F) -> F:
+        group = SingleFlight()
+        _single_flight_groups[f"{func.__module__}.{func.__qualname__}"] = group
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            flight_key = key(*args, **kwargs) if key is not None else (args, tuple(sorted(kwargs.items())))
+            try:
+                hash(flight_key)
+            except TypeError:
+                return func(*args, **kwargs)
+            value, _shared = group.do(flight_key, lambda: func(*args, **kwargs))
+            return value
+
+        wrapper.single_flight_group = group  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator(fn) if fn is not None else decorator
+
+
+def cache_stats() -> dict[str, Any]:
+    """Per-cache counters plus coalesced call counts for ``@single_flight`` functions."""
+    caches = {name: cache.stats() for name, cache in sorted(_registry.items())}
+    return {
+        "caches": caches,
+        "entries": sum(entry["entries"] for entry in caches.values()),
+        "bytes": sum(entry["bytes"] for entry in caches.values()),
+        "single_flight": {name: group.coalesced for name, group in sorted(_single_flight_groups.items())},
+    }
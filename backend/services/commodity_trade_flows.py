@@ -7,6 +7,11 @@ import os
 import time
 from typing import Any
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 MINING_HS_CODES: dict[str, str] = {
     "2601": "Iron ores and concentrates",
     "2603": "Copper ores and concentrates",
@@ -31,6 +36,7 @@ SYNC_ENABLED = (os.getenv("COMMODITY_COMTRADE_SYNC_ENABLED") or "true").strip().
 }
 
 
+@schema_ready("commodity_trade_flows")
 def ensure_commodity_trade_flows_table(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
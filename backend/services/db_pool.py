@@ -0,0 +1,374 @@
+"""Per-process bounded Postgres connection pool shared by API handlers and service helpers.
+
+``get_pooled_connection()`` hands out psycopg2 connections whose ``close()`` returns
+them to the pool instead of tearing down the socket, so existing
+``conn = ...; try: ... finally: conn.close()`` call sites keep working unchanged.
+Connections are health-checked on checkout, recycled after a max lifetime, and the
+pool exposes saturation counters for ``/api/health``.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Optional
+
+import psycopg2
+import psycopg2.extensions
+
+
+def _env_bool(key: str, default: bool) -> bool:
+    raw = (os.getenv(key) or "").strip().lower()
+    if raw == "":
+        return default
+    return raw in {"1", "true", "yes", "on"}
+
+
+def _env_float(key: str, default: float) -> float:
+    raw = (os.getenv(key) or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return default
+
+
+def _env_int(key: str, default: int) -> int:
+    raw = (os.getenv(key) or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return default
+
+
+def db_pool_enabled() -> bool:
+    return _env_bool("DB_POOL_ENABLED", True)
+
+
+def db_connect_kwargs() -> dict[str, Any]:
+    """psycopg2.connect kwargs from DATABASE_URL or the DB_* env vars."""
+    database_url = os.getenv("DATABASE_URL", "").strip()
+    if database_url:
+        return {"dsn": database_url, "connect_timeout": 5}
+    return {
+        "host": os.getenv("DB_HOST", "localhost"),
+        "port": int(os.getenv("DB_PORT", "5432")),
+        "database": os.getenv("DB_NAME", "mining_db"),
+        "user": os.getenv("DB_USER", "postgres"),
+        "password": os.getenv("DB_PASSWORD", "password"),
+        "connect_timeout": 5,
+    }
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """Raised when no pooled connection frees up within the checkout timeout."""
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection whose ``close()`` returns it to the owning pool."""
+
+    _pool: Optional["ConnectionPool"] = None
+
+    def close(self) -> None:
+        pool = self._pool
+        if pool is None:
+            super().close()
+            return
+        pool.putconn(self)
+
+    def discard(self) -> None:
+        self._pool = None
+        super().close()
+
+
+def _hard_close(conn: Any) -> None:
+    try:
+        if isinstance(conn, PooledConnection):
+            conn.discard()
+        else:
+            conn.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    """Bounded LIFO pool with checkout health checks and max-lifetime recycling.
+
+    ``connect`` must return a new DB-API connection; the pool never holds more than
+    ``max_size`` connections (idle + checked out). Checked-out connections are
+    tracked weakly so a handler that forgets ``close()`` does not leak a slot
+    forever once its connection is garbage collected.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        max_size: int = 10,
+        checkout_timeout: float = 10.0,
+        max_lifetime: float = 1800.0,
+        max_idle: float = 300.0,
+        ping_after: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._connect = connect
+        self.max_size = max(1, int(max_size))
+        self.checkout_timeout = checkout_timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.ping_after = ping_after
+        self._clock = clock
+        self._cond = threading.Condition()
+        # (conn, created_at, returned_at); LIFO so hot connections stay warm.
+        self._idle: deque[tuple[Any, float, float]] = deque()
+        self._created_at: "weakref.WeakKeyDictionary[Any, float]" = weakref.WeakKeyDictionary()
+        self._checked_out: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._pending_connects = 0
+        self._returning = 0
+        self._stats = {
+            "checkouts": 0,
+            "created": 0,
+            "recycled": 0,
+            "discarded_unhealthy": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+        }
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._checked_out) + self._pending_connects + self._returning
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.max_lifetime > 0 and now - created_at >= self.max_lifetime
+
+    def _healthy(self, conn: Any, returned_at: float, now: float) -> bool:
+        if getattr(conn, "closed", 0):
+            return False
+        if self.ping_after and now - returned_at < self.ping_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+                cur.fetchone()
+            if not conn.autocommit:
+                conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _take_idle(self, now: float) -> Optional[tuple[Any, float, float]]:
+        while self._idle:
+            conn, created_at, returned_at = self._idle.pop()
+            if self._expired(created_at, now):
+                self._stats["recycled"] += 1
+                _hard_close(conn)
+                continue
+            if self.max_idle > 0 and now - returned_at >= self.max_idle:
+                self._stats["recycled"] += 1
+                _hard_close(conn)
+                continue
+            return conn, created_at, returned_at
+        return None
+
+    def getconn(self) -> Any:
+        started = self._clock()
+        deadline = started + self.checkout_timeout
+        waited = False
+        while True:
+            candidate: Optional[tuple[Any, float, float]] = None
+            should_connect = False
+            with self._cond:
+                while True:
+                    now = self._clock()
+                    candidate = self._take_idle(now)
+                    if candidate is not None:
+                        self._checked_out.add(candidate[0])
+                        break
+                    if self._total() < self.max_size:
+                        self._pending_connects += 1
+                        should_connect = True
+                        break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"connection pool exhausted ({self.max_size} in use) after {self.checkout_timeout:.1f}s"
+                        )
+                    if not waited:
+                        waited = True
+                        self._stats["waits"] += 1
+                    # Bounded wait so slots freed by garbage-collected leaks are noticed.
+                    self._cond.wait(min(remaining, 1.0))
+
+            if candidate is not None:
+                conn, _, returned_at = candidate
+                if self._healthy(conn, returned_at, self._clock()):
+                    return self._checked_out_ok(conn, started, waited)
+                with self._cond:
+                    self._checked_out.discard(conn)
+                    self._stats["discarded_unhealthy"] += 1
+                    self._cond.notify()
+                _hard_close(conn)
+                continue
+
+            if should_connect:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    with self._cond:
+                        self._pending_connects -= 1
+                        self._cond.notify()
+                    raise
+                if isinstance(conn, PooledConnection):
+                    conn._pool = self
+                with self._cond:
+                    self._pending_connects -= 1
+                    self._created_at[conn] = self._clock()
+                    self._checked_out.add(conn)
+                    self._stats["created"] += 1
+                return self._checked_out_ok(conn, started, waited)
+
+    def _checked_out_ok(self, conn: Any, started: float, waited: bool) -> Any:
+        wait_ms = (self._clock() - started) * 1000.0
+        with self._cond:
+            self._stats["checkouts"] += 1
+            if waited:
+                self._stats["wait_ms_total"] += wait_ms
+                self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], wait_ms)
+        return conn
+
+    def _reset_for_reuse(self, conn: Any) -> bool:
+        if getattr(conn, "closed", 0):
+            return False
+        try:
+            status = conn.get_transaction_status()
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if conn.autocommit:
+                conn.autocommit = False
+            return True
+        except Exception:
+            return False
+
+    def putconn(self, conn: Any) -> None:
+        with self._cond:
+            if conn not in self._checked_out:
+                # Double close or foreign connection: nothing to return.
+                return
+            self._checked_out.discard(conn)
+            self._returning += 1
+        reusable = self._reset_for_reuse(conn)
+        now = self._clock()
+        with self._cond:
+            self._returning -= 1
+            created_at = self._created_at.get(conn, now)
+            if reusable and self._expired(created_at, now):
+                self._stats["recycled"] += 1
+                reusable = False
+            elif not reusable:
+                self._stats["discarded_unhealthy"] += 1
+            if reusable:
+                self._idle.append((conn, created_at, now))
+            self._cond.notify()
+        if not reusable:
+            _hard_close(conn)
+
+    def closeall(self) -> None:
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            _hard_close(conn)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            in_use = len(self._checked_out)
+            idle = len(self._idle)
+            body: dict[str, Any] = dict(self._stats)
+        body["wait_ms_total"] = round(body["wait_ms_total"], 2)
+        body["wait_ms_max"] = round(body["wait_ms_max"], 2)
+        body.update(
+            {
+                "max_size": self.max_size,
+                "in_use": in_use,
+                "idle": idle,
+                "saturation": round(in_use / self.max_size, 3),
+            }
+        )
+        return body
+
+
+_pools_lock = threading.Lock()
+# Keyed by (pid, connect kwargs) so each forked gunicorn worker builds its own pool.
+_pools: dict[tuple[int, tuple[tuple[str, Any], ...]], ConnectionPool] = {}
+
+
+def _pool_key(connect_kwargs: dict[str, Any]) -> tuple[int, tuple[tuple[str, Any], ...]]:
+    return os.getpid(), tuple(sorted(connect_kwargs.items()))
+
+
+def get_pool(connect_kwargs: Optional[dict[str, Any]] = None) -> ConnectionPool:
+    kwargs = dict(connect_kwargs or db_connect_kwargs())
+    key = _pool_key(kwargs)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(
+                lambda: psycopg2.connect(connection_factory=PooledConnection, **kwargs),
+                max_size=_env_int("DB_POOL_MAX_SIZE", 10),
+                checkout_timeout=_env_float("DB_POOL_TIMEOUT_SEC", 10.0),
+                max_lifetime=_env_float("DB_POOL_MAX_LIFETIME_SEC", 1800.0),
+                max_idle=_env_float("DB_POOL_MAX_IDLE_SEC", 300.0),
+                ping_after=_env_float("DB_POOL_PING_AFTER_SEC", 5.0),
+            )
+            _pools[key] = pool
+        return pool
+
+
+def get_pooled_connection(connect_kwargs: Optional[dict[str, Any]] = None) -> Any:
+    """Check out a connection; ``close()`` returns it. Falls back to a direct connect when disabled."""
+    kwargs = dict(connect_kwargs or db_connect_kwargs())
+    if not db_pool_enabled():
+        return psycopg2.connect(**kwargs)
+    return get_pool(kwargs).getconn()
+
+
+def pool_stats() -> dict[str, Any]:
+    """Aggregate stats for this process's pools (``enabled`` false when pooling is off)."""
+    pid = os.getpid()
+    with _pools_lock:
+        pools = [pool for (owner, _), pool in _pools.items() if owner == pid]
+    body: dict[str, Any] = {"enabled": db_pool_enabled(), "pid": pid, "pools": len(pools)}
+    if not pools:
+        return body
+    totals: dict[str, Any] = {}
+    for pool in pools:
+        for key, value in pool.stats().items():
+            if key == "saturation":
+                continue
+            if key == "wait_ms_max":
+                totals[key] = max(totals.get(key, 0.0), value)
+            else:
+                totals[key] = totals.get(key, 0) + value
+    totals["saturation"] = round(totals["in_use"] / totals["max_size"], 3) if totals.get("max_size") else 0.0
+    body.update(totals)
+    return body
+
+
+def close_all_pools() -> None:
+    pid = os.getpid()
+    with _pools_lock:
+        owned = [key for key in _pools if key[0] == pid]
+        pools = [_pools.pop(key) for key in owned]
+    for pool in pools:
+        pool.closeall()
@@ -5,6 +5,11 @@ import uuid
 from datetime import datetime
 from typing import Any, Optional
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 try:
     from psycopg2.extras import Json, RealDictCursor
 except ImportError:  # pragma: no cover
@@ -69,6 +74,7 @@ def _safe_json(value: Any, default: Any) -> Any:
 ARCHIVED_STATUS = "archived"
 
 
+@schema_ready("deal_rooms")
 def ensure_deal_rooms_table(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
@@ -9,16 +9,27 @@ QUANTITY in source files is **thousand barrels**; stored normalized as barrels (
 
 from __future__ import annotations
 
+import io
 import json
+import multiprocessing
 import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
 try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
+try:
+    import numpy as np
     import pandas as pd
 except ImportError:  # pragma: no cover
+    np = None  # type: ignore
     pd = None  # type: ignore
 
 # Canonical column names (uppercase keys after normalization)
@@ -49,6 +60,46 @@ _HEADER_MARKERS = frozenset({"RPT_PERIOD", "R_S_NAME", "CNTRY_NAME", "QUANTITY"}
 
 _DEFAULT_DOWNLOADS = os.path.expanduser("~/Downloads/EIA_downloads")
 
+# eia_historic_imports columns in COPY order (id / ingested_at come from defaults).
+_INSERT_COLUMNS = (
+    "data_source",
+    "source_file",
+    "source_sheet",
+    "period_year",
+    "period_month",
+    "line_num",
+    "importer_name",
+    "importer_country",
+    "origin_country",
+    "origin_name",
+    "product",
+    "commodity_family",
+    "volume",
+    "volume_unit",
+    "value_usd",
+    "port_code",
+    "port_city",
+    "port_state",
+    "raw",
+)
+_PERIOD_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%m/%d/%Y")
+# Checked in order, like map_product_to_commodity_family.
+_FAMILY_PATTERNS = (
+    ("diesel", "DISTILLATE|DIESEL|GASOIL"),
+    ("gasoline", "MOTOR GAS|GASOLINE|REFORMULATED"),
+    ("lpg", "PROPANE|NGL|LPG|BUTANE"),
+    ("fuel_oil", "RESIDUAL|FUEL OIL"),
+    ("jet", "JET|KEROSENE"),
+)
+
+
+def _parse_workers() -> int:
+    """Workbooks parsed in parallel (EIA_HISTORIC_PARSE_WORKERS); unset/0/1 parses in-process."""
+    try:
+        return max(0, int(os.getenv("EIA_HISTORIC_PARSE_WORKERS", "0")))
+    except (TypeError, ValueError):
+        return 0
+
 
 def default_downloads_dir() -> str:
     return (os.getenv("EIA_DOWNLOADS_DIR") or _DEFAULT_DOWNLOADS).strip()
@@ -83,6 +134,7 @@ def try_auto_ingest_eia_downloads(
     return ingest_eia_downloads_folder(conn, str(folder))
 
 
+@schema_ready("eia_historic_imports")
 def ensure_eia_historic_imports_table(conn: Any) -> None:
     ddl = """
     CREATE TABLE IF NOT EXISTS eia_historic_imports (
@@ -125,8 +177,142 @@ def ensure_eia_historic_imports_table(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(ddl)
     ensure_eia_historic_file_state_table(conn)
+    ensure_eia_historic_rollup_table(conn)
+
 
+# Same normalization as _importer_key, so search terms and stored keys line up.
+_IMPORTER_KEY_SQL = "BTRIM(REGEXP_REPLACE(UPPER(COALESCE(importer_name, '')), '[^A-Z0-9]+', ' ', 'g'))"
+_ROLLUP_GRAIN = (
+    "data_source, source_file, period_year, period_month, origin_country, importer_name, "
+    "port_code, port_city, port_state, commodity_family"
+)
+
+
+@schema_ready("eia_historic_rollup")
+def ensure_eia_historic_rollup_table(conn: Any) -> None:
+    """Per-file rollup at year × month × origin × importer × port × commodity_family.
+
+    Dashboard endpoints aggregate this instead of eia_historic_imports. Rows are replaced per
+    source file at ingest, so one file's refresh never touches another's.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS eia_historic_rollup (
+                data_source TEXT NOT NULL,
+                source_file TEXT NOT NULL,
+                period_year INT,
+                period_month INT,
+                origin_country TEXT,
+                importer_name TEXT,
+                importer_key TEXT NOT NULL DEFAULT '',
+                port_code TEXT,
+                port_city TEXT,
+                port_state TEXT,
+                commodity_family TEXT,
+                volume NUMERIC,
+                row_count BIGINT NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_eia_historic_rollup_file
+                ON eia_historic_rollup (data_source, source_file);
+            CREATE INDEX IF NOT EXISTS idx_eia_historic_rollup_year_origin
+                ON eia_historic_rollup (period_year, origin_country);
+            CREATE INDEX IF NOT EXISTS idx_eia_historic_rollup_importer_key
+                ON eia_historic_rollup (importer_key text_pattern_ops, period_year);
+            """
+        )
+        # Substring importer search uses a trigram index when pg_trgm can be enabled;
+        # without it the prefix index above still serves exact and leading matches.
+        cur.execute("SAVEPOINT eia_historic_rollup_trgm")
+        try:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_eia_historic_rollup_importer_trgm
+                    ON eia_historic_rollup USING gin (importer_key gin_trgm_ops);
+                """
+            )
+            cur.execute("RELEASE SAVEPOINT eia_historic_rollup_trgm")
+        except Exception as exc:
+            cur.execute("ROLLBACK TO SAVEPOINT eia_historic_rollup_trgm")
+            cur.execute("RELEASE SAVEPOINT eia_historic_rollup_trgm")
+            print(f"[eia-historic] pg_trgm importer index skipped: {exc}", flush=True)
 
+
+def _importer_key(name: Optional[str]) -> str:
+    """Upper-case alphanumerics separated by single spaces: ``Chevron U.S.A.`` → ``CHEVRON U S A``."""
+    return re.sub(r"[^A-Z0-9]+", " ", (name or "").upper()).strip()
+
+
+def _refresh_file_rollup(cur: Any, source_file: str, data_source: str) -> None:
+    cur.execute(
+        "DELETE FROM eia_historic_rollup WHERE source_file = %s AND data_source = %s;",
+        (source_file, data_source),
+    )
+    cur.execute(
+        f"""
+        INSERT INTO eia_historic_rollup ({_ROLLUP_GRAIN}, importer_key, volume, row_count)
+        SELECT {_ROLLUP_GRAIN}, {_IMPORTER_KEY_SQL}, SUM(volume), COUNT(*)
+        FROM eia_historic_imports
+        WHERE source_file = %s AND data_source = %s
+        GROUP BY {_ROLLUP_GRAIN};
+        """,
+        (source_file, data_source),
+    )
+
+
+# eia_historic_file_state row written once the post-upgrade backfill has finished; after it,
+# every load keeps the rollup current per file, so dashboards can read it.
+_ROLLUP_BACKFILL_MARKER = ("__rollup_backfill__", "eia_historic_rollup")
+_rollup_complete = False
+
+
+def _rollup_backfilled(conn: Any) -> bool:
+    """True once the backfill marker exists (cached per process after the first hit)."""
+    global _rollup_complete
+    if _rollup_complete:
+        return True
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT 1 FROM eia_historic_file_state WHERE source_file = %s AND data_source = %s;",
+            _ROLLUP_BACKFILL_MARKER,
+        )
+        _rollup_complete = cur.fetchone() is not None
+    return _rollup_complete
+
+
+def backfill_eia_historic_rollups(conn: Any) -> int:
+    """Build rollups for files ingested before the rollup existed, once. Returns files rolled up."""
+    ensure_eia_historic_imports_table(conn)
+    if _rollup_backfilled(conn):
+        return 0
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT DISTINCT i.source_file, i.data_source
+            FROM eia_historic_imports i
+            WHERE NOT EXISTS (
+                SELECT 1 FROM eia_historic_rollup r
+                WHERE r.source_file = i.source_file AND r.data_source = i.data_source
+            );
+            """
+        )
+        missing = list(cur.fetchall() or [])
+        for source_file, data_source in missing:
+            _refresh_file_rollup(cur, source_file, data_source)
+        cur.execute(
+            """
+            INSERT INTO eia_historic_file_state (source_file, data_source, file_size, file_mtime)
+            VALUES (%s, %s, 0, 0)
+            ON CONFLICT (data_source, source_file) DO NOTHING;
+            """,
+            _ROLLUP_BACKFILL_MARKER,
+        )
+    conn.commit()
+    return len(missing)
+
+
+@schema_ready("eia_historic_file_state")
 def ensure_eia_historic_file_state_table(conn: Any) -> None:
     """Tracks on-disk file fingerprint so the worker does not re-parse unchanged xls/xlsx."""
     with conn.cursor() as cur:
@@ -245,15 +431,34 @@ def _detect_header_row(preview: Any) -> int:
     return 0
 
 
+def _excel_engine(path: Path) -> str:
+    return "openpyxl" if path.suffix.lower() == ".xlsx" else "xlrd"
+
+
+def _frame_with_header(raw: Any) -> Any:
+    """Promote the detected header row of a ``header=None`` sheet to column names."""
+    header_row = _detect_header_row(raw.head(30))
+    names: list[str] = []
+    seen: dict[str, int] = {}
+    for i, cell in enumerate(raw.iloc[header_row].tolist() if len(raw) else []):
+        name = _normalize_header_cell(cell) or f"COL_{i}"
+        # Same de-duplication read_excel applies to repeated headers.
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    df = raw.iloc[header_row + 1 :].reset_index(drop=True)
+    df.columns = names or list(df.columns)
+    return df.infer_objects()
+
+
 def _read_sheet(path: Path, sheet_name: str) -> Any:
     if pd is None:
         raise RuntimeError("pandas is required for EIA file ingest (pip install pandas openpyxl xlrd)")
-    engine = "openpyxl" if path.suffix.lower() == ".xlsx" else "xlrd"
-    preview = pd.read_excel(path, sheet_name=sheet_name, header=None, nrows=30, engine=engine)
-    header_row = _detect_header_row(preview)
-    df = pd.read_excel(path, sheet_name=sheet_name, header=header_row, engine=engine)
-    df.columns = [_normalize_header_cell(c) or f"COL_{i}" for i, c in enumerate(df.columns)]
-    return df
+    raw = pd.read_excel(path, sheet_name=sheet_name, header=None, engine=_excel_engine(path))
+    return _frame_with_header(raw)
 
 
 def _parse_period(val: Any) -> tuple[Optional[int], Optional[int]]:
@@ -320,7 +525,7 @@ def _row_to_record(
     line_num = _safe_int(row.get("LINE_NUM"))
 
     volume_bbl = qty_kbbl * 1000.0
-    raw = {k: row[k] for k in row if row.get(k) is not None and not (pd is not None and pd.isna(row.get(k)))}
+    raw = {k: v for k, v in row.items() if v is not None and not (pd is not None and pd.isna(v))}
 
     origin_name = _safe_str(row.get("PCOMP_RNAM")) or origin
 
@@ -347,6 +552,93 @@ def _row_to_record(
     }
 
 
+def _column(df: Any, name: str) -> Any:
+    if name in df.columns:
+        return df[name]
+    return pd.Series(pd.NA, index=df.index, dtype="object")
+
+
+def _clean_text(col: Any) -> Any:
+    """Vectorized ``_safe_str``: stripped text, empty / ``nan`` as NA."""
+    text = col.astype("string").str.strip()
+    return text.mask(text.eq("") | text.str.lower().eq("nan"))
+
+
+def _parse_periods(col: Any) -> tuple[Any, Any]:
+    """Vectorized ``_parse_period`` → nullable (year, month) series."""
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return col.dt.year.astype("Int64"), col.dt.month.astype("Int64")
+    text = col.astype("string").str.strip().str.slice(0, 19)
+    parsed = pd.Series(pd.NaT, index=col.index, dtype="datetime64[ns]")
+    for fmt in _PERIOD_FORMATS:
+        parsed = parsed.fillna(pd.to_datetime(text, format=fmt, errors="coerce"))
+    year = parsed.dt.year.astype("Int64")
+    month = parsed.dt.month.astype("Int64")
+    prefix = text.str.extract(r"^(\d{4})-(\d{2})")
+    year = year.fillna(pd.to_numeric(prefix[0], errors="coerce").astype("Int64"))
+    month = month.fillna(pd.to_numeric(prefix[1], errors="coerce").astype("Int64"))
+    return year, month
+
+
+def _commodity_families(product: Any, prod_code: Any) -> Any:
+    """Vectorized ``map_product_to_commodity_family``."""
+    name = product.fillna("").str.upper()
+    code = prod_code.astype("string").str.strip().fillna("")
+    conditions = [(name.str.contains("CRUDE", regex=False) | code.str.startswith("05")).to_numpy(dtype=bool)]
+    choices = ["crude"]
+    for family, pattern in _FAMILY_PATTERNS:
+        conditions.append(name.str.contains(pattern, regex=True).to_numpy(dtype=bool))
+        choices.append(family)
+    return pd.Series(np.select(conditions, choices, default="other"), index=product.index)
+
+
+def _normalize_import_frame(
+    df: Any,
+    *,
+    source_file: str,
+    source_sheet: str,
+    data_source: str = "eia_file_upload",
+) -> Any:
+    """Columnar ``_row_to_record``: one eia_historic_imports row per usable sheet row."""
+    importer = _clean_text(_column(df, "R_S_NAME"))
+    origin = _clean_text(_column(df, "CNTRY_NAME"))
+    qty_kbbl = pd.to_numeric(_column(df, "QUANTITY"), errors="coerce")
+    keep = (importer.notna() & origin.notna() & (qty_kbbl > 0)).fillna(False).to_numpy(dtype=bool)
+    src = df.loc[keep]
+    importer, origin, qty_kbbl = importer[keep], origin[keep], qty_kbbl[keep]
+    year, month = _parse_periods(_column(src, "RPT_PERIOD"))
+    product = _clean_text(_column(src, "PROD_NAME"))
+    line_num = np.trunc(pd.to_numeric(_column(src, "LINE_NUM"), errors="coerce")).astype("Int64")
+    # raw keeps the sheet row as read; JSON encoding stays in pandas' C writer.
+    raw = src.to_json(orient="records", lines=True, date_format="iso", default_handler=str)
+    out = pd.DataFrame(
+        {
+            "data_source": data_source,
+            "source_file": source_file,
+            "source_sheet": source_sheet,
+            "period_year": year,
+            "period_month": month,
+            "line_num": line_num,
+            "importer_name": importer,
+            "importer_country": "United States",
+            "origin_country": origin,
+            "origin_name": _clean_text(_column(src, "PCOMP_RNAM")).fillna(origin),
+            "product": product,
+            "commodity_family": _commodity_families(product, _column(src, "PROD_CODE")),
+            "volume": qty_kbbl.astype("float64") * 1000.0,
+            "volume_unit": "bbl",
+            "value_usd": np.nan,
+            "port_code": _clean_text(_column(src, "PORT_CODE")),
+            "port_city": _clean_text(_column(src, "PORT_CITY")),
+            "port_state": _clean_text(_column(src, "PORT_STATE")),
+            "raw": raw.splitlines() if len(src) else [],
+        },
+        index=src.index,
+        columns=list(_INSERT_COLUMNS),
+    )
+    return out.reset_index(drop=True)
+
+
 def _iter_import_files(folder: Path) -> list[Path]:
     if not folder.is_dir():
         return []
@@ -360,96 +652,94 @@ def _iter_import_files(folder: Path) -> list[Path]:
     return out
 
 
-def _ingest_file(conn: Any, path: Path, *, data_source: str = "eia_file_upload") -> dict[str, Any]:
-    if pd is None:
-        raise RuntimeError("pandas required")
+def _sheet_order(sheet_names: list[str]) -> list[str]:
+    # Prefer Imports sheet naming variants
+    order = [name for name in ("IMPORTS", "Imports", "import") if name in sheet_names]
+    return order + [name for name in sheet_names if name not in order]
 
-    xl = pd.ExcelFile(path, engine="openpyxl" if path.suffix.lower() == ".xlsx" else "xlrd")
-    file_stats: dict[str, Any] = {
-        "file": path.name,
-        "sheets": [],
-        "rows_parsed": 0,
-        "rows_upserted": 0,
-        "errors": [],
-    }
 
-    upsert_sql = """
-    INSERT INTO eia_historic_imports (
-        data_source, source_file, source_sheet, period_year, period_month, line_num,
-        importer_name, importer_country, origin_country, origin_name, product,
-        commodity_family, volume, volume_unit, value_usd, port_code, port_city, port_state, raw
-    ) VALUES (
-        %(data_source)s, %(source_file)s, %(source_sheet)s, %(period_year)s, %(period_month)s,
-        %(line_num)s, %(importer_name)s, %(importer_country)s, %(origin_country)s, %(origin_name)s,
-        %(product)s, %(commodity_family)s, %(volume)s, %(volume_unit)s, %(value_usd)s,
-        %(port_code)s, %(port_city)s, %(port_state)s, %(raw)s::jsonb
-    )
-    ON CONFLICT DO NOTHING
+def parse_eia_workbook(path: str, data_source: str = "eia_file_upload") -> dict[str, Any]:
+    """Parse and normalize every sheet of one workbook into COPY-ready CSV.
+
+    Top-level and returning plain data so it can run on a process pool.
     """
+    if pd is None:
+        raise RuntimeError("pandas required")
+    workbook = Path(path)
+    parsed: dict[str, Any] = {"file": workbook.name, "sheets": [], "rows_parsed": 0, "errors": [], "csv": ""}
+    frames = []
+    started = time.monotonic()
+    with pd.ExcelFile(workbook, engine=_excel_engine(workbook)) as xl:
+        for sheet in _sheet_order(list(xl.sheet_names)):
+            try:
+                df = _frame_with_header(xl.parse(sheet, header=None))
+            except Exception as exc:
+                parsed["errors"].append(f"{sheet}: {exc}")
+                continue
+            records = _normalize_import_frame(
+                df, source_file=workbook.name, source_sheet=sheet, data_source=data_source
+            )
+            frames.append(records)
+            parsed["sheets"].append({"sheet": sheet, "rows_parsed": len(records)})
+            parsed["rows_parsed"] += len(records)
+    if frames:
+        parsed["csv"] = pd.concat(frames, ignore_index=True).to_csv(index=False, header=False)
+    parsed["parse_sec"] = round(time.monotonic() - started, 3)
+    return parsed
+
+
+_STAGE_COLUMNS_DDL = """
+    data_source TEXT, source_file TEXT, source_sheet TEXT, period_year INT, period_month INT,
+    line_num INT, importer_name TEXT, importer_country TEXT, origin_country TEXT, origin_name TEXT,
+    product TEXT, commodity_family TEXT, volume NUMERIC, volume_unit TEXT, value_usd NUMERIC,
+    port_code TEXT, port_city TEXT, port_state TEXT, raw JSONB
+"""
+
 
+def _load_parsed_workbook(conn: Any, parsed: dict[str, Any], *, data_source: str) -> dict[str, Any]:
+    """Replace one file's rows: COPY into a temp stage table, then one merge INSERT."""
+    columns = ", ".join(_INSERT_COLUMNS)
+    inserted_by_sheet: dict[str, int] = {}
     with conn.cursor() as cur:
         cur.execute(
             "DELETE FROM eia_historic_imports WHERE source_file = %s AND data_source = %s;",
-            (path.name, data_source),
+            (parsed["file"], data_source),
         )
-
-    # Prefer Imports sheet naming variants
-    sheet_order = []
-    for preferred in ("IMPORTS", "Imports", "import"):
-        if preferred in xl.sheet_names:
-            sheet_order.append(preferred)
-    for s in xl.sheet_names:
-        if s not in sheet_order:
-            sheet_order.append(s)
-
-    for sheet in sheet_order:
-        try:
-            df = _read_sheet(path, sheet)
-        except Exception as exc:
-            file_stats["errors"].append(f"{sheet}: {exc}")
-            continue
-
-        records: list[dict[str, Any]] = []
-        for _, series in df.iterrows():
-            row = {str(k): series[k] for k in df.columns}
-            rec = _row_to_record(
-                row,
-                source_file=path.name,
-                source_sheet=sheet,
-                data_source=data_source,
+        if parsed["rows_parsed"]:
+            cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS eia_historic_imports_stage ({_STAGE_COLUMNS_DDL});")
+            cur.execute("TRUNCATE eia_historic_imports_stage;")
+            cur.copy_expert(
+                f"COPY eia_historic_imports_stage ({columns}) FROM STDIN WITH (FORMAT csv)",
+                io.StringIO(parsed["csv"]),
             )
-            if rec:
-                records.append(rec)
+            cur.execute(
+                f"""
+                WITH inserted AS (
+                    INSERT INTO eia_historic_imports ({columns})
+                    SELECT {columns} FROM eia_historic_imports_stage
+                    ON CONFLICT DO NOTHING
+                    RETURNING source_sheet
+                )
+                SELECT source_sheet, COUNT(*)::int FROM inserted GROUP BY source_sheet;
+                """
+            )
+            inserted_by_sheet = {str(sheet): int(count) for sheet, count in cur.fetchall()}
+        _refresh_file_rollup(cur, parsed["file"], data_source)
+    sheets = [
+        {**sheet, "rows_inserted": inserted_by_sheet.get(sheet["sheet"], 0)} for sheet in parsed["sheets"]
+    ]
+    return {
+        "file": parsed["file"],
+        "sheets": sheets,
+        "rows_parsed": parsed["rows_parsed"],
+        "rows_upserted": sum(inserted_by_sheet.values()),
+        "errors": list(parsed["errors"]),
+        "parse_sec": parsed.get("parse_sec"),
+    }
 
-        upserted = 0
-        batch_size = max(50, int(os.getenv("EIA_HISTORIC_INSERT_BATCH", "500")))
-        with conn.cursor() as cur:
-            try:
-                from psycopg2.extras import execute_batch
-            except ImportError:
-                execute_batch = None  # type: ignore
-            if execute_batch and len(records) > 1:
-                for i in range(0, len(records), batch_size):
-                    chunk = records[i : i + batch_size]
-                    try:
-                        execute_batch(cur, upsert_sql, chunk, page_size=batch_size)
-                        upserted += len(chunk)
-                    except (TypeError, AttributeError):
-                        for rec in chunk:
-                            cur.execute(upsert_sql, rec)
-                            upserted += cur.rowcount
-            else:
-                for rec in records:
-                    cur.execute(upsert_sql, rec)
-                    upserted += cur.rowcount
-
-        file_stats["sheets"].append(
-            {"sheet": sheet, "rows_parsed": len(records), "rows_inserted": upserted}
-        )
-        file_stats["rows_parsed"] += len(records)
-        file_stats["rows_upserted"] += upserted
 
-    return file_stats
+def _ingest_file(conn: Any, path: Path, *, data_source: str = "eia_file_upload") -> dict[str, Any]:
+    return _load_parsed_workbook(conn, parse_eia_workbook(str(path), data_source), data_source=data_source)
 
 
 def ingest_eia_downloads_folder(
@@ -485,41 +775,51 @@ def ingest_eia_downloads_folder(
     paths = _iter_import_files(folder)
     summary["files_found"] = len(paths)
 
+    changed: list[Path] = []
     for path in paths:
         try:
-            if _file_unchanged_on_disk(conn, path, data_source=data_source):
-                summary["files_skipped_unchanged"] += 1
-                summary["files"].append(
-                    {
-                        "file": path.name,
-                        "status": "skipped",
-                        "reason": "unchanged_on_disk",
-                    }
-                )
-                continue
-
-            print(f"[eia-historic] ingesting {path.name}…", flush=True)
-            file_stats = _ingest_file(conn, path, data_source=data_source)
-            _record_file_ingest_state(
-                conn,
-                path,
-                data_source=data_source,
-                row_count=int(file_stats.get("rows_upserted", 0) or 0),
-            )
-            conn.commit()
-            print(
-                f"[eia-historic] {path.name}: parsed={file_stats.get('rows_parsed', 0)} "
-                f"upserted={file_stats.get('rows_upserted', 0)}",
-                flush=True,
-            )
-            summary["files"].append(file_stats)
-            summary["files_processed"] += 1
-            summary["rows_parsed"] += file_stats.get("rows_parsed", 0)
-            summary["rows_inserted"] += file_stats.get("rows_upserted", 0)
+            unchanged = _file_unchanged_on_disk(conn, path, data_source=data_source)
         except Exception as exc:
             conn.rollback()
             summary["errors"].append(f"{path.name}: {exc}")
-            print(f"[eia-historic] {path.name} failed: {exc}", flush=True)
+            continue
+        if unchanged:
+            summary["files_skipped_unchanged"] += 1
+            summary["files"].append(
+                {
+                    "file": path.name,
+                    "status": "skipped",
+                    "reason": "unchanged_on_disk",
+                }
+            )
+        else:
+            changed.append(path)
+
+    # Workbooks parse on the pool while this connection loads them one at a time, in order.
+    # Spawned, not forked: the API process is threaded (DB pool, request lanes).
+    workers = min(_parse_workers(), len(changed))
+    pool = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        if workers > 1
+        else None
+    )
+    futures = [pool.submit(parse_eia_workbook, str(path), data_source) for path in changed] if pool else []
+    started = time.monotonic()
+    try:
+        for index, path in enumerate(changed):
+            _load_changed_file(conn, path, futures[index] if pool else None, data_source, summary)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    elapsed = time.monotonic() - started
+    try:
+        summary["rollup_files_backfilled"] = backfill_eia_historic_rollups(conn)
+    except Exception as exc:
+        conn.rollback()
+        summary["errors"].append(f"rollup backfill: {exc}")
+    summary["parse_workers"] = workers if pool else 1
+    summary["duration_sec"] = round(elapsed, 3)
+    summary["rows_per_sec"] = round(summary["rows_parsed"] / elapsed) if elapsed > 0 else None
 
     if summary["errors"] and summary["files_processed"] == 0 and summary["files_skipped_unchanged"] == 0:
         summary["status"] = "error"
@@ -530,10 +830,67 @@ def ingest_eia_downloads_folder(
     return summary
 
 
+def _load_changed_file(
+    conn: Any,
+    path: Path,
+    future: Any,
+    data_source: str,
+    summary: dict[str, Any],
+) -> None:
+    try:
+        print(f"[eia-historic] ingesting {path.name}…", flush=True)
+        if future is None:
+            file_stats = _ingest_file(conn, path, data_source=data_source)
+        else:
+            file_stats = _load_parsed_workbook(conn, future.result(), data_source=data_source)
+        _record_file_ingest_state(
+            conn,
+            path,
+            data_source=data_source,
+            row_count=int(file_stats.get("rows_upserted", 0) or 0),
+        )
+        conn.commit()
+        print(
+            f"[eia-historic] {path.name}: parsed={file_stats.get('rows_parsed', 0)} "
+            f"upserted={file_stats.get('rows_upserted', 0)}",
+            flush=True,
+        )
+        summary["files"].append(file_stats)
+        summary["files_processed"] += 1
+        summary["rows_parsed"] += file_stats.get("rows_parsed", 0)
+        summary["rows_inserted"] += file_stats.get("rows_upserted", 0)
+    except Exception as exc:
+        conn.rollback()
+        summary["errors"].append(f"{path.name}: {exc}")
+        print(f"[eia-historic] {path.name} failed: {exc}", flush=True)
+
+
 # ---------------------------------------------------------------------------
 # Query helpers (API)
 # ---------------------------------------------------------------------------
 
+def _fact_table(conn: Any) -> tuple[str, str]:
+    """``(table, row-count expression)`` for dashboard aggregates.
+
+    Reads eia_historic_rollup; raw eia_historic_imports until the post-upgrade backfill
+    has completed (a partially built rollup would under-count).
+    """
+    if _rollup_backfilled(conn):
+        return "eia_historic_rollup", "SUM(row_count)"
+    return "eia_historic_imports", "COUNT(*)"
+
+
+def _importer_clause(table: str) -> str:
+    """Importer filter on the normalized key, so rollup and raw readers match the same rows."""
+    if table == "eia_historic_rollup":
+        return "importer_key LIKE %s"
+    return f"{_IMPORTER_KEY_SQL} LIKE %s"
+
+
+def _importer_pattern(importer: str) -> str:
+    return f"%{_importer_key(importer)}%"
+
+
 def query_summary(
     conn: Any,
     *,
@@ -543,12 +900,13 @@ def query_summary(
     limit: int = 50,
 ) -> dict[str, Any]:
     ensure_eia_historic_imports_table(conn)
+    table, rows = _fact_table(conn)
     clauses = ["1=1"]
     params: list[Any] = []
 
     if importer:
-        clauses.append("importer_name ILIKE %s")
-        params.append(f"%{importer.strip()}%")
+        clauses.append(_importer_clause(table))
+        params.append(_importer_pattern(importer))
     if year_from is not None:
         clauses.append("period_year >= %s")
         params.append(year_from)
@@ -563,9 +921,9 @@ def query_summary(
             f"""
             SELECT COALESCE(MIN(period_year), 0) AS y_min,
                    COALESCE(MAX(period_year), 0) AS y_max,
-                   COUNT(*)::bigint AS row_count,
+                   COALESCE({rows}, 0)::bigint AS row_count,
                    COUNT(DISTINCT importer_name)::bigint AS importer_count
-            FROM eia_historic_imports WHERE {where};
+            FROM {table} WHERE {where};
             """,
             params,
         )
@@ -575,8 +933,8 @@ def query_summary(
             f"""
             SELECT period_year AS year,
                    SUM(volume)::float AS volume_bbl,
-                   COUNT(*)::bigint AS row_count
-            FROM eia_historic_imports
+                   COALESCE({rows}, 0)::bigint AS row_count
+            FROM {table}
             WHERE {where}
             GROUP BY period_year
             ORDER BY period_year;
@@ -592,8 +950,8 @@ def query_summary(
             f"""
             SELECT origin_country,
                    SUM(volume)::float AS volume_bbl,
-                   COUNT(*)::bigint AS row_count
-            FROM eia_historic_imports
+                   COALESCE({rows}, 0)::bigint AS row_count
+            FROM {table}
             WHERE {where}
             GROUP BY origin_country
             ORDER BY volume_bbl DESC NULLS LAST
@@ -609,7 +967,7 @@ def query_summary(
         cur.execute(
             f"""
             SELECT importer_name, SUM(volume)::float AS volume_bbl
-            FROM eia_historic_imports
+            FROM {table}
             WHERE {where}
             GROUP BY importer_name
             ORDER BY volume_bbl DESC NULLS LAST
@@ -642,8 +1000,9 @@ def query_series(
     commodity_family: Optional[str] = None,
 ) -> dict[str, Any]:
     ensure_eia_historic_imports_table(conn)
-    clauses = ["importer_name ILIKE %s"]
-    params: list[Any] = [f"%{importer.strip()}%"]
+    table, rows = _fact_table(conn)
+    clauses = [_importer_clause(table)]
+    params: list[Any] = [_importer_pattern(importer)]
 
     if origin_country:
         clauses.append("origin_country ILIKE %s")
@@ -659,8 +1018,8 @@ def query_series(
             f"""
             SELECT period_year, period_month,
                    SUM(volume)::float AS volume_bbl,
-                   COUNT(*)::bigint AS row_count
-            FROM eia_historic_imports
+                   COALESCE({rows}, 0)::bigint AS row_count
+            FROM {table}
             WHERE {where}
             GROUP BY period_year, period_month
             ORDER BY period_year, period_month NULLS FIRST;
@@ -685,6 +1044,79 @@ def query_series(
     }
 
 
+def query_rows(
+    conn: Any,
+    *,
+    year: int,
+    importer: Optional[str] = None,
+    origin_country: Optional[str] = None,
+    port_code: Optional[str] = None,
+    commodity_family: Optional[str] = None,
+    limit: int = 200,
+    offset: int = 0,
+) -> dict[str, Any]:
+    """Line-level drill-down behind one corridor / importer year (raw rows, not the rollup)."""
+    ensure_eia_historic_imports_table(conn)
+    clauses = ["period_year = %s"]
+    params: list[Any] = [year]
+
+    if importer:
+        clauses.append(_importer_clause("eia_historic_imports"))
+        params.append(_importer_pattern(importer))
+    if origin_country:
+        clauses.append("origin_country = %s")
+        params.append(origin_country.strip())
+    if port_code:
+        clauses.append("port_code = %s")
+        params.append(port_code.strip())
+    if commodity_family:
+        clauses.append("commodity_family = %s")
+        params.append(commodity_family)
+
+    where = " AND ".join(clauses)
+    limit = max(1, min(int(limit), 1000))
+
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT period_year, period_month, line_num, importer_name, origin_country, origin_name,
+                   product, commodity_family, volume::float, port_code, port_city, port_state, source_file
+            FROM eia_historic_imports
+            WHERE {where}
+            ORDER BY volume DESC NULLS LAST, period_month, line_num
+            LIMIT %s OFFSET %s;
+            """,
+            [*params, limit, max(0, int(offset))],
+        )
+        rows = [
+            {
+                "year": r[0],
+                "month": r[1],
+                "line_num": r[2],
+                "importer_name": r[3],
+                "origin_country": r[4],
+                "origin_name": r[5],
+                "product": r[6],
+                "commodity_family": r[7],
+                "volume_bbl": r[8],
+                "port_code": r[9],
+                "port_city": r[10],
+                "port_state": r[11],
+                "port_label": _port_label(r[10], r[11], r[9]),
+                "source_file": r[12],
+            }
+            for r in cur.fetchall()
+        ]
+
+    return {
+        "year": year,
+        "rows": rows,
+        "limit": limit,
+        "offset": max(0, int(offset)),
+        "provenance": "EIA file import — company-level line items",
+    }
+
+
 def _port_label(port_city: Optional[str], port_state: Optional[str], port_code: Optional[str]) -> str:
     city = (port_city or "").strip()
     state = (port_state or "").strip()
@@ -706,12 +1138,13 @@ def query_map_arcs(
     limit: int = 80,
 ) -> dict[str, Any]:
     ensure_eia_historic_imports_table(conn)
+    table, rows = _fact_table(conn)
     clauses = ["period_year = %s"]
     params: list[Any] = [year]
 
     if importer:
-        clauses.append("importer_name ILIKE %s")
-        params.append(f"%{importer.strip()}%")
+        clauses.append(_importer_clause(table))
+        params.append(_importer_pattern(importer))
 
     where = " AND ".join(clauses)
 
@@ -724,8 +1157,8 @@ def query_map_arcs(
                    port_state,
                    port_code,
                    SUM(volume)::float AS volume_bbl,
-                   COUNT(*)::bigint AS row_count
-            FROM eia_historic_imports
+                   COALESCE({rows}, 0)::bigint AS row_count
+            FROM {table}
             WHERE {where}
             GROUP BY origin_country, commodity_family, port_city, port_state, port_code
             ORDER BY volume_bbl DESC NULLS LAST
@@ -765,12 +1198,12 @@ def query_map_arcs(
                            port_state,
                            port_code,
                            SUM(volume)::float AS slice_vol,
-                           COUNT(*)::bigint AS slice_rows,
+                           COALESCE({rows}, 0)::bigint AS slice_rows,
                            ROW_NUMBER() OVER (
                                PARTITION BY importer_name
                                ORDER BY SUM(volume) DESC NULLS LAST
                            ) AS rn
-                    FROM eia_historic_imports
+                    FROM {table}
                     WHERE {where} AND origin_country = %s
                       AND importer_name IS NOT NULL AND TRIM(importer_name) <> ''
                     GROUP BY importer_name, port_city, port_state, port_code
@@ -816,8 +1249,8 @@ def query_map_arcs(
                        port_state,
                        port_code,
                        SUM(volume)::float AS volume_bbl,
-                       COUNT(*)::bigint AS row_count
-                FROM eia_historic_imports
+                       COALESCE({rows}, 0)::bigint AS row_count
+                FROM {table}
                 WHERE {where} AND origin_country = %s
                   AND (
                     (port_city IS NOT NULL AND TRIM(port_city) <> '')
@@ -7,9 +7,10 @@ from datetime import datetime
 from typing import Any, Optional
 
 try:
-    from psycopg2.extras import Json, RealDictCursor
+    from psycopg2.extras import Json, RealDictCursor, execute_values
 except ImportError:
     RealDictCursor = None
+    execute_values = None  # type: ignore
 
     def Json(value: Any) -> Any:
         return value
@@ -423,6 +424,70 @@ def upsert_entity_contact_candidates(conn: Any, candidates: list[dict[str, Any]]
     return len(candidates)
 
 
+_BATCH_UPSERT_SQL = """
+    INSERT INTO entity_contacts (
+        id, fingerprint, entity_kind, entity_id, contact_type, contact_scope, label, value,
+        normalized_value, source_name, source_url, source_type, confidence_score, raw_payload,
+        extracted_from, verified_at, discovered_by, phone_verified_at, last_seen_at
+    )
+    VALUES %s
+    ON CONFLICT (fingerprint) DO UPDATE SET
+        label = EXCLUDED.label,
+        value = EXCLUDED.value,
+        normalized_value = EXCLUDED.normalized_value,
+        source_name = EXCLUDED.source_name,
+        source_url = EXCLUDED.source_url,
+        source_type = EXCLUDED.source_type,
+        confidence_score = EXCLUDED.confidence_score,
+        raw_payload = EXCLUDED.raw_payload,
+        extracted_from = EXCLUDED.extracted_from,
+        verified_at = COALESCE(EXCLUDED.verified_at, entity_contacts.verified_at),
+        discovered_by = EXCLUDED.discovered_by,
+        phone_verified_at = COALESCE(EXCLUDED.phone_verified_at, entity_contacts.phone_verified_at),
+        last_seen_at = CURRENT_TIMESTAMP
+"""
+_BATCH_UPSERT_TEMPLATE = "(" + ", ".join(["%s"] * 18) + ", CURRENT_TIMESTAMP)"
+
+
+def upsert_entity_contact_candidates_batch(conn: Any, candidates: list[dict[str, Any]]) -> int:
+    """``upsert_entity_contact_candidates`` as one multi-row ``execute_values`` statement.
+
+    Duplicate fingerprints keep the last candidate; Postgres rejects an ON CONFLICT
+    upsert that touches the same row twice.
+    """
+    unique = list({candidate["fingerprint"]: candidate for candidate in candidates}.values())
+    if not unique:
+        return 0
+    if execute_values is None:
+        return upsert_entity_contact_candidates(conn, unique)
+    values = [
+        (
+            candidate["id"],
+            candidate["fingerprint"],
+            candidate["entity_kind"],
+            candidate["entity_id"],
+            candidate["contact_type"],
+            candidate["contact_scope"],
+            candidate["label"],
+            candidate["value"],
+            candidate["normalized_value"],
+            candidate["source_name"],
+            candidate["source_url"],
+            candidate["source_type"],
+            candidate["confidence_score"],
+            Json(candidate["raw_payload"]),
+            candidate["extracted_from"],
+            candidate["verified_at"],
+            candidate.get("discovered_by") or "open_data",
+            candidate.get("phone_verified_at"),
+        )
+        for candidate in unique
+    ]
+    with conn.cursor() as cur:
+        execute_values(cur, _BATCH_UPSERT_SQL, values, template=_BATCH_UPSERT_TEMPLATE, page_size=len(values))
+    return len(unique)
+
+
 def sync_license_contacts_for_row(conn: Any, row: dict[str, Any]) -> int:
     entity_id = _clean_text(row.get("id"))
     if not entity_id:
@@ -448,6 +513,45 @@ def sync_license_contacts_for_row(conn: Any, row: dict[str, Any]) -> int:
     return upsert_entity_contact_candidates(conn, candidates)
 
 
+def build_license_contacts_for_rows(rows: list[dict[str, Any]]) -> tuple[list[str], list[dict[str, Any]]]:
+    """Entity ids and open-data contact candidates for many license rows (pure, picklable)."""
+    entity_ids: list[str] = []
+    candidates: list[dict[str, Any]] = []
+    for row in rows:
+        entity_id = _clean_text(row.get("id"))
+        if not entity_id:
+            continue
+        entity_ids.append(entity_id)
+        for candidate in build_license_contact_candidates(row):
+            candidate.setdefault("discovered_by", "open_data")
+            candidates.append(candidate)
+    return entity_ids, candidates
+
+
+def replace_license_contacts(conn: Any, entity_ids: list[str], candidates: list[dict[str, Any]]) -> int:
+    """Swap the open-data managed contacts of ``entity_ids`` for ``candidates``: one DELETE, one upsert."""
+    if not entity_ids:
+        return 0
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            DELETE FROM entity_contacts
+            WHERE entity_kind = 'license'
+              AND entity_id = ANY(%s)
+              AND source_type IN ('official_open_data', 'source_backed_record')
+              AND COALESCE(discovered_by, 'open_data') = 'open_data'
+            """,
+            (entity_ids,),
+        )
+    return upsert_entity_contact_candidates_batch(conn, candidates)
+
+
+def sync_license_contacts_for_rows(conn: Any, rows: list[dict[str, Any]]) -> int:
+    """Set-wise ``sync_license_contacts_for_row``: one DELETE for all rows, then one batched upsert."""
+    entity_ids, candidates = build_license_contacts_for_rows(rows)
+    return replace_license_contacts(conn, entity_ids, candidates)
+
+
 def sync_license_contacts(conn: Any, license_id: str) -> int:
     with conn.cursor(**_cursor_kwargs()) as cur:
         cur.execute(
@@ -474,24 +578,10 @@ def sync_license_contacts(conn: Any, license_id: str) -> int:
 
 
 def sync_all_license_contacts(conn: Any) -> int:
-    total = 0
-    with conn.cursor(**_cursor_kwargs()) as cur:
-        cur.execute(
-            """
-            SELECT
-                id,
-                phone_number,
-                record_origin,
-                source_name,
-                source_url,
-                source_record_url,
-                source_updated_at,
-                raw_payload,
-                last_synced_at
-            FROM licenses
-            """
-        )
-        rows = cur.fetchall()
-    for row in rows:
-        total += sync_license_contacts_for_row(conn, row)
-    return total
+    """Full re-derivation in keyset chunks (commits per chunk); returns contacts written."""
+    try:
+        from backend.services.entity_derivation import derive_license_entities
+    except ImportError:
+        from services.entity_derivation import derive_license_entities
+
+    return derive_license_entities(conn, kinds=("contacts",), incremental=False)["contacts"]
@@ -0,0 +1,275 @@
+"""Chunked, set-based derivation of entity_contacts and entity_relationships from licenses.
+
+The per-license sync helpers cost a SELECT, a DELETE and one INSERT per candidate for
+every row; run across the whole table that is hundreds of thousands of round-trips.
+``derive_license_entities`` instead:
+
+* reads licenses in keyset-ordered chunks (``id > last id``) together with a
+  derivation-input fingerprint computed in SQL;
+* builds contact and relationship candidates for the chunk in memory, optionally on a
+  process pool since walking raw payload leaves is pure CPU work;
+* writes each chunk with one DELETE and one ``execute_values`` upsert per table, records
+  the fingerprints in ``license_derivation_state`` and commits.
+
+In incremental mode only licenses whose fingerprint differs from the recorded one
+are read at all. The fingerprint covers ``raw_payload`` plus the columns candidates are
+built from, including ``source_updated_at`` (it becomes ``verified_at``); ``last_synced_at``
+is left out so a resync that only bumps it does not re-derive every row.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+try:
+    from psycopg2.extras import RealDictCursor, execute_values
+except ImportError:
+    RealDictCursor = None
+    execute_values = None  # type: ignore
+
+try:
+    from backend.services.entity_contacts import build_license_contacts_for_rows, replace_license_contacts
+    from backend.services.entity_relationships import (
+        build_license_relationships_for_rows,
+        relationship_row_eligible,
+        replace_license_relationships,
+    )
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.entity_contacts import build_license_contacts_for_rows, replace_license_contacts
+    from services.entity_relationships import (  # type: ignore[no-redef]
+        build_license_relationships_for_rows,
+        relationship_row_eligible,
+        replace_license_relationships,
+    )
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(key, str(default))))
+    except (TypeError, ValueError):
+        return default
+
+
+DERIVATION_KINDS = ("contacts", "relationships")
+ENTITY_DERIVATION_CHUNK_ROWS = max(1, _env_int("ENTITY_DERIVATION_CHUNK_ROWS", 1000))
+# 0/1 derives in-process; >1 walks payloads on that many spawned worker processes.
+ENTITY_DERIVATION_WORKERS = _env_int("ENTITY_DERIVATION_WORKERS", 0)
+
+LICENSE_DERIVATION_COLUMNS = (
+    "id",
+    "company",
+    "sector",
+    "phone_number",
+    "record_origin",
+    "source_name",
+    "source_url",
+    "source_record_url",
+    "source_updated_at",
+    "date_issued",
+    "raw_payload",
+    "last_synced_at",
+)
+# Inputs that change candidates; json_build_array keeps NULLs positional.
+_FINGERPRINT_SQL = (
+    "md5(json_build_array(l.company, l.sector, l.phone_number, l.record_origin, l.source_name, "
+    "l.source_url, l.source_record_url, l.source_updated_at, l.date_issued, l.raw_payload)::text)"
+)
+
+
+@schema_ready("license_derivation_state")
+def ensure_license_derivation_state_table(conn: Any) -> None:
+    """Last derivation-input fingerprint written per license and derived table."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS license_derivation_state (
+                license_id TEXT PRIMARY KEY,
+                contacts_fingerprint TEXT,
+                relationships_fingerprint TEXT,
+                derived_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+            """
+        )
+
+
+@dataclass
+class DerivedChunk:
+    """Candidates for one chunk, built in a worker process or inline."""
+
+    contact_ids: list[str] = field(default_factory=list)
+    contacts: list[dict[str, Any]] = field(default_factory=list)
+    relationship_ids: list[str] = field(default_factory=list)
+    relationships: list[dict[str, Any]] = field(default_factory=list)
+
+
+def derive_license_chunk(rows: Sequence[dict[str, Any]], kinds: Sequence[str] = DERIVATION_KINDS) -> DerivedChunk:
+    """Pure candidate building for a chunk; module-level so a process pool can pickle it."""
+    rows = list(rows)
+    chunk = DerivedChunk()
+    if "contacts" in kinds:
+        chunk.contact_ids, chunk.contacts = build_license_contacts_for_rows(rows)
+    if "relationships" in kinds:
+        eligible = [row for row in rows if relationship_row_eligible(row)]
+        chunk.relationship_ids, chunk.relationships = build_license_relationships_for_rows(eligible)
+    return chunk
+
+
+def _select_chunk_sql(kinds: Sequence[str], incremental: bool) -> str:
+    columns = ", ".join(f"l.{column}" for column in LICENSE_DERIVATION_COLUMNS)
+    changed = "TRUE"
+    if incremental:
+        changed = " OR ".join(f"s.{kind}_fingerprint IS DISTINCT FROM c.derivation_fingerprint" for kind in kinds)
+    return f"""
+        SELECT c.*
+        FROM (
+            SELECT {columns}, {_FINGERPRINT_SQL} AS derivation_fingerprint
+            FROM licenses l
+            WHERE l.id > %s
+        ) c
+        LEFT JOIN license_derivation_state s ON s.license_id = c.id
+        WHERE {changed}
+        ORDER BY c.id
+        LIMIT %s
+    """
+
+
+def _fetch_chunk(conn: Any, sql: str, after_id: str, limit: int) -> list[dict[str, Any]]:
+    cursor_kwargs = {"cursor_factory": RealDictCursor} if RealDictCursor is not None else {}
+    with conn.cursor(**cursor_kwargs) as cur:
+        cur.execute(sql, (after_id, limit))
+        # Plain dicts: RealDictRow pickles, but cheaper to ship to workers as dict.
+        return [dict(row) for row in cur.fetchall()]
+
+
+def _record_state(conn: Any, fingerprints: dict[str, str], kinds: Sequence[str]) -> None:
+    values = [
+        (
+            license_id,
+            fingerprint if "contacts" in kinds else None,
+            fingerprint if "relationships" in kinds else None,
+        )
+        for license_id, fingerprint in fingerprints.items()
+    ]
+    if not values:
+        return
+    sql = """
+        INSERT INTO license_derivation_state (license_id, contacts_fingerprint, relationships_fingerprint, derived_at)
+        VALUES %s
+        ON CONFLICT (license_id) DO UPDATE SET
+            contacts_fingerprint = COALESCE(
+                EXCLUDED.contacts_fingerprint, license_derivation_state.contacts_fingerprint
+            ),
+            relationships_fingerprint = COALESCE(
+                EXCLUDED.relationships_fingerprint, license_derivation_state.relationships_fingerprint
+            ),
+            derived_at = now()
+    """
+    template = "(%s, %s, %s, now())"
+    with conn.cursor() as cur:
+        if execute_values is not None:
+            execute_values(cur, sql, values, template=template, page_size=len(values))
+        else:
+            for value in values:
+                cur.execute(sql.replace("VALUES %s", "VALUES " + template), value)
+
+
+def _write_chunk(
+    conn: Any,
+    derived: DerivedChunk,
+    fingerprints: dict[str, str],
+    kinds: Sequence[str],
+) -> tuple[int, int]:
+    try:
+        contacts = replace_license_contacts(conn, derived.contact_ids, derived.contacts) if "contacts" in kinds else 0
+        relationships = (
+            replace_license_relationships(conn, derived.relationship_ids, derived.relationships)
+            if "relationships" in kinds
+            else 0
+        )
+        _record_state(conn, fingerprints, kinds)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return contacts, relationships
+
+
+def derive_license_entities(
+    conn: Any,
+    *,
+    kinds: Sequence[str] = DERIVATION_KINDS,
+    incremental: bool = True,
+    chunk_rows: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> dict[str, Any]:
+    """Derive contacts/relationships for every (changed) license; commits per chunk.
+
+    ``workers`` > 1 builds candidates on a process pool while the next chunk is read
+    and earlier chunks are written; writes stay on ``conn`` in id order.
+    """
+    kinds = tuple(kind for kind in DERIVATION_KINDS if kind in kinds)
+    if not kinds:
+        raise ValueError(f"kinds must include one of {DERIVATION_KINDS}")
+    chunk_rows = max(1, chunk_rows or ENTITY_DERIVATION_CHUNK_ROWS)
+    workers = ENTITY_DERIVATION_WORKERS if workers is None else workers
+    ensure_license_derivation_state_table(conn)
+    conn.commit()
+
+    sql = _select_chunk_sql(kinds, incremental)
+    summary: dict[str, Any] = {
+        "kinds": list(kinds),
+        "incremental": incremental,
+        "workers": workers,
+        "licenses": 0,
+        "chunks": 0,
+        "contacts": 0,
+        "relationships": 0,
+    }
+    started = time.monotonic()
+
+    def write(derived: DerivedChunk, fingerprints: dict[str, str]) -> None:
+        contacts, relationships = _write_chunk(conn, derived, fingerprints, kinds)
+        summary["contacts"] += contacts
+        summary["relationships"] += relationships
+        summary["chunks"] += 1
+        summary["licenses"] += len(fingerprints)
+
+    # Spawned, not forked: derivation also runs inside the threaded API process.
+    pool = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        if workers > 1
+        else None
+    )
+    pending: deque[tuple[Future, dict[str, str]]] = deque()
+    after_id = ""
+    try:
+        while True:
+            rows = _fetch_chunk(conn, sql, after_id, chunk_rows)
+            if not rows:
+                break
+            after_id = str(rows[-1]["id"])
+            fingerprints = {str(row["id"]): row.pop("derivation_fingerprint") for row in rows}
+            if pool is None:
+                write(derive_license_chunk(rows, kinds), fingerprints)
+                continue
+            pending.append((pool.submit(derive_license_chunk, rows, kinds), fingerprints))
+            while len(pending) > workers:
+                future, done_fingerprints = pending.popleft()
+                write(future.result(), done_fingerprints)
+        while pending:
+            future, done_fingerprints = pending.popleft()
+            write(future.result(), done_fingerprints)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    summary["duration_sec"] = round(time.monotonic() - started, 3)
+    return summary
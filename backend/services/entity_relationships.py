@@ -7,9 +7,10 @@ from datetime import datetime
 from typing import Any, Optional
 
 try:
-    from psycopg2.extras import Json, RealDictCursor
+    from psycopg2.extras import Json, RealDictCursor, execute_values
 except ImportError:
     RealDictCursor = None
+    execute_values = None  # type: ignore
 
     def Json(value: Any) -> Any:
         return value
@@ -434,6 +435,149 @@ UPSERT_SQL = """
 """
 
 
+def _upsert_relationship_candidate(cur: Any, candidate: dict[str, Any]) -> None:
+    cur.execute(
+        """
+        INSERT INTO entity_relationships (
+            fingerprint,
+            source_entity_kind,
+            source_entity_ref,
+            target_entity_kind,
+            target_entity_ref,
+            target_name,
+            relationship_type,
+            relationship_label,
+            rel_type,
+            ownership_pct,
+            effective_date,
+            source_name,
+            source_url,
+            source_type,
+            confidence_score,
+            raw_payload,
+            extracted_from,
+            verified_at,
+            discovered_by,
+            last_seen_at
+        )
+        VALUES (
+            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+            %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP
+        )
+        ON CONFLICT (fingerprint) DO UPDATE SET
+            source_entity_kind = EXCLUDED.source_entity_kind,
+            source_entity_ref = EXCLUDED.source_entity_ref,
+            target_entity_kind = EXCLUDED.target_entity_kind,
+            target_entity_ref = EXCLUDED.target_entity_ref,
+            target_name = EXCLUDED.target_name,
+            relationship_type = EXCLUDED.relationship_type,
+            relationship_label = EXCLUDED.relationship_label,
+            rel_type = EXCLUDED.rel_type,
+            ownership_pct = EXCLUDED.ownership_pct,
+            effective_date = EXCLUDED.effective_date,
+            source_name = EXCLUDED.source_name,
+            source_url = EXCLUDED.source_url,
+            source_type = EXCLUDED.source_type,
+            confidence_score = EXCLUDED.confidence_score,
+            raw_payload = EXCLUDED.raw_payload,
+            extracted_from = EXCLUDED.extracted_from,
+            verified_at = COALESCE(EXCLUDED.verified_at, entity_relationships.verified_at),
+            discovered_by = EXCLUDED.discovered_by,
+            last_seen_at = CURRENT_TIMESTAMP;
+        """,
+        (
+            candidate["fingerprint"],
+            candidate["source_entity_kind"],
+            candidate["source_entity_ref"],
+            candidate["target_entity_kind"],
+            candidate["target_entity_ref"],
+            candidate["target_name"],
+            candidate["relationship_type"],
+            candidate["relationship_label"],
+            candidate["relationship_type"],
+            candidate["ownership_pct"],
+            candidate["effective_date"],
+            candidate["source_name"],
+            candidate["source_url"],
+            candidate["source_type"],
+            candidate["confidence_score"],
+            Json(candidate["raw_payload"]),
+            candidate["extracted_from"],
+            candidate["verified_at"],
+            candidate.get("discovered_by", "open_data"),
+        ),
+    )
+
+
+_BATCH_UPSERT_SQL = """
+    INSERT INTO entity_relationships (
+        fingerprint, source_entity_kind, source_entity_ref, target_entity_kind, target_entity_ref,
+        target_name, relationship_type, relationship_label, rel_type, ownership_pct, effective_date,
+        source_name, source_url, source_type, confidence_score, raw_payload, extracted_from,
+        verified_at, discovered_by, last_seen_at
+    )
+    VALUES %s
+    ON CONFLICT (fingerprint) DO UPDATE SET
+        source_entity_kind = EXCLUDED.source_entity_kind,
+        source_entity_ref = EXCLUDED.source_entity_ref,
+        target_entity_kind = EXCLUDED.target_entity_kind,
+        target_entity_ref = EXCLUDED.target_entity_ref,
+        target_name = EXCLUDED.target_name,
+        relationship_type = EXCLUDED.relationship_type,
+        relationship_label = EXCLUDED.relationship_label,
+        rel_type = EXCLUDED.rel_type,
+        ownership_pct = EXCLUDED.ownership_pct,
+        effective_date = EXCLUDED.effective_date,
+        source_name = EXCLUDED.source_name,
+        source_url = EXCLUDED.source_url,
+        source_type = EXCLUDED.source_type,
+        confidence_score = EXCLUDED.confidence_score,
+        raw_payload = EXCLUDED.raw_payload,
+        extracted_from = EXCLUDED.extracted_from,
+        verified_at = COALESCE(EXCLUDED.verified_at, entity_relationships.verified_at),
+        discovered_by = EXCLUDED.discovered_by,
+        last_seen_at = CURRENT_TIMESTAMP
+"""
+_BATCH_UPSERT_TEMPLATE = "(" + ", ".join(["%s"] * 19) + ", CURRENT_TIMESTAMP)"
+
+
+def upsert_relationship_candidates_batch(cur: Any, candidates: list[dict[str, Any]]) -> int:
+    """Upsert candidates with one multi-row ``execute_values`` statement (last duplicate wins)."""
+    unique = list({candidate["fingerprint"]: candidate for candidate in candidates}.values())
+    if not unique:
+        return 0
+    if execute_values is None:
+        for candidate in unique:
+            _upsert_relationship_candidate(cur, candidate)
+        return len(unique)
+    values = [
+        (
+            candidate["fingerprint"],
+            candidate["source_entity_kind"],
+            candidate["source_entity_ref"],
+            candidate["target_entity_kind"],
+            candidate["target_entity_ref"],
+            candidate["target_name"],
+            candidate["relationship_type"],
+            candidate["relationship_label"],
+            candidate["relationship_type"],
+            candidate["ownership_pct"],
+            candidate["effective_date"],
+            candidate["source_name"],
+            candidate["source_url"],
+            candidate["source_type"],
+            candidate["confidence_score"],
+            Json(candidate["raw_payload"]),
+            candidate["extracted_from"],
+            candidate["verified_at"],
+            candidate.get("discovered_by", "open_data"),
+        )
+        for candidate in unique
+    ]
+    execute_values(cur, _BATCH_UPSERT_SQL, values, template=_BATCH_UPSERT_TEMPLATE, page_size=len(values))
+    return len(unique)
+
+
 def sync_license_relationships_for_row(conn: Any, row: dict[str, Any]) -> int:
     entity_id = _clean_text(row.get("id"))
     if not entity_id:
@@ -444,77 +588,7 @@ def sync_license_relationships_for_row(conn: Any, row: dict[str, Any]) -> int:
 
     with conn.cursor() as cur:
         for candidate in candidates:
-            cur.execute(
-            """
-            INSERT INTO entity_relationships (
-                fingerprint,
-                source_entity_kind,
-                source_entity_ref,
-                target_entity_kind,
-                target_entity_ref,
-                target_name,
-                relationship_type,
-                relationship_label,
-                rel_type,
-                ownership_pct,
-                effective_date,
-                source_name,
-                source_url,
-                source_type,
-                confidence_score,
-                raw_payload,
-                extracted_from,
-                verified_at,
-                discovered_by,
-                last_seen_at
-            )
-            VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP
-            )
-            ON CONFLICT (fingerprint) DO UPDATE SET
-                source_entity_kind = EXCLUDED.source_entity_kind,
-                source_entity_ref = EXCLUDED.source_entity_ref,
-                target_entity_kind = EXCLUDED.target_entity_kind,
-                target_entity_ref = EXCLUDED.target_entity_ref,
-                target_name = EXCLUDED.target_name,
-                relationship_type = EXCLUDED.relationship_type,
-                relationship_label = EXCLUDED.relationship_label,
-                rel_type = EXCLUDED.rel_type,
-                ownership_pct = EXCLUDED.ownership_pct,
-                effective_date = EXCLUDED.effective_date,
-                source_name = EXCLUDED.source_name,
-                source_url = EXCLUDED.source_url,
-                source_type = EXCLUDED.source_type,
-                confidence_score = EXCLUDED.confidence_score,
-                raw_payload = EXCLUDED.raw_payload,
-                extracted_from = EXCLUDED.extracted_from,
-                verified_at = COALESCE(EXCLUDED.verified_at, entity_relationships.verified_at),
-                discovered_by = EXCLUDED.discovered_by,
-                last_seen_at = CURRENT_TIMESTAMP;
-            """,
-            (
-                candidate["fingerprint"],
-                candidate["source_entity_kind"],
-                candidate["source_entity_ref"],
-                candidate["target_entity_kind"],
-                candidate["target_entity_ref"],
-                candidate["target_name"],
-                candidate["relationship_type"],
-                candidate["relationship_label"],
-                candidate["relationship_type"],
-                candidate["ownership_pct"],
-                candidate["effective_date"],
-                candidate["source_name"],
-                candidate["source_url"],
-                candidate["source_type"],
-                candidate["confidence_score"],
-                Json(candidate["raw_payload"]),
-                candidate["extracted_from"],
-                candidate["verified_at"],
-                candidate.get("discovered_by", "open_data"),
-            ),
-        )
+            _upsert_relationship_candidate(cur, candidate)
 
         source_type_placeholders = ", ".join(["%s"] * len(AUTO_MANAGED_SOURCE_TYPES))
         params: list[Any] = ["license", entity_id, *AUTO_MANAGED_SOURCE_TYPES]
@@ -533,6 +607,51 @@ def sync_license_relationships_for_row(conn: Any, row: dict[str, Any]) -> int:
     return len(candidates)
 
 
+def relationship_row_eligible(row: dict[str, Any]) -> bool:
+    """Bulk derivation only covers licenses with a recorded company, as the full resync always did."""
+    return bool(_clean_text(row.get("company")))
+
+
+def build_license_relationships_for_rows(
+    rows: list[dict[str, Any]],
+) -> tuple[list[str], list[dict[str, Any]]]:
+    """Entity ids and relationship candidates for many license rows (pure, picklable)."""
+    entity_ids: list[str] = []
+    candidates: list[dict[str, Any]] = []
+    for row in rows:
+        entity_id = _clean_text(row.get("id"))
+        if not entity_id:
+            continue
+        entity_ids.append(entity_id)
+        candidates.extend(build_license_relationship_candidates(row))
+    return entity_ids, candidates
+
+
+def replace_license_relationships(conn: Any, entity_ids: list[str], candidates: list[dict[str, Any]]) -> int:
+    """Upsert ``candidates`` in one statement, then drop stale auto-managed rows of ``entity_ids``."""
+    if not entity_ids:
+        return 0
+    with conn.cursor() as cur:
+        upsert_relationship_candidates_batch(cur, candidates)
+        cur.execute(
+            """
+            DELETE FROM entity_relationships
+            WHERE source_entity_kind = 'license'
+              AND source_entity_ref = ANY(%s)
+              AND source_type = ANY(%s)
+              AND NOT (fingerprint = ANY(%s))
+            """,
+            (entity_ids, list(AUTO_MANAGED_SOURCE_TYPES), [candidate["fingerprint"] for candidate in candidates]),
+        )
+    return len(candidates)
+
+
+def sync_license_relationships_for_rows(conn: Any, rows: list[dict[str, Any]]) -> int:
+    """Set-wise ``sync_license_relationships_for_row``: one batched upsert, then one stale-row DELETE."""
+    entity_ids, candidates = build_license_relationships_for_rows(rows)
+    return replace_license_relationships(conn, entity_ids, candidates)
+
+
 def sync_license_relationships(conn: Any, entity_id: str) -> int:
     with conn.cursor(**_cursor_kwargs()) as cur:
         cur.execute(
@@ -562,29 +681,10 @@ def sync_license_relationships(conn: Any, entity_id: str) -> int:
 
 
 def sync_all_license_relationships(conn: Any) -> int:
-    with conn.cursor(**_cursor_kwargs()) as cur:
-        cur.execute(
-            """
-            SELECT
-                id,
-                company,
-                sector,
-                record_origin,
-                source_name,
-                source_url,
-                source_record_url,
-                source_updated_at,
-                date_issued,
-                raw_payload,
-                last_synced_at
-            FROM licenses
-            WHERE company IS NOT NULL
-              AND COALESCE(company, '') != ''
-            """
-        )
-        rows = cur.fetchall()
+    """Full re-derivation in keyset chunks (commits per chunk); returns relationships written."""
+    try:
+        from backend.services.entity_derivation import derive_license_entities
+    except ImportError:
+        from services.entity_derivation import derive_license_entities
 
-    total = 0
-    for row in rows:
-        total += sync_license_relationships_for_row(conn, row)
-    return total
+    return derive_license_entities(conn, kinds=("relationships",), incremental=False)["relationships"]
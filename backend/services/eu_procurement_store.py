@@ -6,7 +6,13 @@ import json
 from datetime import datetime
 from typing import Any, Optional, Sequence
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
 
+
+@schema_ready("eu_procurement")
 def ensure_eu_procurement_tables(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
@@ -6,6 +6,11 @@ import json
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 SOURCE_ID = "gem_ggit_lng_terminals_september_2025"
 LAYER_LABEL = "LNG terminals — GEM GGIT"
 ATTRIBUTION = "© Global Energy Monitor (GGIT LNG, September 2025)"
@@ -25,6 +30,7 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+@schema_ready("gem_lng_terminals")
 def ensure_gem_lng_tables(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
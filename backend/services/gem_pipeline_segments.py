@@ -6,6 +6,11 @@ import json
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 SOURCE_ID = "gem_goit_oil_ngl_pipelines_march_2025"
 LAYER_LABEL = "Oil/NGL pipelines — GEM GOIT"
 ATTRIBUTION = "© Global Energy Monitor (CC BY 4.0)"
@@ -26,6 +31,7 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+@schema_ready("gem_pipeline_segments")
 def ensure_gem_pipeline_tables(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
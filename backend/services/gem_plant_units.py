@@ -6,6 +6,11 @@ import json
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 SOURCE_ID = "gem_gogpt_plants_january_2026"
 LAYER_LABEL = "Oil & gas plants — GEM GOGPT"
 ATTRIBUTION = "© Global Energy Monitor (GOGPT, January 2026)"
@@ -25,6 +30,7 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+@schema_ready("gem_plant_units")
 def ensure_gem_plant_tables(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
@@ -5,18 +5,27 @@ from __future__ import annotations
 import json
 import os
 import re
-import time
 from typing import Any, Optional
 from urllib.parse import quote
 from urllib.request import Request, urlopen
 
+try:
+    from backend.services.bounded_cache import BoundedCache
+except ImportError:
+    from services.bounded_cache import BoundedCache  # type: ignore[no-redef]
+
 GLEIF_SEARCH_URL = "https://api.gleif.org/api/v1/lei-records"
 USER_AGENT = os.getenv(
     "GLEIF_USER_AGENT",
     "MeridianMiningMap/1.0 (open-data research; contact: admin@example.com)",
 )
 CACHE_TTL_SECONDS = 60 * 60 * 6
-_cache: dict[str, Any] = {"loaded_at": 0.0, "key": "", "payload": {}}
+_cache = BoundedCache(
+    "gleif_lei",
+    max_entries=int(os.getenv("GLEIF_CACHE_MAX", "1024")),
+    ttl_seconds=CACHE_TTL_SECONDS,
+    shared=True,
+)
 
 
 def _normalize_name(value: str) -> str:
@@ -41,21 +50,20 @@ def lookup_lei(company_name: str, *, limit: int = 5, force_refresh: bool = False
     if not query:
         return {"status": "error", "message": "Company name required", "matches": []}
 
-    cache_key = _normalize_name(query)
-    age = time.time() - float(_cache.get("loaded_at") or 0.0)
-    if (
-        not force_refresh
-        and _cache.get("key") == cache_key
-        and _cache.get("payload")
-        and age < CACHE_TTL_SECONDS
-    ):
-        return dict(_cache["payload"])
-
     try:
-        body = _fetch_lei_search(query, limit=limit)
+        return dict(
+            _cache.get_or_load(
+                _normalize_name(query),
+                lambda: _search_lei(query, limit=limit),
+                force=force_refresh,
+            )
+        )
     except Exception as exc:
         return {"status": "error", "message": str(exc), "matches": [], "query": query}
 
+
+def _search_lei(query: str, *, limit: int) -> dict[str, Any]:
+    body = _fetch_lei_search(query, limit=limit)
     matches: list[dict[str, Any]] = []
     for item in body.get("data") or []:
         if not isinstance(item, dict):
@@ -82,7 +90,4 @@ def lookup_lei(company_name: str, *, limit: int = 5, force_refresh: bool = False
         "source": "GLEIF public API",
         "source_url": "https://www.gleif.org/en/lei-data",
     }
-    _cache["loaded_at"] = time.time()
-    _cache["key"] = cache_key
-    _cache["payload"] = out
     return out
@@ -5,7 +5,8 @@ no documented public REST API as of 2026; this module:
 
 1. Optionally calls a partner API when ``GOLDBOD_API_BASE_URL`` + ``GOLDBOD_API_KEY`` are set.
 2. Otherwise matches against the official public License Registry HTML page
-   (https://goldbod.net/license-registry/index.html) with in-memory TTL cache.
+   (https://goldbod.net/license-registry/index.html) with a TTL cache (shared through
+   Redis when configured; a stale registry is served while it refreshes).
 3. Always returns deep links + manual checklist when live data is unavailable.
 
 Env (all optional):
@@ -23,7 +24,6 @@ import json
 import logging
 import os
 import re
-import time
 from datetime import date, datetime
 from difflib import SequenceMatcher
 from typing import Any, Callable, Optional
@@ -31,6 +31,11 @@ from urllib.error import HTTPError, URLError
 from urllib.parse import quote, urlencode
 from urllib.request import Request, urlopen
 
+try:
+    from backend.services.bounded_cache import BoundedCache
+except ImportError:
+    from services.bounded_cache import BoundedCache  # type: ignore[no-redef]
+
 logger = logging.getLogger(__name__)
 
 GOLDBOD_PORTAL_URL = "https://www.goldbod.gov.gh/"
@@ -46,7 +51,9 @@ VALID_STATUSES = {
     "check_manually",
 }
 
-_REGISTRY_CACHE: dict[str, Any] = {"fetched_at": 0.0, "entries": [], "error": None}
+_REGISTRY_CACHE_KEY = "entries"
+# One entry (the parsed registry); TTL comes from GOLDBOD_CACHE_TTL_SECONDS per load.
+_registry_cache = BoundedCache("goldbod_registry", max_entries=1, ttl_seconds=86400, stale_seconds=86400, shared=True)
 
 _LICENSE_CATEGORY_PREFIXES = {
     "GGB/AGR/": "aggregator",
@@ -189,28 +196,21 @@ def load_registry_entries(
     if _env_flag("GOLDBOD_REGISTRY_DISABLED"):
         return [], "registry_disabled"
 
-    now = time.time()
-    ttl = _cache_ttl_seconds()
-    if (
-        not force_refresh
-        and _REGISTRY_CACHE.get("entries")
-        and now - float(_REGISTRY_CACHE.get("fetched_at") or 0) < ttl
-    ):
-        return list(_REGISTRY_CACHE["entries"]), _REGISTRY_CACHE.get("error")
-
     try:
-        html = _fetch_registry_html(urlopen_fn=urlopen_fn)
-        entries = _parse_registry_html(html)
-        _REGISTRY_CACHE["entries"] = entries
-        _REGISTRY_CACHE["fetched_at"] = now
-        _REGISTRY_CACHE["error"] = None if entries else "registry_empty"
-        return entries, _REGISTRY_CACHE["error"]
+        entries = _registry_cache.get_or_load(
+            _REGISTRY_CACHE_KEY,
+            lambda: _parse_registry_html(_fetch_registry_html(urlopen_fn=urlopen_fn)),
+            ttl=_cache_ttl_seconds(),
+            cache_if=bool,
+            force=force_refresh,
+        )
     except (HTTPError, URLError, TimeoutError, OSError) as exc:
         logger.warning("GoldBod registry fetch failed: %s", exc)
-        _REGISTRY_CACHE["error"] = str(exc)
-        if _REGISTRY_CACHE.get("entries"):
-            return list(_REGISTRY_CACHE["entries"]), str(exc)
+        previous = _registry_cache.peek(_REGISTRY_CACHE_KEY)
+        if previous:
+            return list(previous), str(exc)
         return [], str(exc)
+    return list(entries), None if entries else "registry_empty"
 
 
 def _parse_expiry(expiry: str) -> Optional[date]:
@@ -7,6 +7,11 @@ import re
 from datetime import date, datetime, timezone
 from typing import Any, Optional
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 try:
     from backend.services.gov_procurement_intel import (
         COMMODITY_FEED_PROFILES,
@@ -48,6 +53,7 @@ def normalize_recipient_key(*, name: str, uei: Optional[str] = None) -> str:
     return f"name:{slug or 'unknown'}"
 
 
+@schema_ready("gov_procurement")
 def ensure_gov_procurement_tables(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
@@ -0,0 +1,388 @@
+"""Concurrent ArcGIS FeatureServer/MapServer paging with per-host budgets.
+
+``ArcGISFetcher`` pages several ``resultOffset`` windows of a layer in parallel and
+prefetches a few sources ahead of the consumer, while every request to a host goes
+through that host's ``HostBudget`` (max in-flight requests + requests/second). Pages
+are yielded in offset order through bounded queues, so ``sync_open_data_sources``
+can stream normalized features into the upsert stage without holding whole layers.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Iterator, Optional
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urlsplit
+from urllib.request import Request, urlopen
+
+DEFAULT_USER_AGENT = os.getenv(
+    "OPEN_DATA_SYNC_USER_AGENT",
+    "mining-map-open-data-sync/1.0 (+https://cursor.sh)",
+)
+RETRYABLE_HTTP_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER_SECONDS = 60.0
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(key, str(default))))
+    except ValueError:
+        return default
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(key, str(default))))
+    except ValueError:
+        return default
+
+
+class HostBudget:
+    """Caps in-flight requests and spaces request starts to ``rps`` for one host."""
+
+    def __init__(self, *, concurrency: int, rps: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.concurrency = max(1, int(concurrency))
+        self.rps = max(0.0, float(rps))
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._next_start = 0.0
+        self.min_interval = 0.0
+
+    def _interval(self) -> float:
+        base = 1.0 / self.rps if self.rps > 0 else 0.0
+        return max(base, self.min_interval)
+
+    def reserve(self) -> float:
+        """Reserve the next start slot; returns seconds to wait before starting."""
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval()
+            return start - now
+
+    def __enter__(self) -> "HostBudget":
+        self._slots.acquire()
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._slots.release()
+
+
+class HostBudgets:
+    """Lazily created ``HostBudget`` per URL host (``ARCGIS_HOST_CONCURRENCY`` / ``ARCGIS_HOST_RPS``)."""
+
+    def __init__(self, *, concurrency: Optional[int] = None, rps: Optional[float] = None) -> None:
+        self.concurrency = concurrency if concurrency is not None else _env_int("ARCGIS_HOST_CONCURRENCY", 2)
+        self.rps = rps if rps is not None else _env_float("ARCGIS_HOST_RPS", 4.0)
+        self._lock = threading.Lock()
+        self._budgets: dict[str, HostBudget] = {}
+
+    def for_url(self, url: str, *, min_interval: float = 0.0) -> HostBudget:
+        host = (urlsplit(url).netloc or "").lower()
+        with self._lock:
+            budget = self._budgets.get(host)
+            if budget is None:
+                budget = HostBudget(concurrency=self.concurrency, rps=self.rps)
+                self._budgets[host] = budget
+            # A source's request_pause_seconds tightens the whole host, never loosens it.
+            budget.min_interval = max(budget.min_interval, float(min_interval or 0.0))
+            return budget
+
+
+def _retry_after_seconds(exc: HTTPError) -> Optional[float]:
+    raw = exc.headers.get("Retry-After") if exc.headers else None
+    if not raw:
+        return None
+    try:
+        return min(MAX_RETRY_AFTER_SECONDS, max(0.0, float(raw)))
+    except ValueError:
+        pass
+    try:
+        return min(MAX_RETRY_AFTER_SECONDS, max(0.0, parsedate_to_datetime(raw).timestamp() - time.time()))
+    except (TypeError, ValueError):
+        return None
+
+
+def fetch_json(
+    url: str,
+    *,
+    budget: Optional[HostBudget] = None,
+    retries: int = 3,
+    backoff_seconds: float = 1.0,
+    timeout: float = 60.0,
+) -> dict[str, Any]:
+    """GET ``url`` as JSON inside the host budget, retrying transient errors with backoff."""
+    last_error: Exception | None = None
+    for attempt in range(retries):
+        req = Request(url, headers={"User-Agent": DEFAULT_USER_AGENT})
+        delay = backoff_seconds * (2 ** attempt)
+        try:
+            if budget is None:
+                with urlopen(req, timeout=timeout) as response:
+                    return json.load(response)
+            with budget:
+                with urlopen(req, timeout=timeout) as response:
+                    return json.load(response)
+        except HTTPError as exc:
+            last_error = exc
+            if exc.code not in RETRYABLE_HTTP_STATUSES:
+                break
+            delay = _retry_after_seconds(exc) or delay
+        except (URLError, TimeoutError, ValueError) as exc:
+            last_error = exc
+        if attempt < retries - 1:
+            time.sleep(delay)
+    if last_error is None:
+        raise RuntimeError(f"Failed to fetch JSON from {url}")
+    raise RuntimeError(f"Failed to fetch JSON from {url}: {last_error}") from last_error
+
+
+def _query_params(source: Any, **extra: Any) -> dict[str, Any]:
+    params: dict[str, Any] = {
+        "where": source.where,
+        "outFields": "*",
+        "returnGeometry": "true",
+        "f": "pjson",
+        "outSR": "4326",
+    }
+    if source.order_by:
+        params["orderByFields"] = source.order_by
+    params.update(extra)
+    return params
+
+
+def _query_url(source: Any, params: dict[str, Any]) -> str:
+    return f"{source.layer_url}/query?{urlencode(params)}"
+
+
+_DONE = object()
+
+
+class _SourceStream:
+    """Feature iterator over one source's page queue.
+
+    ``close()`` cancels the producer even when iteration never started, so an abandoned
+    source always gives its ``max_sources`` slot back to the sources queued behind it.
+    """
+
+    def __init__(self, out: "queue.Queue[Any]", cancelled: threading.Event, fetcher_closed: threading.Event) -> None:
+        self._out = out
+        self._cancelled = cancelled
+        self._fetcher_closed = fetcher_closed
+        self._page: Iterator[dict[str, Any]] = iter(())
+        self._done = False
+
+    def __iter__(self) -> "_SourceStream":
+        return self
+
+    def __next__(self) -> dict[str, Any]:
+        while True:
+            for feature in self._page:
+                return feature
+            if self._done:
+                raise StopIteration
+            item = self._next_item()
+            if item is _DONE:
+                self.close()
+                raise StopIteration
+            if isinstance(item, Exception):
+                self.close()
+                raise item
+            self._page = iter(item)
+
+    def _next_item(self) -> Any:
+        while True:
+            try:
+                return self._out.get(timeout=0.5)
+            except queue.Empty:
+                if self._fetcher_closed.is_set() or self._cancelled.is_set():
+                    self.close()
+                    raise RuntimeError("ArcGIS source stream closed before it finished")
+
+    def close(self) -> None:
+        self._done = True
+        self._page = iter(())
+        self._cancelled.set()
+
+
+class ArcGISFetcher:
+    """Thread-pool ArcGIS fetcher shared across sources.
+
+    ``max_workers`` bounds page requests in flight overall, ``page_window`` bounds pages
+    fetched ahead per source, and ``max_sources`` bounds sources fetched concurrently
+    (the one being consumed plus prefetch). Per-host limits come from ``budgets``.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: Optional[int] = None,
+        max_sources: Optional[int] = None,
+        page_window: Optional[int] = None,
+        budgets: Optional[HostBudgets] = None,
+        fetch: Optional[Callable[..., dict[str, Any]]] = None,
+    ) -> None:
+        self.max_workers = max_workers or _env_int("ARCGIS_FETCH_WORKERS", 8)
+        self.max_sources = max_sources or _env_int("ARCGIS_FETCH_SOURCES", 3)
+        self.page_window = page_window or _env_int("ARCGIS_FETCH_PAGE_WINDOW", 4)
+        self.budgets = budgets or HostBudgets()
+        self._fetch = fetch or fetch_json
+        self._pages = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="arcgis-page")
+        self._sources = ThreadPoolExecutor(max_workers=self.max_sources, thread_name_prefix="arcgis-source")
+        self._closed = threading.Event()
+
+    def __enter__(self) -> "ArcGISFetcher":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._sources.shutdown(wait=True, cancel_futures=True)
+        self._pages.shutdown(wait=True, cancel_futures=True)
+
+    def _get(self, source: Any, params: dict[str, Any]) -> dict[str, Any]:
+        url = _query_url(source, params)
+        budget = self.budgets.for_url(url, min_interval=getattr(source, "request_pause_seconds", 0.0))
+        payload = self._fetch(url, budget=budget)
+        if payload.get("error"):
+            raise RuntimeError(f"{source.source_id} ArcGIS query failed: {payload['error']}")
+        return payload
+
+    def _count(self, source: Any) -> Optional[int]:
+        try:
+            payload = self._get(source, {"where": source.where, "returnCountOnly": "true", "f": "pjson"})
+        except Exception:
+            return None
+        count = payload.get("count")
+        return int(count) if isinstance(count, int) or (isinstance(count, str) and count.isdigit()) else None
+
+    def _fetch_range(self, source: Any, offset: int, size: int) -> list[dict[str, Any]]:
+        """Features in ``[offset, offset + size)``; re-pages when the server caps below ``size``."""
+        features: list[dict[str, Any]] = []
+        while len(features) < size:
+            want = size - len(features)
+            payload = self._get(
+                source,
+                _query_params(source, resultOffset=offset + len(features), resultRecordCount=want),
+            )
+            page = payload.get("features") or []
+            if not page:
+                break
+            features.extend(page[:want])
+            if len(page) >= want or not payload.get("exceededTransferLimit"):
+                break
+        return features
+
+    def _iter_sequential(self, source: Any) -> Iterator[list[dict[str, Any]]]:
+        fetched = 0
+        offset = 0
+        while True:
+            remaining = None
+            if source.max_records is not None:
+                remaining = source.max_records - fetched
+                if remaining <= 0:
+                    return
+            batch_size = min(source.page_size, remaining) if remaining is not None else source.page_size
+            payload = self._get(source, _query_params(source, resultOffset=offset, resultRecordCount=batch_size))
+            features = payload.get("features") or []
+            if not features:
+                return
+            yield features[:batch_size]
+            fetched += min(len(features), batch_size)
+            offset += len(features)
+            # Some MapServers omit exceededTransferLimit but still honor resultOffset.
+            if not payload.get("exceededTransferLimit") and len(features) < batch_size:
+                return
+
+    def iter_pages(self, source: Any) -> Iterator[list[dict[str, Any]]]:
+        """Yield feature pages of one source in offset order."""
+        if not source.supports_result_offset:
+            payload = self._get(source, _query_params(source))
+            features = list(payload.get("features") or [])
+            if source.max_records is not None:
+                features = features[: source.max_records]
+            yield features
+            return
+
+        total = self._count(source)
+        if total is None:
+            yield from self._iter_sequential(source)
+            return
+        if source.max_records is not None:
+            total = min(total, source.max_records)
+        offsets = iter(range(0, total, source.page_size))
+        in_flight: deque[Future] = deque()
+
+        def _submit_next() -> bool:
+            offset = next(offsets, None)
+            if offset is None:
+                return False
+            size = min(source.page_size, total - offset)
+            in_flight.append(self._pages.submit(self._fetch_range, source, offset, size))
+            return True
+
+        try:
+            for _ in range(self.page_window):
+                if not _submit_next():
+                    break
+            while in_flight:
+                page = in_flight.popleft().result()
+                _submit_next()
+                if page:
+                    yield page
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def iter_features(self, source: Any) -> Iterator[dict[str, Any]]:
+        for page in self.iter_pages(source):
+            yield from page
+
+    def _produce(self, source: Any, out: "queue.Queue[Any]", cancelled: threading.Event) -> None:
+        def _put(item: Any) -> bool:
+            while not (self._closed.is_set() or cancelled.is_set()):
+                try:
+                    out.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            for page in self.iter_pages(source):
+                if not _put(page):
+                    return
+        except Exception as exc:
+            _put(exc)
+            return
+        _put(_DONE)
+
+    def stream_sources(self, sources: list[Any]) -> Iterator[tuple[Any, Iterator[dict[str, Any]]]]:
+        """Yield ``(source, features)`` in registry order while later sources prefetch.
+
+        Each source gets a bounded page queue, so at most ``max_sources`` layers are in
+        flight and each holds no more than ``page_window`` pages. Fetch errors are raised
+        from the features iterator of the source that failed; callers should ``close()``
+        an iterator they stop reading early.
+        """
+        streams: list[tuple[Any, "queue.Queue[Any]", threading.Event]] = []
+        for source in sources:
+            out: "queue.Queue[Any]" = queue.Queue(maxsize=self.page_window)
+            cancelled = threading.Event()
+            streams.append((source, out, cancelled))
+            self._sources.submit(self._produce, source, out, cancelled)
+        for source, out, cancelled in streams:
+            yield source, _SourceStream(out, cancelled, self._closed)
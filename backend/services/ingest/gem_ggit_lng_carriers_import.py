@@ -11,6 +11,11 @@ import os
 from pathlib import Path
 from typing import Any, Optional
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 REPO_ROOT = Path(__file__).resolve().parents[3]
 DEFAULT_FILENAME = "Global-Gas-Infrastructure-Tracker-GGIT-LNG-Carriers-December-2025.xlsx"
 
@@ -22,6 +27,7 @@ def default_workbook_path() -> Path:
     return REPO_ROOT / DEFAULT_FILENAME
 
 
+@schema_ready("gem_lng_carriers")
 def ensure_gem_lng_carrier_tables(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
@@ -2,33 +2,46 @@ from __future__ import annotations
 
 import functools
 import hashlib
+import io
 import json
-import os
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Iterable, Optional
-from urllib.error import HTTPError, URLError
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
 
 try:
-    from backend.services.entity_contacts import sync_license_contacts_for_row
+    from backend.country_lookup import resolve_countries
 except ImportError:
-    from services.entity_contacts import sync_license_contacts_for_row
+    from country_lookup import resolve_countries
 
 try:
-    from backend.services.entity_relationships import sync_license_relationships_for_row
+    from backend.services.ingest.arcgis_fetch import ArcGISFetcher, fetch_json
 except ImportError:
-    from services.entity_relationships import sync_license_relationships_for_row
+    from services.ingest.arcgis_fetch import ArcGISFetcher, fetch_json
+
+try:
+    from backend.services.entity_contacts import sync_license_contacts_for_rows
+except ImportError:
+    from services.entity_contacts import sync_license_contacts_for_rows
+
+try:
+    from backend.services.entity_relationships import sync_license_relationships_for_rows
+except ImportError:
+    from services.entity_relationships import sync_license_relationships_for_rows
+
+try:
+    from backend.services.entity_derivation import LICENSE_DERIVATION_COLUMNS
+except ImportError:
+    from services.entity_derivation import LICENSE_DERIVATION_COLUMNS
+
+try:
+    from psycopg2.extras import RealDictCursor
+except ImportError:
+    RealDictCursor = None
 
 
 BACKEND_ROOT = Path(__file__).resolve().parents[2]
-DEFAULT_USER_AGENT = os.getenv(
-    "OPEN_DATA_SYNC_USER_AGENT",
-    "mining-map-open-data-sync/1.0 (+https://cursor.sh)",
-)
 
 
 def _clean_text(value: Any) -> Optional[str]:
@@ -1465,77 +1478,13 @@ def _sector_coverage_overrides(country: str, sector: str) -> dict[str, Any]:
 
 
 def _fetch_json(url: str, retries: int = 3, pause_seconds: float = 1.0) -> dict[str, Any]:
-    last_error: Exception | None = None
-    for attempt in range(retries):
-        req = Request(url, headers={"User-Agent": DEFAULT_USER_AGENT})
-        try:
-            with urlopen(req, timeout=60) as response:
-                return json.load(response)
-        except (HTTPError, URLError, TimeoutError, ValueError) as exc:
-            last_error = exc
-            if attempt < retries - 1:
-                time.sleep(pause_seconds)
-    if last_error is None:
-        raise RuntimeError(f"Failed to fetch JSON from {url}")
-    raise RuntimeError(f"Failed to fetch JSON from {url}: {last_error}") from last_error
+    return fetch_json(url, retries=retries, backoff_seconds=pause_seconds)
 
 
 def fetch_arcgis_features(source: ArcGISOpenDataSource) -> list[dict[str, Any]]:
-    if not source.supports_result_offset:
-        params: dict[str, Any] = {
-            "where": source.where,
-            "outFields": "*",
-            "returnGeometry": "true",
-            "f": "pjson",
-            "outSR": "4326",
-        }
-        if source.order_by:
-            params["orderByFields"] = source.order_by
-        query_url = f"{source.layer_url}/query?{urlencode(params)}"
-        payload = _fetch_json(query_url)
-        if payload.get("error"):
-            raise RuntimeError(f"{source.source_id} ArcGIS query failed: {payload['error']}")
-        features = list(payload.get("features") or [])
-        if source.max_records is not None:
-            features = features[: source.max_records]
-        return features
-
-    all_features: list[dict[str, Any]] = []
-    offset = 0
-    while True:
-        remaining = None
-        if source.max_records is not None:
-            remaining = source.max_records - len(all_features)
-            if remaining <= 0:
-                break
-        batch_size = min(source.page_size, remaining) if remaining is not None else source.page_size
-        params = {
-            "where": source.where,
-            "outFields": "*",
-            "returnGeometry": "true",
-            "f": "pjson",
-            "outSR": "4326",
-            "resultOffset": offset,
-            "resultRecordCount": batch_size,
-        }
-        if source.order_by:
-            params["orderByFields"] = source.order_by
-        query_url = f"{source.layer_url}/query?{urlencode(params)}"
-        payload = _fetch_json(query_url)
-        if payload.get("error"):
-            raise RuntimeError(f"{source.source_id} ArcGIS query failed: {payload['error']}")
-        features = payload.get("features", [])
-        if not features:
-            break
-        all_features.extend(features[:batch_size])
-        offset += len(features)
-        if not payload.get("exceededTransferLimit"):
-            # Some MapServers omit exceededTransferLimit but still honor resultOffset.
-            if len(features) < batch_size:
-                break
-        if source.request_pause_seconds > 0:
-            time.sleep(source.request_pause_seconds)
-    return all_features
+    """All features of one layer (pages fetched concurrently within the host budget)."""
+    with ArcGISFetcher(max_sources=1) as fetcher:
+        return list(fetcher.iter_features(source))
 
 
 def normalize_feature(source: ArcGISOpenDataSource, feature: dict[str, Any]) -> dict[str, Any]:
@@ -1588,110 +1537,269 @@ def normalize_feature(source: ArcGISOpenDataSource, feature: dict[str, Any]) ->
     }
 
 
-def _dedupe_by_id(records: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
-    deduped: dict[str, dict[str, Any]] = {}
+GLOBAL_SOURCE_COUNTRY = "Global"
+
+
+def _resolve_country_batch(records: list[dict[str, Any]]) -> None:
+    pending = [
+        record
+        for record in records
+        if record.get("country") == GLOBAL_SOURCE_COUNTRY
+        and record.get("lat") is not None
+        and record.get("lng") is not None
+    ]
+    if not pending:
+        return
+    resolved = resolve_countries([record["lat"] for record in pending], [record["lng"] for record in pending])
+    for record, (country, _) in zip(pending, resolved):
+        if country != "Unknown":
+            record["country"] = country
+
+
+def fill_countries_from_coordinates(
+    records: Iterable[dict[str, Any]],
+    *,
+    batch_size: Optional[int] = None,
+) -> Iterable[dict[str, Any]]:
+    """Replace the ``Global`` placeholder country with a point-in-country lookup, a batch at a time.
+
+    Global layers (MRDS, megagiant fields) fall back to ``Global`` when a feature has no
+    COUNTRY attribute; their coordinates still place them in a real country.
+    """
+    batch_size = batch_size or COPY_CHUNK_ROWS
+    batch: list[dict[str, Any]] = []
     for record in records:
-        deduped[record["id"]] = record
-    return list(deduped.values())
+        batch.append(record)
+        if len(batch) >= batch_size:
+            _resolve_country_batch(batch)
+            yield from batch
+            batch = []
+    if batch:
+        _resolve_country_batch(batch)
+        yield from batch
+
+
+class _CountingIterator:
+    """Pass-through iterator that counts items (features fetched while streaming)."""
+
+    def __init__(self, items: Iterable[Any]) -> None:
+        self._items = iter(items)
+        self.count = 0
+
+    def __iter__(self) -> "_CountingIterator":
+        return self
+
+    def __next__(self) -> Any:
+        item = next(self._items)
+        self.count += 1
+        return item
 
 
 def _default_db_connection():
-    import psycopg2
-
-    database_url = os.getenv("DATABASE_URL", "").strip()
-    if database_url:
-        return psycopg2.connect(database_url, connect_timeout=5)
-    return psycopg2.connect(
-        host=os.getenv("DB_HOST", "localhost"),
-        port=int(os.getenv("DB_PORT", "5432")),
-        database=os.getenv("DB_NAME", "mining_db"),
-        user=os.getenv("DB_USER", "postgres"),
-        password=os.getenv("DB_PASSWORD", "password"),
-        connect_timeout=5,
-    )
+    try:
+        from backend.services.db_pool import get_pooled_connection
+    except ImportError:
+        from services.db_pool import get_pooled_connection
 
+    return get_pooled_connection()
 
-UPSERT_SQL = """
-    INSERT INTO licenses (
-        id, company, country, region, commodity, license_type, status, lat, lng,
-        date_issued, sector, record_origin, source_id, source_name, source_url,
-        source_record_url, source_updated_at, raw_payload, last_synced_at
-    )
-    VALUES (
-        %s, %s, %s, %s, %s, %s, %s, %s, %s,
-        %s, %s, %s, %s, %s, %s,
-        %s, %s, %s, CURRENT_TIMESTAMP
-    )
+
+def _refresh_country_origin_summary(conn: Any, countries: Optional[Iterable[Any]] = None) -> None:
+    """Keep license_country_origin_summary in step with origin-changing writes (best effort)."""
+    try:
+        try:
+            from backend.services.license_map_perf import refresh_license_country_origin_summary
+        except ImportError:
+            from services.license_map_perf import refresh_license_country_origin_summary
+
+        refresh_license_country_origin_summary(conn, countries)
+    except Exception as exc:
+        print(f"[OpenData] Country origin summary refresh skipped: {exc}")
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+
+
+_STAGE_COLUMNS = (
+    "id",
+    "company",
+    "country",
+    "region",
+    "commodity",
+    "license_type",
+    "status",
+    "lat",
+    "lng",
+    "date_issued",
+    "sector",
+    "record_origin",
+    "source_id",
+    "source_name",
+    "source_url",
+    "source_record_url",
+    "source_updated_at",
+    "raw_payload",
+)
+_STAGE_TABLE = "open_data_license_stage"
+COPY_CHUNK_ROWS = 5000
+DERIVE_CHUNK_ROWS = 500
+
+MERGE_STAGE_SQL = f"""
+    INSERT INTO licenses ({", ".join(_STAGE_COLUMNS)}, last_synced_at)
+    SELECT DISTINCT ON (id) {", ".join(_STAGE_COLUMNS)}, CURRENT_TIMESTAMP
+    FROM {_STAGE_TABLE}
+    ORDER BY id, stage_seq DESC
     ON CONFLICT (id) DO UPDATE SET
-        company = EXCLUDED.company,
-        country = EXCLUDED.country,
-        region = EXCLUDED.region,
-        commodity = EXCLUDED.commodity,
-        license_type = EXCLUDED.license_type,
-        status = EXCLUDED.status,
-        lat = EXCLUDED.lat,
-        lng = EXCLUDED.lng,
-        date_issued = EXCLUDED.date_issued,
-        sector = EXCLUDED.sector,
-        record_origin = EXCLUDED.record_origin,
-        source_id = EXCLUDED.source_id,
-        source_name = EXCLUDED.source_name,
-        source_url = EXCLUDED.source_url,
-        source_record_url = EXCLUDED.source_record_url,
-        source_updated_at = EXCLUDED.source_updated_at,
-        raw_payload = EXCLUDED.raw_payload,
+        {", ".join(f"{column} = EXCLUDED.{column}" for column in _STAGE_COLUMNS if column != "id")},
         last_synced_at = CURRENT_TIMESTAMP
-    WHERE licenses.manually_edited IS NOT TRUE;
+    WHERE licenses.manually_edited IS NOT TRUE
+    RETURNING id, record_origin;
 """
 
 
-def upsert_open_data_records(
+@dataclass
+class OpenDataUpsertStats:
+    written: int = 0
+    unique: int = 0
+    merged: int = 0
+    skipped_manual: int = 0
+    contacts: int = 0
+    relationships: int = 0
+    duration_sec: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return round(self.written / self.duration_sec, 1) if self.duration_sec > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "written": self.written,
+            "unique": self.unique,
+            "merged": self.merged,
+            "skipped_manual": self.skipped_manual,
+            "contacts": self.contacts,
+            "relationships": self.relationships,
+            "duration_ms": int(round(self.duration_sec * 1000)),
+            "rows_per_sec": self.rows_per_sec,
+        }
+
+
+def _copy_text(value: Any) -> str:
+    """One field in COPY text format (``\\N`` for NULL, backslash escapes for separators)."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    text = str(value).replace("\x00", "")
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _copy_stage_chunk(cur: Any, rows: list[dict[str, Any]]) -> None:
+    buffer = io.StringIO()
+    for record in rows:
+        buffer.write("\t".join(_copy_text(record[column]) for column in _STAGE_COLUMNS))
+        buffer.write("\n")
+    buffer.seek(0)
+    cur.copy_expert(
+        f"COPY {_STAGE_TABLE} ({', '.join(_STAGE_COLUMNS)}) FROM STDIN",
+        buffer,
+    )
+
+
+_DERIVE_SELECT_SQL = f"""
+    SELECT {", ".join(LICENSE_DERIVATION_COLUMNS)}
+    FROM licenses
+    WHERE id = ANY(%s)
+"""
+
+
+def _derive_license_entities(conn: Any, license_ids: list[str], stats: OpenDataUpsertStats) -> None:
+    """Contacts + relationships for merged licenses, re-read from ``licenses`` one chunk of ids at
+    a time so the staged records are never held in memory; a failed chunk is rolled back alone."""
+    cursor_kwargs = {"cursor_factory": RealDictCursor} if RealDictCursor is not None else {}
+    for idx in range(0, len(license_ids), DERIVE_CHUNK_ROWS):
+        chunk_ids = license_ids[idx: idx + DERIVE_CHUNK_ROWS]
+        with conn.cursor() as cur:
+            cur.execute("SAVEPOINT open_data_derive")
+            try:
+                with conn.cursor(**cursor_kwargs) as select_cur:
+                    select_cur.execute(_DERIVE_SELECT_SQL, (chunk_ids,))
+                    rows = [dict(row) for row in select_cur.fetchall()]
+                stats.contacts += sync_license_contacts_for_rows(conn, rows)
+                stats.relationships += sync_license_relationships_for_rows(conn, rows)
+                cur.execute("RELEASE SAVEPOINT open_data_derive")
+            except Exception as exc:
+                cur.execute("ROLLBACK TO SAVEPOINT open_data_derive")
+                cur.execute("RELEASE SAVEPOINT open_data_derive")
+                print(
+                    f"[OpenData] Contact/relationship sync skipped for {len(chunk_ids)} rows "
+                    f"starting {chunk_ids[0]}: {exc}"
+                )
+
+
+def bulk_upsert_open_data_records(
     conn: Any,
     records: Iterable[dict[str, Any]],
     *,
     sync_contacts: bool = True,
-) -> int:
-    written = 0
+) -> OpenDataUpsertStats:
+    """COPY records into a temp staging table, merge with one ``INSERT ... ON CONFLICT``, then
+    derive contacts/relationships for the merged rows. Manually edited licenses are left alone
+    (counted in ``skipped_manual``); duplicate ids keep the last record, like the row-wise path.
+    """
+    started = time.perf_counter()
+    stats = OpenDataUpsertStats()
+    countries: set[Any] = set()
     with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS pg_temp.{_STAGE_TABLE}")
+        cur.execute(
+            f"""
+            CREATE TEMP TABLE {_STAGE_TABLE} ON COMMIT DROP AS
+            SELECT {", ".join(_STAGE_COLUMNS)} FROM licenses WITH NO DATA
+            """
+        )
+        cur.execute(f"ALTER TABLE {_STAGE_TABLE} ADD COLUMN stage_seq BIGSERIAL")
+        chunk: list[dict[str, Any]] = []
         for record in records:
-            cur.execute(
-                UPSERT_SQL,
-                (
-                    record["id"],
-                    record["company"],
-                    record["country"],
-                    record["region"],
-                    record["commodity"],
-                    record["license_type"],
-                    record["status"],
-                    record["lat"],
-                    record["lng"],
-                    record["date_issued"],
-                    record["sector"],
-                    record["record_origin"],
-                    record["source_id"],
-                    record["source_name"],
-                    record["source_url"],
-                    record["source_record_url"],
-                    record["source_updated_at"],
-                    record["raw_payload"],
-                ),
-            )
-            if sync_contacts and record.get("record_origin") != "global_open_fallback":
-                try:
-                    sync_license_contacts_for_row(conn, record)
-                except Exception as contact_exc:
-                    print(f"[OpenData] Contact sync skipped for {record.get('id')}: {contact_exc}")
-                try:
-                    sync_license_relationships_for_row(conn, record)
-                except Exception as rel_exc:
-                    print(f"[OpenData] Relationship sync skipped for {record.get('id')}: {rel_exc}")
-            
-            written += 1
-            if written % 100 == 0:
-                conn.commit()
+            countries.add(record["country"])
+            chunk.append(record)
+            stats.written += 1
+            if len(chunk) >= COPY_CHUNK_ROWS:
+                _copy_stage_chunk(cur, chunk)
+                chunk = []
+        if chunk:
+            _copy_stage_chunk(cur, chunk)
+        if not stats.written:
+            conn.commit()
+            return stats
+        cur.execute(f"SELECT COUNT(DISTINCT id) FROM {_STAGE_TABLE}")
+        stats.unique = int(cur.fetchone()[0])
+        cur.execute(MERGE_STAGE_SQL)
+        derive_ids: list[str] = []
+        for license_id, record_origin in cur.fetchall():
+            stats.merged += 1
+            if sync_contacts and record_origin != "global_open_fallback":
+                derive_ids.append(str(license_id))
+    stats.skipped_manual = max(0, stats.unique - stats.merged)
+    if derive_ids:
+        _derive_license_entities(conn, derive_ids, stats)
     conn.commit()
-    return written
+    stats.duration_sec = time.perf_counter() - started
+    if countries:
+        _refresh_country_origin_summary(conn, countries)
+    return stats
+
+
+def upsert_open_data_records(
+    conn: Any,
+    records: Iterable[dict[str, Any]],
+    *,
+    sync_contacts: bool = True,
+) -> int:
+    return bulk_upsert_open_data_records(conn, records, sync_contacts=sync_contacts).written
 
 
 def mark_existing_bundled_rows(conn: Any) -> int:
@@ -1737,6 +1845,8 @@ def mark_existing_bundled_rows(conn: Any) -> int:
             if updated % 2500 == 0:
                 conn.commit()
     conn.commit()
+    if updated:
+        _refresh_country_origin_summary(conn)
     return updated
 
 
@@ -1814,11 +1924,16 @@ def seed_bundled_json_fallback(conn: Any) -> int:
 def sync_open_data_sources(
     conn: Any | None = None,
     source_ids: Optional[Iterable[str]] = None,
+    *,
+    fetcher: Optional[ArcGISFetcher] = None,
 ) -> dict[str, Any]:
     requested = set(source_ids or [])
     own_connection = conn is None
     if conn is None:
         conn = _default_db_connection()
+    own_fetcher = fetcher is None
+    if fetcher is None:
+        fetcher = ArcGISFetcher()
 
     summary = {
         "sources": [],
@@ -1844,24 +1959,35 @@ def sync_open_data_sources(
             )
 
         summary["bundled_rows_marked"] = mark_existing_bundled_rows(conn)
-        for source in OPEN_DATA_SOURCES:
-            if requested and source.source_id not in requested:
-                continue
+        selected = [source for source in OPEN_DATA_SOURCES if not requested or source.source_id in requested]
+        # Later sources page in the background (per-host budgets) while the current one is upserted;
+        # features stream straight into the COPY stage and duplicates collapse in the merge.
+        for source, features in fetcher.stream_sources(selected):
             run_id: int | None = None
+            fetched = 0
             try:
                 run_id = start_license_sync_run(conn, source_id=source.source_id)
-                features = fetch_arcgis_features(source)
-                records = _dedupe_by_id(normalize_feature(source, feature) for feature in features)
-                written = upsert_open_data_records(conn, records, sync_contacts=source.sync_contacts)
-                summary["records_fetched"] += len(features)
+                counted = _CountingIterator(features)
+                records = (normalize_feature(source, feature) for feature in counted)
+                if source.country == GLOBAL_SOURCE_COUNTRY:
+                    records = fill_countries_from_coordinates(records)
+                upsert_stats = bulk_upsert_open_data_records(
+                    conn,
+                    records,
+                    sync_contacts=source.sync_contacts,
+                )
+                fetched = counted.count
+                written = upsert_stats.unique
+                summary["records_fetched"] += fetched
                 summary["records_written"] += written
                 source_summary = {
                     "source_id": source.source_id,
                     "source_name": source.source_name,
                     "sector": source.sector,
                     "country": source.country,
-                    "fetched": len(features),
+                    "fetched": fetched,
                     "written": written,
+                    "upsert": upsert_stats.as_dict(),
                     "metadata": source.metadata,
                 }
                 summary["sources"].append(source_summary)
@@ -1876,9 +2002,12 @@ def sync_open_data_sources(
                         conn,
                         run_id,
                         status="success",
-                        records_fetched=len(features),
+                        records_fetched=fetched,
                         records_written=written,
+                        records_skipped_manual=upsert_stats.skipped_manual,
                         drift_warning=drift_warning,
+                        duration_ms=int(round(upsert_stats.duration_sec * 1000)),
+                        rows_per_sec=upsert_stats.rows_per_sec,
                     )
                     run_entry = {"run_id": run_id, **source_summary, "status": "success"}
                     if drift_warning:
@@ -1907,8 +2036,26 @@ def sync_open_data_sources(
                             conn.rollback()
                         except Exception:
                             pass
+            finally:
+                features.close()
+        if summary["records_written"] or summary["bundled_rows_marked"]:
+            try:
+                try:
+                    from backend.services.license_map_perf import rebuild_license_map_cells
+                except ImportError:
+                    from services.license_map_perf import rebuild_license_map_cells
+
+                summary["map_cells"] = rebuild_license_map_cells(conn)
+            except Exception as exc:
+                summary["errors"].append(f"license_map_cells: {exc}")
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
         return summary
     finally:
+        if own_fetcher:
+            fetcher.close()
         if own_connection and conn is not None:
             conn.close()
 
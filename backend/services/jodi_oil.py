@@ -9,6 +9,11 @@ import os
 import urllib.request
 from typing import Any
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 JODI_ENABLED = (os.getenv("JODI_SYNC_ENABLED") or "true").strip().lower() not in {
     "0",
     "false",
@@ -41,6 +46,7 @@ def _record_jodi_sync(conn: Any, step: dict[str, Any]) -> None:
         pass
 
 
+@schema_ready("jodi_oil")
 def ensure_jodi_table(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
@@ -0,0 +1,347 @@
+"""Streaming license exports (CSV, gzip CSV, Parquet) over a server-side cursor.
+
+``/licenses/export`` and ``/api/admin/licenses/export`` used to ``fetchall()`` the
+whole table and build the CSV in memory before the first byte went out. Here rows
+come from a named psycopg2 cursor ``itersize`` at a time and are encoded into
+chunks as they arrive, so memory stays flat and the download starts immediately.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+import uuid
+import zlib
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+try:
+    from psycopg2.extras import RealDictCursor
+except ImportError:  # pragma: no cover - tests can import without psycopg2 extras.
+    RealDictCursor = None
+
+LICENSE_EXPORT_COLUMNS = [
+    "id",
+    "company",
+    "country",
+    "region",
+    "commodity",
+    "license_type",
+    "status",
+    "lat",
+    "lng",
+    "phone_number",
+    "contact_person",
+    "public_business_phone",
+    "public_business_phone_source",
+    "public_business_phone_source_type",
+    "date_issued",
+]
+
+LICENSE_EXPORT_PROVENANCE_COLUMNS = [
+    "sector",
+    "record_origin",
+    "source_id",
+    "source_name",
+    "source_url",
+    "source_record_url",
+    "source_updated_at",
+    "last_synced_at",
+    "manually_edited",
+]
+
+ADMIN_LICENSE_EXPORT_COLUMNS = [
+    "id",
+    "company",
+    "country",
+    "region",
+    "commodity",
+    "license_type",
+    "status",
+    "lat",
+    "lng",
+    "phone_number",
+    "contact_person",
+    "date_issued",
+    "sector",
+    "record_origin",
+    "source_id",
+    "source_name",
+    "source_url",
+    "source_record_url",
+    "source_updated_at",
+    "last_synced_at",
+    "manually_edited",
+    "manually_edited_at",
+    "manually_edited_by",
+]
+
+LICENSE_EXPORT_SQL = """
+    SELECT
+        licenses.*,
+        public_phone.value AS public_business_phone,
+        public_phone.source_name AS public_business_phone_source,
+        public_phone.source_type AS public_business_phone_source_type
+    FROM licenses
+    LEFT JOIN LATERAL (
+        SELECT
+            value,
+            source_name,
+            source_type
+        FROM entity_contacts
+        WHERE entity_id = licenses.id
+          AND entity_kind = 'license'
+          AND contact_type = 'phone'
+          AND contact_scope = 'public_business'
+        ORDER BY
+            CASE source_type
+                WHEN 'official_open_data' THEN 1
+                WHEN 'source_backed_record' THEN 2
+                WHEN 'llm_extracted_from_source' THEN 3
+                ELSE 4
+            END,
+            confidence_score DESC NULLS LAST,
+            last_seen_at DESC NULLS LAST
+        LIMIT 1
+    ) AS public_phone ON TRUE
+"""
+
+EXPORT_FORMATS = ("csv", "parquet")
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "csv.gz": "application/gzip",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXPORT_ITERSIZE = max(100, int(os.getenv("LICENSE_EXPORT_ITERSIZE", "2000")))
+CSV_CHUNK_ROWS = 1000
+PARQUET_ROW_GROUP_ROWS = 50_000
+
+_PARQUET_FLOAT_COLUMNS = {"lat", "lng"}
+_PARQUET_BOOL_COLUMNS = {"manually_edited"}
+
+
+def license_export_columns(*, include_provenance: bool = False) -> list[str]:
+    columns = list(LICENSE_EXPORT_COLUMNS)
+    if include_provenance:
+        columns.extend(LICENSE_EXPORT_PROVENANCE_COLUMNS)
+    return columns
+
+
+def admin_license_export_query(
+    *, sector: Optional[str] = None, country: Optional[str] = None
+) -> tuple[str, list[Any]]:
+    query = f"""
+        SELECT {", ".join(ADMIN_LICENSE_EXPORT_COLUMNS)}
+        FROM licenses
+        WHERE 1=1
+    """
+    params: list[Any] = []
+    if sector:
+        query += " AND lower(coalesce(sector, 'mining')) = lower(%s)"
+        params.append(sector.strip())
+    if country:
+        query += " AND lower(country) = lower(%s)"
+        params.append(country.strip())
+    query += " ORDER BY country, sector, company"
+    return query, params
+
+
+def export_filename(stem: str, fmt: str, *, gzip_output: bool = False) -> str:
+    if fmt == "parquet":
+        return f"{stem}.parquet"
+    return f"{stem}.csv.gz" if gzip_output else f"{stem}.csv"
+
+
+def export_media_type(fmt: str, *, gzip_output: bool = False) -> str:
+    if fmt == "csv" and gzip_output:
+        return EXPORT_MEDIA_TYPES["csv.gz"]
+    return EXPORT_MEDIA_TYPES[fmt]
+
+
+def open_export_cursor(
+    conn: Any,
+    query: str,
+    params: Sequence[Any] = (),
+    *,
+    itersize: int = EXPORT_ITERSIZE,
+) -> Any:
+    """Declare a named (server-side) cursor and run ``query`` on it.
+
+    Executing before the response starts means SQL errors still surface as a 500
+    instead of a truncated download.
+    """
+    cur = conn.cursor(name=f"license_export_{uuid.uuid4().hex[:12]}", cursor_factory=RealDictCursor)
+    cur.itersize = itersize
+    cur.execute(query, tuple(params))
+    return cur
+
+
+def iter_cursor_rows(conn: Any, cur: Any) -> Iterator[dict[str, Any]]:
+    """Yield rows from ``cur``; closes the cursor and connection when done or abandoned."""
+    try:
+        for row in cur:
+            yield row
+    finally:
+        try:
+            cur.close()
+        except Exception:
+            pass
+        conn.close()
+
+
+def iter_csv_chunks(
+    rows: Iterable[dict[str, Any]],
+    columns: Sequence[str],
+    *,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """Encode ``rows`` as UTF-8 CSV, header first, ``chunk_rows`` rows per chunk."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow([row.get(col) for col in columns])
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    tail = buffer.getvalue()
+    if tail:
+        yield tail.encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], *, level: int = 6) -> Iterator[bytes]:
+    """Incrementally gzip a byte stream (single gzip member)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def parquet_export_available() -> bool:
+    """pyarrow is optional (not in requirements.txt); without it ``format=parquet`` is a 501."""
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever ParquetWriter flushed so far."""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._parts.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _parquet_schema(columns: Sequence[str]) -> Any:
+    import pyarrow as pa
+
+    fields = []
+    for col in columns:
+        if col in _PARQUET_FLOAT_COLUMNS:
+            fields.append(pa.field(col, pa.float64()))
+        elif col in _PARQUET_BOOL_COLUMNS:
+            fields.append(pa.field(col, pa.bool_()))
+        else:
+            fields.append(pa.field(col, pa.string()))
+    return pa.schema(fields)
+
+
+def _parquet_value(col: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if col in _PARQUET_FLOAT_COLUMNS:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    if col in _PARQUET_BOOL_COLUMNS:
+        return bool(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_parquet_chunks(
+    rows: Iterable[dict[str, Any]],
+    columns: Sequence[str],
+    *,
+    row_group_rows: int = PARQUET_ROW_GROUP_ROWS,
+) -> Iterator[bytes]:
+    """Encode ``rows`` as Parquet, yielding bytes after each row group (requires pyarrow).
+
+    Coordinates are float64 and ``manually_edited`` is boolean; every other column is
+    a string (timestamps in ISO 8601) so batches never disagree on inferred types.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    batch: dict[str, list[Any]] = {col: [] for col in columns}
+    pending = 0
+    try:
+        for row in rows:
+            for col in columns:
+                batch[col].append(_parquet_value(col, row.get(col)))
+            pending += 1
+            if pending >= row_group_rows:
+                writer.write_table(pa.Table.from_pydict(batch, schema=schema))
+                batch = {col: [] for col in columns}
+                pending = 0
+                data = sink.drain()
+                if data:
+                    yield data
+        if pending:
+            writer.write_table(pa.Table.from_pydict(batch, schema=schema))
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def encode_license_export(
+    rows: Iterable[dict[str, Any]],
+    columns: Sequence[str],
+    fmt: str,
+    *,
+    gzip_output: bool = False,
+) -> Iterator[bytes]:
+    if fmt == "parquet":
+        return iter_parquet_chunks(rows, columns)
+    chunks = iter_csv_chunks(rows, columns)
+    return gzip_chunks(chunks) if gzip_output else chunks
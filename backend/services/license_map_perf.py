@@ -3,7 +3,19 @@
 from __future__ import annotations
 
 import math
-from typing import Any, Optional
+import time
+from typing import Any, Iterable, Optional
+
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
+# Server-side cluster grid sizes returned by ``license_grid_degrees`` (z < 8).
+LICENSE_GRID_STEPS: tuple[float, ...] = (16.0, 12.0, 8.0)
+
+# Must match ``_licenses_sector_sql_fragment`` in main.py so the expression index is usable.
+LICENSE_SECTOR_KEY_SQL = "LOWER(TRIM(COALESCE(NULLIF(TRIM(sector), ''), 'mining')))"
 
 
 def license_grid_degrees(zoom: Optional[float]) -> Optional[float]:
@@ -220,8 +232,12 @@ def query_license_clusters(
     open_clause: str,
     limit: int = 800,
     zoom: Optional[float] = None,
+    open_params: Optional[list[Any]] = None,
 ) -> list[dict[str, Any]]:
-    """Aggregate licenses into viewport grid cells for low-zoom map paint."""
+    """Aggregate licenses into viewport grid cells for low-zoom map paint.
+
+    ``open_params`` bind the placeholders inside ``open_clause`` (it follows the bbox filter).
+    """
     safe_limit = max(1, min(int(limit or 800), 2000))
     min_cnt = license_cluster_min_count(grid_deg)
     sql = f"""
@@ -267,11 +283,40 @@ def query_license_clusters(
         max_lat,
         min_lng,
         max_lng,
+        *(open_params or []),
         min_cnt,
         safe_limit,
     ]
     cur.execute(sql, tuple(params))
-    rows = cur.fetchall()
+    return _finalize_license_clusters(
+        cur.fetchall(),
+        grid_deg=g,
+        min_cnt=min_cnt,
+        min_lat=min_lat,
+        max_lat=max_lat,
+        min_lng=min_lng,
+        max_lng=max_lng,
+        origin_lat=min_lat,
+        origin_lng=min_lng,
+        zoom=zoom,
+    )
+
+
+def _finalize_license_clusters(
+    rows: list[Any],
+    *,
+    grid_deg: float,
+    min_cnt: int,
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float,
+    origin_lat: float,
+    origin_lng: float,
+    zoom: Optional[float],
+) -> list[dict[str, Any]]:
+    """Turn (lat, lng, cnt, country, sector) rows into merged, viewport-snapped cluster markers."""
+    g = grid_deg
     out: list[dict[str, Any]] = []
     for row in rows:
         keys = row.keys() if hasattr(row, "keys") else []
@@ -301,7 +346,7 @@ def query_license_clusters(
                 "entityKind": "license",
             }
         )
-    merged = merge_license_clusters(out, grid_deg=g, origin_lat=min_lat, origin_lng=min_lng)
+    merged = merge_license_clusters(out, grid_deg=g, origin_lat=origin_lat, origin_lng=origin_lng)
     snapped = []
     for row in merged:
         lat, lng = _snap_cluster_to_viewport(
@@ -406,6 +451,314 @@ def _merge_cluster_rows(
     }
 
 
+@schema_ready("license_map_cells")
+def ensure_license_map_cell_tables(conn: Any) -> None:
+    """Persisted fixed-origin cluster grid for z < 8 reads (PostGIS-free)."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS license_map_cells (
+                grid_deg REAL NOT NULL,
+                lat_bucket INTEGER NOT NULL,
+                lng_bucket INTEGER NOT NULL,
+                country TEXT NOT NULL DEFAULT '',
+                sector TEXT NOT NULL,
+                origin_class TEXT NOT NULL,
+                cnt INTEGER NOT NULL,
+                lat DOUBLE PRECISION NOT NULL,
+                lng DOUBLE PRECISION NOT NULL,
+                PRIMARY KEY (grid_deg, lat_bucket, lng_bucket, country, sector, origin_class)
+            );
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS license_map_cells_meta (
+                id SMALLINT PRIMARY KEY DEFAULT 1,
+                built_at TIMESTAMPTZ,
+                source_rows INTEGER,
+                cell_rows INTEGER,
+                build_ms INTEGER
+            );
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS idx_licenses_sector_key_lat_lng
+            ON licenses (({LICENSE_SECTOR_KEY_SQL}), lat, lng)
+            WHERE lat IS NOT NULL AND lng IS NOT NULL;
+            """
+        )
+
+
+def rebuild_license_map_cells(conn: Any) -> dict[str, Any]:
+    """Recompute ``license_map_cells`` from ``licenses`` in one transaction (readers keep the old grid)."""
+    started = time.time()
+    ensure_license_map_cell_tables(conn)
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM license_map_cells")
+        for grid_deg in LICENSE_GRID_STEPS:
+            cur.execute(
+                f"""
+                INSERT INTO license_map_cells (
+                    grid_deg, lat_bucket, lng_bucket, country, sector, origin_class, cnt, lat, lng
+                )
+                SELECT
+                    %s,
+                    FLOOR(lat / %s)::int,
+                    FLOOR(lng / %s)::int,
+                    COALESCE(country, ''),
+                    sector_key,
+                    origin_class,
+                    COUNT(*)::int,
+                    PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY lat),
+                    PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY lng)
+                FROM (
+                    SELECT
+                        lat,
+                        lng,
+                        country,
+                        {LICENSE_SECTOR_KEY_SQL} AS sector_key,
+                        CASE
+                            WHEN LOWER(TRIM(COALESCE(record_origin, ''))) = 'bundled_json' THEN 'bundled'
+                            WHEN LOWER(TRIM(COALESCE(record_origin, ''))) IN ('open_data', 'global_open_fallback')
+                                THEN 'open'
+                            ELSE 'other'
+                        END AS origin_class
+                    FROM licenses
+                    WHERE lat IS NOT NULL AND lng IS NOT NULL
+                      AND lat BETWEEN -90 AND 90
+                      AND lng BETWEEN -180 AND 180
+                      AND NOT (ABS(lat) < 0.05 AND ABS(lng) < 0.05)
+                ) src
+                GROUP BY 2, 3, 4, 5, 6
+                """,
+                (grid_deg, grid_deg, grid_deg),
+            )
+        cur.execute("SELECT COUNT(*), COALESCE(SUM(cnt), 0) FROM license_map_cells WHERE grid_deg = %s", (LICENSE_GRID_STEPS[-1],))
+        cell_rows, source_rows = cur.fetchone()
+        build_ms = int((time.time() - started) * 1000)
+        cur.execute(
+            """
+            INSERT INTO license_map_cells_meta (id, built_at, source_rows, cell_rows, build_ms)
+            VALUES (1, NOW(), %s, %s, %s)
+            ON CONFLICT (id) DO UPDATE SET
+                built_at = EXCLUDED.built_at,
+                source_rows = EXCLUDED.source_rows,
+                cell_rows = EXCLUDED.cell_rows,
+                build_ms = EXCLUDED.build_ms
+            """,
+            (int(source_rows or 0), int(cell_rows or 0), build_ms),
+        )
+    conn.commit()
+    return {"source_rows": int(source_rows or 0), "cell_rows": int(cell_rows or 0), "build_ms": build_ms}
+
+
+def license_map_cells_age_seconds(cur: Any) -> Optional[float]:
+    """Seconds since the last rebuild, or None when the grid was never built / table missing."""
+    try:
+        cur.execute("SAVEPOINT license_map_cells_age")
+        cur.execute("SELECT EXTRACT(EPOCH FROM (NOW() - built_at)) AS age FROM license_map_cells_meta WHERE id = 1")
+        row = cur.fetchone()
+        cur.execute("RELEASE SAVEPOINT license_map_cells_age")
+    except Exception:
+        cur.execute("ROLLBACK TO SAVEPOINT license_map_cells_age")
+        cur.execute("RELEASE SAVEPOINT license_map_cells_age")
+        return None
+    if not row:
+        return None
+    age = row["age"] if hasattr(row, "keys") else row[0]
+    return float(age) if age is not None else None
+
+
+def mark_license_map_cells_stale(cur: Any) -> None:
+    """Clear the grid's ``built_at`` so every worker reads live clusters until the next rebuild."""
+    cur.execute("SAVEPOINT license_map_cells_stale")
+    try:
+        cur.execute("UPDATE license_map_cells_meta SET built_at = NULL WHERE id = 1")
+    except Exception:
+        cur.execute("ROLLBACK TO SAVEPOINT license_map_cells_stale")
+    cur.execute("RELEASE SAVEPOINT license_map_cells_stale")
+
+
+_OPEN_ORIGIN_SQL = "LOWER(TRIM(COALESCE(record_origin, ''))) IN ('open_data', 'global_open_fallback')"
+
+
+@schema_ready("license_country_origin_summary")
+def ensure_license_country_origin_summary(conn: Any) -> None:
+    """Per (country, normalized sector) flag for the ``prefer_open_data`` filter; seeded when empty."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS license_country_origin_summary (
+                country TEXT NOT NULL,
+                sector TEXT NOT NULL,
+                has_open_data BOOLEAN NOT NULL DEFAULT FALSE,
+                open_rows INTEGER NOT NULL DEFAULT 0,
+                total_rows INTEGER NOT NULL DEFAULT 0,
+                refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (country, sector)
+            );
+            """
+        )
+        cur.execute("SELECT 1 FROM license_country_origin_summary LIMIT 1")
+        seeded = cur.fetchone() is not None
+    if not seeded:
+        refresh_license_country_origin_summary(conn, commit=False)
+
+
+def refresh_license_country_origin_summary(
+    conn: Any,
+    countries: Optional[Iterable[str]] = None,
+    *,
+    commit: bool = True,
+) -> int:
+    """Recompute summary rows for ``countries`` (all countries when None); returns rows written."""
+    scope_sql = ""
+    params: tuple[Any, ...] = ()
+    if countries is not None:
+        scoped = sorted({str(country) for country in countries if country})
+        if not scoped:
+            return 0
+        scope_sql = " AND country = ANY(%s)"
+        params = (scoped,)
+    with conn.cursor() as cur:
+        cur.execute(f"DELETE FROM license_country_origin_summary WHERE TRUE{scope_sql}", params)
+        cur.execute(
+            f"""
+            INSERT INTO license_country_origin_summary (
+                country, sector, has_open_data, open_rows, total_rows, refreshed_at
+            )
+            SELECT
+                country,
+                {LICENSE_SECTOR_KEY_SQL},
+                BOOL_OR({_OPEN_ORIGIN_SQL}),
+                COUNT(*) FILTER (WHERE {_OPEN_ORIGIN_SQL})::int,
+                COUNT(*)::int,
+                NOW()
+            FROM licenses
+            WHERE country IS NOT NULL{scope_sql}
+            GROUP BY 1, 2
+            """,
+            params,
+        )
+        written = int(cur.rowcount or 0)
+    if commit:
+        conn.commit()
+    return written
+
+
+def license_open_data_preference_sql(sector_sql: str, licenses_ref: str = "licenses") -> str:
+    """``prefer_open_data`` clause: hide bundled rows where the country already has open-data rows.
+
+    ``sector_sql`` binds against the summary's normalized sector, so callers append its params
+    once more after their own WHERE params.
+    """
+    return f""" AND (
+        LOWER(TRIM(COALESCE({licenses_ref}.record_origin, ''))) <> 'bundled_json'
+        OR {licenses_ref}.country IS NULL
+        OR NOT EXISTS (
+            SELECT 1 FROM license_country_origin_summary s
+            WHERE s.country = {licenses_ref}.country
+              AND s.has_open_data
+              AND {sector_sql}
+        )
+    ) """
+
+
+def query_license_clusters_from_cells(
+    cur: Any,
+    *,
+    sector_sql: str,
+    sector_params: list[Any],
+    country_sql: str,
+    country_params: list[Any],
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float,
+    grid_deg: float,
+    prefer_open_data: bool,
+    limit: int = 800,
+    zoom: Optional[float] = None,
+) -> list[dict[str, Any]]:
+    """Indexed range read over ``license_map_cells``; same output shape as ``query_license_clusters``.
+
+    Cells are aligned to a fixed global origin, so sector/origin partials of one cell are
+    combined with a count-weighted centre and a cell is kept when that centre is in view.
+    ``sector_sql`` / ``country_sql`` are the same unqualified fragments used against ``licenses``;
+    the rollup stores the normalized sector key in ``sector`` so they apply unchanged.
+    """
+    safe_limit = max(1, min(int(limit or 800), 2000))
+    min_cnt = license_cluster_min_count(grid_deg)
+    g = float(grid_deg)
+    open_clause = ""
+    open_params: list[Any] = []
+    if prefer_open_data:
+        open_clause = f"""
+              AND (
+                  c.origin_class <> 'bundled'
+                  OR c.country = ''
+                  OR NOT EXISTS (
+                      SELECT 1 FROM license_country_origin_summary s
+                      WHERE s.country = c.country
+                        AND s.has_open_data
+                        AND {sector_sql}
+                  )
+              )"""
+        open_params = list(sector_params)
+    sql = f"""
+        SELECT
+            (SUM(c.lat * c.cnt) / SUM(c.cnt))::float AS lat,
+            (SUM(c.lng * c.cnt) / SUM(c.cnt))::float AS lng,
+            SUM(c.cnt)::int AS cnt,
+            c.country,
+            MAX(c.sector) AS sector
+        FROM license_map_cells c
+        WHERE c.grid_deg = %s
+          AND c.lat_bucket BETWEEN %s AND %s
+          AND c.lng_bucket BETWEEN %s AND %s
+          AND {sector_sql}
+          AND ({country_sql})
+          {open_clause}
+        GROUP BY c.lat_bucket, c.lng_bucket, c.country
+        HAVING SUM(c.cnt) >= %s
+           AND SUM(c.lat * c.cnt) / SUM(c.cnt) BETWEEN %s AND %s
+           AND SUM(c.lng * c.cnt) / SUM(c.cnt) BETWEEN %s AND %s
+        ORDER BY cnt DESC
+        LIMIT %s
+    """
+    params = [
+        g,
+        math.floor(min_lat / g),
+        math.floor(max_lat / g),
+        math.floor(min_lng / g),
+        math.floor(max_lng / g),
+        *sector_params,
+        *country_params,
+        *open_params,
+        min_cnt,
+        min_lat,
+        max_lat,
+        min_lng,
+        max_lng,
+        safe_limit,
+    ]
+    cur.execute(sql, tuple(params))
+    return _finalize_license_clusters(
+        cur.fetchall(),
+        grid_deg=g,
+        min_cnt=min_cnt,
+        min_lat=min_lat,
+        max_lat=max_lat,
+        min_lng=min_lng,
+        max_lng=max_lng,
+        origin_lat=0.0,
+        origin_lng=0.0,
+        zoom=zoom,
+    )
+
+
 def simplify_tolerance_for_zoom(zoom: Optional[float]) -> float:
     """Degrees tolerance for ST_Simplify on WGS84 geometries (pipelines)."""
     if zoom is None:
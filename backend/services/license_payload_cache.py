@@ -0,0 +1,113 @@
+"""Pre-serialized /licenses payloads: JSON (or MVT) encoded once, gzipped, and served with ETags.
+
+Cache hits hand the stored gzip bytes straight to the client (or a 304 when the
+ETag matches) instead of ``json.loads`` + ``jsonable_encoder`` on every request.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+try:
+    from starlette.responses import Response
+except ImportError:  # pragma: no cover - import guard for unit tests
+    Response = None  # type: ignore[misc, assignment]
+
+BLOB_MAGIC = b"LP1"
+GZIP_LEVEL = 6
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+@dataclass(frozen=True)
+class LicensePayload:
+    etag: str
+    gzip_body: bytes
+    max_age: Optional[int] = None
+
+    def body(self) -> bytes:
+        return gzip.decompress(self.gzip_body)
+
+    def to_blob(self) -> bytes:
+        max_age = "" if self.max_age is None else str(int(self.max_age))
+        header = f"{self.etag} {max_age}".encode("ascii")
+        return BLOB_MAGIC + header + b"\n" + self.gzip_body
+
+    @classmethod
+    def from_blob(cls, blob: Any) -> Optional["LicensePayload"]:
+        if not isinstance(blob, (bytes, bytearray)) or not blob.startswith(BLOB_MAGIC):
+            return None
+        header, sep, body = bytes(blob[len(BLOB_MAGIC):]).partition(b"\n")
+        if not sep or not body:
+            return None
+        etag, _, max_age = header.decode("ascii", "replace").partition(" ")
+        return cls(etag=etag, gzip_body=body, max_age=int(max_age) if max_age.isdigit() else None)
+
+
+def encode_license_bytes(raw: bytes, *, max_age: Optional[int] = None) -> LicensePayload:
+    """Gzip an already-encoded body (JSON or MVT); the ETag hashes the uncompressed bytes."""
+    etag = '"' + hashlib.blake2b(raw, digest_size=16).hexdigest() + '"'
+    # mtime=0 keeps the gzip bytes identical across workers for the same payload.
+    return LicensePayload(etag=etag, gzip_body=gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0), max_age=max_age)
+
+
+def encode_license_payload(payload: Any, *, max_age: Optional[int] = None) -> LicensePayload:
+    """Serialize ``payload`` once to compact JSON and gzip it; the ETag hashes the JSON bytes."""
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=_json_default).encode("utf-8")
+    return encode_license_bytes(raw, max_age=max_age)
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for part in (accept_encoding or "").lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip() not in {"gzip", "*"}:
+            continue
+        if params.replace(" ", "") in {"q=0", "q=0.0", "q=0.00", "q=0.000"}:
+            return False
+        return True
+    return False
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    header = (if_none_match or "").strip()
+    if not header:
+        return False
+    if header == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def license_payload_response(
+    payload: LicensePayload,
+    *,
+    if_none_match: Optional[str] = None,
+    accept_encoding: Optional[str] = None,
+    media_type: str = "application/json",
+) -> Response:
+    headers = {"ETag": payload.etag, "Vary": "Accept-Encoding"}
+    if payload.max_age is not None:
+        headers["Cache-Control"] = f"public, max-age={payload.max_age}"
+    if etag_matches(if_none_match, payload.etag):
+        return Response(status_code=304, headers=headers)
+    if accepts_gzip(accept_encoding):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=payload.gzip_body, media_type=media_type, headers=headers)
+    return Response(content=payload.body(), media_type=media_type, headers=headers)
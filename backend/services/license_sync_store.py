@@ -6,6 +6,11 @@ import json
 import os
 from typing import Any, Optional, Sequence
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 try:
     import psycopg2.extensions as _pg_ext
 except ImportError:
@@ -37,6 +42,7 @@ def _drift_alert_pct() -> float:
         return 20.0
 
 
+@schema_ready("license_sync")
 def ensure_license_sync_tables(conn: Any) -> None:
     _recover_connection(conn)
     with conn.cursor() as cur:
@@ -52,13 +58,21 @@ def ensure_license_sync_tables(conn: Any) -> None:
                 records_written INTEGER DEFAULT 0,
                 records_skipped_manual INTEGER DEFAULT 0,
                 error TEXT,
-                drift_warning JSONB
+                drift_warning JSONB,
+                duration_ms INTEGER,
+                rows_per_sec DOUBLE PRECISION
             );
             """
         )
         cur.execute(
             "ALTER TABLE license_sync_runs ADD COLUMN IF NOT EXISTS drift_warning JSONB;"
         )
+        cur.execute(
+            "ALTER TABLE license_sync_runs ADD COLUMN IF NOT EXISTS duration_ms INTEGER;"
+        )
+        cur.execute(
+            "ALTER TABLE license_sync_runs ADD COLUMN IF NOT EXISTS rows_per_sec DOUBLE PRECISION;"
+        )
         cur.execute(
             """
             CREATE INDEX IF NOT EXISTS idx_license_sync_runs_source_started
@@ -92,7 +106,10 @@ def finish_license_sync_run(
     records_skipped_manual: int = 0,
     error: Optional[str] = None,
     drift_warning: Optional[dict[str, Any]] = None,
+    duration_ms: Optional[int] = None,
+    rows_per_sec: Optional[float] = None,
 ) -> None:
+    """Close a run; ``duration_ms`` / ``rows_per_sec`` record write throughput for the source."""
     with conn.cursor() as cur:
         cur.execute(
             """
@@ -103,7 +120,9 @@ def finish_license_sync_run(
                 records_written = %s,
                 records_skipped_manual = %s,
                 error = %s,
-                drift_warning = %s
+                drift_warning = %s,
+                duration_ms = %s,
+                rows_per_sec = %s
             WHERE id = %s;
             """,
             (
@@ -113,6 +132,8 @@ def finish_license_sync_run(
                 records_skipped_manual,
                 error,
                 json.dumps(drift_warning) if drift_warning else None,
+                duration_ms,
+                rows_per_sec,
                 run_id,
             ),
         )
@@ -232,7 +253,9 @@ def list_license_sync_runs(
                 records_written,
                 records_skipped_manual,
                 error,
-                drift_warning
+                drift_warning,
+                duration_ms,
+                rows_per_sec
             FROM license_sync_runs
             {where}
             ORDER BY started_at DESC
@@ -265,7 +288,9 @@ def list_sync_drift_alerts(
                 records_written,
                 records_skipped_manual,
                 error,
-                drift_warning
+                drift_warning,
+                duration_ms,
+                rows_per_sec
             FROM license_sync_runs
             WHERE drift_warning IS NOT NULL
             ORDER BY started_at DESC
@@ -293,7 +318,9 @@ def list_latest_sync_run_per_source(conn: Any) -> list[dict[str, Any]]:
                 records_written,
                 records_skipped_manual,
                 error,
-                drift_warning
+                drift_warning,
+                duration_ms,
+                rows_per_sec
             FROM license_sync_runs
             ORDER BY COALESCE(source_id, ''), started_at DESC
             """
@@ -309,6 +336,9 @@ def list_license_sync_runs_from_rows(rows: Sequence[Any]) -> list[dict[str, Any]
         if isinstance(row, dict):
             item = dict(row)
         else:
+            duration_ms = rows_per_sec = None
+            if len(row) >= 12:
+                duration_ms, rows_per_sec = row[10:12]
             if len(row) >= 10:
                 (
                     run_id,
@@ -346,6 +376,8 @@ def list_license_sync_runs_from_rows(rows: Sequence[Any]) -> list[dict[str, Any]
                 "records_skipped_manual": records_skipped_manual,
                 "error": error,
                 "drift_warning": drift_warning,
+                "duration_ms": duration_ms,
+                "rows_per_sec": rows_per_sec,
             }
         drift = item.get("drift_warning")
         if isinstance(drift, str):
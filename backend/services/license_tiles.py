@@ -0,0 +1,360 @@
+"""Mapbox vector tiles (MVT) for the license map: grid clusters at low zoom, points above.
+
+Tiles reuse the ``license_map_perf`` cluster queries so ``/api/licenses/tiles/{z}/{x}/{y}.pbf``
+paints the same clusters as ``/licenses?zoom=`` while the client only fetches visible tiles.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Optional
+
+try:
+    import mapbox_vector_tile
+except ImportError:  # pragma: no cover - optional until requirements are installed
+    mapbox_vector_tile = None  # type: ignore
+
+try:
+    from backend.services.license_map_perf import (
+        license_grid_degrees,
+        license_open_data_preference_sql,
+        query_license_clusters,
+        query_license_clusters_from_cells,
+    )
+except ImportError:
+    from services.license_map_perf import (
+        license_grid_degrees,
+        license_open_data_preference_sql,
+        query_license_clusters,
+        query_license_clusters_from_cells,
+    )
+
+LICENSE_TILE_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+LICENSE_TILE_EXTENT = 4096
+LICENSE_TILE_MAX_ZOOM = 22
+LICENSE_TILE_CLUSTER_LAYER = "license_clusters"
+LICENSE_TILE_POINT_LAYER = "licenses"
+LICENSE_TILE_CLUSTER_LIMIT = 2000
+LICENSE_TILE_POINT_LIMIT = 5000
+# A detail tile with more points than the limit is sent as this many grid cells per side instead.
+LICENSE_TILE_DENSE_GRID_CELLS = 64
+_POINT_COLUMNS = ("id", "company", "license_type", "commodity", "status", "country", "sector", "lat", "lng")
+# Web Mercator latitude limit; tiles never reach the poles.
+_MAX_MERCATOR_LAT = 85.0511287798
+
+
+def valid_tile(z: int, x: int, y: int) -> bool:
+    if z < 0 or z > LICENSE_TILE_MAX_ZOOM:
+        return False
+    n = 1 << z
+    return 0 <= x < n and 0 <= y < n
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lng, max_lng) of an XYZ tile."""
+    n = float(1 << z)
+
+    def _lat(row: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1.0 - 2.0 * row / n))))
+
+    return _lat(y + 1), _lat(y), x / n * 360.0 - 180.0, (x + 1) / n * 360.0 - 180.0
+
+
+def tile_pixel(lat: float, lng: float, z: int, x: int, y: int, extent: int = LICENSE_TILE_EXTENT) -> tuple[int, int]:
+    """Project WGS84 to integer tile coordinates (origin top-left, y down)."""
+    n = float(1 << z)
+    lat = max(-_MAX_MERCATOR_LAT, min(_MAX_MERCATOR_LAT, lat))
+    px = ((lng + 180.0) / 360.0 * n - x) * extent
+    rad = math.radians(lat)
+    py = ((1.0 - math.log(math.tan(rad) + 1.0 / math.cos(rad)) / math.pi) / 2.0 * n - y) * extent
+    return int(round(px)), int(round(py))
+
+
+def _in_tile(lat: float, lng: float, bounds: tuple[float, float, float, float]) -> bool:
+    # Half-open on the east/south edges so a point on a shared edge lands in exactly one tile.
+    min_lat, max_lat, min_lng, max_lng = bounds
+    return min_lat < lat <= max_lat and min_lng <= lng < max_lng
+
+
+def _grid_aligned_bounds(bounds: tuple[float, float, float, float], grid_deg: float) -> tuple[float, float, float, float]:
+    """Expand tile bounds to whole grid cells so clusters are computed from complete cells."""
+    min_lat, max_lat, min_lng, max_lng = bounds
+    g = float(grid_deg)
+    return (
+        max(-90.0, math.floor(min_lat / g) * g),
+        min(90.0, math.ceil(max_lat / g) * g),
+        max(-180.0, math.floor(min_lng / g) * g),
+        min(180.0, math.ceil(max_lng / g) * g),
+    )
+
+
+def _feature(lat: float, lng: float, z: int, x: int, y: int, properties: dict[str, Any]) -> dict[str, Any]:
+    px, py = tile_pixel(lat, lng, z, x, y)
+    return {
+        "geometry": f"POINT({px} {py})",
+        "properties": {key: value for key, value in properties.items() if value not in (None, "")},
+    }
+
+
+def query_license_tile_clusters(
+    cur: Any,
+    z: int,
+    x: int,
+    y: int,
+    *,
+    sector_sql: str,
+    sector_params: list[Any],
+    country_sql: str,
+    country_params: list[Any],
+    prefer_open_data: bool,
+    use_cells: bool,
+) -> list[dict[str, Any]]:
+    """Cluster markers whose centre falls inside the tile (cell grid when fresh, live otherwise)."""
+    grid_deg = license_grid_degrees(z)
+    if grid_deg is None:
+        return []
+    bounds = tile_bounds(z, x, y)
+    min_lat, max_lat, min_lng, max_lng = _grid_aligned_bounds(bounds, grid_deg)
+    common = {
+        "sector_sql": sector_sql,
+        "sector_params": sector_params,
+        "country_sql": country_sql,
+        "country_params": country_params,
+        "min_lat": min_lat,
+        "max_lat": max_lat,
+        "min_lng": min_lng,
+        "max_lng": max_lng,
+        "grid_deg": grid_deg,
+        "limit": LICENSE_TILE_CLUSTER_LIMIT,
+        "zoom": z,
+    }
+    if use_cells:
+        clusters = query_license_clusters_from_cells(cur, prefer_open_data=prefer_open_data, **common)
+    else:
+        open_clause = license_open_data_preference_sql(sector_sql) if prefer_open_data else ""
+        clusters = query_license_clusters(
+            cur,
+            open_clause=open_clause,
+            open_params=list(sector_params) if prefer_open_data else None,
+            **common,
+        )
+    return [row for row in clusters if _in_tile(float(row["lat"]), float(row["lng"]), bounds)]
+
+
+def query_license_tile_points(
+    cur: Any,
+    z: int,
+    x: int,
+    y: int,
+    *,
+    sector_sql: str,
+    sector_params: list[Any],
+    country_sql: str,
+    country_params: list[Any],
+    prefer_open_data: bool,
+    limit: int = LICENSE_TILE_POINT_LIMIT,
+) -> list[dict[str, Any]]:
+    """Individual license markers inside the tile (detail zooms)."""
+    min_lat, max_lat, min_lng, max_lng = tile_bounds(z, x, y)
+    open_clause = license_open_data_preference_sql(sector_sql) if prefer_open_data else ""
+    open_params = list(sector_params) if prefer_open_data else []
+    cur.execute(
+        f"""
+        SELECT {", ".join(_POINT_COLUMNS)}
+        FROM licenses
+        WHERE {sector_sql}
+          AND ({country_sql})
+          AND lat IS NOT NULL AND lng IS NOT NULL
+          AND lat > %s AND lat <= %s
+          AND lng >= %s AND lng < %s
+          {open_clause}
+        ORDER BY id
+        LIMIT %s
+        """,
+        (
+            *sector_params,
+            *country_params,
+            min_lat,
+            max_lat,
+            min_lng,
+            max_lng,
+            *open_params,
+            max(1, min(int(limit), LICENSE_TILE_POINT_LIMIT + 1)),
+        ),
+    )
+    out: list[dict[str, Any]] = []
+    for row in cur.fetchall():
+        if not hasattr(row, "keys"):
+            row = dict(zip(_POINT_COLUMNS, row))
+        out.append(
+            {
+                "id": row["id"],
+                "company": row["company"],
+                "licenseType": row["license_type"],
+                "commodity": row["commodity"],
+                "status": row["status"],
+                "country": row["country"],
+                "sector": row["sector"] or "mining",
+                "lat": float(row["lat"]),
+                "lng": float(row["lng"]),
+            }
+        )
+    return out
+
+
+def query_license_tile_dense_cells(
+    cur: Any,
+    z: int,
+    x: int,
+    y: int,
+    *,
+    sector_sql: str,
+    sector_params: list[Any],
+    country_sql: str,
+    country_params: list[Any],
+    prefer_open_data: bool,
+) -> list[dict[str, Any]]:
+    """Every license in the tile, bucketed on a fine grid (cluster rows, singletons included).
+
+    Used when a detail tile holds more than ``LICENSE_TILE_POINT_LIMIT`` points, so the tile
+    still accounts for all of them; the client zooms in to split the cells into markers.
+    """
+    min_lat, max_lat, min_lng, max_lng = tile_bounds(z, x, y)
+    grid_deg = (max_lng - min_lng) / LICENSE_TILE_DENSE_GRID_CELLS
+    open_clause = license_open_data_preference_sql(sector_sql) if prefer_open_data else ""
+    open_params = list(sector_params) if prefer_open_data else []
+    cur.execute(
+        f"""
+        SELECT AVG(lat)::float AS lat, AVG(lng)::float AS lng, COUNT(*)::int AS cnt, country,
+               MAX(COALESCE(sector, 'mining')) AS sector
+        FROM licenses
+        WHERE {sector_sql}
+          AND ({country_sql})
+          AND lat IS NOT NULL AND lng IS NOT NULL
+          AND lat > %s AND lat <= %s
+          AND lng >= %s AND lng < %s
+          {open_clause}
+        GROUP BY FLOOR((lat - %s) / %s), FLOOR((lng - %s) / %s), country
+        """,
+        (
+            *sector_params,
+            *country_params,
+            min_lat,
+            max_lat,
+            min_lng,
+            max_lng,
+            *open_params,
+            min_lat,
+            grid_deg,
+            min_lng,
+            grid_deg,
+        ),
+    )
+    out: list[dict[str, Any]] = []
+    for row in cur.fetchall():
+        if not hasattr(row, "keys"):
+            row = dict(zip(("lat", "lng", "cnt", "country", "sector"), row))
+        lat, lng = float(row["lat"]), float(row["lng"])
+        out.append(
+            {
+                "id": f"cell:{row['country'] or ''}:{round(lat, 5)}:{round(lng, 5)}",
+                "country": row["country"],
+                "sector": row["sector"] or "mining",
+                "lat": lat,
+                "lng": lng,
+                "mapClusterCount": int(row["cnt"]),
+                "mapClusterGridDeg": grid_deg,
+            }
+        )
+    return out
+
+
+def encode_license_tile(
+    z: int,
+    x: int,
+    y: int,
+    *,
+    clusters: Optional[list[dict[str, Any]]] = None,
+    points: Optional[list[dict[str, Any]]] = None,
+) -> bytes:
+    """Encode cluster / point dicts into one MVT (layers ``license_clusters`` and ``licenses``)."""
+    if mapbox_vector_tile is None:
+        raise RuntimeError("mapbox-vector-tile is not installed")
+    layers: list[dict[str, Any]] = []
+    if clusters is not None:
+        layers.append(
+            {
+                "name": LICENSE_TILE_CLUSTER_LAYER,
+                "features": [
+                    _feature(
+                        float(row["lat"]),
+                        float(row["lng"]),
+                        z,
+                        x,
+                        y,
+                        {
+                            "id": row.get("id"),
+                            "count": int(row.get("mapClusterCount") or 0),
+                            "country": row.get("country"),
+                            "sector": row.get("sector"),
+                            "grid_deg": float(row.get("mapClusterGridDeg") or 0.0),
+                        },
+                    )
+                    for row in clusters
+                ],
+            }
+        )
+    if points is not None:
+        layers.append(
+            {
+                "name": LICENSE_TILE_POINT_LAYER,
+                "features": [
+                    _feature(
+                        float(row["lat"]),
+                        float(row["lng"]),
+                        z,
+                        x,
+                        y,
+                        {key: value for key, value in row.items() if key not in {"lat", "lng"}},
+                    )
+                    for row in points
+                ],
+            }
+        )
+    return mapbox_vector_tile.encode(
+        layers,
+        default_options={"y_coord_down": True, "extents": LICENSE_TILE_EXTENT},
+    )
+
+
+def build_license_tile(
+    cur: Any,
+    z: int,
+    x: int,
+    y: int,
+    *,
+    sector_sql: str,
+    sector_params: list[Any],
+    country_sql: str,
+    country_params: list[Any],
+    prefer_open_data: bool,
+    use_cells: bool = False,
+) -> tuple[bytes, int]:
+    """Query and encode one tile; returns ``(pbf_bytes, feature_count)``."""
+    filters = {
+        "sector_sql": sector_sql,
+        "sector_params": sector_params,
+        "country_sql": country_sql,
+        "country_params": country_params,
+        "prefer_open_data": prefer_open_data,
+    }
+    if license_grid_degrees(z) is not None:
+        clusters = query_license_tile_clusters(cur, z, x, y, use_cells=use_cells, **filters)
+        return encode_license_tile(z, x, y, clusters=clusters), len(clusters)
+    points = query_license_tile_points(cur, z, x, y, limit=LICENSE_TILE_POINT_LIMIT + 1, **filters)
+    if len(points) > LICENSE_TILE_POINT_LIMIT:
+        # Too dense for markers: ship fine grid cells (license_clusters layer) rather than an
+        # arbitrary subset of points.
+        cells = query_license_tile_dense_cells(cur, z, x, y, **filters)
+        return encode_license_tile(z, x, y, clusters=cells), len(cells)
+    return encode_license_tile(z, x, y, points=points), len(points)
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import csv
+import hashlib
 import json
 import math
 import os
 import re
+import threading
 import time
 from datetime import datetime, timezone
 from typing import Any, Optional
@@ -14,6 +16,23 @@ from urllib.parse import urlparse, urlunparse
 from urllib.parse import quote_plus, urlencode
 from urllib.request import Request, urlopen
 
+try:
+    from backend.services.bounded_cache import BoundedCache, SingleFlight
+    from backend.services.schema_registry import schema_ready
+    from backend.services.unlocode_snapshot import (
+        UnlocodePortTable,
+        load_unlocode_snapshot,
+        write_unlocode_snapshot,
+    )
+except ImportError:
+    from services.bounded_cache import BoundedCache, SingleFlight  # type: ignore[no-redef]
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+    from services.unlocode_snapshot import (  # type: ignore[no-redef]
+        UnlocodePortTable,
+        load_unlocode_snapshot,
+        write_unlocode_snapshot,
+    )
+
 
 AISSTREAM_URL = "wss://stream.aisstream.io/v0/stream"
 AISSTREAM_PERSIAN_GULF_ISSUE_URL = "https://github.com/aisstream/aisstream/issues/17"
@@ -40,6 +59,10 @@ WIKIDATA_SPARQL_URL = "https://query.wikidata.org/sparql"
 
 REQUEST_TIMEOUT_SECONDS = 12
 UNLOCODE_CACHE_TTL_SECONDS = 60 * 60 * 24
+# The on-disk snapshot is rebuilt in the background once it is older than this.
+UNLOCODE_SNAPSHOT_MAX_AGE_DAYS = float(os.getenv("UNLOCODE_SNAPSHOT_MAX_AGE_DAYS", "30"))
+# After a failed download, background refreshes are not retried for this long.
+UNLOCODE_REFRESH_RETRY_SECONDS = 300
 AIS_CACHE_TTL_SECONDS = 60
 AIS_DEFAULT_MAX_VESSELS = 1000
 AIS_MAX_VESSELS = max(1000, int(os.getenv("AIS_MAX_VESSELS", "15000")))
@@ -204,7 +227,17 @@ OIL_PORT_KEYWORDS = (
 
 UNLOCODE_OFFICIAL_SOURCE_URL = "https://unece.org/trade/cefact/UNLOCODE-Download"
 
-_unlocode_cache: dict[str, Any] = {"loaded_at": 0.0, "rows": []}
+# Single entry (the mapped port table). Expiry only re-reads the snapshot from disk
+# (picking up another worker's refresh); downloads run in the background.
+_unlocode_cache = BoundedCache(
+    "unlocode_ports",
+    max_entries=1,
+    ttl_seconds=UNLOCODE_CACHE_TTL_SECONDS,
+    stale_seconds=UNLOCODE_CACHE_TTL_SECONDS,
+)
+_unlocode_refresh_flight = SingleFlight()
+_unlocode_refresh_failed_at = 0.0
+_EMPTY_UNLOCODE_TABLE = UnlocodePortTable.from_rows([])
 _ais_cache: dict[str, Any] = {"items": {}}
 
 _COORD_RE = re.compile(
@@ -640,19 +673,12 @@ def _iso_datetime(value: Any) -> Any:
 
 
 def _db_connect():
-    import psycopg2
+    try:
+        from backend.services.db_pool import get_pooled_connection
+    except ImportError:
+        from services.db_pool import get_pooled_connection
 
-    database_url = os.getenv("DATABASE_URL", "").strip()
-    if database_url:
-        return psycopg2.connect(database_url, connect_timeout=5)
-    return psycopg2.connect(
-        host=os.getenv("DB_HOST", "localhost"),
-        port=int(os.getenv("DB_PORT", "5432")),
-        database=os.getenv("DB_NAME", "mining_db"),
-        user=os.getenv("DB_USER", "postgres"),
-        password=os.getenv("DB_PASSWORD", "password"),
-        connect_timeout=5,
-    )
+    return get_pooled_connection()
 
 
 def _maintenance_db_connect():
@@ -701,6 +727,7 @@ def ensure_maritime_database_exists() -> None:
         conn.close()
 
 
+@schema_ready("maritime")
 def ensure_maritime_tables(conn) -> None:
     with conn.cursor() as cur:
         cur.execute(
@@ -1097,53 +1124,128 @@ def _fetch_json(url: str, params: Optional[dict[str, Any]] = None) -> dict[str,
         return json.loads(payload)
 
 
-def _load_unlocode_ports(force_refresh: bool = False) -> list[dict[str, Any]]:
-    age = time.time() - float(_unlocode_cache.get("loaded_at") or 0.0)
-    if not force_refresh and _unlocode_cache.get("rows") and age < UNLOCODE_CACHE_TTL_SECONDS:
-        return list(_unlocode_cache["rows"])
+def _cached_unlocode_ports(force_refresh: bool = False) -> UnlocodePortTable:
+    """The shared columnar port table (snapshot-backed; never downloads on a warm path).
 
+    ``force_refresh`` schedules a background snapshot rebuild and returns the current
+    table.
+    """
+    if force_refresh:
+        schedule_unlocode_snapshot_refresh()
     try:
-        csv_text = _fetch_text(UNLOCODE_CSV_URL)
-        reader = csv.DictReader(csv_text.splitlines())
-        rows: list[dict[str, Any]] = []
-        for raw_row in reader:
-            function_code = _clean_text(raw_row.get("Function"))
-            if not _is_port_row(function_code):
-                continue
-            lat, lng = parse_unlocode_coordinates(_clean_text(raw_row.get("Coordinates")))
-            if lat is None or lng is None:
-                continue
+        return _unlocode_cache.get_or_load("ports", _load_unlocode_table, cache_if=bool)
+    except Exception:
+        return _unlocode_cache.peek("ports") or _EMPTY_UNLOCODE_TABLE
 
-            country_code = _clean_text(raw_row.get("Country")).upper()
-            location = _clean_text(raw_row.get("Location")).upper()
-            name = _clean_text(raw_row.get("Name"))
-            remarks = _clean_text(raw_row.get("Remarks"))
-            if not country_code or not location or not name:
-                continue
 
-            rows.append(
-                {
-                    "unlocode": f"{country_code}{location}",
-                    "country_iso2": country_code,
-                    "name": name,
-                    "name_ascii": _clean_text(raw_row.get("NameWoDiacritics")) or name,
-                    "subdivision": _clean_text(raw_row.get("Subdivision")) or None,
-                    "status": _clean_text(raw_row.get("Status")) or None,
-                    "function": function_code,
-                    "remarks": remarks or None,
-                    "lat": lat,
-                    "lng": lng,
-                    "role": _country_port_role(name, remarks),
-                    "source_label": "UN/LOCODE",
-                    "source_url": UNLOCODE_OFFICIAL_SOURCE_URL,
-                }
-            )
+def _load_unlocode_table() -> UnlocodePortTable:
+    table = load_unlocode_snapshot()
+    if table is None:
+        # No snapshot on disk yet (fresh volume): serve an empty table (not cached) and
+        # bootstrap in the background; the refresh installs the table once it lands.
+        schedule_unlocode_snapshot_refresh()
+        return _EMPTY_UNLOCODE_TABLE
+    if table.age_seconds() > UNLOCODE_SNAPSHOT_MAX_AGE_DAYS * 86400:
+        schedule_unlocode_snapshot_refresh()
+    return table
 
-        _unlocode_cache["loaded_at"] = time.time()
-        _unlocode_cache["rows"] = rows
-        return list(rows)
-    except Exception:
-        return list(_unlocode_cache.get("rows") or [])
+
+def _refresh_unlocode_snapshot() -> UnlocodePortTable:
+    csv_text = _fetch_text(UNLOCODE_CSV_URL)
+    rows = _parse_unlocode_ports(csv_text)
+    if not rows:
+        raise ValueError("UN/LOCODE download contained no port rows")
+    version = hashlib.sha256(csv_text.encode("utf-8")).hexdigest()[:16]
+    table: Optional[UnlocodePortTable] = None
+    try:
+        write_unlocode_snapshot(
+            rows, version=version, source_url=UNLOCODE_OFFICIAL_SOURCE_URL, download_url=UNLOCODE_CSV_URL
+        )
+        table = load_unlocode_snapshot()
+    except OSError as exc:
+        print(f"[maritime] UN/LOCODE snapshot write failed ({exc}); keeping it in memory only")
+    if table is None:
+        table = UnlocodePortTable.from_rows(
+            rows,
+            version=version,
+            source_url=UNLOCODE_OFFICIAL_SOURCE_URL,
+            built_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        )
+    _unlocode_cache.set("ports", table)
+    return table
+
+
+def schedule_unlocode_snapshot_refresh() -> bool:
+    """Rebuild the UN/LOCODE snapshot in a background thread.
+
+    No-op while one runs or within ``UNLOCODE_REFRESH_RETRY_SECONDS`` of a failed attempt.
+    """
+    if _unlocode_refresh_flight.in_flight("refresh"):
+        return False
+    if time.time() - _unlocode_refresh_failed_at < UNLOCODE_REFRESH_RETRY_SECONDS:
+        return False
+
+    def _run() -> None:
+        global _unlocode_refresh_failed_at
+        try:
+            table, _shared = _unlocode_refresh_flight.do("refresh", _refresh_unlocode_snapshot)
+            print(f"[maritime] UN/LOCODE snapshot refreshed: {len(table)} ports (version {table.version})")
+        except Exception as exc:
+            _unlocode_refresh_failed_at = time.time()
+            print(f"[maritime] UN/LOCODE snapshot refresh failed: {exc}")
+
+    threading.Thread(target=_run, name="unlocode-snapshot-refresh", daemon=True).start()
+    return True
+
+
+def warm_unlocode_ports() -> None:
+    """Map the snapshot (or schedule its bootstrap) off the request path at startup."""
+
+    def _run() -> None:
+        table = _cached_unlocode_ports()
+        if table:
+            table.spatial_index()
+
+    threading.Thread(target=_run, name="unlocode-warm", daemon=True).start()
+
+
+def _parse_unlocode_ports(csv_text: str) -> list[dict[str, Any]]:
+    reader = csv.DictReader(csv_text.splitlines())
+    rows: list[dict[str, Any]] = []
+    for raw_row in reader:
+        function_code = _clean_text(raw_row.get("Function"))
+        if not _is_port_row(function_code):
+            continue
+        lat, lng = parse_unlocode_coordinates(_clean_text(raw_row.get("Coordinates")))
+        if lat is None or lng is None:
+            continue
+
+        country_code = _clean_text(raw_row.get("Country")).upper()
+        location = _clean_text(raw_row.get("Location")).upper()
+        name = _clean_text(raw_row.get("Name"))
+        remarks = _clean_text(raw_row.get("Remarks"))
+        if not country_code or not location or not name:
+            continue
+
+        rows.append(
+            {
+                "unlocode": f"{country_code}{location}",
+                "country_iso2": country_code,
+                "name": name,
+                "name_ascii": _clean_text(raw_row.get("NameWoDiacritics")) or name,
+                "subdivision": _clean_text(raw_row.get("Subdivision")) or None,
+                "status": _clean_text(raw_row.get("Status")) or None,
+                "function": function_code,
+                "remarks": remarks or None,
+                "lat": lat,
+                "lng": lng,
+                "role": _country_port_role(name, remarks),
+                "source_label": "UN/LOCODE",
+                "source_url": UNLOCODE_OFFICIAL_SOURCE_URL,
+            }
+        )
+
+    return rows
 
 
 def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
@@ -1167,34 +1269,45 @@ def find_nearest_ports(
     lng: Optional[float] = None,
     limit: int = 5,
 ) -> list[dict[str, Any]]:
-    rows = _load_unlocode_ports()
-    if not rows:
+    table = _cached_unlocode_ports()
+    if not table:
         return []
 
     country_code = _clean_text(country_iso2).upper()
-    scoped = [row for row in rows if not country_code or row["country_iso2"] == country_code]
 
     if lat is not None and lng is not None:
+        if limit <= 0:
+            return []
+        index = table.spatial_index()
+        group = country_code or None
+        nearest = index.query(lat, lng, limit, group=group)
+        if not nearest:
+            return []
+        # Results order by (distance rounded to 0.1 km, name): widen to every row that
+        # could tie the k-th after rounding, then materialize only the winners.
+        shell = index.query_radius(lat, lng, nearest[-1][1] + 0.1, group=group)
+        ranked = sorted(
+            (round(haversine_km(lat, lng, float(table.lat[pos]), float(table.lng[pos])), 1), table.name(pos), pos)
+            for pos, _ in shell
+        )
         enriched = []
-        for row in scoped:
-            distance = haversine_km(lat, lng, row["lat"], row["lng"])
-            row_copy = dict(row)
-            row_copy["distance_km"] = round(distance, 1)
-            row_copy["confidence"] = 0.65 if row_copy["role"] == "energy_port" else 0.45
-            enriched.append(row_copy)
-        enriched.sort(key=lambda item: (item["distance_km"], item["name"]))
-        return enriched[:limit]
+        for distance, _, pos in ranked[:limit]:
+            row = table.row(pos)
+            row["distance_km"] = distance
+            row["confidence"] = 0.65 if row["role"] == "energy_port" else 0.45
+            enriched.append(row)
+        return enriched
 
     energy_first = sorted(
-        scoped,
-        key=lambda item: (0 if item["role"] == "energy_port" else 1, item["name"]),
+        table.positions(country_code).tolist(),
+        key=lambda pos: (0 if table.role(pos) == "energy_port" else 1, table.name(pos)),
     )
     results = []
-    for row in energy_first[:limit]:
-        row_copy = dict(row)
-        row_copy["distance_km"] = None
-        row_copy["confidence"] = 0.55 if row_copy["role"] == "energy_port" else 0.35
-        results.append(row_copy)
+    for pos in energy_first[:limit]:
+        row = table.row(pos)
+        row["distance_km"] = None
+        row["confidence"] = 0.55 if row["role"] == "energy_port" else 0.35
+        results.append(row)
     return results
 
 
@@ -1203,21 +1316,22 @@ def match_destination_to_port(destination: str, country_iso2: str = "") -> Optio
     if not token:
         return None
 
-    rows = _load_unlocode_ports()
-    if not rows:
+    table = _cached_unlocode_ports()
+    if not table:
         return None
 
     country_code = _clean_text(country_iso2).upper()
-    scoped = [row for row in rows if not country_code or row["country_iso2"] == country_code]
-    if not scoped:
-        scoped = rows
+    scoped = table.positions(country_code) if country_code else None
+    if scoped is None or not scoped.size:
+        scoped = table.positions()
 
-    best: tuple[float, dict[str, Any]] | None = None
-    for row in scoped:
+    best: tuple[float, int] | None = None
+    for pos in scoped.tolist():
+        name, name_ascii = table.text_fields(pos)[:2]
         tokens = {
-            _normalize_token(row["name"]),
-            _normalize_token(row["name_ascii"]),
-            _normalize_token(row["unlocode"]),
+            _normalize_token(name),
+            _normalize_token(name_ascii),
+            _normalize_token(table.unlocode(pos)),
         }
         score = 0.0
         if token in tokens:
@@ -1228,12 +1342,12 @@ def match_destination_to_port(destination: str, country_iso2: str = "") -> Optio
             continue
 
         if best is None or score > best[0]:
-            best = (score, row)
+            best = (score, pos)
 
     if best is None:
         return None
 
-    matched = dict(best[1])
+    matched = table.row(best[1])
     matched["matched_on"] = destination
     matched["confidence"] = best[0]
     return matched
@@ -0,0 +1,564 @@
+"""Background market-data poller and the versioned quote snapshot behind the ticker endpoints.
+
+``/api/market-ticker`` and ``/market-prices`` used to make up to nine sequential
+Yahoo/CoinGecko calls per request, so every dashboard load waited for the slowest
+upstream and concurrent users multiplied outbound traffic. Now:
+
+* one poller per process refreshes every symbol concurrently each
+  ``MARKET_POLL_INTERVAL_SEC``; with Redis configured a short ``SET NX`` lease lets a
+  single worker poll while the others adopt the snapshot it writes to Redis;
+* a symbol whose fetch fails keeps its last good quote (with that quote's own
+  ``as_of``), so one blocked upstream does not blank the whole ticker;
+* every snapshot pre-renders both endpoint payloads as JSON bytes, so requests only
+  return bytes plus staleness headers;
+* ``version`` increases only when a rendered price changes; subscribers of
+  ``market_event_stream`` (SSE) are woken on each new version.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+import requests
+
+try:
+    from backend.services.redis_connection import drop_shared_redis_client, shared_redis_client
+except ImportError:
+    from services.redis_connection import drop_shared_redis_client, shared_redis_client  # type: ignore[no-redef]
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(key, str(default))))
+    except (TypeError, ValueError):
+        return default
+
+
+def market_poller_enabled() -> bool:
+    return (os.getenv("MARKET_POLLER_ENABLED") or "true").strip().lower() in {"1", "true", "yes", "on"}
+
+
+MARKET_POLL_INTERVAL_SEC = max(5.0, _env_float("MARKET_POLL_INTERVAL_SEC", 60.0))
+MARKET_STALE_AFTER_SEC = _env_float("MARKET_STALE_AFTER_SEC", 300.0)
+# How long a request waits for the very first refresh before serving placeholder rows.
+MARKET_COLD_WAIT_SEC = _env_float("MARKET_COLD_WAIT_SEC", 8.0)
+MARKET_SSE_MAX_SUBSCRIBERS = int(_env_float("MARKET_SSE_MAX_SUBSCRIBERS", 500))
+MARKET_SSE_KEEPALIVE_SEC = 15.0
+
+REDIS_SNAPSHOT_KEY = "market:snapshot:v1"
+REDIS_POLL_LEASE_KEY = "market:poller-lease"
+
+YAHOO_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+YAHOO_SYMBOLS = ("GC=F", "SI=F", "BZ=F", "CL=F", "HO=F", "HG=F", "SB=F", "KC=F")
+BTC_SYMBOL = "BTC"
+COINGECKO_BTC_URL = (
+    "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd&include_24hr_change=true"
+)
+
+FALLBACK_PRICES = [
+    {"symbol": "XAU/USD", "price": "—", "change": "—", "up": None},
+    {"symbol": "XAG/USD", "price": "—", "change": "—", "up": None},
+    {"symbol": "BTC/USD", "price": "103,200.00", "change": "+1.85%", "up": True},
+    {"symbol": "BRENT", "price": "64.20", "change": "+0.72%", "up": True},
+]
+
+
+def fetch_yahoo_quote(yahoo_symbol: str, *, session: Any = requests, timeout: float = 10) -> Optional[dict[str, Any]]:
+    """Last price + change vs prior close for a Yahoo Finance symbol (e.g. CL=F, BZ=F)."""
+    try:
+        r = session.get(
+            f"https://query1.finance.yahoo.com/v8/finance/chart/{yahoo_symbol}",
+            params={"interval": "1d", "range": "2d"},
+            headers={"User-Agent": YAHOO_UA, "Accept": "application/json"},
+            timeout=timeout,
+        )
+        if r.status_code != 200:
+            return None
+        chart = r.json().get("chart", {})
+        res = chart.get("result") or []
+        if not res:
+            return None
+        meta = res[0].get("meta") or {}
+        price = meta.get("regularMarketPrice")
+        if price is None:
+            price = meta.get("previousClose")
+        prev = meta.get("chartPreviousClose") or meta.get("previousClose")
+        if price is None:
+            return None
+        price = float(price)
+        prev_f = float(prev) if prev is not None else None
+        chg_pct = None
+        if prev_f and prev_f > 0:
+            chg_pct = (price - prev_f) / prev_f * 100.0
+        return {"price": price, "chg_pct": chg_pct}
+    except Exception as ex:
+        print(f"[yahoo] {yahoo_symbol}: {ex}")
+        return None
+
+
+def fetch_btc_quote(*, session: Any = requests, timeout: float = 6) -> Optional[dict[str, Any]]:
+    """Bitcoin in USD with 24h change from CoinGecko (free, no auth)."""
+    try:
+        r = session.get(COINGECKO_BTC_URL, timeout=timeout)
+        if r.status_code != 200:
+            return None
+        data = r.json().get("bitcoin", {})
+        if data.get("usd") is None:
+            return None
+        return {"price": float(data["usd"]), "chg_pct": float(data.get("usd_24h_change") or 0.0)}
+    except Exception as ex:
+        print(f"[coingecko] bitcoin: {ex}")
+        return None
+
+
+def normalize_comex_usd_per_troy_oz(price: float, *, metal: str) -> float:
+    """
+    Yahoo GC=F / SI=F are COMEX continuous futures quoted in USD per troy ounce.
+    If an upstream ever returns cents-per-oz scale, pull it back to dollars.
+    """
+    p = float(price)
+    if metal == "gold" and p > 50_000:
+        p = p / 100.0
+    if metal == "silver" and p > 500:
+        p = p / 100.0
+    return p
+
+
+def _change(quote: dict[str, Any]) -> tuple[bool, str]:
+    chg_pct = quote.get("chg_pct")
+    if chg_pct is None:
+        return True, "LIVE"
+    return chg_pct >= 0, f"{chg_pct:+.2f}%"
+
+
+_TICKER_METALS = (
+    ("GOLD/oz", "GC=F", "gold"),
+    ("SILVER/oz", "SI=F", "silver"),
+)
+# ICE / NYMEX continuous futures on Yahoo
+_TICKER_BENCHMARKS: tuple[tuple[str, str, str, Callable[[float], str]], ...] = (
+    ("BRENT", "Energy", "BZ=F", lambda p: f"${p:.2f}/bbl"),
+    ("WTI CRUDE", "Energy", "CL=F", lambda p: f"${p:.2f}/bbl"),
+    ("HEATING OIL", "Energy", "HO=F", lambda p: f"${p:.3f}/gal"),
+    ("COPPER", "Industrial", "HG=F", lambda p: f"${p:.3f}/lb"),
+    ("SUGAR #11", "Softs", "SB=F", lambda p: f"{p * 100:.2f}¢/lb"),
+    ("COFFEE", "Softs", "KC=F", lambda p: f"{p * 100:.2f}¢/lb"),
+)
+
+
+def render_ticker_rows(quotes: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+    """``/api/market-ticker`` rows: metals always present (em dash when missing), others only when quoted."""
+    rows: list[dict[str, Any]] = []
+    for label, symbol, metal in _TICKER_METALS:
+        quote = quotes.get(symbol)
+        if quote is None:
+            rows.append({"symbol": label, "price": "$—", "category": "Metal", "up": None, "change": "—"})
+            continue
+        up, change = _change(quote)
+        price = normalize_comex_usd_per_troy_oz(quote["price"], metal=metal)
+        rows.append({"symbol": label, "price": f"${price:,.2f}", "category": "Metal", "up": up, "change": change})
+    btc = quotes.get(BTC_SYMBOL)
+    if btc is not None:
+        up, change = _change(btc)
+        rows.append({"symbol": "BTC/USD", "price": f"${btc['price']:,.2f}", "category": "Crypto", "up": up, "change": change})
+    for label, category, symbol, price_fmt in _TICKER_BENCHMARKS:
+        quote = quotes.get(symbol)
+        if quote is None:
+            continue
+        up, change = _change(quote)
+        rows.append({"symbol": label, "price": price_fmt(quote["price"]), "category": category, "up": up, "change": change})
+    return rows
+
+
+def render_market_price_rows(quotes: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+    """``/market-prices`` rows (legacy Entrepreneur Desk shape)."""
+    rows: list[dict[str, Any]] = []
+    for label, symbol, metal in (("XAU/USD", "GC=F", "gold"), ("XAG/USD", "SI=F", "silver")):
+        quote = quotes.get(symbol)
+        if quote is None:
+            rows.append({"symbol": label, "price": "—", "change": "—", "up": None})
+            continue
+        up, change = _change(quote)
+        price = normalize_comex_usd_per_troy_oz(quote["price"], metal=metal)
+        rows.append({"symbol": label, "price": f"{price:,.2f}", "change": change, "up": up})
+    btc = quotes.get(BTC_SYMBOL)
+    if btc is not None:
+        up, change = _change(btc)
+        rows.append({"symbol": "BTC/USD", "price": f"{btc['price']:,.2f}", "change": change, "up": up})
+    else:
+        rows.append(FALLBACK_PRICES[2])
+    for label, symbol, fallback in (("BRENT", "BZ=F", FALLBACK_PRICES[3]), ("WTI", "CL=F", None)):
+        quote = quotes.get(symbol)
+        if quote is None:
+            if fallback is not None:
+                rows.append(fallback)
+            continue
+        up, change = _change(quote)
+        rows.append({"symbol": label, "price": f"{quote['price']:.2f}", "change": change, "up": up})
+    return rows
+
+
+def _iso(ts: float) -> Optional[str]:
+    if not ts:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="seconds")
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """Immutable quote set; rendered payloads are built once per snapshot."""
+
+    version: int
+    fetched_at: float
+    quotes: dict[str, dict[str, Any]] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    ticker_json: bytes = b"[]"
+    prices_json: bytes = b"[]"
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        fetched_at: float,
+        quotes: dict[str, dict[str, Any]],
+        errors: Optional[dict[str, str]] = None,
+    ) -> "MarketSnapshot":
+        return cls(
+            version=version,
+            fetched_at=fetched_at,
+            quotes=quotes,
+            errors=dict(errors or {}),
+            ticker_json=json.dumps(render_ticker_rows(quotes), ensure_ascii=False).encode("utf-8"),
+            prices_json=json.dumps(render_market_price_rows(quotes), ensure_ascii=False).encode("utf-8"),
+        )
+
+    @classmethod
+    def empty(cls) -> "MarketSnapshot":
+        return cls.build(0, 0.0, {})
+
+    def age_seconds(self, now: Optional[float] = None) -> Optional[float]:
+        if not self.fetched_at:
+            return None
+        return max(0.0, (time.time() if now is None else now) - self.fetched_at)
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        age = self.age_seconds(now)
+        return age is None or age > MARKET_STALE_AFTER_SEC
+
+    def meta(self, now: Optional[float] = None) -> dict[str, Any]:
+        age = self.age_seconds(now)
+        return {
+            "version": self.version,
+            "fetched_at": _iso(self.fetched_at),
+            "age_seconds": None if age is None else round(age, 1),
+            "stale": self.is_stale(now),
+            "missing": sorted(set(YAHOO_SYMBOLS + (BTC_SYMBOL,)) - set(self.quotes)),
+            "errors": self.errors,
+        }
+
+    def headers(self, now: Optional[float] = None) -> dict[str, str]:
+        age = self.age_seconds(now)
+        return {
+            "X-Market-Version": str(self.version),
+            "X-Market-As-Of": _iso(self.fetched_at) or "",
+            "X-Market-Age-Seconds": "" if age is None else f"{age:.0f}",
+            "X-Market-Stale": "true" if self.is_stale(now) else "false",
+            "Cache-Control": "public, max-age=10",
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"version": self.version, "fetched_at": self.fetched_at, "quotes": self.quotes, "errors": self.errors}
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> Optional["MarketSnapshot"]:
+        try:
+            body = json.loads(raw)
+            return cls.build(int(body["version"]), float(body["fetched_at"]), dict(body["quotes"]), body.get("errors"))
+        except (TypeError, ValueError, KeyError):
+            return None
+
+
+def _rendered(snapshot: MarketSnapshot) -> tuple[bytes, bytes]:
+    return snapshot.ticker_json, snapshot.prices_json
+
+
+def default_fetchers(session: Any = requests) -> dict[str, Callable[[], Optional[dict[str, Any]]]]:
+    fetchers: dict[str, Callable[[], Optional[dict[str, Any]]]] = {
+        symbol: (lambda symbol=symbol: fetch_yahoo_quote(symbol, session=session)) for symbol in YAHOO_SYMBOLS
+    }
+    fetchers[BTC_SYMBOL] = lambda: fetch_btc_quote(session=session)
+    return fetchers
+
+
+class MarketDataPoller:
+    """Refreshes all quotes concurrently on a schedule and publishes versioned snapshots."""
+
+    def __init__(
+        self,
+        fetchers: Optional[dict[str, Callable[[], Optional[dict[str, Any]]]]] = None,
+        *,
+        interval: float = MARKET_POLL_INTERVAL_SEC,
+        redis_client: Callable[[], Any] = shared_redis_client,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._fetchers = fetchers if fetchers is not None else default_fetchers(requests.Session())
+        self.interval = interval
+        self._redis_client = redis_client
+        self._clock = clock
+        self._snapshot = MarketSnapshot.empty()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._subscribers: set["_Subscription"] = set()
+        self.stats = {"refreshes": 0, "adopted": 0, "fetch_errors": 0, "last_refresh_ms": 0.0}
+
+    @property
+    def snapshot(self) -> MarketSnapshot:
+        return self._snapshot
+
+    def _redis(self) -> Any:
+        try:
+            return self._redis_client()
+        except Exception:
+            return None
+
+    def _redis_snapshot(self, client: Any) -> Optional[MarketSnapshot]:
+        try:
+            raw = client.get(REDIS_SNAPSHOT_KEY)
+        except Exception as exc:
+            print(f"[market] redis read failed: {exc}")
+            drop_shared_redis_client()
+            return None
+        return MarketSnapshot.from_json(raw) if raw else None
+
+    def _holds_poll_lease(self, client: Any) -> bool:
+        try:
+            return bool(client.set(REDIS_POLL_LEASE_KEY, str(os.getpid()), nx=True, ex=max(1, int(self.interval * 0.9))))
+        except Exception:
+            drop_shared_redis_client()
+            return True
+
+    def _fetch_all(self) -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
+        quotes: dict[str, dict[str, Any]] = {}
+        errors: dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=len(self._fetchers) or 1, thread_name_prefix="market-fetch") as pool:
+            futures = {symbol: pool.submit(fetch) for symbol, fetch in self._fetchers.items()}
+            for symbol, future in futures.items():
+                try:
+                    quote = future.result()
+                except Exception as exc:
+                    quote = None
+                    errors[symbol] = str(exc)[:200]
+                if quote is None:
+                    errors.setdefault(symbol, "no quote")
+                    continue
+                quotes[symbol] = quote
+        return quotes, errors
+
+    def refresh_once(self) -> MarketSnapshot:
+        """One poll cycle; adopts a newer Redis snapshot instead of polling when another worker holds the lease."""
+        with self._refresh_lock:
+            started = time.perf_counter()
+            client = self._redis()
+            previous = self._snapshot
+            if client is not None:
+                shared = self._redis_snapshot(client)
+                if shared is not None and shared.version > previous.version:
+                    previous = shared
+                # With nothing to adopt yet, poll regardless so a cold worker is not left with dashes.
+                if previous.version and not self._holds_poll_lease(client):
+                    if previous is not self._snapshot:
+                        self.stats["adopted"] += 1
+                        self._publish(previous)
+                    self._ready.set()
+                    return self._snapshot
+
+            fresh, errors = self._fetch_all()
+            now = self._clock()
+            quotes = dict(previous.quotes)
+            for symbol, quote in fresh.items():
+                quotes[symbol] = {"price": quote["price"], "chg_pct": quote.get("chg_pct"), "as_of": now}
+            # A cycle where every upstream failed must not make old quotes look fresh.
+            fetched_at = now if fresh else previous.fetched_at
+            changed = _rendered(MarketSnapshot.build(0, fetched_at, quotes)) != _rendered(previous)
+            version = previous.version + 1 if changed or previous.version == 0 else previous.version
+            snapshot = MarketSnapshot.build(version, fetched_at, quotes, errors)
+            self.stats["refreshes"] += 1
+            self.stats["fetch_errors"] += len(errors)
+            self.stats["last_refresh_ms"] = round((time.perf_counter() - started) * 1000.0, 1)
+            if client is not None:
+                try:
+                    client.set(REDIS_SNAPSHOT_KEY, snapshot.to_json(), ex=int(max(MARKET_STALE_AFTER_SEC, self.interval) * 4))
+                except Exception as exc:
+                    print(f"[market] redis write failed: {exc}")
+                    drop_shared_redis_client()
+            self._publish(snapshot)
+            self._ready.set()
+            return snapshot
+
+    def _publish(self, snapshot: MarketSnapshot) -> None:
+        with self._lock:
+            bumped = snapshot.version != self._snapshot.version
+            self._snapshot = snapshot
+            subscribers = list(self._subscribers) if bumped else []
+        for subscription in subscribers:
+            subscription.notify()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh_once()
+            except Exception as exc:
+                print(f"[market] refresh failed: {exc}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="market-poller", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def wait_ready(self, timeout: float) -> bool:
+        return self._ready.wait(timeout)
+
+    def subscribe(self) -> "_Subscription":
+        with self._lock:
+            if len(self._subscribers) >= MARKET_SSE_MAX_SUBSCRIBERS:
+                raise MarketStreamFull(f"market stream has {len(self._subscribers)} subscribers")
+            subscription = _Subscription(self)
+            self._subscribers.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: "_Subscription") -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+
+class MarketStreamFull(RuntimeError):
+    """Raised when MARKET_SSE_MAX_SUBSCRIBERS streams are already open in this process."""
+
+
+class _Subscription:
+    """Wakes one SSE stream, from the poller thread, when a new snapshot version lands."""
+
+    def __init__(self, poller: MarketDataPoller) -> None:
+        self.poller = poller
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+
+    def notify(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._changed.set)
+        except RuntimeError:
+            # Loop already closed; the stream is gone and will unsubscribe itself.
+            pass
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._changed.clear()
+        return True
+
+
+_poller_lock = threading.Lock()
+_poller: Optional[MarketDataPoller] = None
+
+
+def get_market_poller() -> MarketDataPoller:
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = MarketDataPoller()
+        return _poller
+
+
+def start_market_poller() -> Optional[MarketDataPoller]:
+    if not market_poller_enabled():
+        return None
+    poller = get_market_poller()
+    poller.start()
+    return poller
+
+
+def current_market_snapshot(*, wait: float = MARKET_COLD_WAIT_SEC) -> MarketSnapshot:
+    """Latest snapshot; a cold process waits up to ``wait`` seconds for the first refresh.
+
+    With the poller disabled a single synchronous refresh runs instead, so the
+    endpoints still work in scripts and tests that never start background threads.
+    """
+    poller = get_market_poller()
+    if poller.snapshot.version:
+        return poller.snapshot
+    if market_poller_enabled():
+        poller.start()
+        poller.wait_ready(wait)
+        return poller.snapshot
+    return poller.refresh_once()
+
+
+def market_quote(symbol: str) -> Optional[dict[str, Any]]:
+    """Snapshot quote for a tracked symbol, falling back to a direct fetch."""
+    quote = get_market_poller().snapshot.quotes.get(symbol)
+    if quote is not None:
+        return quote
+    if symbol == BTC_SYMBOL:
+        return fetch_btc_quote()
+    return fetch_yahoo_quote(symbol)
+
+
+def _sse(event: str, snapshot: MarketSnapshot) -> str:
+    body = {
+        **snapshot.meta(),
+        "ticker": json.loads(snapshot.ticker_json),
+        "prices": json.loads(snapshot.prices_json),
+    }
+    return f"id: {snapshot.version}\nevent: {event}\ndata: {json.dumps(body, ensure_ascii=False)}\n\n"
+
+
+async def market_event_stream(
+    is_disconnected: Callable[[], Awaitable[bool]],
+    *,
+    keepalive: float = MARKET_SSE_KEEPALIVE_SEC,
+) -> AsyncIterator[str]:
+    """Server-sent events: the current snapshot, then one ``ticker`` event per new version."""
+    poller = get_market_poller()
+    subscription = poller.subscribe()
+    try:
+        sent = poller.snapshot.version
+        yield _sse("ticker", poller.snapshot)
+        while not await is_disconnected():
+            await subscription.wait(keepalive)
+            snapshot = poller.snapshot
+            if snapshot.version != sent:
+                sent = snapshot.version
+                yield _sse("ticker", snapshot)
+            else:
+                yield ": keepalive\n\n"
+    finally:
+        poller.unsubscribe(subscription)
@@ -8,7 +8,12 @@ import re
 import urllib.request
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Optional
+
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
 
 try:
     from psycopg2.extras import Json, RealDictCursor
@@ -16,6 +21,11 @@ except ImportError:
     Json = None  # type: ignore
     RealDictCursor = None  # type: ignore
 
+try:
+    from backend.services.step_dag import DagStep, critical_path, run_step_dag, select_steps
+except ImportError:
+    from services.step_dag import DagStep, critical_path, run_step_dag, select_steps  # type: ignore[no-redef]
+
 try:
     from backend.services.storage_terminals import get_storage_terminals
 except ImportError:
@@ -40,6 +50,12 @@ GRAPH_SYNC_ENABLED = (os.getenv("OIL_GRAPH_SYNC_ENABLED") or "true").strip().low
     "no",
     "off",
 }
+# DAG runner (services/step_dag.py): threads / per-step connections, per-step timeout (0 = none),
+# retries for network-bound steps and their backoff base.
+GRAPH_SYNC_WORKERS = max(1, int(os.getenv("OIL_GRAPH_SYNC_WORKERS", "6") or "6"))
+GRAPH_SYNC_STEP_TIMEOUT_SEC = float(os.getenv("OIL_GRAPH_SYNC_STEP_TIMEOUT_SEC", "1800") or "0")
+GRAPH_SYNC_STEP_RETRIES = max(0, int(os.getenv("OIL_GRAPH_SYNC_STEP_RETRIES", "1") or "0"))
+GRAPH_SYNC_RETRY_BASE_SEC = float(os.getenv("OIL_GRAPH_SYNC_RETRY_BASE_SEC", "10") or "10")
 
 
 def _graph_sync_go_step_enabled(step: str) -> bool:
@@ -135,6 +151,7 @@ def _apply_migration_file(conn: Any, path: Path) -> None:
     conn.commit()
 
 
+@schema_ready("commercial_graph")
 def ensure_commercial_graph_tables(conn: Any) -> None:
     """Apply graph-related migrations when oil-live base tables already exist."""
     with conn.cursor() as cur:
@@ -188,14 +205,37 @@ def _record_graph_sync_at(conn: Any, finished_at: str) -> None:
         )
 
 
-def _record_graph_sync_steps(conn: Any, steps: dict[str, Any]) -> None:
-    """Persist per-step outcomes for GET /api/oil-live/sync-status graph_sync_steps."""
+def _record_graph_sync_steps(
+    conn: Any,
+    steps: dict[str, Any],
+    *,
+    timings: Optional[dict[str, dict[str, Any]]] = None,
+    critical_path: Optional[dict[str, Any]] = None,
+) -> None:
+    """Persist per-step outcomes for GET /api/oil-live/sync-status graph_sync_steps.
+
+    ``timings`` adds wall time, attempts and the DAG run status to each step;
+    ``critical_path`` is stored under ``graph_sync_critical_path``.
+    """
     if not steps:
         return
+    timings = timings or {}
+    on_path = set((critical_path or {}).get("steps") or ())
     with conn.cursor() as cur:
         for step_name, payload in steps.items():
             if not isinstance(payload, dict):
                 payload = {"status": "ok", "detail": payload}
+            timing = timings.get(step_name)
+            if timing:
+                payload = {
+                    **payload,
+                    "status": payload.get("status") or timing["status"],
+                    "duration_ms": timing["duration_ms"],
+                    "attempts": timing["attempts"],
+                    "critical_path": step_name in on_path,
+                }
+                if timing.get("upstream_errors"):
+                    payload["upstream_errors"] = timing["upstream_errors"]
             cur.execute(
                 """
                 INSERT INTO oil_live_sync_state (key, value, metadata, updated_at)
@@ -207,6 +247,18 @@ def _record_graph_sync_steps(conn: Any, steps: dict[str, Any]) -> None:
                 """,
                 (f"graph_sync_step_{step_name}", json.dumps(payload)),
             )
+        if critical_path:
+            cur.execute(
+                """
+                INSERT INTO oil_live_sync_state (key, value, metadata, updated_at)
+                VALUES ('graph_sync_critical_path', now(), %s::jsonb, now())
+                ON CONFLICT (key) DO UPDATE SET
+                  value = now(),
+                  metadata = EXCLUDED.metadata,
+                  updated_at = now()
+                """,
+                (json.dumps(critical_path),),
+            )
 
 
 def _ensure_demo_opportunities(cur: Any) -> dict[str, Any]:
@@ -1428,8 +1480,248 @@ def _trigger_synthetic_bol_rebuild() -> dict[str, Any]:
         return {"status": "skipped", "error": str(exc)}
 
 
-def run_full_graph_sync(conn: Any, *, rebuild_synthetic_bol: bool = True) -> dict[str, Any]:
-    """Run all graph merge steps against mining_db."""
+def _with_cursor(fn: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def run(conn: Any) -> Any:
+        with conn.cursor() as cur:
+            return fn(cur)
+
+    return run
+
+
+def _go_or(step: str, fn: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Skip ``step`` when oil-live-intel-worker owns it (checked at run time)."""
+
+    def run(conn: Any) -> Any:
+        if _graph_sync_go_step_enabled(step):
+            return _graph_sync_go_skip_payload(step)
+        return fn(conn)
+
+    return run
+
+
+def _storage_terminals_step(cur: Any) -> dict[str, Any]:
+    if not _table_exists(cur, "oil_terminals"):
+        return {
+            "status": "skipped",
+            "reason": "oil_terminals table missing — start oil-live-intel once to apply migrations",
+        }
+    return _import_storage_terminals(cur)
+
+
+def _port_authority_tenants_step(cur: Any) -> dict[str, Any]:
+    try:
+        from backend.services.port_authority_directory import sync_port_authority_tenants_to_companies
+    except ImportError:
+        from services.port_authority_directory import sync_port_authority_tenants_to_companies  # type: ignore
+    return sync_port_authority_tenants_to_companies(cur)
+
+
+def _barentswatch_ais_step(conn: Any) -> dict[str, Any]:
+    try:
+        try:
+            from backend.services.ingest.barentswatch_ais_sync import sync_barentswatch_ais
+        except ImportError:
+            from services.ingest.barentswatch_ais_sync import sync_barentswatch_ais
+        return sync_barentswatch_ais(conn)
+    except Exception as exc:
+        return {"status": "skipped", "error": str(exc)}
+
+
+_VESSEL_POSITION_MIRROR_RETIRED = {
+    "status": "retired",
+    "detail": (
+        "Python maritime-worker Redis snapshot writer removed; "
+        "oil-live-intel-worker owns durable AIS ingest."
+    ),
+}
+
+# Steps that upsert oil_companies / oil_commercial_events share the "graph" group so they
+# never hold row locks on the same companies at once; the network fetchers run beside them.
+_COMPANY_WRITERS = ("licenses", "terminal_operators", "port_authority_tenants", "bunker_fuel_suppliers")
+_TRADE_FLOW_WRITERS = ("census_trade", "usitc_trade", "eia_crude_imports", "eia_historic_imports", "eurostat_trade")
+
+
+def graph_sync_steps(*, rebuild_synthetic_bol: bool = True) -> list[DagStep]:
+    """Graph-sync steps with their ordering constraints, in the legacy sequential order."""
+    timeout = GRAPH_SYNC_STEP_TIMEOUT_SEC or None
+    retries = GRAPH_SYNC_STEP_RETRIES
+    gleif_limit = int(os.getenv("GLEIF_BATCH_LIMIT", "100") or "100")
+    wikidata_limit = int(os.getenv("WIKIDATA_BATCH_LIMIT", "50") or "50")
+    opensanctions_limit = int(os.getenv("OPENSANCTIONS_BATCH_LIMIT", "50") or "50")
+
+    def local(name: str, run: Callable[[Any], Any], after: tuple[str, ...] = (), group: Optional[str] = "graph") -> DagStep:
+        return DagStep(name, run, after=after, group=group, timeout=timeout)
+
+    def fetch(name: str, run: Callable[[Any], Any], after: tuple[str, ...] = (), group: Optional[str] = None) -> DagStep:
+        return DagStep(name, run, after=after, group=group, timeout=timeout, retries=retries)
+
+    # Lambdas resolve the module-level helpers at call time so they stay patchable.
+    steps = [
+        fetch("storage_terminals", _with_cursor(lambda cur: _storage_terminals_step(cur)), group="graph"),
+        fetch(
+            "petroleum_osm_storage",
+            _go_or("petroleum_osm_storage", lambda conn: _ensure_petroleum_osm_storage_layer(conn)),
+        ),
+        local("licenses", _go_or("licenses", _with_cursor(lambda cur: _index_licenses(cur)))),
+        local(
+            "terminal_operators",
+            _go_or("terminal_operators", _with_cursor(lambda cur: _index_terminal_operators(cur))),
+            after=("storage_terminals",),
+        ),
+        local("port_authority_tenants", _with_cursor(lambda cur: _port_authority_tenants_step(cur))),
+        local(
+            "seed_port_calls",
+            _with_cursor(lambda cur: _seed_port_calls_if_sparse(cur)),
+            after=("storage_terminals",),
+            group=None,
+        ),
+        local(
+            "trade_flows",
+            _go_or("trade_flows", _with_cursor(lambda cur: {"events": _mirror_trade_flows(cur)})),
+            after=_TRADE_FLOW_WRITERS,
+        ),
+        fetch("census_trade", lambda conn: _sync_census_trade_flows(conn)),
+        fetch("usitc_trade", lambda conn: _sync_usitc_trade_flows(conn)),
+        # Phase 4b — EIA crude imports + refinery throughput (macro tier, country-level).
+        # One EIA step at a time: they share the API key's rate limit and oil_trade_flows rows.
+        fetch("eia_crude_imports", lambda conn: _sync_eia_crude_imports(conn), group="eia"),
+        fetch("eia_refinery_throughput", lambda conn: _sync_eia_refinery_throughput(conn), group="eia"),
+        fetch("eia_padd_storage", lambda conn: _sync_eia_padd_storage(conn), group="eia"),
+        fetch("eia_historic_imports", lambda conn: _sync_eia_historic_downloads(conn), group="eia"),
+        fetch("gem_extraction_tracker", lambda conn: _sync_gem_extraction_tracker(conn)),
+        fetch("gem_goit_pipelines", lambda conn: _sync_gem_goit_pipelines(conn)),
+        fetch("gem_gogpt_plants", lambda conn: _sync_gem_gogpt_plants(conn)),
+        fetch("gem_ggit_lng", lambda conn: _sync_gem_ggit_lng(conn)),
+        fetch("gem_ggit_gas_pipelines", lambda conn: _sync_gem_ggit_gas_pipelines(conn)),
+        local(
+            "bunker_fuel_suppliers",
+            _go_or("bunker_fuel_suppliers", lambda conn: _sync_bunker_fuel_suppliers(conn)),
+        ),
+        fetch("eurostat_trade", _go_or("eurostat_trade", lambda conn: _sync_eurostat_trade_flows(conn))),
+        fetch("jodi_oil", lambda conn: _sync_jodi_validation(conn)),
+        fetch("commodity_trade_flows", lambda conn: _sync_commodity_trade_comtrade(conn)),
+        fetch("trade_manifest_uk", lambda conn: _sync_uk_trade_manifests(conn)),
+        fetch("trade_manifest_brazil", lambda conn: _sync_brazil_trade_manifests(conn)),
+        # Phase 4c — LEI + Wikidata batch enrichment for oil_companies, after the company indexers.
+        fetch(
+            "gleif_batch",
+            lambda conn: _run_gleif_batch(conn, limit=gleif_limit),
+            after=_COMPANY_WRITERS,
+            group="company_enrichment",
+        ),
+        fetch(
+            "wikidata_enrich",
+            lambda conn: _run_wikidata_batch(conn, limit=wikidata_limit),
+            after=_COMPANY_WRITERS,
+            group="company_enrichment",
+        ),
+        # Phase 4a — OpenSanctions screening for oil_companies.
+        fetch(
+            "opensanctions_screening",
+            lambda conn: _run_opensanctions_batch(conn, limit=opensanctions_limit),
+            after=_COMPANY_WRITERS,
+            group="company_enrichment",
+        ),
+        local(
+            "port_calls",
+            _go_or("port_calls", _with_cursor(lambda cur: {"events": _mirror_port_calls(cur)})),
+            after=("seed_port_calls",),
+        ),
+        local("vessel_position_mirror", lambda conn: dict(_VESSEL_POSITION_MIRROR_RETIRED), group=None),
+        fetch("barentswatch_ais", lambda conn: _barentswatch_ais_step(conn)),
+        local("ted", _go_or("ted", _with_cursor(lambda cur: {"events": _mirror_ted_notices(cur)}))),
+        local("gov_awards", _go_or("gov_awards", _with_cursor(lambda cur: {"events": _mirror_gov_awards(cur)}))),
+        local(
+            "opportunity_links",
+            _with_cursor(lambda cur: _ensure_demo_opportunities(cur)),
+            after=("storage_terminals", "port_calls"),
+        ),
+    ]
+    if rebuild_synthetic_bol:
+        merged = tuple(step.name for step in steps)
+        steps.append(
+            fetch("synthetic_bol", lambda conn: _trigger_synthetic_bol_rebuild(), after=merged),
+        )
+        # Post-rebuild: copy lei + sanctions from oil_companies → meridian_cargo_records
+        # so the cargo popup / drawer can render chips without extra JOINs.
+        steps.append(
+            local(
+                "mcr_party_denormalize",
+                lambda conn: _denormalize_mcr_party_enrichment(conn),
+                after=("synthetic_bol",),
+                group=None,
+            )
+        )
+    return steps
+
+
+def _load_graph_sync_step_state(conn: Any) -> dict[str, dict[str, Any]]:
+    """Last recorded status and time per step (``graph_sync_step_<name>`` rows)."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT key, metadata, updated_at
+            FROM oil_live_sync_state
+            WHERE key LIKE 'graph_sync_step_%'
+            """
+        )
+        rows = cur.fetchall()
+    state: dict[str, dict[str, Any]] = {}
+    for key, metadata, updated_at in rows:
+        meta = metadata if isinstance(metadata, dict) else {}
+        state[str(key)[len("graph_sync_step_"):]] = {"status": meta.get("status"), "updated_at": updated_at}
+    return state
+
+
+def parse_graph_sync_since(value: str, *, now: Optional[datetime] = None) -> datetime:
+    """``--since`` as an ISO timestamp or a look-back like ``90m``, ``6h`` or ``2d``."""
+    text = (value or "").strip()
+    match = re.fullmatch(r"(\d+)\s*([mhd])", text.lower())
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {"m": timedelta(minutes=amount), "h": timedelta(hours=amount), "d": timedelta(days=amount)}[unit]
+        return (now or datetime.now(timezone.utc)) - delta
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError as exc:
+        raise ValueError(f"--since expects an ISO timestamp or NNm/NNh/NNd, got {value!r}") from exc
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _steps_stale_since(
+    steps: list[DagStep], state: dict[str, dict[str, Any]], since: datetime
+) -> list[str]:
+    """Steps with no clean run recorded at or after ``since`` (missing, failed, timed out or older)."""
+    stale = []
+    for step in steps:
+        recorded = state.get(step.name) or {}
+        updated_at = recorded.get("updated_at")
+        if isinstance(updated_at, datetime) and updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        if (
+            recorded.get("status") in {"error", "timeout"}
+            or not isinstance(updated_at, datetime)
+            or updated_at < since
+        ):
+            stale.append(step.name)
+    return stale
+
+
+def run_full_graph_sync(
+    conn: Any,
+    *,
+    rebuild_synthetic_bol: bool = True,
+    connect: Optional[Callable[[], Any]] = None,
+    only: Optional[Iterable[str]] = None,
+    since: Optional[datetime] = None,
+) -> dict[str, Any]:
+    """Run all graph merge steps against mining_db.
+
+    With ``connect`` the steps run as a DAG on up to OIL_GRAPH_SYNC_WORKERS threads, each on its
+    own connection; without it they run one by one on ``conn``. ``only`` restricts the run to the
+    named steps and ``since`` to steps without a clean run since then. Partial runs record their
+    steps but leave ``last_graph_sync_at`` alone.
+    """
     if not GRAPH_SYNC_ENABLED:
         return {"status": "skipped", "reason": "OIL_GRAPH_SYNC_ENABLED is off"}
 
@@ -1443,6 +1735,15 @@ def run_full_graph_sync(conn: Any, *, rebuild_synthetic_bol: bool = True) -> dic
         ensure_commercial_graph_tables(conn)
     except RuntimeError as exc:
         return {"status": "skipped", "reason": str(exc)}
+    conn.commit()
+
+    steps = graph_sync_steps(rebuild_synthetic_bol=rebuild_synthetic_bol)
+    partial = only is not None or since is not None
+    if only is not None:
+        steps = select_steps(steps, only)
+    if since is not None:
+        steps = select_steps(steps, _steps_stale_since(steps, _load_graph_sync_step_state(conn), since))
+
     started = _now_iso()
     census_key = (os.getenv("CENSUS_API_KEY") or "").strip()
     eia_key = (os.getenv("EIA_API_KEY") or "").strip()
@@ -1455,127 +1756,41 @@ def run_full_graph_sync(conn: Any, *, rebuild_synthetic_bol: bool = True) -> dic
         ),
         "steps": {},
     }
-    gleif_limit = int(os.getenv("GLEIF_BATCH_LIMIT", "100") or "100")
-    wikidata_limit = int(os.getenv("WIKIDATA_BATCH_LIMIT", "50") or "50")
-    opensanctions_limit = int(os.getenv("OPENSANCTIONS_BATCH_LIMIT", "50") or "50")
-    with conn.cursor() as cur:
-        if not _table_exists(cur, "oil_terminals"):
-            summary["steps"]["storage_terminals"] = {
-                "status": "skipped",
-                "reason": "oil_terminals table missing — start oil-live-intel once to apply migrations",
-            }
-        else:
-            summary["steps"]["storage_terminals"] = _import_storage_terminals(cur)
-        if _graph_sync_go_step_enabled("petroleum_osm_storage"):
-            summary["steps"]["petroleum_osm_storage"] = _graph_sync_go_skip_payload(
-                "petroleum_osm_storage"
-            )
-        else:
-            summary["steps"]["petroleum_osm_storage"] = _ensure_petroleum_osm_storage_layer(conn)
-        if _graph_sync_go_step_enabled("licenses"):
-            summary["steps"]["licenses"] = _graph_sync_go_skip_payload("licenses")
-        else:
-            summary["steps"]["licenses"] = _index_licenses(cur)
-        if _graph_sync_go_step_enabled("terminal_operators"):
-            summary["steps"]["terminal_operators"] = _graph_sync_go_skip_payload("terminal_operators")
-        else:
-            summary["steps"]["terminal_operators"] = _index_terminal_operators(cur)
-        try:
-            from backend.services.port_authority_directory import sync_port_authority_tenants_to_companies
-        except ImportError:
-            from services.port_authority_directory import sync_port_authority_tenants_to_companies  # type: ignore
-        summary["steps"]["port_authority_tenants"] = sync_port_authority_tenants_to_companies(cur)
-        summary["steps"]["seed_port_calls"] = _seed_port_calls_if_sparse(cur)
-        if _graph_sync_go_step_enabled("trade_flows"):
-            summary["steps"]["trade_flows"] = _graph_sync_go_skip_payload("trade_flows")
+    if partial:
+        summary["partial"] = True
+        summary["selected_steps"] = [step.name for step in steps]
+    results, timings = run_step_dag(
+        steps,
+        conn=conn,
+        connect=connect,
+        max_workers=GRAPH_SYNC_WORKERS,
+        retry_base_sec=GRAPH_SYNC_RETRY_BASE_SEC,
+    )
+    for name, result in results.items():
+        if name == "synthetic_bol":
+            summary["synthetic_bol"] = result
         else:
-            summary["steps"]["trade_flows"] = {"events": _mirror_trade_flows(cur)}
-        summary["steps"]["census_trade"] = _sync_census_trade_flows(conn)
-        summary["steps"]["usitc_trade"] = _sync_usitc_trade_flows(conn)
-        # Phase 4b — EIA crude imports + refinery throughput (macro tier, country-level).
-        summary["steps"]["eia_crude_imports"] = _sync_eia_crude_imports(conn)
-        summary["steps"]["eia_refinery_throughput"] = _sync_eia_refinery_throughput(conn)
-        summary["steps"]["eia_padd_storage"] = _sync_eia_padd_storage(conn)
-        summary["steps"]["eia_historic_imports"] = _sync_eia_historic_downloads(conn)
-        summary["steps"]["gem_extraction_tracker"] = _sync_gem_extraction_tracker(conn)
-        summary["steps"]["gem_goit_pipelines"] = _sync_gem_goit_pipelines(conn)
-        summary["steps"]["gem_gogpt_plants"] = _sync_gem_gogpt_plants(conn)
-        summary["steps"]["gem_ggit_lng"] = _sync_gem_ggit_lng(conn)
-        summary["steps"]["gem_ggit_gas_pipelines"] = _sync_gem_ggit_gas_pipelines(conn)
-        summary["steps"]["bunker_fuel_suppliers"] = (
-            _graph_sync_go_skip_payload("bunker_fuel_suppliers")
-            if _graph_sync_go_step_enabled("bunker_fuel_suppliers")
-            else _sync_bunker_fuel_suppliers(conn)
-        )
-        summary["steps"]["eurostat_trade"] = (
-            _graph_sync_go_skip_payload("eurostat_trade")
-            if _graph_sync_go_step_enabled("eurostat_trade")
-            else _sync_eurostat_trade_flows(conn)
-        )
-        summary["steps"]["jodi_oil"] = _sync_jodi_validation(conn)
-        summary["steps"]["commodity_trade_flows"] = _sync_commodity_trade_comtrade(conn)
-        summary["steps"]["trade_manifest_uk"] = _sync_uk_trade_manifests(conn)
-        summary["steps"]["trade_manifest_brazil"] = _sync_brazil_trade_manifests(conn)
-        # Phase 4c — LEI + Wikidata batch enrichment for oil_companies.
-        summary["steps"]["gleif_batch"] = _run_gleif_batch(conn, limit=gleif_limit)
-        summary["steps"]["wikidata_enrich"] = _run_wikidata_batch(
-            conn, limit=wikidata_limit
-        )
-        # Phase 4a — OpenSanctions screening for oil_companies.
-        summary["steps"]["opensanctions_screening"] = _run_opensanctions_batch(
-            conn, limit=opensanctions_limit
-        )
-        summary["steps"]["port_calls"] = (
-            _graph_sync_go_skip_payload("port_calls")
-            if _graph_sync_go_step_enabled("port_calls")
-            else {"events": _mirror_port_calls(cur)}
-        )
-        summary["steps"]["vessel_position_mirror"] = {
-            "status": "retired",
-            "detail": (
-                "Python maritime-worker Redis snapshot writer removed; "
-                "oil-live-intel-worker owns durable AIS ingest."
-            ),
-        }
-        try:
-            try:
-                from backend.services.ingest.barentswatch_ais_sync import sync_barentswatch_ais
-            except ImportError:
-                from services.ingest.barentswatch_ais_sync import sync_barentswatch_ais
-            summary["steps"]["barentswatch_ais"] = sync_barentswatch_ais(conn)
-        except Exception as exc:
-            summary["steps"]["barentswatch_ais"] = {
-                "status": "skipped",
-                "error": str(exc),
-            }
-        summary["steps"]["ted"] = (
-            _graph_sync_go_skip_payload("ted")
-            if _graph_sync_go_step_enabled("ted")
-            else {"events": _mirror_ted_notices(cur)}
-        )
-        summary["steps"]["gov_awards"] = (
-            _graph_sync_go_skip_payload("gov_awards")
-            if _graph_sync_go_step_enabled("gov_awards")
-            else {"events": _mirror_gov_awards(cur)}
-        )
-        summary["steps"]["opportunity_links"] = _ensure_demo_opportunities(cur)
-    conn.commit()
-    if rebuild_synthetic_bol:
-        summary["synthetic_bol"] = _trigger_synthetic_bol_rebuild()
-        # Post-rebuild: copy lei + sanctions from oil_companies → meridian_cargo_records
-        # so the cargo popup / drawer can render chips without extra JOINs.
-        summary["steps"]["mcr_party_denormalize"] = _denormalize_mcr_party_enrichment(
-            conn
-        )
+            summary["steps"][name] = result
+    summary["timings"] = timings
+    summary["critical_path"] = critical_path(steps, timings)
     summary["finished_at"] = _now_iso()
-    _record_graph_sync_at(conn, summary["finished_at"])
-    _record_graph_sync_steps(conn, summary.get("steps") or {})
+    if not partial:
+        _record_graph_sync_at(conn, summary["finished_at"])
+    recorded = dict(summary["steps"])
+    if "synthetic_bol" in summary:
+        # Kept out of summary["steps"] for the API shape, but --since needs its state too.
+        recorded["synthetic_bol"] = summary["synthetic_bol"]
+    _record_graph_sync_steps(
+        conn,
+        recorded,
+        timings=timings,
+        critical_path=None if partial else summary["critical_path"],
+    )
     conn.commit()
     summary["status"] = "ok"
     return summary
 
 
-
 def purge_demo_seed(conn: Any) -> dict[str, int]:
     """
     Remove demo opportunities, seed port calls, seed-linked MCRs, and restore hijacked vessels.
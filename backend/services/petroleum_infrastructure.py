@@ -6,7 +6,6 @@ import json
 import math
 import os
 import re
-import time
 from datetime import datetime, timezone
 from typing import Any, Callable, Optional
 from urllib.error import HTTPError, URLError
@@ -18,6 +17,11 @@ try:
 except ImportError:  # pragma: no cover
     mapbox_vector_tile = None  # type: ignore
 
+try:
+    from backend.services.bounded_cache import BoundedCache, single_flight
+except ImportError:
+    from services.bounded_cache import BoundedCache, single_flight  # type: ignore[no-redef]
+
 
 REQUEST_TIMEOUT_SECONDS = 20
 LAYER_CACHE_TTL_SECONDS = 60 * 60
@@ -46,7 +50,13 @@ _OIL_PIPELINE_LAYER = "global_oil_pipelines_7z9-dvrjxe"
 _GAS_PIPELINE_LAYER = "natural_gas_pipelines_j96-44dhf7"
 _REFINERIES_LAYER = "REFINERIES-dtgbkt"
 
-_layer_cache: dict[str, Any] = {"entries": {}}
+_layer_cache = BoundedCache(
+    "petroleum_mapbox_layers",
+    max_entries=int(os.getenv("PETROLEUM_LAYER_CACHE_MAX", "256")),
+    max_bytes=int(os.getenv("PETROLEUM_LAYER_CACHE_MAX_MB", "256")) * 1024 * 1024,
+    ttl_seconds=LAYER_CACHE_TTL_SECONDS,
+    shared=True,
+)
 
 CatalogLayer = dict[str, Any]
 FeatureFilter = Callable[[dict[str, Any]], bool]
@@ -282,17 +292,11 @@ def _collect_from_tileset(
 
 
 def _cache_get(key: str) -> Optional[dict[str, Any]]:
-    entry = _layer_cache["entries"].get(key)
-    if not entry:
-        return None
-    if time.time() - entry["loaded_at"] > LAYER_CACHE_TTL_SECONDS:
-        _layer_cache["entries"].pop(key, None)
-        return None
-    return entry["payload"]
+    return _layer_cache.get(key)
 
 
 def _cache_set(key: str, payload: dict[str, Any]) -> None:
-    _layer_cache["entries"][key] = {"loaded_at": time.time(), "payload": payload}
+    _layer_cache.set(key, payload)
 
 
 PETROLEUM_LAYER_DEFINITIONS: dict[str, CatalogLayer] = {
@@ -386,6 +390,7 @@ def get_petroleum_layer_catalog() -> dict[str, Any]:
     }
 
 
+@single_flight
 def get_petroleum_layer_geojson(
     layer_id: str,
     bbox: Optional[tuple[float, float, float, float]] = None,
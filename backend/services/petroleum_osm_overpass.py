@@ -1,19 +1,23 @@
 """OpenStreetMap petroleum infrastructure via Overpass (free Mapbox alternative).
 
 Layers: pipelines (man_made=pipeline) and refineries (industrial=refinery).
-Respects Overpass rate limits via tile chunking and in-memory TTL cache.
+Respects Overpass rate limits via tile chunking and a bounded in-memory TTL cache
+(stale layers are served while one background refresh re-queries Overpass).
 """
 
 from __future__ import annotations
 
 import json
 import os
-import time
 
 try:
     from backend.services.pipeline_substance import classify_pipeline_substance
 except ImportError:
     from services.pipeline_substance import classify_pipeline_substance  # type: ignore
+try:
+    from backend.services.bounded_cache import BoundedCache
+except ImportError:
+    from services.bounded_cache import BoundedCache  # type: ignore[no-redef]
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from typing import Any, Optional
@@ -22,6 +26,7 @@ from urllib.request import Request, urlopen
 
 OVERPASS_TIMEOUT_SECONDS = 45
 CACHE_TTL_SECONDS = 60 * 60 * 12
+CACHE_STALE_SECONDS = 60 * 60 * 12
 MAX_TILE_WORKERS = 4
 USER_AGENT = "MeridianMiningMap/1.0 (petroleum-osm; +https://github.com/)"
 
@@ -57,7 +62,13 @@ OSM_LAYERS: dict[str, dict[str, Any]] = {
     },
 }
 
-_layer_cache: dict[str, dict[str, Any]] = {}
+_layer_cache = BoundedCache(
+    "petroleum_osm_layers",
+    max_entries=int(os.getenv("PETROLEUM_OSM_LAYER_CACHE_MAX", "64")),
+    max_bytes=int(os.getenv("PETROLEUM_OSM_LAYER_CACHE_MAX_MB", "512")) * 1024 * 1024,
+    ttl_seconds=CACHE_TTL_SECONDS,
+    stale_seconds=CACHE_STALE_SECONDS,
+)
 
 
 def _now_iso() -> str:
@@ -365,10 +376,10 @@ def get_osm_layer_geojson(
         bbox = (-55.0, -180.0, 84.0, 180.0)
 
     cache_key = f"{layer_id}:{_bbox_key(bbox)}"
-    cached = _layer_cache.get(cache_key)
-    if cached and (time.time() - float(cached.get("loaded_at") or 0)) < CACHE_TTL_SECONDS:
-        return dict(cached["response"])
+    return dict(_layer_cache.get_or_load(cache_key, lambda: _build_osm_layer_geojson(layer_id, bbox)))
 
+
+def _build_osm_layer_geojson(layer_id: str, bbox: tuple[float, float, float, float]) -> dict[str, Any]:
     warnings: list[str] = []
     features: list[dict[str, Any]] = []
     tiles = _tiles_for_bbox(bbox)
@@ -405,6 +416,4 @@ def get_osm_layer_geojson(
         "limitations": get_osm_layer_catalog()["limitations"] + warnings,
         "cached": False,
     }
-
-    _layer_cache[cache_key] = {"loaded_at": time.time(), "response": response}
     return response
@@ -12,6 +12,11 @@ import time
 from datetime import datetime, timezone
 from typing import Any, Callable, Optional
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 # Default off — same posture as STORAGE_SKIP_LIVE_OVERPASS in docker-compose.
 PETROLEUM_OSMLAYER_LIVE_OVERPASS = (os.getenv("PETROLEUM_OSMLAYER_LIVE_OVERPASS") or "").strip().lower() in {
     "1",
@@ -51,6 +56,7 @@ except ImportError:
     )
 
 
+@schema_ready("petroleum_osm")
 def ensure_petroleum_osm_tables(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
@@ -91,18 +97,22 @@ def layer_has_cached_features(conn: Any, layer_id: str) -> bool:
         return cur.fetchone() is not None
 
 
+LAYER_FEATURE_STATS_SQL = """
+SELECT COUNT(*)::int, MAX(fetched_at)
+FROM petroleum_osm_features
+WHERE layer_id = %s;
+"""
+
+
 def layer_feature_stats(conn: Any, layer_id: str) -> dict[str, Any]:
     ensure_petroleum_osm_tables(conn)
     with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT COUNT(*)::int, MAX(fetched_at)
-            FROM petroleum_osm_features
-            WHERE layer_id = %s;
-            """,
-            (layer_id,),
-        )
-        row = cur.fetchone()
+        cur.execute(LAYER_FEATURE_STATS_SQL, (layer_id,))
+        return layer_feature_stats_from_row(cur.fetchone())
+
+
+def layer_feature_stats_from_row(row: Any) -> dict[str, Any]:
+    """Decode a LAYER_FEATURE_STATS_SQL row (shared with the async map loader)."""
     count = int(row[0]) if row else 0
     fetched_at = row[1] if row else None
     return {
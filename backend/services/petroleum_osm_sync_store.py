@@ -4,7 +4,13 @@ from __future__ import annotations
 
 from typing import Any, Optional, Sequence
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
 
+
+@schema_ready("petroleum_osm_sync_runs")
 def ensure_petroleum_osm_sync_tables(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
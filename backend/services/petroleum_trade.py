@@ -32,8 +32,9 @@ metadata where useful):
 5. **Static seed rows** — bundled curated 2022 figures (HS 2709/2710/2711
    for top exporters).  Final safety net when every upstream is down.
 
-All upstream responses are memoised in an in-process TTL cache (24h) to
-respect fair-use limits and keep panel reloads snappy.  No persistence
+All upstream responses are memoised in a bounded TTL cache (24h, LRU, shared
+through Redis when configured) to respect fair-use limits and keep panel reloads
+snappy; concurrent identical fetches are coalesced into one upstream call.  No persistence
 layer is required for the public preview because the data set already
 lags 12-24 months from the current date.
 """
@@ -41,8 +42,6 @@ lags 12-24 months from the current date.
 from __future__ import annotations
 
 import os
-import threading
-import time
 from typing import Any, Optional
 
 try:
@@ -50,6 +49,11 @@ try:
 except ImportError:  # pragma: no cover
     requests = None  # type: ignore
 
+try:
+    from backend.services.bounded_cache import BoundedCache, single_flight
+except ImportError:
+    from services.bounded_cache import BoundedCache, single_flight  # type: ignore[no-redef]
+
 
 # ---------------------------------------------------------------------------
 # Endpoints & tunables
@@ -77,34 +81,28 @@ PETROLEUM_HS_CODES: dict[str, str] = {
 STATCAN_TRADE_PID = "12100146"
 
 # ---------------------------------------------------------------------------
-# In-memory TTL cache
+# Bounded TTL cache
 # ---------------------------------------------------------------------------
 
-_cache_lock = threading.Lock()
-_cache: dict[str, tuple[float, Any]] = {}
+_cache = BoundedCache(
+    "petroleum_trade",
+    max_entries=int(os.getenv("PETROLEUM_TRADE_CACHE_MAX", "2048")),
+    ttl_seconds=CACHE_TTL_SECONDS,
+    shared=True,
+)
 
 
 def _cache_get(key: str) -> Optional[Any]:
-    with _cache_lock:
-        entry = _cache.get(key)
-        if not entry:
-            return None
-        ts, payload = entry
-        if time.time() - ts > CACHE_TTL_SECONDS:
-            _cache.pop(key, None)
-            return None
-        return payload
+    return _cache.get(key)
 
 
 def _cache_set(key: str, value: Any) -> None:
-    with _cache_lock:
-        _cache[key] = (time.time(), value)
+    _cache.set(key, value)
 
 
 def clear_cache() -> None:
     """Test helper — wipe the TTL cache between scenarios."""
-    with _cache_lock:
-        _cache.clear()
+    _cache.clear()
 
 
 # ---------------------------------------------------------------------------
@@ -149,6 +147,7 @@ def _normalize_comtrade_row(row: dict) -> dict:
     }
 
 
+@single_flight
 def fetch_comtrade_public(
     reporter_m49: str,
     hs_code: str,
@@ -206,6 +205,7 @@ def fetch_comtrade_public(
     return out
 
 
+@single_flight
 def fetch_comtrade_keyed(
     reporter_m49: str,
     hs_code: str,
@@ -268,6 +268,7 @@ _STATCAN_HS_CHAPTER = {
 }
 
 
+@single_flight
 def fetch_statcan_canada(
     hs_code: str,
     year: int = 2023,
@@ -398,6 +399,7 @@ EIA_COUNTRY_ISO3: dict[str, str] = {
 }
 
 
+@single_flight
 def fetch_eia_international(
     iso2: str,
     hs_code: str,
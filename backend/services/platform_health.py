@@ -25,6 +25,10 @@ def build_platform_health(
     redis_ping,
     get_maritime_stats,
     get_oil_live_health=None,
+    get_db_pool_stats=None,
+    get_schema_stats=None,
+    get_cache_stats=None,
+    get_lane_stats=None,
 ) -> dict[str, Any]:
     redis_ok = False
     redis_error: Optional[str] = None
@@ -80,6 +84,34 @@ def build_platform_health(
         except Exception as exc:
             oil_live_intel = {"ok": False, "error": str(exc)}
 
+    db_pool: Optional[dict[str, Any]] = None
+    if get_db_pool_stats is not None:
+        try:
+            db_pool = get_db_pool_stats()
+        except Exception as exc:
+            db_pool = {"error": str(exc)}
+
+    schema: Optional[dict[str, Any]] = None
+    if get_schema_stats is not None:
+        try:
+            schema = get_schema_stats()
+        except Exception as exc:
+            schema = {"error": str(exc)}
+
+    caches: Optional[dict[str, Any]] = None
+    if get_cache_stats is not None:
+        try:
+            caches = get_cache_stats()
+        except Exception as exc:
+            caches = {"error": str(exc)}
+
+    lanes: Optional[dict[str, Any]] = None
+    if get_lane_stats is not None:
+        try:
+            lanes = get_lane_stats()
+        except Exception as exc:
+            lanes = {"error": str(exc)}
+
     ai_providers = get_ai_provider_status()
     oil_live_ok = oil_live_intel.get("ok") is not False
     platform_ok = redis_ok and (worker_healthy or ais_positions_fresh) and oil_live_ok
@@ -97,5 +129,9 @@ def build_platform_health(
         "maritime_worker": maritime_worker,
         "ais_positions_fresh": ais_positions_fresh,
         "oil_live_intel": oil_live_intel,
+        "db_pool": db_pool,
+        "schema": schema,
+        "caches": caches,
+        "lanes": lanes,
         "status": status,
     }
@@ -3,8 +3,8 @@ from __future__ import annotations
 import csv
 import io
 import json
+import os
 import re
-import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
@@ -22,6 +22,11 @@ try:
 except ImportError:
     from services.maritime_intel import haversine_km, find_nearest_ports, parse_unlocode_coordinates
 
+try:
+    from backend.services.bounded_cache import BoundedCache, single_flight
+except ImportError:
+    from services.bounded_cache import BoundedCache, single_flight  # type: ignore[no-redef]
+
 
 UNLOCODE_CSV_URL = "https://raw.githubusercontent.com/datasets/un-locode/main/data/code-list.csv"
 UNLOCODE_OFFICIAL_SOURCE_URL = "https://unece.org/trade/cefact/UNLOCODE-Download"
@@ -43,8 +48,13 @@ LOGISTICS_KEYWORD_RE = re.compile(
 )
 TERMINAL_KEYWORD_RE = re.compile(r"(terminal|quay|jetty|berth|harbour|harbor|dock|wharf)", re.I)
 
-_list_cache: dict[str, Any] = {"loaded_at": 0.0, "response": None}
-_detail_cache: dict[str, dict[str, Any]] = {}
+_list_cache = BoundedCache("port_logistics_list", max_entries=1, ttl_seconds=LIST_CACHE_TTL_SECONDS)
+_detail_cache = BoundedCache(
+    "port_logistics_detail",
+    max_entries=int(os.getenv("PORT_LOGISTICS_DETAIL_CACHE_MAX", "512")),
+    ttl_seconds=DETAIL_CACHE_TTL_SECONDS,
+    shared=True,
+)
 _country_name_cache: dict[str, str] | None = None
 
 
@@ -350,12 +360,11 @@ def _build_stats(entities: list[dict[str, Any]]) -> dict[str, Any]:
 
 
 def _fresh_list_cache() -> Optional[dict[str, Any]]:
-    age = time.time() - float(_list_cache.get("loaded_at") or 0.0)
-    if _list_cache.get("response") and age < LIST_CACHE_TTL_SECONDS:
-        return dict(_list_cache["response"])
-    return None
+    response = _list_cache.get("entities")
+    return dict(response) if response else None
 
 
+@single_flight
 def get_port_logistics_entities(force_refresh: bool = False) -> dict[str, Any]:
     if not force_refresh:
         cached = _fresh_list_cache()
@@ -405,8 +414,7 @@ def get_port_logistics_entities(force_refresh: bool = False) -> dict[str, Any]:
         "stats": _build_stats(entities),
     }
 
-    _list_cache["loaded_at"] = time.time()
-    _list_cache["response"] = response
+    _list_cache.set("entities", response)
     return dict(response)
 
 
@@ -648,10 +656,11 @@ def _detail_limitations(subtype: str) -> list[str]:
     return limitations
 
 
+@single_flight
 def get_port_logistics_details(entity_id: str) -> Optional[dict[str, Any]]:
     cached = _detail_cache.get(entity_id)
-    if cached and time.time() - float(cached.get("loaded_at") or 0.0) < DETAIL_CACHE_TTL_SECONDS:
-        detail = dict(cached["detail"])
+    if cached:
+        detail = dict(cached)
         detail["cached"] = True
         return detail
 
@@ -717,8 +726,5 @@ def get_port_logistics_details(entity_id: str) -> Optional[dict[str, Any]]:
         from services.port_authority_directory import attach_port_directory_to_entity  # type: ignore
     detail = attach_port_directory_to_entity(detail)
 
-    _detail_cache[entity_id] = {
-        "loaded_at": time.time(),
-        "detail": detail,
-    }
+    _detail_cache.set(entity_id, detail)
     return dict(detail)
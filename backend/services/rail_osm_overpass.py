@@ -1,7 +1,8 @@
 """OpenStreetMap railway corridors via Overpass (free, ODbL).
 
 Fetches ``railway=rail|light_rail`` ways between two hubs for route planning.
-Results are cached in memory with TTL, similar to petroleum OSM layers.
+Results are cached in a bounded TTL cache (shared through Redis when configured),
+similar to petroleum OSM layers.
 """
 
 from __future__ import annotations
@@ -9,35 +10,38 @@ from __future__ import annotations
 import json
 import math
 import os
-import time
 from typing import Any, Callable, Optional
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
+try:
+    from backend.services.bounded_cache import BoundedCache, single_flight
+except ImportError:
+    from services.bounded_cache import BoundedCache, single_flight  # type: ignore[no-redef]
+
 OVERPASS_URL = os.getenv("RAIL_OVERPASS_URL", "https://overpass-api.de/api/interpreter")
 OVERPASS_TIMEOUT_SEC = float(os.getenv("RAIL_OVERPASS_TIMEOUT_SEC", "45"))
 CACHE_TTL_SECONDS = int(os.getenv("RAIL_OSM_CACHE_TTL_SEC", str(60 * 60 * 12)))
 MAX_CHUNK_KM = float(os.getenv("RAIL_OVERPASS_MAX_CHUNK_KM", "650"))
 USER_AGENT = "MeridianMiningMap/1.0 (rail-routing; +https://github.com/)"
 
-_rail_cache: dict[str, dict[str, Any]] = {}
+_rail_cache = BoundedCache(
+    "rail_osm_corridors",
+    max_entries=int(os.getenv("RAIL_OSM_CACHE_MAX", "1024")),
+    ttl_seconds=CACHE_TTL_SECONDS,
+    shared=True,
+)
 
 
 def _cache_get(key: str) -> Optional[list[tuple[float, float]]]:
-    entry = _rail_cache.get(key)
-    if not entry:
-        return None
-    if time.monotonic() - float(entry.get("stored_at", 0)) > CACHE_TTL_SECONDS:
-        _rail_cache.pop(key, None)
-        return None
-    path = entry.get("path")
+    path = _rail_cache.get(key)
     if isinstance(path, list) and path:
         return [(float(p[0]), float(p[1])) for p in path]
     return None
 
 
 def _cache_put(key: str, path: list[tuple[float, float]]) -> None:
-    _rail_cache[key] = {"stored_at": time.monotonic(), "path": path}
+    _rail_cache.set(key, [[lat, lng] for lat, lng in path])
 
 
 def _haversine_km(a_lat: float, a_lng: float, b_lat: float, b_lng: float) -> float:
@@ -213,6 +217,7 @@ def _elements_to_path(
     return _chain_way_polylines(ways, a_lat, a_lng, b_lat, b_lng)
 
 
+@single_flight
 def fetch_rail_corridor_geometry(
     a_lat: float,
     a_lng: float,
@@ -277,5 +282,5 @@ def fetch_rail_corridor_geometry(
     return merged
 
 
-def rail_cache_stats() -> dict[str, int]:
-    return {"entries": len(_rail_cache), "ttl_seconds": CACHE_TTL_SECONDS}
+def rail_cache_stats() -> dict[str, Any]:
+    return _rail_cache.stats()
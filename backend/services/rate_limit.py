@@ -1,4 +1,9 @@
-"""Per-client rate limiting for expensive backend endpoints (Redis with in-memory fallback)."""
+"""Per-client rate limiting for expensive backend endpoints (Redis with in-memory fallback).
+
+Both paths use a sliding-window counter. Redis checks and increments in one Lua call
+on the process-wide pooled client; the fallback keeps two fixed-window slots per
+window length in memory.
+"""
 
 from __future__ import annotations
 
@@ -6,7 +11,7 @@ import hashlib
 import os
 import threading
 import time
-from typing import Callable, Optional
+from typing import Any, Optional
 
 try:
     from fastapi import Request
@@ -17,6 +22,11 @@ except ImportError:  # pragma: no cover - import guard for unit tests
     BaseHTTPMiddleware = object  # type: ignore[misc, assignment]
     JSONResponse = object  # type: ignore[misc, assignment]
 
+try:
+    from backend.services.redis_connection import drop_shared_redis_client, shared_redis_client
+except ImportError:
+    from services.redis_connection import drop_shared_redis_client, shared_redis_client  # type: ignore[no-redef]
+
 
 def _env_bool(key: str, default: bool) -> bool:
     raw = (os.getenv(key) or "").strip().lower()
@@ -39,26 +49,66 @@ RATE_LIMIT_ENABLED = _env_bool("RATE_LIMIT_ENABLED", False)
 RATE_LIMIT_RPM = _env_int("RATE_LIMIT_RPM", 30)
 RATE_LIMIT_ROUTE_RPM = _env_int("RATE_LIMIT_ROUTE_RPM", 60)
 RATE_LIMIT_WINDOW_SEC = 60
+# Per-window client cap for the in-memory fallback; the oldest-seen client in the
+# current window is forgotten first.
+RATE_LIMIT_MEMORY_MAX_KEYS = _env_int("RATE_LIMIT_MEMORY_MAX_KEYS", 10_000)
+
+# Sliding-window counter: the previous fixed window's count is weighted by how much
+# of it still overlaps the trailing window. Rejected requests are not counted, so a
+# client that keeps retrying is admitted again at the configured rate.
+# KEYS: current, previous window counters. ARGV: limit, ttl seconds, previous weight.
+_SLIDING_WINDOW_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if previous * tonumber(ARGV[3]) + current >= tonumber(ARGV[1]) then
+  return 0
+end
+if redis.call('INCR', KEYS[1]) == 1 then
+  redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+end
+return 1
+"""
+
+
+class _WindowWheel:
+    """In-memory sliding-window counters for one window length.
+
+    Two slots (previous and current fixed window) of per-key counts. Advancing the
+    window drops the oldest slot whole, so there is never a scan over stale keys, and
+    each slot is capped at ``max_keys``.
+    """
+
+    def __init__(self, window_sec: int, max_keys: int) -> None:
+        self.window_sec = window_sec
+        self.max_keys = max_keys
+        self.window = 0
+        self.current: dict[str, int] = {}
+        self.previous: dict[str, int] = {}
+
+    def allow(self, key: str, limit: int, now: float) -> bool:
+        window = int(now // self.window_sec)
+        if window != self.window:
+            self.previous = self.current if window == self.window + 1 else {}
+            self.current = {}
+            self.window = window
+        weight = 1.0 - (now - window * self.window_sec) / self.window_sec
+        count = self.current.get(key, 0)
+        if self.previous.get(key, 0) * weight + count >= limit:
+            return False
+        if not count and len(self.current) >= self.max_keys:
+            self.current.pop(next(iter(self.current)))
+        self.current[key] = count + 1
+        return True
+
 
 _memory_lock = threading.Lock()
-_memory_counts: dict[str, tuple[int, int]] = {}
+_memory_wheels: dict[int, _WindowWheel] = {}
+# "script": (client, registered Script) for the current shared client.
+_redis_script: dict[str, tuple[Any, Any]] = {}
 
 
 def _redis_client():
-    host = (os.getenv("REDIS_HOST") or "").strip()
-    if not host:
-        return None
-    try:
-        import redis
-
-        try:
-            from backend.services.redis_connection import redis_client_kwargs
-        except ImportError:
-            from services.redis_connection import redis_client_kwargs
-
-        return redis.Redis(**redis_client_kwargs())
-    except Exception:
-        return None
+    return shared_redis_client()
 
 
 def client_key(request: Request) -> str:
@@ -90,41 +140,41 @@ def path_limit(path: str) -> Optional[tuple[str, int]]:
     return None
 
 
-def _memory_allow(key: str, limit: int, window_sec: int) -> bool:
-    window = int(time.time()) // window_sec
+def _memory_allow(key: str, limit: int, window_sec: int, now: Optional[float] = None) -> bool:
+    now = time.time() if now is None else now
     with _memory_lock:
-        count, stored_window = _memory_counts.get(key, (0, window))
-        if stored_window != window:
-            count = 0
-            stored_window = window
-        count += 1
-        _memory_counts[key] = (count, stored_window)
-        if len(_memory_counts) > 10_000:
-            cutoff = window - 2
-            stale = [k for k, (_, w) in _memory_counts.items() if w < cutoff]
-            for k in stale:
-                _memory_counts.pop(k, None)
-        return count <= limit
-
-
-def _redis_allow(client, key: str, limit: int, window_sec: int) -> Optional[bool]:
+        wheel = _memory_wheels.get(window_sec)
+        if wheel is None:
+            wheel = _memory_wheels[window_sec] = _WindowWheel(window_sec, RATE_LIMIT_MEMORY_MAX_KEYS)
+        return wheel.allow(key, limit, now)
+
+
+def _redis_allow(client, key: str, limit: int, window_sec: int, now: Optional[float] = None) -> Optional[bool]:
+    """One EVALSHA round-trip; ``None`` (caller falls back to memory) on any Redis error."""
+    now = time.time() if now is None else now
+    window = int(now // window_sec)
+    weight = 1.0 - (now - window * window_sec) / window_sec
     try:
-        count = client.incr(key)
-        if count == 1:
-            client.expire(key, window_sec)
-        return int(count) <= limit
+        cached = _redis_script.get("script")
+        if cached is None or cached[0] is not client:
+            cached = _redis_script["script"] = (client, client.register_script(_SLIDING_WINDOW_LUA))
+        allowed = cached[1](keys=[f"{key}:{window}", f"{key}:{window - 1}"], args=[limit, window_sec * 2, weight])
+        return bool(int(allowed))
     except Exception:
+        _redis_script.clear()
+        drop_shared_redis_client()
         return None
 
 
 def allow_request(client_key: str, bucket: str, limit: int, window_sec: int = RATE_LIMIT_WINDOW_SEC) -> bool:
-    redis_key = f"rl:{bucket}:{client_key}:{int(time.time()) // window_sec}"
+    key = f"rl:{bucket}:{client_key}"
+    now = time.time()
     client = _redis_client()
     if client is not None:
-        allowed = _redis_allow(client, redis_key, limit, window_sec)
+        allowed = _redis_allow(client, key, limit, window_sec, now)
         if allowed is not None:
             return allowed
-    return _memory_allow(redis_key, limit, window_sec)
+    return _memory_allow(key, limit, window_sec, now)
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -152,4 +202,5 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
 def reset_memory_store_for_tests() -> None:
     with _memory_lock:
-        _memory_counts.clear()
+        _memory_wheels.clear()
+    _redis_script.clear()
@@ -1,9 +1,16 @@
-"""Shared Redis client kwargs for cache and maritime snapshot writers."""
+"""Shared Redis client kwargs and process-wide pooled clients for cache, limiter and snapshot writers."""
 
 from __future__ import annotations
 
 import os
-from typing import Any
+import threading
+import time
+from typing import Any, Optional
+
+REDIS_MAX_CONNECTIONS = max(1, int(os.getenv("REDIS_MAX_CONNECTIONS", "32")))
+# After a failed connect/command, callers skip Redis for this long instead of paying
+# the socket timeout on every request.
+REDIS_RETRY_SECONDS = float(os.getenv("REDIS_RETRY_SECONDS", "30"))
 
 
 def redis_password() -> str:
@@ -24,3 +31,66 @@ def redis_client_kwargs() -> dict[str, Any]:
     if password:
         kwargs["password"] = password
     return kwargs
+
+
+_shared_lock = threading.Lock()
+# decode_responses -> (client, kwargs it was built from); failed_at per flavour.
+_shared_clients: dict[bool, tuple[Any, dict[str, Any]]] = {}
+_shared_failed_at: dict[bool, float] = {}
+
+
+def shared_redis_client(*, decode_responses: bool = True) -> Optional[Any]:
+    """Process-wide ``redis.Redis`` over one bounded ``ConnectionPool``.
+
+    ``None`` when REDIS_HOST is unset, the package is missing, or the client was
+    dropped less than REDIS_RETRY_SECONDS ago. Rebuilt if the connection env changes.
+    """
+    kwargs = redis_client_kwargs()
+    if not kwargs["host"]:
+        return None
+    kwargs["decode_responses"] = decode_responses
+    with _shared_lock:
+        cached = _shared_clients.get(decode_responses)
+        if cached is not None and cached[1] == kwargs:
+            return cached[0]
+        failed_at = _shared_failed_at.get(decode_responses, 0.0)
+        if failed_at and time.monotonic() - failed_at < REDIS_RETRY_SECONDS:
+            return None
+        try:
+            import redis
+
+            pool = redis.ConnectionPool(max_connections=REDIS_MAX_CONNECTIONS, **kwargs)
+            client = redis.Redis(connection_pool=pool)
+        except Exception as exc:
+            print(f"[redis] client unavailable: {exc}")
+            _shared_failed_at[decode_responses] = time.monotonic()
+            return None
+        if cached is not None:
+            cached[0].connection_pool.disconnect()
+        _shared_clients[decode_responses] = (client, kwargs)
+        _shared_failed_at.pop(decode_responses, None)
+        return client
+
+
+def drop_shared_redis_client(*, decode_responses: bool = True) -> None:
+    """Forget the shared client after an error and back off before reconnecting."""
+    with _shared_lock:
+        cached = _shared_clients.pop(decode_responses, None)
+        _shared_failed_at[decode_responses] = time.monotonic()
+    if cached is not None:
+        try:
+            cached[0].connection_pool.disconnect()
+        except Exception:
+            pass
+
+
+def reset_shared_redis_clients() -> None:
+    with _shared_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+        _shared_failed_at.clear()
+    for client, _kwargs in clients:
+        try:
+            client.connection_pool.disconnect()
+        except Exception:
+            pass
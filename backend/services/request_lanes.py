@@ -0,0 +1,185 @@
+"""Bounded thread lanes that keep slow sync handlers from starving the map endpoints.
+
+Starlette runs every plain ``def`` endpoint on one shared AnyIO thread limiter, so a
+burst of admin syncs, agent runs or AI analyses could occupy every worker thread
+while the read-only map layers queued behind them. Each lane here is its own
+``ThreadPoolExecutor`` with a fixed worker count and a short admission queue:
+
+* ``map`` — read-only map payload handlers (/licenses, oil-live map proxies, storage
+  terminal post-processing);
+* ``slow`` — admin, agent and AI endpoints that may block for seconds;
+* ``poll`` — short status reads issued by long-poll and SSE handlers while they wait.
+
+``@offload("slow")`` turns a sync endpoint into an async one that runs the original
+function in the lane; a full lane raises ``LaneSaturated`` (served as 503 with
+Retry-After) instead of queueing without bound.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def _env_int(key: str, default: int) -> int:
+    raw = (os.getenv(key) or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return default
+
+
+# lane -> (workers env, default workers, queue env, default queue depth)
+LANE_SETTINGS: dict[str, tuple[str, int, str, int]] = {
+    "map": ("MAP_LANE_WORKERS", 16, "MAP_LANE_QUEUE", 64),
+    "slow": ("SLOW_LANE_WORKERS", 8, "SLOW_LANE_QUEUE", 32),
+    "poll": ("POLL_LANE_WORKERS", 4, "POLL_LANE_QUEUE", 64),
+}
+
+
+class LaneSaturated(RuntimeError):
+    """Raised when a lane already has ``workers + queue_limit`` calls admitted."""
+
+    def __init__(self, lane: str) -> None:
+        super().__init__(f"{lane} lane is saturated")
+        self.lane = lane
+
+
+class RequestLane:
+    """One bounded executor; admission is counted until the worker call returns."""
+
+    def __init__(self, name: str, *, workers: int, queue_limit: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"lane-{name}")
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_ms_max = 0.0
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._admitted >= self.workers + self.queue_limit:
+                self._rejected += 1
+                raise LaneSaturated(self.name)
+            self._admitted += 1
+
+    def _call(self, ctx: contextvars.Context, queued_at: float, fn: Callable[..., T], args, kwargs) -> T:
+        waited_ms = (time.perf_counter() - queued_at) * 1000.0
+        with self._lock:
+            self._running += 1
+            self._wait_ms_max = max(self._wait_ms_max, waited_ms)
+        try:
+            return ctx.run(fn, *args, **kwargs)
+        finally:
+            # Released here rather than in run() so a cancelled request keeps its
+            # slot until the thread is actually free again.
+            with self._lock:
+                self._running -= 1
+                self._admitted -= 1
+                self._completed += 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        self._admit()
+        loop = asyncio.get_running_loop()
+        call = functools.partial(
+            self._call, contextvars.copy_context(), time.perf_counter(), fn, args, kwargs
+        )
+        try:
+            future = loop.run_in_executor(self._executor, call)
+        except BaseException:
+            with self._lock:
+                self._admitted -= 1
+            raise
+        return await future
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "running": self._running,
+                "queued": self._admitted - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_ms_max": round(self._wait_ms_max, 1),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+_lanes_lock = threading.Lock()
+# Keyed by pid so forked workers never inherit a parent's executor threads.
+_lanes: dict[tuple[int, str], RequestLane] = {}
+
+
+def get_lane(name: str) -> RequestLane:
+    key = (os.getpid(), name)
+    with _lanes_lock:
+        lane = _lanes.get(key)
+        if lane is None:
+            if name not in LANE_SETTINGS:
+                raise KeyError(f"unknown request lane: {name}")
+            workers_env, workers, queue_env, queue_limit = LANE_SETTINGS[name]
+            lane = RequestLane(
+                name,
+                workers=_env_int(workers_env, workers),
+                queue_limit=_env_int(queue_env, queue_limit),
+            )
+            _lanes[key] = lane
+        return lane
+
+
+async def run_in_lane(name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``fn`` on the named lane, preserving the caller's contextvars."""
+    return await get_lane(name).run(fn, *args, **kwargs)
+
+
+def offload(name: str) -> Callable[[Callable[..., T]], Callable[..., Any]]:
+    """Decorate a sync FastAPI endpoint so it runs on a lane instead of the shared threadpool.
+
+    ``functools.wraps`` keeps ``__wrapped__``, so FastAPI still reads the original
+    signature for query, body, header and dependency parameters.
+    """
+
+    def decorate(fn: Callable[..., T]) -> Callable[..., Any]:
+        if asyncio.iscoroutinefunction(fn):
+            raise TypeError(f"{fn.__name__} is already async; offload only wraps sync endpoints")
+
+        @functools.wraps(fn)
+        async def endpoint(*args: Any, **kwargs: Any) -> T:
+            return await run_in_lane(name, fn, *args, **kwargs)
+
+        return endpoint
+
+    return decorate
+
+
+def lane_stats() -> dict[str, Any]:
+    pid = os.getpid()
+    with _lanes_lock:
+        lanes = {name: lane for (owner, name), lane in _lanes.items() if owner == pid}
+    return {name: lane.stats() for name, lane in sorted(lanes.items())}
+
+
+def shutdown_lanes() -> None:
+    pid = os.getpid()
+    with _lanes_lock:
+        owned = [key for key in _lanes if key[0] == pid]
+        lanes = [_lanes.pop(key) for key in owned]
+    for lane in lanes:
+        lane.shutdown()
@@ -0,0 +1,217 @@
+"""Persistent leg geometry cache shared by the API workers and route-service.
+
+OSRM road paths and searoute sea paths used to live only in each process's in-memory
+LRU, so every worker (and every restart) re-queried OSRM and recomputed searoute for
+the same hub pairs. ``RouteGeometryStore`` keeps successful results in the
+``route_geometry_cache`` table, keyed by method, network version and the rounded
+endpoint tuple from ``routing_geometry._osrm_cache_key``; the in-memory caches sit in
+front of it and ``route_planner.precompute_hub_geometry`` warms it for hub-to-hub pairs.
+
+The store is best-effort like the rest of the routing stack: when Postgres is
+unreachable lookups miss, writes are dropped, and connection attempts back off for
+``ROUTE_GEOMETRY_STORE_RETRY_SEC``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
+EndpointKey = tuple[float, float, float, float]
+
+
+def _env_bool(key: str, default: bool) -> bool:
+    raw = (os.getenv(key) or "").strip().lower()
+    if not raw:
+        return default
+    return raw in {"1", "true", "yes", "on", "enabled"}
+
+
+ROUTE_GEOMETRY_STORE_ENABLED = _env_bool("ROUTE_GEOMETRY_STORE_ENABLED", True)
+ROUTE_GEOMETRY_STORE_RETRY_SEC = float(os.getenv("ROUTE_GEOMETRY_STORE_RETRY_SEC", "60"))
+# Road networks change; stored OSRM paths older than this are treated as misses.
+ROUTE_GEOMETRY_STORE_MAX_AGE_DAYS = float(os.getenv("ROUTE_GEOMETRY_STORE_MAX_AGE_DAYS", "30"))
+
+
+@schema_ready("route_geometry_cache")
+def ensure_route_geometry_cache_table(conn: Any) -> None:
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS route_geometry_cache (
+                method TEXT NOT NULL,
+                network_version TEXT NOT NULL,
+                a_lat DOUBLE PRECISION NOT NULL,
+                a_lng DOUBLE PRECISION NOT NULL,
+                b_lat DOUBLE PRECISION NOT NULL,
+                b_lng DOUBLE PRECISION NOT NULL,
+                path JSONB NOT NULL,
+                distance_km DOUBLE PRECISION NOT NULL,
+                duration_hours DOUBLE PRECISION NOT NULL,
+                source TEXT NOT NULL,
+                notes JSONB NOT NULL DEFAULT '[]'::jsonb,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (method, network_version, a_lat, a_lng, b_lat, b_lng)
+            );
+            """
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_route_geometry_cache_created "
+            "ON route_geometry_cache (created_at);"
+        )
+
+
+_SELECT_SQL = """
+    SELECT path, distance_km, duration_hours, source, notes
+    FROM route_geometry_cache
+    WHERE method = %s AND network_version = %s
+      AND a_lat = %s AND a_lng = %s AND b_lat = %s AND b_lng = %s
+      AND created_at > NOW() - make_interval(secs => %s)
+"""
+
+_UPSERT_SQL = """
+    INSERT INTO route_geometry_cache (
+        method, network_version, a_lat, a_lng, b_lat, b_lng,
+        path, distance_km, duration_hours, source, notes, created_at
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s::jsonb, %s, %s, %s, %s::jsonb, NOW())
+    ON CONFLICT (method, network_version, a_lat, a_lng, b_lat, b_lng) DO UPDATE SET
+        path = EXCLUDED.path,
+        distance_km = EXCLUDED.distance_km,
+        duration_hours = EXCLUDED.duration_hours,
+        source = EXCLUDED.source,
+        notes = EXCLUDED.notes,
+        created_at = EXCLUDED.created_at
+"""
+
+
+def _default_connect() -> Any:
+    try:
+        from backend.services.db_pool import get_pooled_connection
+    except ImportError:
+        from services.db_pool import get_pooled_connection  # type: ignore[no-redef]
+
+    return get_pooled_connection()
+
+
+def _json_value(value: Any) -> Any:
+    # psycopg2 decodes JSONB already; test doubles and TEXT casts may not.
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+class RouteGeometryStore:
+    """Postgres-backed geometry rows: ``get``/``put`` plain dicts, never raise."""
+
+    def __init__(
+        self,
+        *,
+        connect: Optional[Callable[[], Any]] = None,
+        enabled: bool = ROUTE_GEOMETRY_STORE_ENABLED,
+        max_age_days: float = ROUTE_GEOMETRY_STORE_MAX_AGE_DAYS,
+        retry_seconds: float = ROUTE_GEOMETRY_STORE_RETRY_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._connect = connect or _default_connect
+        self.enabled = enabled
+        self.max_age_days = max_age_days
+        self.retry_seconds = retry_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._retry_at = 0.0
+        self._last_error: Optional[str] = None
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _failed(self, exc: Exception) -> None:
+        with self._lock:
+            self._counters["errors"] += 1
+            self._last_error = str(exc).strip().splitlines()[0] if str(exc).strip() else type(exc).__name__
+            self._retry_at = self._clock() + self.retry_seconds
+
+    def available(self) -> bool:
+        return self.enabled and self._clock() >= self._retry_at
+
+    def _run(self, work: Callable[[Any], Any]) -> Any:
+        conn = None
+        try:
+            conn = self._connect()
+            ensure_route_geometry_cache_table(conn)
+            result = work(conn)
+            conn.commit()
+            return result
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def get(self, method: str, network_version: str, key: EndpointKey) -> Optional[dict[str, Any]]:
+        if not self.available():
+            return None
+
+        def work(conn: Any) -> Any:
+            with conn.cursor() as cur:
+                cur.execute(_SELECT_SQL, (method, network_version, *key, self.max_age_days * 86400.0))
+                return cur.fetchone()
+
+        try:
+            row = self._run(work)
+        except Exception as exc:
+            self._failed(exc)
+            return None
+        if row is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        path, distance_km, duration_hours, source, notes = row
+        return {
+            "path": [tuple(point) for point in _json_value(path)],
+            "distance_km": float(distance_km),
+            "duration_hours": float(duration_hours),
+            "source": source,
+            "notes": list(_json_value(notes) or []),
+        }
+
+    def put(self, method: str, network_version: str, key: EndpointKey, geometry: dict[str, Any]) -> bool:
+        if not self.available():
+            return False
+        params = (
+            method,
+            network_version,
+            *key,
+            json.dumps([list(point) for point in geometry["path"]]),
+            float(geometry["distance_km"]),
+            float(geometry["duration_hours"]),
+            str(geometry["source"]),
+            json.dumps(list(geometry.get("notes") or [])),
+        )
+
+        def work(conn: Any) -> None:
+            with conn.cursor() as cur:
+                cur.execute(_UPSERT_SQL, params)
+
+        try:
+            self._run(work)
+        except Exception as exc:
+            self._failed(exc)
+            return False
+        self._count("writes")
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "enabled": self.enabled,
+                "available": self.enabled and self._clock() >= self._retry_at,
+                "last_error": self._last_error,
+            }
@@ -13,12 +13,15 @@ Geometry sources (env-configurable, all degrade gracefully):
 
 from __future__ import annotations
 
+import contextvars
 import math
 import os
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import asdict, dataclass, field
-from typing import Any, Callable, Optional
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Optional
 
 ROUTE_PLAN_DEADLINE_SEC = float(os.getenv("ROUTE_PLAN_DEADLINE_SEC", "75"))
 
@@ -32,11 +35,15 @@ try:
         rank_trade_hubs,
         rail_corridor_viable,
         resolve_leg_geometry,
+        segment_likely_crosses_ocean,
         select_nearest_trade_hub,
+        trade_hub_index,
     )
-    from backend.services.shipping_costs import estimate_route_cost, route_cost_to_dict
+    from backend.services.shipping_costs import METHOD_RATE_USD_PER_TON_KM, estimate_route_cost, route_cost_to_dict
     from backend.services.routing_leg_metadata import enrich_leg_payload, leg_limitations, routing_engine_label
     from backend.services.vessel_ais import NAVIGATIONAL_STATUS_LABELS
+    from backend.services.sea_lane_matrix import decode_chokepoint_flags, get_sea_lane_matrix
+    from backend.services.bounded_cache import SingleFlight
 except ImportError:
     from services.routing_geometry import (  # type: ignore[no-redef]
         INLAND_PORT_THRESHOLD_KM,
@@ -47,11 +54,15 @@ except ImportError:
         rank_trade_hubs,
         rail_corridor_viable,
         resolve_leg_geometry,
+        segment_likely_crosses_ocean,
         select_nearest_trade_hub,
+        trade_hub_index,
     )
-    from services.shipping_costs import estimate_route_cost, route_cost_to_dict
+    from services.shipping_costs import METHOD_RATE_USD_PER_TON_KM, estimate_route_cost, route_cost_to_dict
     from services.routing_leg_metadata import enrich_leg_payload, leg_limitations, routing_engine_label  # type: ignore[no-redef]
     from services.vessel_ais import NAVIGATIONAL_STATUS_LABELS
+    from services.sea_lane_matrix import decode_chokepoint_flags, get_sea_lane_matrix  # type: ignore[no-redef]
+    from services.bounded_cache import SingleFlight  # type: ignore[no-redef]
 
 
 SUPPORTED_SHIPPING_METHODS = ("sea", "road", "rail", "pipeline", "air")
@@ -242,7 +253,7 @@ def _path_distance_km(path: list[tuple[float, float]]) -> float:
 
 
 def _nearest_hub(point: RoutePoint, hubs: tuple[TransportHub, ...]) -> TransportHub:
-    return min(hubs, key=lambda hub: _haversine_km(point.lat, point.lng, hub.lat, hub.lng))
+    return hubs[trade_hub_index(hubs).query(point.lat, point.lng, 1)[0][0]]
 
 
 def _select_rail_hubs_for_leg(
@@ -656,6 +667,75 @@ def _sea_path(origin: RoutePoint, destination: RoutePoint) -> list[tuple[float,
     return segments
 
 
+# Export ports scored from the sea-lane matrix per request; only the cheapest few get
+# full geometry and costing.
+SEA_EXPORT_CANDIDATES = int(os.getenv("ROUTE_SEA_EXPORT_CANDIDATES", "4"))
+
+
+@lru_cache(maxsize=1024)
+def _corridor_sea_km(export_hub: TransportHub, import_hub: TransportHub) -> float:
+    path = _sea_path(_point_from_hub(export_hub), _point_from_hub(import_hub))
+    return _path_distance_km(path) * METHOD_DISTANCE_MULTIPLIERS["sea"]
+
+
+def _sea_lane_estimate(export_hub: TransportHub, import_hub: TransportHub) -> dict[str, Any]:
+    """Trunk km between two ports from the prebuilt matrix, else the offshore corridor."""
+    matrix = get_sea_lane_matrix(MARITIME_HUBS)
+    lane = matrix.lookup(export_hub.name, import_hub.name) if matrix is not None else None
+    if lane is not None:
+        return {
+            "distance_km": round(lane.distance_km, 1),
+            "duration_hours": round(lane.duration_hours, 1),
+            "chokepoints": decode_chokepoint_flags(lane.flags),
+            "source": "sea_lane_matrix",
+        }
+    distance_km = _corridor_sea_km(export_hub, import_hub)
+    return {
+        "distance_km": round(distance_km, 1),
+        "duration_hours": round(distance_km / 35.0, 1),
+        "chokepoints": [],
+        "source": "corridor_estimate",
+    }
+
+
+def _rank_export_hubs(
+    origin: RoutePoint,
+    import_hub: TransportHub,
+    candidates: list[TransportHub],
+    requested_methods: list[str],
+) -> list[TransportHub]:
+    """Order candidate export ports by screening cost per ton (inland haul + sea trunk).
+
+    A same-country first candidate (the country-authoritative gateway) keeps its place;
+    the rest are ordered by estimate. No geometry is resolved here.
+    """
+    if len(candidates) <= 1:
+        return list(candidates)
+    matrix = get_sea_lane_matrix(MARITIME_HUBS)
+    sea_km = (
+        matrix.distances_to([hub.name for hub in candidates], import_hub.name)
+        if matrix is not None
+        else [float("nan")] * len(candidates)
+    )
+    scores: list[float] = []
+    for hub, lane_km in zip(candidates, sea_km):
+        if lane_km != lane_km:  # NaN: hub pair not in the matrix
+            lane_km = _corridor_sea_km(hub, import_hub)
+        inland_km = _haversine_km(origin.lat, origin.lng, hub.lat, hub.lng)
+        inland_method = _inland_method(requested_methods, inland_km)
+        inland_cost = inland_km * METHOD_DISTANCE_MULTIPLIERS[inland_method] * METHOD_RATE_USD_PER_TON_KM[inland_method]
+        scores.append(inland_cost + float(lane_km) * METHOD_RATE_USD_PER_TON_KM["sea"])
+
+    pinned: list[TransportHub] = []
+    rest = list(range(len(candidates)))
+    origin_country = normalize_country_key(_origin_country(origin))
+    if origin_country and normalize_country_key(candidates[0].country) == origin_country:
+        pinned = [candidates[0]]
+        rest = rest[1:]
+    rest.sort(key=lambda idx: (scores[idx], idx))
+    return [*pinned, *(candidates[idx] for idx in rest)]
+
+
 def _pipeline_viable(a: RoutePoint, b: RoutePoint, layer_enabled: bool) -> bool:
     if not layer_enabled:
         return False
@@ -711,6 +791,64 @@ def _distance_multiplier(method: str, geometry_source: str) -> float:
     return 1.0
 
 
+# Leg geometry for all plans runs on one bounded pool instead of a pool per call.
+ROUTE_GEOMETRY_WORKERS = int(os.getenv("ROUTE_GEOMETRY_WORKERS", "8"))
+ROUTE_BATCH_PLAN_WORKERS = int(os.getenv("ROUTE_BATCH_PLAN_WORKERS", "4"))
+
+_geometry_pool: Optional[ThreadPoolExecutor] = None
+_geometry_pool_lock = threading.Lock()
+
+
+def _geometry_executor() -> ThreadPoolExecutor:
+    global _geometry_pool
+    if _geometry_pool is None:
+        with _geometry_pool_lock:
+            if _geometry_pool is None:
+                _geometry_pool = ThreadPoolExecutor(
+                    max_workers=max(1, ROUTE_GEOMETRY_WORKERS),
+                    thread_name_prefix="route-geometry",
+                )
+    return _geometry_pool
+
+
+class _LegMemo:
+    """Batch-scoped leg geometry: identical legs across plans resolve once."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._results: dict[tuple[Any, ...], tuple[ResolvedGeometry, str]] = {}
+        self._flights = SingleFlight()
+        self.resolved = 0
+        self.shared = 0
+
+    def get_or_resolve(
+        self,
+        key: tuple[Any, ...],
+        resolve: Callable[[], tuple[ResolvedGeometry, str]],
+    ) -> tuple[ResolvedGeometry, str]:
+        with self._lock:
+            hit = self._results.get(key)
+            if hit is not None:
+                self.shared += 1
+                return hit
+
+        def run() -> tuple[ResolvedGeometry, str]:
+            result = resolve()
+            with self._lock:
+                self._results[key] = result
+                self.resolved += 1
+            return result
+
+        result, coalesced = self._flights.do(key, run)
+        if coalesced:
+            with self._lock:
+                self.shared += 1
+        return result
+
+
+_leg_memo: contextvars.ContextVar[Optional[_LegMemo]] = contextvars.ContextVar("route_leg_memo", default=None)
+
+
 def _geometry_for_leg(
     from_point: RoutePoint,
     to_point: RoutePoint,
@@ -718,6 +856,40 @@ def _geometry_for_leg(
     *,
     corridor_fallback: Optional[Callable[[], list[tuple[float, float]]]] = None,
     deadline: Optional[float] = None,
+) -> tuple[ResolvedGeometry, str]:
+    def resolve() -> tuple[ResolvedGeometry, str]:
+        return _resolve_geometry_for_leg(
+            from_point,
+            to_point,
+            method,
+            corridor_fallback=corridor_fallback,
+            deadline=deadline,
+        )
+
+    memo = _leg_memo.get()
+    if memo is None:
+        return resolve()
+    # Sea corridors derive from the endpoints and rail hub choice from the countries, so
+    # these identify the leg.
+    key = (
+        method,
+        round(from_point.lat, 3),
+        round(from_point.lng, 3),
+        round(to_point.lat, 3),
+        round(to_point.lng, 3),
+        _point_country(from_point),
+        _point_country(to_point),
+    )
+    return memo.get_or_resolve(key, resolve)
+
+
+def _resolve_geometry_for_leg(
+    from_point: RoutePoint,
+    to_point: RoutePoint,
+    method: str,
+    *,
+    corridor_fallback: Optional[Callable[[], list[tuple[float, float]]]] = None,
+    deadline: Optional[float] = None,
 ) -> tuple[ResolvedGeometry, str]:
     rail_hubs: Optional[dict[str, Any]] = None
     rail_notes: list[str] = []
@@ -799,12 +971,13 @@ def _resolve_leg_geometries_parallel(
         )
         return index, geometry
 
-    max_workers = min(4, len(specs))
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(_resolve, index) for index in range(len(specs))]
-        for future in as_completed(futures):
-            index, geometry = future.result()
-            results[index] = geometry
+    executor = _geometry_executor()
+    futures = [
+        executor.submit(contextvars.copy_context().run, _resolve, index) for index in range(len(specs))
+    ]
+    for future in as_completed(futures):
+        index, geometry = future.result()
+        results[index] = geometry
 
     return [geometry for geometry in results if geometry is not None]
 
@@ -1218,7 +1391,17 @@ def _generate_route_plans(
         export_hub_limit = 1
 
     if offer_alternatives and "sea" in requested_methods:
-        export_hubs = _nearest_maritime_hubs(origin, limit=3 if offer_alternatives else 1)
+        import_hub, _ = _select_sea_import_hub(
+            destination,
+            MARITIME_HUBS,
+            country=_destination_country(destination),
+        )
+        export_hubs = _rank_export_hubs(
+            origin,
+            import_hub,
+            _nearest_maritime_hubs(origin, limit=max(SEA_EXPORT_CANDIDATES, export_hub_limit)),
+            requested_methods,
+        )
         for idx, hub in enumerate(export_hubs[:export_hub_limit]):
             legs, gateways = _plan_sea_route(
                 origin,
@@ -1230,19 +1413,19 @@ def _generate_route_plans(
             )
             alt_id = f"sea_{_port_slug(hub.name)}"
             label = f"Via {hub.name} (sea)" if idx > 0 else f"Recommended: via {hub.name} (sea)"
-            plans.append(
-                _build_route_plan_entry(
-                    alternative_id=alt_id,
-                    label=label,
-                    is_recommended=False,
-                    legs=legs,
-                    gateways=gateways,
-                    strategy="staged-inland-port-sea-port-inland",
-                    origin=origin,
-                    destination=destination,
-                    quantity_tons=quantity_tons,
-                )
+            entry = _build_route_plan_entry(
+                alternative_id=alt_id,
+                label=label,
+                is_recommended=False,
+                legs=legs,
+                gateways=gateways,
+                strategy="staged-inland-port-sea-port-inland",
+                origin=origin,
+                destination=destination,
+                quantity_tons=quantity_tons,
             )
+            entry["route"]["optimization"]["sea_lane_estimate"] = _sea_lane_estimate(hub, import_hub)
+            plans.append(entry)
 
     if offer_alternatives and "air" in requested_methods:
         legs, gateways = _plan_air_route(
@@ -1407,3 +1590,136 @@ def plan_route(request_payload: dict[str, Any]) -> dict[str, Any]:
         "limitations": [*base_limitations, *mixed_mode_notes],
     }
     return response
+
+
+def plan_route_batch(
+    request_payloads: list[dict[str, Any]],
+    *,
+    max_workers: Optional[int] = None,
+) -> Iterator[dict[str, Any]]:
+    """Plan many lanes concurrently, yielding one result per request as it completes.
+
+    Legs shared between plans (same hub pairs, same OSRM segments) resolve once per
+    batch; geometry runs on the shared bounded pool. Each item carries the request
+    ``index`` and either ``plan`` or ``error``; a final ``summary`` item follows.
+    Closing the iterator early cancels plans that have not started.
+    """
+    started = time.monotonic()
+    memo = _LegMemo()
+    counts = {"ok": 0, "error": 0}
+
+    def run(index: int, payload: dict[str, Any]) -> dict[str, Any]:
+        item: dict[str, Any] = {"index": index, "id": payload.get("id")}
+        try:
+            item["plan"] = plan_route(payload)
+            item["status"] = "ok"
+        except (KeyError, TypeError, ValueError) as exc:
+            item.update(status="error", error=f"Invalid route request: {exc}")
+        except Exception as exc:
+            item.update(status="error", error=f"Route planning failed: {exc}")
+        return item
+
+    def run_in_batch(index: int, payload: dict[str, Any]) -> dict[str, Any]:
+        _leg_memo.set(memo)
+        return run(index, payload)
+
+    workers = max(1, min(max_workers or ROUTE_BATCH_PLAN_WORKERS, len(request_payloads) or 1))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="route-batch")
+    try:
+        futures = [
+            executor.submit(contextvars.copy_context().run, run_in_batch, index, payload)
+            for index, payload in enumerate(request_payloads)
+        ]
+        for future in as_completed(futures):
+            item = future.result()
+            counts[item["status"]] += 1
+            yield item
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    yield {
+        "summary": {
+            "requests": len(request_payloads),
+            "ok": counts["ok"],
+            "failed": counts["error"],
+            "legs_resolved": memo.resolved,
+            "legs_shared": memo.shared,
+            "elapsed_sec": round(time.monotonic() - started, 3),
+        }
+    }
+
+
+HUB_PRECOMPUTE_MAX_ROAD_KM = float(os.getenv("HUB_PRECOMPUTE_MAX_ROAD_KM", "1500"))
+
+
+def _overland_hub_pair(a: RoutePoint, b: RoutePoint, max_km: float) -> bool:
+    if a is b or not _connector_leg_needed(a, b):
+        return False
+    if _haversine_km(a.lat, a.lng, b.lat, b.lng) > max_km:
+        return False
+    return not segment_likely_crosses_ocean(a.lat, a.lng, b.lat, b.lng)
+
+
+def hub_geometry_pairs(
+    methods: tuple[str, ...] = ("sea", "road", "rail"),
+    *,
+    max_road_km: float = HUB_PRECOMPUTE_MAX_ROAD_KM,
+) -> list[tuple[RoutePoint, RoutePoint, str]]:
+    """Hub-to-hub legs whose geometry plan_route resolves over the network.
+
+    Sea: every ordered pair of ``MARITIME_HUBS`` (ocean trunks). Road: pairs across the
+    port, airport and rail catalogs within ``max_road_km`` that do not cross open water
+    (gateway connectors and airport drayage). Rail: ordered ``RAIL_HUBS`` pairs, which
+    also warms the OSRM approach segments. Air trunks are great-circle and need no warming.
+    """
+    pairs: list[tuple[RoutePoint, RoutePoint, str]] = []
+    if "sea" in methods:
+        ports = [_point_from_hub(hub) for hub in MARITIME_HUBS]
+        pairs.extend(
+            (a, b, "sea") for a in ports for b in ports if a is not b and _connector_leg_needed(a, b)
+        )
+    if "road" in methods:
+        seen: set[tuple[float, float]] = set()
+        hubs: list[RoutePoint] = []
+        for hub in (*MARITIME_HUBS, *AIR_HUBS, *RAIL_HUBS):
+            coord = (round(hub.lat, 3), round(hub.lng, 3))
+            if coord not in seen:
+                seen.add(coord)
+                hubs.append(_point_from_hub(hub))
+        pairs.extend((a, b, "road") for a in hubs for b in hubs if _overland_hub_pair(a, b, max_road_km))
+    if "rail" in methods:
+        terminals = [_point_from_hub(hub) for hub in RAIL_HUBS]
+        pairs.extend(
+            (a, b, "rail") for a in terminals for b in terminals if _overland_hub_pair(a, b, max_road_km)
+        )
+    return pairs
+
+
+def precompute_hub_geometry(
+    methods: tuple[str, ...] = ("sea", "road", "rail"),
+    *,
+    max_road_km: float = HUB_PRECOMPUTE_MAX_ROAD_KM,
+    workers: int = 4,
+    on_leg: Optional[Callable[[RoutePoint, RoutePoint, str, ResolvedGeometry], None]] = None,
+) -> dict[str, dict[str, int]]:
+    """Resolve every hub pair once so the shared geometry cache is warm for cold workers.
+
+    Pairs already in the persistent store are cheap lookups, so re-running only fills
+    gaps. Returns per-method counts of legs resolved and their geometry sources.
+    """
+    pairs = hub_geometry_pairs(methods, max_road_km=max_road_km)
+    summary: dict[str, dict[str, int]] = {}
+
+    def _resolve(pair: tuple[RoutePoint, RoutePoint, str]) -> tuple[str, ResolvedGeometry]:
+        from_point, to_point, method = pair
+        corridor = (lambda: _sea_path(from_point, to_point)) if method == "sea" else None
+        geometry, _ = _geometry_for_leg(from_point, to_point, method, corridor_fallback=corridor)
+        if on_leg is not None:
+            on_leg(from_point, to_point, method, geometry)
+        return method, geometry
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for method, geometry in executor.map(_resolve, pairs):
+            counts = summary.setdefault(method, {"pairs": 0})
+            counts["pairs"] += 1
+            counts[geometry.source] = counts.get(geometry.source, 0) + 1
+    return summary
@@ -9,6 +9,7 @@ from __future__ import annotations
 import math
 import os
 import time
+from importlib import metadata
 from dataclasses import dataclass, field
 from functools import lru_cache
 from typing import Any, Callable, Optional, Protocol, Sequence
@@ -20,6 +21,21 @@ try:
 except ImportError:
     from services.rail_osm_overpass import fetch_rail_corridor_geometry  # type: ignore[no-redef]
 
+try:
+    from backend.services.bounded_cache import BoundedCache, single_flight
+except ImportError:
+    from services.bounded_cache import BoundedCache, single_flight  # type: ignore[no-redef]
+
+try:
+    from backend.services.route_geometry_store import RouteGeometryStore
+except ImportError:
+    from services.route_geometry_store import RouteGeometryStore  # type: ignore[no-redef]
+
+try:
+    from backend.services.spherical_index import SphericalIndex, index_for
+except ImportError:
+    from services.spherical_index import SphericalIndex, index_for  # type: ignore[no-redef]
+
 OSRM_BASE_URL = (os.getenv("OSRM_BASE_URL") or "https://router.project-osrm.org").rstrip("/")
 OSRM_TIMEOUT_SEC = float(os.getenv("OSRM_TIMEOUT_SEC", "8"))
 SEAROUTE_TIMEOUT_SEC = float(os.getenv("SEAROUTE_TIMEOUT_SEC", "15"))
@@ -166,30 +182,88 @@ def _cached_osrm_route_key(key: tuple[float, float, float, float]) -> str:
     return "|".join(str(v) for v in key)
 
 
-_osrm_geometry_cache: dict[str, ResolvedGeometry] = {}
-_osrm_geometry_cache_max: int = int(os.getenv("OSRM_GEOMETRY_CACHE_MAX", "256"))
+OSRM_GEOMETRY_CACHE_TTL_SEC = float(os.getenv("OSRM_GEOMETRY_CACHE_TTL_SEC", str(60 * 60 * 24)))
+
+_osrm_geometry_cache = BoundedCache(
+    "osrm_geometry",
+    max_entries=int(os.getenv("OSRM_GEOMETRY_CACHE_MAX", "256")),
+    ttl_seconds=OSRM_GEOMETRY_CACHE_TTL_SEC,
+)
+
+
+_sea_geometry_cache = BoundedCache(
+    "sea_geometry",
+    max_entries=int(os.getenv("SEA_GEOMETRY_CACHE_MAX", "1024")),
+    ttl_seconds=OSRM_GEOMETRY_CACHE_TTL_SEC,
+)
+
+# Persistent tier behind both in-memory caches, shared by main.py and route-service.
+_geometry_store = RouteGeometryStore()
+
+# Bump when sea-path post-processing (offshore anchoring, chokepoint repair) changes so
+# stored searoute geometry is recomputed; ROUTE_GEOMETRY_NETWORK_VERSION does the same
+# for operators without a deploy.
+SEA_GEOMETRY_REVISION = "1"
+
+
+@lru_cache(maxsize=1)
+def _searoute_package_version() -> str:
+    try:
+        return metadata.version("searoute")
+    except metadata.PackageNotFoundError:
+        return "none"
+
+
+def route_network_version(method: str) -> str:
+    """Version tag stored with persistent geometry; a change makes old rows misses."""
+    override = (os.getenv("ROUTE_GEOMETRY_NETWORK_VERSION") or "1").strip()
+    if method == "sea":
+        return f"searoute-{_searoute_package_version()}/r{SEA_GEOMETRY_REVISION}/{override}"
+    return f"osrm:{OSRM_BASE_URL}/{override}"
+
+
+def _geometry_to_row(resolved: ResolvedGeometry) -> dict[str, Any]:
+    return {
+        "path": resolved.path,
+        "distance_km": resolved.distance_km,
+        "duration_hours": resolved.duration_hours,
+        "source": resolved.source,
+        "notes": resolved.notes,
+    }
+
+
+def _load_persisted_geometry(method: str, key: tuple[float, float, float, float]) -> Optional[ResolvedGeometry]:
+    row = _geometry_store.get(method, route_network_version(method), key)
+    if row is None:
+        return None
+    return ResolvedGeometry(
+        path=tuple((float(lat), float(lng)) for lat, lng in row["path"]),
+        distance_km=row["distance_km"],
+        duration_hours=row["duration_hours"],
+        source=row["source"],
+        notes=row["notes"],
+    )
 
 
 def configure_osrm_geometry_cache(*, max_entries: int) -> None:
     """Resize the in-memory OSRM geometry LRU (route-service sets a large cap at startup)."""
-    global _osrm_geometry_cache_max
-    _osrm_geometry_cache_max = max(64, int(max_entries))
+    _osrm_geometry_cache.resize(max_entries=max(64, int(max_entries)))
+
+
+def osrm_cache_stats() -> dict[str, Any]:
+    return _osrm_geometry_cache.stats()
 
 
-def osrm_cache_stats() -> dict[str, int]:
+def route_geometry_cache_stats() -> dict[str, Any]:
     return {
-        "entries": len(_osrm_geometry_cache),
-        "max_entries": _osrm_geometry_cache_max,
+        "osrm": _osrm_geometry_cache.stats(),
+        "sea": _sea_geometry_cache.stats(),
+        "store": _geometry_store.stats(),
     }
 
 
 def _store_osrm_geometry_cache(key_str: str, resolved: ResolvedGeometry) -> None:
-    while len(_osrm_geometry_cache) >= _osrm_geometry_cache_max and _osrm_geometry_cache:
-        try:
-            _osrm_geometry_cache.pop(next(iter(_osrm_geometry_cache)))
-        except StopIteration:
-            break
-    _osrm_geometry_cache[key_str] = resolved
+    _osrm_geometry_cache.set(key_str, resolved)
 
 
 def _decode_osrm_coordinates(geojson_geometry: dict[str, Any]) -> list[tuple[float, float]]:
@@ -205,6 +279,13 @@ def _decode_osrm_coordinates(geojson_geometry: dict[str, Any]) -> list[tuple[flo
     return out
 
 
+@single_flight(
+    key=lambda a_lat, a_lng, b_lat, b_lng, *, method="road", use_cache=True, **_: (
+        _osrm_cache_key(a_lat, a_lng, b_lat, b_lng),
+        method,
+        use_cache,
+    )
+)
 def fetch_osrm_route(
     a_lat: float,
     a_lng: float,
@@ -223,6 +304,10 @@ def fetch_osrm_route(
         cached = _osrm_geometry_cache.get(_cached_osrm_route_key(cache_key))
         if cached is not None:
             return cached
+        persisted = _load_persisted_geometry("road", cache_key)
+        if persisted is not None:
+            _store_osrm_geometry_cache(_cached_osrm_route_key(cache_key), persisted)
+            return persisted
 
     remaining = _remaining_deadline_seconds(deadline)
     if remaining is not None and remaining < OSRM_DEADLINE_BUFFER_SEC:
@@ -281,6 +366,7 @@ def fetch_osrm_route(
         )
         if use_cache and resolved.source == "osrm":
             _store_osrm_geometry_cache(_cached_osrm_route_key(cache_key), resolved)
+            _geometry_store.put("road", route_network_version("road"), cache_key, _geometry_to_row(resolved))
         return resolved
     except Exception:
         return fallback
@@ -375,6 +461,12 @@ def repair_known_sea_chokepoints(
     return repaired, changed
 
 
+@single_flight(
+    key=lambda a_lat, a_lng, b_lat, b_lng, *, use_cache=True, **_: (
+        _osrm_cache_key(a_lat, a_lng, b_lat, b_lng),
+        use_cache,
+    )
+)
 def fetch_sea_route(
     a_lat: float,
     a_lng: float,
@@ -383,8 +475,24 @@ def fetch_sea_route(
     *,
     corridor_fallback: Callable[[], list[tuple[float, float]]],
     deadline: Optional[float] = None,
+    use_cache: bool = True,
 ) -> ResolvedGeometry:
-    """Marine route via searoute when enabled; otherwise corridor fallback."""
+    """Marine route via searoute when enabled; otherwise corridor fallback.
+
+    Searoute results are cached in memory and in the persistent geometry store keyed
+    by the rounded endpoints; the corridor fallback is derived from the same endpoints.
+    """
+
+    cache_key = _osrm_cache_key(a_lat, a_lng, b_lat, b_lng)
+    key_str = _cached_osrm_route_key(cache_key)
+    if use_cache and SEAROUTE_ENABLED:
+        cached = _sea_geometry_cache.get(key_str)
+        if cached is not None:
+            return cached
+        persisted = _load_persisted_geometry("sea", cache_key)
+        if persisted is not None:
+            _sea_geometry_cache.set(key_str, persisted)
+            return persisted
 
     fallback_path, fallback_repaired = repair_known_sea_chokepoints(corridor_fallback())
     if len(fallback_path) < 2:
@@ -474,13 +582,17 @@ def fetch_sea_route(
         notes = ["Sea geometry from searoute marine network.", *offshore_notes]
         if repaired:
             notes.append("Gibraltar guard waypoints added to avoid clipping northern Morocco.")
-        return ResolvedGeometry(
+        resolved = ResolvedGeometry(
             path=tuple(path),
             distance_km=distance_km,
             duration_hours=distance_km / DEFAULT_SPEED_KMH["sea"],
             source="searoute",
             notes=notes,
         )
+        if use_cache:
+            _sea_geometry_cache.set(key_str, resolved)
+            _geometry_store.put("sea", route_network_version("sea"), cache_key, _geometry_to_row(resolved))
+        return resolved
     except Exception:
         return fallback
 
@@ -912,6 +1024,15 @@ def _hub_distance_km(lat: float, lng: float, hub: TradeHubLike) -> float:
     return haversine_km(lat, lng, hub.lat, hub.lng)
 
 
+def _hub_country_key(hub: TradeHubLike) -> str:
+    return normalize_country_key(hub.country)
+
+
+def trade_hub_index(hubs: Sequence[TradeHubLike]) -> SphericalIndex:
+    """Shared nearest-neighbour index over a hub catalog, grouped by country key."""
+    return index_for(hubs, group=_hub_country_key)
+
+
 def select_nearest_trade_hub(
     lat: float,
     lng: float,
@@ -926,8 +1047,8 @@ def select_nearest_trade_hub(
         raise ValueError("hubs must not be empty")
 
     notes: list[str] = []
-    ranked = sorted(hubs, key=lambda hub: _hub_distance_km(lat, lng, hub))
-    nearest = ranked[0]
+    index = trade_hub_index(hubs)
+    nearest = hubs[index.query(lat, lng, 1)[0][0]]
     nearest_km = _hub_distance_km(lat, lng, nearest)
     country_key = normalize_country_key(country)
 
@@ -939,8 +1060,8 @@ def select_nearest_trade_hub(
             )
         return nearest, notes
 
-    domestic = [hub for hub in hubs if normalize_country_key(hub.country) == country_key]
-    if not domestic:
+    domestic_hits = index.query(lat, lng, 1, group=country_key)
+    if not domestic_hits:
         if nearest_km > max_inland_haul_km:
             notes.append(
                 f"No gateway in {country.strip()} catalog; nearest {nearest.name} is "
@@ -948,7 +1069,7 @@ def select_nearest_trade_hub(
             )
         return nearest, notes
 
-    nearest_domestic = min(domestic, key=lambda hub: _hub_distance_km(lat, lng, hub))
+    nearest_domestic = hubs[domestic_hits[0][0]]
     domestic_km = _hub_distance_km(lat, lng, nearest_domestic)
     if normalize_country_key(nearest.country) == country_key:
         return nearest, notes
@@ -988,28 +1109,31 @@ def rank_trade_hubs(
         return []
 
     country_key = normalize_country_key(country)
-    ranked = sorted(hubs, key=lambda hub: _hub_distance_km(lat, lng, hub))
+    index = trade_hub_index(hubs)
     selected: list[TradeHubLike] = []
     seen_names: set[str] = set()
 
-    if country_key:
-        for hub in ranked:
-            if normalize_country_key(hub.country) != country_key:
-                continue
-            if hub.name in seen_names:
-                continue
-            seen_names.add(hub.name)
-            selected.append(hub)
-            if len(selected) >= limit:
-                return selected
-
-    for hub in ranked:
-        if hub.name in seen_names:
-            continue
-        seen_names.add(hub.name)
-        selected.append(hub)
-        if len(selected) >= limit:
-            break
+    def take(group: Optional[str]) -> bool:
+        # Nearest-first hits are a stable prefix for growing k, so widen only when
+        # duplicate names leave the selection short.
+        k, done = limit, 0
+        while True:
+            hits = index.query(lat, lng, k, group=group)
+            for pos, _ in hits[done:]:
+                hub = hubs[pos]
+                if hub.name in seen_names:
+                    continue
+                seen_names.add(hub.name)
+                selected.append(hub)
+                if len(selected) >= limit:
+                    return True
+            if len(hits) < k:
+                return False
+            k, done = k * 2, len(hits)
+
+    if country_key and take(country_key):
+        return selected
+    take(None)
     return selected
 
 
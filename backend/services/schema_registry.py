@@ -0,0 +1,255 @@
+"""Process-wide schema readiness registry for the ``ensure_*`` DDL helpers.
+
+Request handlers call ``ensure_*_table(s)(conn)`` before touching their tables, which
+used to cost a burst of ``CREATE TABLE IF NOT EXISTS`` / ``ALTER ... IF NOT EXISTS``
+round-trips (and catalog locks) on every read. ``@schema_ready("name")`` wraps such a
+helper so the DDL runs at most once per process and database:
+
+* the first call checks ``schema_versions`` for a stamp matching the helper's version
+  (a hash of its source, so editing the DDL re-runs it once everywhere);
+* without a matching stamp the DDL runs and the stamp is written in the same
+  transaction, so the stamp only becomes visible if the DDL committed;
+* once a stamp is seen the name is marked ready and later calls return immediately.
+
+Calls with anything other than a real psycopg2 connection (test doubles) pass straight
+through. ``schema_readiness_report()`` summarizes time spent per helper for the startup
+log and ``/api/health``.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import threading
+import time
+import weakref
+from typing import Any, Callable, Optional, TypeVar
+
+import psycopg2
+import psycopg2.extensions
+
+SCHEMA_VERSIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_versions (
+        name TEXT PRIMARY KEY,
+        version TEXT NOT NULL,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        duration_ms DOUBLE PRECISION
+    );
+"""
+
+_STAMP_SQL = """
+    INSERT INTO schema_versions (name, version, applied_at, duration_ms)
+    VALUES (%s, %s, NOW(), %s)
+    ON CONFLICT (name) DO UPDATE SET
+        version = EXCLUDED.version,
+        applied_at = EXCLUDED.applied_at,
+        duration_ms = EXCLUDED.duration_ms
+"""
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _source_version(fn: Callable[..., Any]) -> str:
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        return "1"
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
+
+def _is_real_connection(conn: Any) -> bool:
+    return isinstance(conn, psycopg2.extensions.connection)
+
+
+def _in_transaction(conn: Any) -> bool:
+    return conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+
+class SchemaRegistry:
+    """Readiness state and timing counters for every ``@schema_ready`` helper."""
+
+    def __init__(self, *, is_connection: Callable[[Any], bool] = _is_real_connection) -> None:
+        self._lock = threading.Lock()
+        self._is_connection = is_connection
+        self._versions: dict[str, str] = {}
+        self._ready: set[tuple[str, str]] = set()
+        self._forced: set[str] = set()
+        # DDL executed inside a still-open transaction, per connection: repeat calls in
+        # that transaction skip it, but readiness waits for the committed stamp.
+        self._uncommitted: "weakref.WeakKeyDictionary[Any, set[str]]" = weakref.WeakKeyDictionary()
+        self._stats: dict[str, dict[str, Any]] = {}
+
+    def register(self, name: str, version: str) -> None:
+        with self._lock:
+            self._versions[name] = version
+            self._stats.setdefault(name, self._empty_stats())
+
+    @staticmethod
+    def _empty_stats() -> dict[str, Any]:
+        return {"ddl_runs": 0, "ddl_ms": 0.0, "stamp_checks": 0, "check_ms": 0.0, "skipped": 0}
+
+    def _record(self, name: str, **deltas: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, self._empty_stats())
+            for key, value in deltas.items():
+                stats[key] += value
+
+    def reset(self, *, ignore_stamps: bool = False) -> None:
+        """Forget readiness; with ``ignore_stamps`` every helper re-runs its DDL once."""
+        with self._lock:
+            self._ready.clear()
+            self._uncommitted = weakref.WeakKeyDictionary()
+            self._forced = set(self._versions) if ignore_stamps else set()
+
+    def is_ready(self, conn: Any, name: str) -> bool:
+        return (conn.dsn, name) in self._ready
+
+    def _pending_in_transaction(self, conn: Any, name: str) -> bool:
+        pending = self._uncommitted.get(conn)
+        if not pending:
+            return False
+        if not _in_transaction(conn):
+            # Committed or rolled back since; the stamp check decides which.
+            self._uncommitted.pop(conn, None)
+            return False
+        return name in pending
+
+    def _stamp_matches(self, conn: Any, name: str, version: str) -> bool:
+        started = time.perf_counter()
+        savepoint = _in_transaction(conn)
+        row = None
+        cur = conn.cursor()
+        try:
+            if savepoint:
+                cur.execute("SAVEPOINT schema_registry_check")
+            try:
+                cur.execute("SELECT version FROM schema_versions WHERE name = %s", (name,))
+                row = cur.fetchone()
+                if savepoint:
+                    cur.execute("RELEASE SAVEPOINT schema_registry_check")
+            except psycopg2.Error:
+                # schema_versions does not exist yet (fresh database).
+                if savepoint:
+                    cur.execute("ROLLBACK TO SAVEPOINT schema_registry_check")
+                else:
+                    conn.rollback()
+        finally:
+            cur.close()
+            self._record(name, stamp_checks=1, check_ms=(time.perf_counter() - started) * 1000.0)
+        if row is None:
+            return False
+        found = row["version"] if isinstance(row, dict) else row[0]
+        return found == version
+
+    def _write_stamp(self, conn: Any, name: str, version: str, duration_ms: float) -> bool:
+        savepoint = _in_transaction(conn)
+        with conn.cursor() as cur:
+            if savepoint:
+                cur.execute("SAVEPOINT schema_registry_stamp")
+            try:
+                cur.execute(SCHEMA_VERSIONS_DDL)
+                cur.execute(_STAMP_SQL, (name, version, duration_ms))
+            except psycopg2.Error as exc:
+                # Keep the caller's DDL; without a stamp the helper simply runs again later.
+                if savepoint:
+                    cur.execute("ROLLBACK TO SAVEPOINT schema_registry_stamp")
+                print(f"[schema] could not stamp {name}: {exc}")
+                return False
+            if savepoint:
+                cur.execute("RELEASE SAVEPOINT schema_registry_stamp")
+        return True
+
+    def ensure(self, name: str, fn: Callable[..., Any], conn: Any, *args: Any, **kwargs: Any) -> Any:
+        if not self._is_connection(conn):
+            return fn(conn, *args, **kwargs)
+        key = (conn.dsn, name)
+        if key in self._ready:
+            self._record(name, skipped=1)
+            return None
+        if self._pending_in_transaction(conn, name):
+            self._record(name, skipped=1)
+            return None
+        version = self._versions.get(name) or "1"
+        forced = name in self._forced
+        if not forced and self._stamp_matches(conn, name, version):
+            with self._lock:
+                self._ready.add(key)
+            return None
+
+        started = time.perf_counter()
+        result = fn(conn, *args, **kwargs)
+        duration_ms = (time.perf_counter() - started) * 1000.0
+        stamped = self._write_stamp(conn, name, version, duration_ms)
+        self._record(name, ddl_runs=1, ddl_ms=duration_ms)
+        with self._lock:
+            self._forced.discard(name)
+            if stamped and conn.autocommit:
+                self._ready.add(key)
+            elif stamped:
+                self._uncommitted.setdefault(conn, set()).add(name)
+        return result
+
+    def report(self, *, include_tables: bool = True) -> dict[str, Any]:
+        with self._lock:
+            ready_names = {name for _, name in self._ready}
+            tables = {
+                name: {**stats, "ready": name in ready_names, "version": self._versions.get(name)}
+                for name, stats in self._stats.items()
+            }
+        report: dict[str, Any] = {
+            "registered": len(self._versions),
+            "ready": sum(1 for entry in tables.values() if entry["ready"]),
+            "ddl_runs": sum(entry["ddl_runs"] for entry in tables.values()),
+            "ddl_ms": round(sum(entry["ddl_ms"] for entry in tables.values()), 1),
+            "check_ms": round(sum(entry["check_ms"] for entry in tables.values()), 1),
+            "skipped": sum(entry["skipped"] for entry in tables.values()),
+        }
+        if include_tables:
+            report["tables"] = tables
+        return report
+
+
+_registry = SchemaRegistry()
+
+
+def schema_ready(name: str, *, version: Optional[str] = None) -> Callable[[F], F]:
+    """Decorate an ``ensure_*(conn, ...)`` helper so its DDL runs once per process/database."""
+
+    def decorator(fn: F) -> F:
+        _registry.register(name, version or _source_version(fn))
+
+        @functools.wraps(fn)
+        def wrapper(conn: Any, *args: Any, **kwargs: Any) -> Any:
+            return _registry.ensure(name, fn, conn, *args, **kwargs)
+
+        wrapper.schema_name = name  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def reset_schema_registry(*, ignore_stamps: bool = False) -> None:
+    _registry.reset(ignore_stamps=ignore_stamps)
+
+
+def schema_readiness_report(*, include_tables: bool = True) -> dict[str, Any]:
+    return _registry.report(include_tables=include_tables)
+
+
+def format_schema_report(report: Optional[dict[str, Any]] = None, *, top: int = 8) -> str:
+    """One-line startup summary: totals plus the slowest helpers."""
+    report = report or schema_readiness_report()
+    tables = report.get("tables") or {}
+    slowest = sorted(tables.items(), key=lambda item: item[1]["ddl_ms"] + item[1]["check_ms"], reverse=True)
+    parts = [
+        f"{name} {entry['ddl_ms'] + entry['check_ms']:.1f}ms"
+        + (f" (ddl x{entry['ddl_runs']})" if entry["ddl_runs"] else "")
+        for name, entry in slowest[:top]
+        if entry["ddl_ms"] + entry["check_ms"] > 0
+    ]
+    summary = (
+        f"[schema] {report.get('ready', 0)}/{report.get('registered', 0)} ready; "
+        f"ddl {report.get('ddl_ms', 0.0):.1f} ms, stamp checks {report.get('check_ms', 0.0):.1f} ms"
+    )
+    return summary + (f"; slowest: {', '.join(parts)}" if parts else "")
@@ -0,0 +1,199 @@
+"""Precomputed sea-lane distance/duration matrix between ``MARITIME_HUBS``.
+
+Route planning used to run a full ``_plan_sea_route`` (searoute geometry, OSRM legs,
+costing) for every candidate export port before picking one. The matrix lets the
+planner score candidates from a table lookup and resolve geometry only for the
+alternatives it actually returns.
+
+The matrix is built offline (``python -m backend.scripts.build_sea_lane_matrix``) and
+stored as a structured ``.npy`` (memory-mapped read-only at load) plus a JSON sidecar
+listing the hub order. A sidecar that no longer matches the hub catalog is ignored so a
+stale file can never mis-index ports. Each cell carries chokepoint flags: which
+straits/canals the lane passes and whether the Gibraltar guard repair was applied.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+SEA_LANE_MATRIX_PATH = Path(
+    os.getenv("SEA_LANE_MATRIX_PATH") or Path(__file__).resolve().parent.parent / "data" / "sea_lane_matrix.npy"
+)
+
+MATRIX_DTYPE = np.dtype([("distance_km", "<f4"), ("duration_hours", "<f4"), ("flags", "<u2")])
+
+FLAG_SEAROUTE = 1 << 0
+FLAG_GIBRALTAR_GUARD = 1 << 1
+# (flag name, lat, lng, radius km): a lane "passes" a chokepoint when any path vertex
+# falls inside the radius.
+CHOKEPOINTS: tuple[tuple[str, float, float, float], ...] = (
+    ("suez", 30.45, 32.35, 120.0),
+    ("bab_el_mandeb", 12.60, 43.35, 150.0),
+    ("gibraltar", 35.96, -5.60, 90.0),
+    ("malacca", 2.60, 101.00, 250.0),
+    ("panama", 9.08, -79.68, 120.0),
+    ("cape", -35.00, 18.20, 350.0),
+    ("hormuz", 26.55, 56.35, 120.0),
+    ("english_channel", 50.05, 1.20, 150.0),
+)
+CHOKEPOINT_FLAGS: dict[str, int] = {name: 1 << (idx + 2) for idx, (name, *_rest) in enumerate(CHOKEPOINTS)}
+
+
+class SeaLane(NamedTuple):
+    distance_km: float
+    duration_hours: float
+    flags: int
+
+
+def _haversine_km(a_lat: float, a_lng: float, b_lat: float, b_lng: float) -> float:
+    d_lat = math.radians(b_lat - a_lat)
+    d_lng = math.radians(b_lng - a_lng)
+    aa = (
+        math.sin(d_lat / 2) ** 2
+        + math.cos(math.radians(a_lat)) * math.cos(math.radians(b_lat)) * math.sin(d_lng / 2) ** 2
+    )
+    return 2 * 6371.0 * math.atan2(math.sqrt(aa), math.sqrt(1 - aa))
+
+
+def chokepoint_flags(
+    path: Sequence[tuple[float, float]],
+    *,
+    source: str = "",
+    gibraltar_guard: bool = False,
+) -> int:
+    flags = FLAG_SEAROUTE if source == "searoute" else 0
+    if gibraltar_guard:
+        flags |= FLAG_GIBRALTAR_GUARD
+    for name, c_lat, c_lng, radius_km in CHOKEPOINTS:
+        if any(_haversine_km(lat, lng, c_lat, c_lng) <= radius_km for lat, lng in path):
+            flags |= CHOKEPOINT_FLAGS[name]
+    return flags
+
+
+def decode_chokepoint_flags(flags: int) -> list[str]:
+    return [name for name, bit in CHOKEPOINT_FLAGS.items() if flags & bit]
+
+
+def _hub_signature(hubs: Sequence[Any]) -> list[list[Any]]:
+    return [[hub.name, round(float(hub.lat), 3), round(float(hub.lng), 3)] for hub in hubs]
+
+
+def build_sea_lane_matrix(
+    hubs: Sequence[Any],
+    resolve: Callable[[Any, Any], tuple[float, float, int]],
+    *,
+    on_pair: Optional[Callable[[int, int], None]] = None,
+) -> np.ndarray:
+    """Fill an ``len(hubs)`` square matrix; ``resolve(a, b)`` returns (km, hours, flags)."""
+    size = len(hubs)
+    matrix = np.zeros((size, size), dtype=MATRIX_DTYPE)
+    for i, a in enumerate(hubs):
+        for j, b in enumerate(hubs):
+            if i == j:
+                continue
+            matrix[i, j] = resolve(a, b)
+            if on_pair is not None:
+                on_pair(i, j)
+    return matrix
+
+
+def write_sea_lane_matrix(
+    matrix: np.ndarray,
+    hubs: Sequence[Any],
+    path: Path = SEA_LANE_MATRIX_PATH,
+    *,
+    network_version: str = "",
+) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, np.ascontiguousarray(matrix, dtype=MATRIX_DTYPE))
+    sidecar = {
+        "hubs": _hub_signature(hubs),
+        "network_version": network_version,
+        "chokepoints": list(CHOKEPOINT_FLAGS),
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    path.with_suffix(".json").write_text(json.dumps(sidecar, indent=1) + "\n", encoding="utf-8")
+    return path
+
+
+class SeaLaneMatrix:
+    """Read-only hub-to-hub lane table; ``lookup`` and ``distances_to`` are O(1)/vectorized."""
+
+    def __init__(self, matrix: np.ndarray, hub_names: Sequence[str], *, network_version: str = "") -> None:
+        self.matrix = matrix
+        self.network_version = network_version
+        self._index = {name: idx for idx, name in enumerate(hub_names)}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    @classmethod
+    def load(cls, hubs: Sequence[Any], path: Path = SEA_LANE_MATRIX_PATH) -> Optional["SeaLaneMatrix"]:
+        """Memory-map ``path``; ``None`` when missing or built for a different hub catalog."""
+        path = Path(path)
+        try:
+            sidecar = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+            if sidecar.get("hubs") != _hub_signature(hubs):
+                return None
+            matrix = np.load(path, mmap_mode="r", allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        if matrix.dtype != MATRIX_DTYPE or matrix.shape != (len(hubs), len(hubs)):
+            return None
+        return cls(matrix, [hub.name for hub in hubs], network_version=str(sidecar.get("network_version") or ""))
+
+    def lookup(self, from_name: str, to_name: str) -> Optional[SeaLane]:
+        i = self._index.get(from_name)
+        j = self._index.get(to_name)
+        if i is None or j is None or i == j:
+            return None
+        cell = self.matrix[i, j]
+        if not cell["distance_km"] > 0:
+            return None
+        return SeaLane(float(cell["distance_km"]), float(cell["duration_hours"]), int(cell["flags"]))
+
+    def distances_to(self, from_names: Sequence[str], to_name: str) -> np.ndarray:
+        """Sea km from each of ``from_names`` to ``to_name``; NaN where unknown."""
+        j = self._index.get(to_name)
+        out = np.full(len(from_names), np.nan, dtype=np.float64)
+        if j is None:
+            return out
+        rows = [(k, self._index[name]) for k, name in enumerate(from_names) if name in self._index]
+        if rows:
+            positions = np.fromiter((k for k, _ in rows), dtype=np.intp, count=len(rows))
+            indices = np.fromiter((i for _, i in rows), dtype=np.intp, count=len(rows))
+            column = np.asarray(self.matrix["distance_km"][indices, j], dtype=np.float64)
+            out[positions] = np.where(column > 0, column, np.nan)
+        return out
+
+
+_loaded: dict[tuple[str, tuple[str, ...]], Optional[SeaLaneMatrix]] = {}
+_load_lock = threading.Lock()
+
+
+def get_sea_lane_matrix(hubs: Sequence[Any], path: Path = SEA_LANE_MATRIX_PATH) -> Optional[SeaLaneMatrix]:
+    """Process-wide matrix for ``hubs`` (loaded once; ``None`` if not built)."""
+    key = (str(path), tuple(hub.name for hub in hubs))
+    if key in _loaded:
+        return _loaded[key]
+    with _load_lock:
+        if key not in _loaded:
+            _loaded[key] = SeaLaneMatrix.load(hubs, path)
+        return _loaded[key]
+
+
+def reset_sea_lane_matrix() -> None:
+    with _load_lock:
+        _loaded.clear()
@@ -0,0 +1,251 @@
+"""Nearest-neighbour index over lat/lng points on the sphere.
+
+Points are mapped to 3D unit vectors and stored in a static KD-tree (median splits on
+the widest axis, leaf buckets scanned with NumPy). Chord length is monotonic in
+great-circle distance, so k-NN and radius queries on the tree return exactly the
+haversine ordering without a linear scan. Results come back as ``(position, km)``
+sorted by distance, ties broken by position like a stable sort over the input.
+
+``groups`` (e.g. country codes) allow the same queries restricted to one group; each
+group's sub-index is built lazily on first use. ``index_for`` caches one index per
+immutable sequence (hub tuples, loaded port lists) so call sites build it once.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+LEAF_SIZE = 24
+
+
+def _unit_vectors(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    lat_r = np.radians(lats)
+    lng_r = np.radians(lngs)
+    cos_lat = np.cos(lat_r)
+    return np.column_stack((cos_lat * np.cos(lng_r), cos_lat * np.sin(lng_r), np.sin(lat_r)))
+
+
+def _chord_sq_to_km(d2: float) -> float:
+    return 2.0 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(max(d2, 0.0)) / 2.0))
+
+
+def _km_to_chord_sq(km: float) -> float:
+    angle = min(max(km, 0.0) / (2.0 * EARTH_RADIUS_KM), math.pi / 2.0)
+    return (2.0 * math.sin(angle)) ** 2 + 1e-12
+
+
+class SphericalIndex:
+    """Static KD-tree over unit vectors with k-NN and radius queries in km."""
+
+    def __init__(
+        self,
+        lats: Sequence[float],
+        lngs: Sequence[float],
+        *,
+        groups: Optional[Sequence[Hashable]] = None,
+        leaf_size: int = LEAF_SIZE,
+    ) -> None:
+        lat_arr = np.asarray(lats, dtype=np.float64)
+        lng_arr = np.asarray(lngs, dtype=np.float64)
+        if lat_arr.shape != lng_arr.shape:
+            raise ValueError("lats and lngs must have the same length")
+        self._size = int(lat_arr.size)
+        self._groups = list(groups) if groups is not None else None
+        if self._groups is not None and len(self._groups) != self._size:
+            raise ValueError("groups must match the number of points")
+        self._group_indexes: dict[Hashable, tuple["SphericalIndex", np.ndarray]] = {}
+        self._group_lock = threading.Lock()
+        self._lats = lat_arr
+        self._lngs = lng_arr
+
+        points = _unit_vectors(lat_arr, lng_arr)
+        order = np.arange(self._size, dtype=np.intp)
+        # Per node: (lo, hi, start, end, left, right); children -1 for leaves.
+        self._nodes: list[tuple[tuple[float, float, float], tuple[float, float, float], int, int, int, int]] = []
+        if self._size:
+            self._build(points, order, 0, self._size, max(1, leaf_size))
+        self._points = points[order]
+        self._order = order
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _build(self, points: np.ndarray, order: np.ndarray, start: int, end: int, leaf_size: int) -> int:
+        segment = points[order[start:end]]
+        lo = segment.min(axis=0)
+        hi = segment.max(axis=0)
+        node_id = len(self._nodes)
+        self._nodes.append((tuple(lo.tolist()), tuple(hi.tolist()), start, end, -1, -1))  # type: ignore[arg-type]
+        if end - start <= leaf_size:
+            return node_id
+        axis = int(np.argmax(hi - lo))
+        mid = (start + end) // 2
+        part = np.argpartition(segment[:, axis], mid - start, kind="introselect")
+        order[start:end] = order[start:end][part]
+        left = self._build(points, order, start, mid, leaf_size)
+        right = self._build(points, order, mid, end, leaf_size)
+        self._nodes[node_id] = (*self._nodes[node_id][:4], left, right)  # type: ignore[assignment]
+        return node_id
+
+    @staticmethod
+    def _bbox_d2(q: tuple[float, float, float], lo: tuple[float, ...], hi: tuple[float, ...]) -> float:
+        total = 0.0
+        for axis in range(3):
+            value = q[axis]
+            if value < lo[axis]:
+                delta = lo[axis] - value
+                total += delta * delta
+            elif value > hi[axis]:
+                delta = value - hi[axis]
+                total += delta * delta
+        return total
+
+    @staticmethod
+    def _query_vector(lat: float, lng: float) -> tuple[float, float, float]:
+        lat_r = math.radians(lat)
+        lng_r = math.radians(lng)
+        return (math.cos(lat_r) * math.cos(lng_r), math.cos(lat_r) * math.sin(lng_r), math.sin(lat_r))
+
+    def _group(self, group: Hashable) -> Optional[tuple["SphericalIndex", np.ndarray]]:
+        if self._groups is None:
+            raise ValueError("index was built without groups")
+        cached = self._group_indexes.get(group)
+        if cached is not None:
+            return cached
+        with self._group_lock:
+            cached = self._group_indexes.get(group)
+            if cached is None:
+                members = np.fromiter(
+                    (pos for pos, key in enumerate(self._groups) if key == group), dtype=np.intp
+                )
+                if members.size == 0:
+                    return None
+                cached = (SphericalIndex(self._lats[members], self._lngs[members]), members)
+                self._group_indexes[group] = cached
+        return cached
+
+    def query(
+        self,
+        lat: float,
+        lng: float,
+        k: int = 1,
+        *,
+        group: Optional[Hashable] = None,
+    ) -> list[tuple[int, float]]:
+        """Up to ``k`` nearest points as ``(position, km)``, nearest first."""
+        if group is not None:
+            sub = self._group(group)
+            if sub is None:
+                return []
+            index, members = sub
+            return [(int(members[pos]), km) for pos, km in index.query(lat, lng, k)]
+        if k <= 0 or not self._size:
+            return []
+        q = self._query_vector(lat, lng)
+        q_arr = np.asarray(q)
+        best: list[tuple[float, int]] = []  # max-heap via (-d2, -position)
+        frontier = [(0.0, 0)]
+        nodes = self._nodes
+        while frontier:
+            bound, node_id = heapq.heappop(frontier)
+            if len(best) == k and bound > -best[0][0]:
+                break
+            lo, hi, start, end, left, right = nodes[node_id]
+            if left < 0:
+                d2 = ((self._points[start:end] - q_arr) ** 2).sum(axis=1)
+                if len(best) == k:
+                    candidates = np.nonzero(d2 <= -best[0][0])[0]
+                else:
+                    candidates = range(end - start)
+                for offset in candidates:
+                    item = (-float(d2[offset]), -int(self._order[start + offset]))
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+                continue
+            for child in (left, right):
+                c_lo, c_hi = nodes[child][0], nodes[child][1]
+                heapq.heappush(frontier, (self._bbox_d2(q, c_lo, c_hi), child))
+        ranked = sorted((-neg_d2, -neg_pos) for neg_d2, neg_pos in best)
+        return [(pos, _chord_sq_to_km(d2)) for d2, pos in ranked]
+
+    def query_radius(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        *,
+        group: Optional[Hashable] = None,
+    ) -> list[tuple[int, float]]:
+        """All points within ``radius_km`` as ``(position, km)``, nearest first."""
+        if group is not None:
+            sub = self._group(group)
+            if sub is None:
+                return []
+            index, members = sub
+            return [(int(members[pos]), km) for pos, km in index.query_radius(lat, lng, radius_km)]
+        if not self._size:
+            return []
+        q = self._query_vector(lat, lng)
+        q_arr = np.asarray(q)
+        r2 = _km_to_chord_sq(radius_km)
+        hits: list[tuple[float, int]] = []
+        stack = [0]
+        nodes = self._nodes
+        while stack:
+            lo, hi, start, end, left, right = nodes[stack.pop()]
+            if self._bbox_d2(q, lo, hi) > r2:
+                continue
+            if left < 0:
+                d2 = ((self._points[start:end] - q_arr) ** 2).sum(axis=1)
+                for offset in np.nonzero(d2 <= r2)[0]:
+                    hits.append((float(d2[offset]), int(self._order[start + offset])))
+                continue
+            stack.append(left)
+            stack.append(right)
+        hits.sort()
+        return [(pos, _chord_sq_to_km(d2)) for d2, pos in hits]
+
+
+_index_cache: "OrderedDict[tuple[int, Any], tuple[Sequence[Any], SphericalIndex]]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+_INDEX_CACHE_MAX = 32
+
+
+def index_for(
+    items: Sequence[Any],
+    *,
+    lat: Callable[[Any], float] = lambda item: item.lat,
+    lng: Callable[[Any], float] = lambda item: item.lng,
+    group: Optional[Callable[[Any], Hashable]] = None,
+) -> SphericalIndex:
+    """Shared index for ``items`` (tuples or lists that are never mutated after load).
+
+    Keyed by object identity (the sequence is kept alive by the cache), so repeated
+    calls with the same hub tuple or loaded port list reuse one tree.
+    """
+    key = (id(items), group)
+    with _index_cache_lock:
+        cached = _index_cache.get(key)
+        if cached is not None and cached[0] is items:
+            _index_cache.move_to_end(key)
+            return cached[1]
+    index = SphericalIndex(
+        [float(lat(item)) for item in items],
+        [float(lng(item)) for item in items],
+        groups=[group(item) for item in items] if group is not None else None,
+    )
+    with _index_cache_lock:
+        _index_cache[key] = (items, index)
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > _INDEX_CACHE_MAX:
+            _index_cache.popitem(last=False)
+    return index
@@ -0,0 +1,337 @@
+"""Run named steps in dependency order on a bounded set of threads.
+
+Each ``DagStep`` names the steps it must follow (``after``) and may name a ``group``. Two steps
+in the same group never run at the same time. Use that for writers that upsert the same rows
+and would otherwise contend for row locks.
+
+With a ``connect`` factory every step gets its own connection and its own transaction:
+
+* the step is committed on success and rolled back when it raises;
+* a step that raises or returns ``{"status": "error"}`` is retried ``retries`` times with
+  exponential backoff;
+* a step still running at its ``timeout`` is reported as ``timeout``. Its in-flight query is
+  cancelled and its dependents are released.
+
+Without ``connect`` the steps run one at a time on the shared connection in dependency order,
+with a commit after each step; timeouts are not enforced in that mode.
+
+Dependencies order steps; they do not gate them. A dependent still runs after an upstream
+error, because every step reads whatever the tables hold. Its ``timings`` entry lists the
+failed upstreams under ``upstream_errors``.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+
+@dataclass(frozen=True)
+class DagStep:
+    name: str
+    run: Callable[[Any], Any]
+    after: tuple[str, ...] = ()
+    group: Optional[str] = None
+    timeout: Optional[float] = None
+    retries: int = 0
+
+
+def _is_error(result: Any) -> bool:
+    return isinstance(result, dict) and result.get("status") == "error"
+
+
+def validate_steps(steps: Sequence[DagStep]) -> list[DagStep]:
+    """Return ``steps`` in a dependency-respecting order (declaration order where free).
+
+    Raises ValueError on duplicate names, unknown dependencies or cycles.
+    """
+    by_name: dict[str, DagStep] = {}
+    for step in steps:
+        if step.name in by_name:
+            raise ValueError(f"duplicate step {step.name!r}")
+        by_name[step.name] = step
+    for step in steps:
+        unknown = [dep for dep in step.after if dep not in by_name]
+        if unknown:
+            raise ValueError(f"step {step.name!r} depends on unknown step(s) {unknown}")
+    ordered: list[DagStep] = []
+    placed: set[str] = set()
+    remaining = list(steps)
+    while remaining:
+        ready = [step for step in remaining if all(dep in placed for dep in step.after)]
+        if not ready:
+            raise ValueError(f"dependency cycle among {[step.name for step in remaining]}")
+        for step in ready:
+            ordered.append(step)
+            placed.add(step.name)
+        remaining = [step for step in remaining if step.name not in placed]
+    return ordered
+
+
+def select_steps(steps: Sequence[DagStep], names: Iterable[str]) -> list[DagStep]:
+    """Keep only ``names``; dependencies on dropped steps count as already satisfied."""
+    wanted = set(names)
+    unknown = wanted - {step.name for step in steps}
+    if unknown:
+        raise ValueError(f"unknown step(s) {sorted(unknown)}; valid: {[step.name for step in steps]}")
+    kept = [step for step in steps if step.name in wanted]
+    return [
+        DagStep(
+            name=step.name,
+            run=step.run,
+            after=tuple(dep for dep in step.after if dep in wanted),
+            group=step.group,
+            timeout=step.timeout,
+            retries=step.retries,
+        )
+        for step in kept
+    ]
+
+
+def _attempt_step(
+    step: DagStep,
+    conn: Any,
+    cancel: threading.Event,
+    retry_base_sec: float,
+) -> tuple[Any, str, int]:
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            result = step.run(conn)
+            conn.commit()
+        except Exception as exc:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            result = {"status": "error", "message": str(exc)[:500]}
+        if not _is_error(result):
+            return result, "ok", attempts
+        if attempts > step.retries or cancel.is_set():
+            return result, "error", attempts
+        if cancel.wait(retry_base_sec * (2 ** (attempts - 1))):
+            return result, "error", attempts
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+def _cancel_query(conn: Any) -> None:
+    cancel = getattr(conn, "cancel", None)
+    if cancel is None:
+        return
+    try:
+        cancel()
+    except Exception:
+        pass
+
+
+def run_step_dag(
+    steps: Sequence[DagStep],
+    *,
+    conn: Any = None,
+    connect: Optional[Callable[[], Any]] = None,
+    max_workers: int = 4,
+    retry_base_sec: float = 5.0,
+    clock: Callable[[], float] = time.monotonic,
+) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """Run ``steps``; return ``(results, timings)`` keyed by step name in declaration order.
+
+    ``timings[name]`` holds ``status`` (ok / error / timeout), ``attempts``, ``start_ms`` (offset
+    from the start of the run) and ``duration_ms``.
+    """
+    ordered = validate_steps(steps)
+    if connect is None and conn is None:
+        raise ValueError("run_step_dag needs conn or connect")
+    run_started = clock()
+    results: dict[str, Any] = {}
+    timings: dict[str, dict[str, Any]] = {}
+
+    def record(step: DagStep, result: Any, status: str, attempts: int, started: float, finished: float) -> None:
+        results[step.name] = result
+        timings[step.name] = {
+            "status": status,
+            "attempts": attempts,
+            "start_ms": round((started - run_started) * 1000),
+            "duration_ms": round((finished - started) * 1000),
+        }
+        failed = [dep for dep in step.after if timings.get(dep, {}).get("status") not in (None, "ok")]
+        if failed:
+            timings[step.name]["upstream_errors"] = failed
+
+    if connect is None:
+        never = threading.Event()
+        for step in ordered:
+            started = clock()
+            result, status, attempts = _attempt_step(step, conn, never, retry_base_sec)
+            record(step, result, status, attempts, started, clock())
+    else:
+        _run_pooled(ordered, connect, max(1, max_workers), retry_base_sec, clock, record)
+
+    names = [step.name for step in steps]
+    return (
+        {name: results[name] for name in names if name in results},
+        {name: timings[name] for name in names if name in timings},
+    )
+
+
+def _run_pooled(
+    ordered: list[DagStep],
+    connect: Callable[[], Any],
+    max_workers: int,
+    retry_base_sec: float,
+    clock: Callable[[], float],
+    record: Callable[..., None],
+) -> None:
+    # Plain daemon threads rather than an executor: a timed-out step cannot be killed, and it
+    # must not hold one of the max_workers slots while it winds down.
+    done_queue: "queue.Queue[tuple[str, Any, str, int, float, float]]" = queue.Queue()
+    lock = threading.Lock()
+    connections: dict[str, Any] = {}
+    cancels: dict[str, threading.Event] = {}
+    pending = list(ordered)
+    running: dict[str, tuple[DagStep, float, Optional[float]]] = {}
+    finished: set[str] = set()
+    busy_groups: set[str] = set()
+    # Timed-out steps whose thread is still winding down: they hold their group (not a worker
+    # slot) until the worker posts, and that late result is dropped.
+    timed_out: dict[str, DagStep] = {}
+
+    def worker(step: DagStep, started: float) -> None:
+        cancel = cancels[step.name]
+        try:
+            step_conn = connect()
+        except Exception as exc:
+            done_queue.put((step.name, {"status": "error", "message": str(exc)[:500]}, "error", 0, started, clock()))
+            return
+        with lock:
+            connections[step.name] = step_conn
+        try:
+            result, status, attempts = _attempt_step(step, step_conn, cancel, retry_base_sec)
+        finally:
+            with lock:
+                connections.pop(step.name, None)
+            _close_quietly(step_conn)
+        done_queue.put((step.name, result, status, attempts, started, clock()))
+
+    def release(step: DagStep, *, free_group: bool = True) -> None:
+        running.pop(step.name, None)
+        finished.add(step.name)
+        if step.group and free_group:
+            busy_groups.discard(step.group)
+
+    while pending or running:
+        for step in list(pending):
+            if len(running) >= max_workers:
+                break
+            if not all(dep in finished for dep in step.after):
+                continue
+            if step.group and step.group in busy_groups:
+                continue
+            pending.remove(step)
+            started = clock()
+            deadline = started + step.timeout if step.timeout else None
+            running[step.name] = (step, started, deadline)
+            cancels[step.name] = threading.Event()
+            if step.group:
+                busy_groups.add(step.group)
+            threading.Thread(target=worker, args=(step, started), name=f"dag-{step.name}", daemon=True).start()
+
+        deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+        wait = max(0.0, min(deadlines) - clock()) if deadlines else None
+        try:
+            name, result, status, attempts, started, ended = done_queue.get(timeout=wait)
+        except queue.Empty:
+            name = None
+        if name is not None and name in timed_out:
+            step = timed_out.pop(name)
+            if step.group:
+                busy_groups.discard(step.group)
+        elif name is not None and name in running:
+            step = running[name][0]
+            release(step)
+            record(step, result, status, attempts, started, ended)
+
+        now = clock()
+        for step, started, deadline in list(running.values()):
+            if deadline is None or now < deadline:
+                continue
+            cancels[step.name].set()
+            with lock:
+                step_conn = connections.get(step.name)
+            if step_conn is not None:
+                _cancel_query(step_conn)
+            release(step, free_group=False)
+            timed_out[step.name] = step
+            record(
+                step,
+                {"status": "timeout", "timeout_sec": step.timeout},
+                "timeout",
+                0,
+                started,
+                deadline,
+            )
+
+
+def critical_path(
+    steps: Sequence[DagStep],
+    timings: dict[str, dict[str, Any]],
+) -> dict[str, Any]:
+    """Walk back from the last step to finish through whatever held each step up.
+
+    A step's blockers are its dependencies plus members of its group that ran before it. The chain of
+    latest-finishing blockers is the path that set the run's wall time. ``queued_ms`` is the
+    time along that path spent waiting for a worker slot rather than running.
+    """
+    by_name = {step.name: step for step in steps if step.name in timings}
+    # Steps start in this order, so an earlier step is the only possible blocker; walking
+    # strictly backwards also keeps zero-length steps in one group from pointing at each other.
+    position = {step.name: index for index, step in enumerate(validate_steps(steps))}
+    if not by_name:
+        return {"steps": [], "path_ms": 0, "queued_ms": 0, "wall_ms": 0, "serial_ms": 0, "parallelism": 0.0}
+
+    def start(name: str) -> int:
+        return int(timings[name]["start_ms"])
+
+    def end(name: str) -> int:
+        return int(timings[name]["start_ms"]) + int(timings[name]["duration_ms"])
+
+    last = max(by_name, key=lambda name: (end(name), position[name]))
+    path = [last]
+    current = last
+    while True:
+        step = by_name[current]
+        blockers = [dep for dep in step.after if dep in by_name]
+        if step.group:
+            blockers += [
+                other.name
+                for other in by_name.values()
+                if other.group == step.group and other.name != current and end(other.name) <= start(current)
+            ]
+        blockers = [
+            name for name in blockers if end(name) <= start(current) and position[name] < position[current]
+        ]
+        if not blockers:
+            break
+        current = max(blockers, key=lambda name: (end(name), position[name]))
+        path.append(current)
+    path.reverse()
+    path_ms = sum(int(timings[name]["duration_ms"]) for name in path)
+    wall_ms = end(last) - min(start(name) for name in by_name)
+    serial_ms = sum(int(timing["duration_ms"]) for name, timing in timings.items() if name in by_name)
+    return {
+        "steps": path,
+        "path_ms": path_ms,
+        "queued_ms": max(0, end(last) - start(path[0]) - path_ms),
+        "wall_ms": wall_ms,
+        "serial_ms": serial_ms,
+        "parallelism": round(serial_ms / wall_ms, 2) if wall_ms > 0 else 0.0,
+    }
@@ -16,6 +16,11 @@ import os
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 STORAGE_DISPLAY_ENRICHMENT_VERSION = int(os.getenv("STORAGE_DISPLAY_ENRICHMENT_VERSION", "1") or "1")
 STORAGE_DISPLAY_MATERIALIZE_LIMIT = int(os.getenv("STORAGE_DISPLAY_MATERIALIZE_LIMIT", "500") or "500")
 STORAGE_DISPLAY_MATERIALIZE_ENABLED = (os.getenv("STORAGE_DISPLAY_MATERIALIZE_ENABLED") or "").strip().lower() in {
@@ -75,6 +80,7 @@ def storage_display_materialize_enabled() -> bool:
     return STORAGE_DISPLAY_MATERIALIZE_ENABLED
 
 
+@schema_ready("storage_terminal_display")
 def ensure_storage_terminal_display_tables(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
@@ -1,30 +1,36 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
 import math
 import os
 import re
 import threading
 import time
-from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
+import psycopg2
+
 try:
-    from backend.country_borders import get_country_borders_geojson
+    from backend.country_lookup import resolve_countries as _resolve_countries_batch
+    from backend.country_lookup import resolve_country_point
 except ImportError:
-    from country_borders import get_country_borders_geojson
+    from country_lookup import resolve_countries as _resolve_countries_batch
+    from country_lookup import resolve_country_point
 
 try:
     from backend.services.maritime_intel import find_nearest_ports
 except ImportError:
     from services.maritime_intel import find_nearest_ports
 
+logger = logging.getLogger(__name__)
+
 
 STORAGE_TERMINALS_LAYER_ID = "storage_terminals"
 OVERPASS_TIMEOUT_SECONDS = int(os.getenv("STORAGE_OVERPASS_TIMEOUT_SECONDS", "120"))
@@ -41,6 +47,7 @@ STORAGE_CACHE_TTL_SECONDS = 60 * 60 * 12
 STORAGE_REFERENCE_ENRICH_MAX = int(os.getenv("STORAGE_REFERENCE_ENRICH_MAX", "2500"))
 STORAGE_VIEWPORT_DB_PAD_DEG = float(os.getenv("STORAGE_VIEWPORT_DB_PAD_DEG", "0.35"))
 STORAGE_VIEWPORT_FAST_MAX_ENTITIES = int(os.getenv("STORAGE_VIEWPORT_FAST_MAX_ENTITIES", "12000"))
+STORAGE_INDEX_CELL_DEG = float(os.getenv("STORAGE_INDEX_CELL_DEG", "1.0"))
 MAX_NEARBY_PORT_DISTANCE_KM = 250.0
 SITE_CONTEXT_MAX_DISTANCE_KM = 2.0
 SITE_POLYGON_BUFFER_DEG = 0.0015
@@ -386,173 +393,71 @@ def _build_osm_object_url(element_type: str, osm_id: int) -> str:
     return f"https://www.openstreetmap.org/{element_type}/{osm_id}"
 
 
-@dataclass(frozen=True)
-class CountryFeature:
-    name: str
-    iso2: str
-    bbox: tuple[float, float, float, float]
-    polygons: list[list[list[tuple[float, float]]]]
-
-
-_country_feature_cache: list[CountryFeature] | None = None
-_storage_cache: dict[str, Any] = {"loaded_at": 0.0, "response": None}
+_storage_cache: dict[str, Any] = {"loaded_at": 0.0, "response": None, "index": None}
 _storage_global_build_lock = threading.Lock()
 _storage_warm_scheduled = False
 
 
-def _ring_bbox(ring: list[tuple[float, float]]) -> tuple[float, float, float, float]:
-    xs = [point[0] for point in ring]
-    ys = [point[1] for point in ring]
-    return min(xs), min(ys), max(xs), max(ys)
-
-
-def _polygon_bbox(polygon: list[list[tuple[float, float]]]) -> tuple[float, float, float, float]:
-    min_x = math.inf
-    min_y = math.inf
-    max_x = -math.inf
-    max_y = -math.inf
-    for ring in polygon:
-        if not ring:
-            continue
-        ring_min_x, ring_min_y, ring_max_x, ring_max_y = _ring_bbox(ring)
-        min_x = min(min_x, ring_min_x)
-        min_y = min(min_y, ring_min_y)
-        max_x = max(max_x, ring_max_x)
-        max_y = max(max_y, ring_max_y)
-    return min_x, min_y, max_x, max_y
-
-
-def _point_in_ring(lng: float, lat: float, ring: list[tuple[float, float]]) -> bool:
-    inside = False
-    if len(ring) < 3:
-        return False
-    j = len(ring) - 1
-    for i in range(len(ring)):
-        xi, yi = ring[i]
-        xj, yj = ring[j]
-        intersects = ((yi > lat) != (yj > lat)) and (
-            lng < (xj - xi) * (lat - yi) / ((yj - yi) or 1e-12) + xi
-        )
-        if intersects:
-            inside = not inside
-        j = i
-    return inside
-
-
-def _point_in_polygon(lng: float, lat: float, polygon: list[list[tuple[float, float]]]) -> bool:
-    if not polygon:
-        return False
-    outer = polygon[0]
-    if not _point_in_ring(lng, lat, outer):
-        return False
-    for hole in polygon[1:]:
-        if _point_in_ring(lng, lat, hole):
-            return False
-    return True
-
-
-def _extract_country_name(properties: dict[str, Any]) -> str:
-    for key in ("ADMIN", "name", "NAME", "formal_en"):
-        value = _clean_text(properties.get(key))
-        if value:
-            return value
-    return "Unknown"
+COUNTRY_CACHE_MAX_ENTRIES = 262144
+_country_cache: dict[tuple[float, float], tuple[str, str]] = {}
+# Request threads and the offload pools share the cache; eviction iterates the dict.
+_country_cache_lock = threading.Lock()
 
 
-def _extract_country_iso2(properties: dict[str, Any]) -> str:
-    for key in ("ISO_A2", "iso_a2", "ISO2", "iso2"):
-        value = _clean_text(properties.get(key)).upper()
-        if len(value) == 2:
-            return value
-    return ""
+def _remember_countries(items: list[tuple[tuple[float, float], tuple[str, str]]]) -> None:
+    with _country_cache_lock:
+        for key, value in items:
+            if key not in _country_cache and len(_country_cache) >= COUNTRY_CACHE_MAX_ENTRIES:
+                # Oldest-first eviction; dicts keep insertion order.
+                _country_cache.pop(next(iter(_country_cache)), None)
+            _country_cache[key] = value
 
 
-def _parse_geojson_rings(raw_coords: Any) -> list[list[tuple[float, float]]]:
-    rings: list[list[tuple[float, float]]] = []
-    if not isinstance(raw_coords, list):
-        return rings
-    for ring in raw_coords:
-        if not isinstance(ring, list):
-            continue
-        parsed_ring: list[tuple[float, float]] = []
-        for coord in ring:
-            if (
-                isinstance(coord, list)
-                and len(coord) >= 2
-                and isinstance(coord[0], (int, float))
-                and isinstance(coord[1], (int, float))
-            ):
-                parsed_ring.append((float(coord[0]), float(coord[1])))
-        if parsed_ring:
-            rings.append(parsed_ring)
-    return rings
-
-
-def _load_country_features() -> list[CountryFeature]:
-    global _country_feature_cache
-    if _country_feature_cache is not None:
-        return _country_feature_cache
-
-    payload, _ = get_country_borders_geojson()
-    features: list[CountryFeature] = []
-    for feature in payload.get("features", []):
-        geometry = feature.get("geometry") or {}
-        properties = feature.get("properties") or {}
-        geometry_type = geometry.get("type")
-        polygons: list[list[list[tuple[float, float]]]] = []
-
-        if geometry_type == "Polygon":
-            polygon = _parse_geojson_rings(geometry.get("coordinates"))
-            if polygon:
-                polygons.append(polygon)
-        elif geometry_type == "MultiPolygon":
-            for raw_polygon in geometry.get("coordinates") or []:
-                polygon = _parse_geojson_rings(raw_polygon)
-                if polygon:
-                    polygons.append(polygon)
-
-        if not polygons:
-            continue
-
-        min_x = math.inf
-        min_y = math.inf
-        max_x = -math.inf
-        max_y = -math.inf
-        for polygon in polygons:
-            poly_min_x, poly_min_y, poly_max_x, poly_max_y = _polygon_bbox(polygon)
-            min_x = min(min_x, poly_min_x)
-            min_y = min(min_y, poly_min_y)
-            max_x = max(max_x, poly_max_x)
-            max_y = max(max_y, poly_max_y)
-
-        features.append(
-            CountryFeature(
-                name=_extract_country_name(properties),
-                iso2=_extract_country_iso2(properties),
-                bbox=(min_x, min_y, max_x, max_y),
-                polygons=polygons,
-            )
+def resolve_country(lat: float, lng: float) -> tuple[str, str]:
+    """Country lookup cached on ~1.1 km grid — list builds call this tens of thousands of times."""
+    key = (round(lat, 2), round(lng, 2))
+    with _country_cache_lock:
+        cached = _country_cache.get(key)
+    if cached is None:
+        cached = resolve_country_point(*key)
+        _remember_countries([(key, cached)])
+    return cached
+
+
+def resolve_countries(points: list[tuple[float, float]]) -> list[tuple[str, str]]:
+    """Batch ``resolve_country``: one vectorized lookup for every uncached grid point."""
+    keys = [(round(lat, 2), round(lng, 2)) for lat, lng in points]
+    with _country_cache_lock:
+        missing = list(dict.fromkeys(key for key in keys if key not in _country_cache))
+    resolved: dict[tuple[float, float], tuple[str, str]] = {}
+    if missing:
+        values = _resolve_countries_batch(
+            [key[0] for key in missing], [key[1] for key in missing], decimals=None
         )
+        resolved = dict(zip(missing, values))
+        _remember_countries(list(resolved.items()))
+    with _country_cache_lock:
+        found = [resolved.get(key) or _country_cache.get(key) for key in keys]
+    return [value or resolve_country(*key) for key, value in zip(keys, found)]
 
-    _country_feature_cache = features
-    return features
 
-
-def resolve_country(lat: float, lng: float) -> tuple[str, str]:
-    """Country lookup cached on ~1.1 km grid — list builds call this tens of thousands of times."""
-    return _resolve_country_cached(round(lat, 2), round(lng, 2))
+def _element_point(element: dict[str, Any]) -> Optional[tuple[float, float]]:
+    lat = _safe_float(element.get("lat"))
+    lng = _safe_float(element.get("lon"))
+    if lat is None or lng is None:
+        center = element.get("center") or {}
+        lat = _safe_float(center.get("lat"))
+        lng = _safe_float(center.get("lon"))
+    if lat is None or lng is None:
+        return None
+    return lat, lng
 
 
-@lru_cache(maxsize=65536)
-def _resolve_country_cached(lat: float, lng: float) -> tuple[str, str]:
-    for feature in _load_country_features():
-        min_x, min_y, max_x, max_y = feature.bbox
-        if lng < min_x or lng > max_x or lat < min_y or lat > max_y:
-            continue
-        for polygon in feature.polygons:
-            if _point_in_polygon(lng, lat, polygon):
-                return feature.name, feature.iso2
-    return "Unknown", ""
+def _prime_country_cache(elements: list[dict[str, Any]]) -> None:
+    """Resolve countries for a batch of OSM elements before per-element normalization."""
+    points = [point for point in (_element_point(element) for element in elements) if point is not None]
+    if points:
+        resolve_countries(points)
 
 
 def _overpass_urls() -> tuple[str, ...]:
@@ -567,19 +472,12 @@ def _overpass_urls() -> tuple[str, ...]:
 
 
 def _db_connect():
-    import psycopg2
-
-    database_url = os.getenv("DATABASE_URL", "").strip()
-    if database_url:
-        return psycopg2.connect(database_url, connect_timeout=5)
-    return psycopg2.connect(
-        host=os.getenv("DB_HOST", "localhost"),
-        port=int(os.getenv("DB_PORT", "5432")),
-        database=os.getenv("DB_NAME", "mining_db"),
-        user=os.getenv("DB_USER", "postgres"),
-        password=os.getenv("DB_PASSWORD", "password"),
-        connect_timeout=5,
-    )
+    try:
+        from backend.services.db_pool import get_pooled_connection
+    except ImportError:
+        from services.db_pool import get_pooled_connection
+
+    return get_pooled_connection()
 
 
 def build_overpass_query(bbox: tuple[float, float, float, float]) -> str:
@@ -759,6 +657,62 @@ def _expand_storage_bbox(
     return (south - pad, west - pad, north + pad, east + pad)
 
 
+def _storage_db_select(
+    bbox: Optional[tuple[float, float, float, float]] = None,
+) -> tuple[str, tuple[Any, ...]]:
+    spatial_sql = ""
+    params: tuple[Any, ...] = (STORAGE_TERMINALS_LAYER_ID,)
+    if bbox is not None:
+        south, west, north, east = bbox
+        spatial_sql = " AND ST_Intersects(geom, ST_MakeEnvelope(%s, %s, %s, %s, 4326))"
+        params = (STORAGE_TERMINALS_LAYER_ID, west, south, east, north)
+    sql = f"""
+        SELECT osm_type, osm_id, tags, ST_AsGeoJSON(geom)::json AS geom_json,
+               ST_Y(ST_Centroid(geom)) AS lat,
+               ST_X(ST_Centroid(geom)) AS lon,
+               ST_YMin(geom) AS south,
+               ST_XMin(geom) AS west,
+               ST_YMax(geom) AS north,
+               ST_XMax(geom) AS east
+        FROM petroleum_osm_features
+        WHERE layer_id = %s{spatial_sql}
+        ORDER BY osm_id;
+        """
+    return sql, params
+
+
+def _storage_elements_from_db_rows(rows: list[tuple]) -> list[dict[str, Any]]:
+    elements: list[dict[str, Any]] = []
+    for osm_type, osm_id, tags_raw, geom_json, lat, lon, south, west, north, east in rows:
+        tags = tags_raw if isinstance(tags_raw, dict) else {}
+        if isinstance(tags_raw, str):
+            try:
+                tags = json.loads(tags_raw)
+            except json.JSONDecodeError:
+                tags = {}
+        geom = geom_json if isinstance(geom_json, dict) else json.loads(geom_json or "{}")
+        bounds = None
+        if all(value is not None for value in (south, west, north, east)):
+            bounds = {
+                "south": float(south),
+                "west": float(west),
+                "north": float(north),
+                "east": float(east),
+            }
+        element = _element_from_db_row(
+            str(osm_type),
+            int(osm_id),
+            tags,
+            geom,
+            lat=float(lat) if lat is not None else None,
+            lng=float(lon) if lon is not None else None,
+            bounds=bounds,
+        )
+        if element:
+            elements.append(element)
+    return elements
+
+
 def _load_storage_terminals_from_db(
     bbox: Optional[tuple[float, float, float, float]] = None,
 ) -> tuple[list[dict[str, Any]], Optional[str]]:
@@ -774,62 +728,40 @@ def _load_storage_terminals_from_db(
         if int(stats.get("feature_count") or 0) <= 0:
             return [], None
         fetched_at = stats.get("last_fetched_at")
-        spatial_sql = ""
-        params: tuple[Any, ...] = (STORAGE_TERMINALS_LAYER_ID,)
-        if bbox is not None:
-            south, west, north, east = bbox
-            spatial_sql = " AND ST_Intersects(geom, ST_MakeEnvelope(%s, %s, %s, %s, 4326))"
-            params = (STORAGE_TERMINALS_LAYER_ID, west, south, east, north)
+        sql, params = _storage_db_select(bbox)
         with conn.cursor() as cur:
-            cur.execute(
-                f"""
-                SELECT osm_type, osm_id, tags, ST_AsGeoJSON(geom)::json AS geom_json,
-                       ST_Y(ST_Centroid(geom)) AS lat,
-                       ST_X(ST_Centroid(geom)) AS lon,
-                       ST_YMin(geom) AS south,
-                       ST_XMin(geom) AS west,
-                       ST_YMax(geom) AS north,
-                       ST_XMax(geom) AS east
-                FROM petroleum_osm_features
-                WHERE layer_id = %s{spatial_sql}
-                ORDER BY osm_id;
-                """,
-                params,
-            )
+            cur.execute(sql, params)
             rows = cur.fetchall()
-        elements: list[dict[str, Any]] = []
-        for osm_type, osm_id, tags_raw, geom_json, lat, lon, south, west, north, east in rows:
-            tags = tags_raw if isinstance(tags_raw, dict) else {}
-            if isinstance(tags_raw, str):
-                try:
-                    tags = json.loads(tags_raw)
-                except json.JSONDecodeError:
-                    tags = {}
-            geom = geom_json if isinstance(geom_json, dict) else json.loads(geom_json or "{}")
-            bounds = None
-            if all(value is not None for value in (south, west, north, east)):
-                bounds = {
-                    "south": float(south),
-                    "west": float(west),
-                    "north": float(north),
-                    "east": float(east),
-                }
-            element = _element_from_db_row(
-                str(osm_type),
-                int(osm_id),
-                tags,
-                geom,
-                lat=float(lat) if lat is not None else None,
-                lng=float(lon) if lon is not None else None,
-                bounds=bounds,
-            )
-            if element:
-                elements.append(element)
-        return elements, fetched_at if isinstance(fetched_at, str) else None
+        return _storage_elements_from_db_rows(rows), fetched_at if isinstance(fetched_at, str) else None
     finally:
         conn.close()
 
 
+async def _load_storage_terminals_from_db_async(
+    bbox: Optional[tuple[float, float, float, float]] = None,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """Same rows as ``_load_storage_terminals_from_db`` awaited on the async pool.
+
+    Skips ``ensure_petroleum_osm_tables`` (DDL needs the sync pool); a missing table
+    surfaces as a psycopg2 error and the caller falls back to the sync path.
+    """
+    try:
+        from backend.services.async_db import get_async_pool
+        from backend.services.petroleum_osm_store import LAYER_FEATURE_STATS_SQL, layer_feature_stats_from_row
+    except ImportError:
+        from services.async_db import get_async_pool
+        from services.petroleum_osm_store import LAYER_FEATURE_STATS_SQL, layer_feature_stats_from_row
+
+    pool = get_async_pool()
+    stats = layer_feature_stats_from_row(await pool.fetchrow(LAYER_FEATURE_STATS_SQL, (STORAGE_TERMINALS_LAYER_ID,)))
+    if int(stats.get("feature_count") or 0) <= 0:
+        return [], None
+    fetched_at = stats.get("last_fetched_at")
+    sql, params = _storage_db_select(bbox)
+    rows = await pool.fetch(sql, params)
+    return _storage_elements_from_db_rows(rows), fetched_at if isinstance(fetched_at, str) else None
+
+
 def _should_load_bulk_seed(db_elements: list[dict[str, Any]], osm_entity_count: int) -> bool:
     if db_elements and osm_entity_count < MIN_NORMALIZED_ENTITIES_FOR_GLOBAL_LAYER:
         if len(db_elements) >= MIN_DB_FEATURES_FOR_GLOBAL_SNAPSHOT:
@@ -850,6 +782,7 @@ def _append_bulk_seed_entities(
         return data_source, 0
     existing_ids = {entity.get("id") for entity in all_entities}
     bulk_added = 0
+    _prime_country_cache(bulk_elements)
     for element in bulk_elements:
         normalized = normalize_storage_terminal(element, fetched_at)
         if normalized and normalized["id"] not in existing_ids:
@@ -874,6 +807,7 @@ def _load_db_snapshot_entities(
     fetched_at: str,
 ) -> list[dict[str, Any]]:
     entities: list[dict[str, Any]] = []
+    _prime_country_cache(db_elements)
     for element in db_elements:
         normalized = normalize_storage_terminal(element, fetched_at, trust_petroleum_layer=True)
         if normalized:
@@ -1072,15 +1006,14 @@ def _db_snapshot_is_globally_complete(elements: list[dict[str, Any]]) -> bool:
     """Reject tiny regional DB snapshots that would hide live global Overpass coverage."""
     if len(elements) < MIN_DB_FEATURES_FOR_GLOBAL_SNAPSHOT:
         return False
-    countries: set[str] = set()
+    points: list[tuple[float, float]] = []
     for element in elements:
         lat = _safe_float(element.get("lat"))
         lng = _safe_float(element.get("lon"))
         if lat is None or lng is None:
             continue
-        country, _ = resolve_country(lat, lng)
-        if country != "Unknown":
-            countries.add(country)
+        points.append((lat, lng))
+    countries = {country for country, _ in resolve_countries(points) if country != "Unknown"}
     return len(countries) >= MIN_DB_COUNTRIES_FOR_GLOBAL_SNAPSHOT
 
 
@@ -1117,14 +1050,10 @@ def normalize_storage_terminal(
     if not subtype:
         return None
 
-    lat = _safe_float(element.get("lat"))
-    lng = _safe_float(element.get("lon"))
-    if lat is None or lng is None:
-        center = element.get("center") or {}
-        lat = _safe_float(center.get("lat"))
-        lng = _safe_float(center.get("lon"))
-    if lat is None or lng is None:
+    point = _element_point(element)
+    if point is None:
         return None
+    lat, lng = point
 
     site_bounds = element.get("siteBounds") if isinstance(element.get("siteBounds"), dict) else None
     if site_bounds is None:
@@ -1376,18 +1305,125 @@ def _entity_in_bbox(entity: dict[str, Any], bbox: tuple[float, float, float, flo
     return south <= float(lat) <= north and west <= float(lng) <= east
 
 
+class StorageSpatialIndex:
+    """Uniform lat/lng grid over an entity list, built once per global cache load.
+
+    Cells hold list positions, so a viewport query touches only the cells it overlaps
+    and returns hits in the original entity order (same result as a linear scan).
+    """
+
+    def __init__(self, entities: list[dict[str, Any]], *, cell_deg: float = STORAGE_INDEX_CELL_DEG) -> None:
+        self.entities = entities
+        self.cell_deg = cell_deg
+        self._lats: list[float] = []
+        self._lngs: list[float] = []
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        for position, entity in enumerate(entities):
+            lat = _safe_float(entity.get("lat"))
+            lng = _safe_float(entity.get("lng"))
+            if lat is None or lng is None:
+                lat = lng = math.nan
+            self._lats.append(lat)
+            self._lngs.append(lng)
+            if math.isnan(lat) or math.isnan(lng):
+                continue
+            self._cells.setdefault(self._cell(lat, lng), []).append(position)
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    def _candidate_cells(self, bbox: tuple[float, float, float, float]) -> list[tuple[int, int]]:
+        south, west, north, east = bbox
+        row_lo, col_lo = self._cell(south, west)
+        row_hi, col_hi = self._cell(north, east)
+        span = (row_hi - row_lo + 1) * (col_hi - col_lo + 1)
+        if span > len(self._cells):
+            # Continental/world viewports: walk occupied cells instead of the empty grid.
+            return [
+                key
+                for key in self._cells
+                if row_lo <= key[0] <= row_hi and col_lo <= key[1] <= col_hi
+            ]
+        return [
+            (row, col)
+            for row in range(row_lo, row_hi + 1)
+            for col in range(col_lo, col_hi + 1)
+            if (row, col) in self._cells
+        ]
+
+    def _scan(self, bbox: tuple[float, float, float, float], limit: int) -> list[int]:
+        south, west, north, east = bbox
+        lats = self._lats
+        lngs = self._lngs
+        hits: list[int] = []
+        for position in range(len(lats)):
+            if south <= lats[position] <= north and west <= lngs[position] <= east:
+                hits.append(position)
+                if len(hits) >= limit:
+                    break
+        return hits
+
+    def query(
+        self, bbox: tuple[float, float, float, float], *, limit: Optional[int] = None
+    ) -> list[dict[str, Any]]:
+        """Entities inside ``bbox`` in list order, at most ``limit`` of them."""
+        south, west, north, east = bbox
+        lats = self._lats
+        lngs = self._lngs
+        cells = self._candidate_cells(bbox)
+        if limit is not None and sum(len(self._cells[key]) for key in cells) > 4 * limit:
+            # Dense viewport: an ordered scan reaches ``limit`` hits long before the end.
+            return [self.entities[position] for position in self._scan(bbox, limit)]
+        hits: list[int] = []
+        for row, col in cells:
+            positions = self._cells[(row, col)]
+            cell_south = row * self.cell_deg
+            cell_west = col * self.cell_deg
+            if (
+                south <= cell_south
+                and cell_south + self.cell_deg < north
+                and west <= cell_west
+                and cell_west + self.cell_deg < east
+            ):
+                hits.extend(positions)
+                continue
+            hits.extend(
+                position
+                for position in positions
+                if south <= lats[position] <= north and west <= lngs[position] <= east
+            )
+        hits.sort()
+        if limit is not None:
+            hits = hits[:limit]
+        entities = self.entities
+        return [entities[position] for position in hits]
+
+
+def _storage_index_for(entities: list[dict[str, Any]]) -> StorageSpatialIndex:
+    """Spatial index for the cached global entity list (rebuilt only when the list changes)."""
+    index = _storage_cache.get("index")
+    if index is None or index.entities is not entities:
+        index = StorageSpatialIndex(entities)
+        _storage_cache["index"] = index
+    return index
+
+
 def _apply_viewport_filter(
     entities: list[dict[str, Any]],
     *,
     bbox: Optional[tuple[float, float, float, float]],
     limit: Optional[int],
+    index: Optional[StorageSpatialIndex] = None,
 ) -> tuple[list[dict[str, Any]], bool]:
     if bbox is None:
         return entities, False
-    filtered = [entity for entity in entities if _entity_in_bbox(entity, bbox)]
-    coverage_gap = len(filtered) == 0
     cap = limit if limit is not None else STORAGE_VIEWPORT_DEFAULT_LIMIT
     cap = min(max(1, cap), STORAGE_VIEWPORT_MAX_LIMIT)
+    if index is not None and index.entities is entities:
+        filtered = index.query(bbox, limit=cap)
+    else:
+        filtered = [entity for entity in entities if _entity_in_bbox(entity, bbox)]
+    coverage_gap = len(filtered) == 0
     if len(filtered) > cap:
         filtered = filtered[:cap]
     return filtered, coverage_gap
@@ -1400,8 +1436,11 @@ def _package_storage_response(
     bbox: Optional[tuple[float, float, float, float]] = None,
     limit: Optional[int] = None,
     cached: bool = False,
+    index: Optional[StorageSpatialIndex] = None,
 ) -> dict[str, Any]:
-    viewport_entities, coverage_gap = _apply_viewport_filter(entities, bbox=bbox, limit=limit)
+    viewport_entities, coverage_gap = _apply_viewport_filter(
+        entities, bbox=bbox, limit=limit, index=index
+    )
     try:
         from backend.services.storage_terminal_display import overlay_materialized_on_entities
     except ImportError:
@@ -1588,10 +1627,17 @@ def _try_viewport_fast_storage_response(
     bbox: tuple[float, float, float, float],
     limit: Optional[int],
     t0: float,
+    db_result: Optional[tuple[list[dict[str, Any]], Optional[str]]] = None,
 ) -> Optional[dict[str, Any]]:
-    """Serve map viewport from bbox-limited Postgres rows instead of rebuilding ~80k global entities."""
+    """Serve map viewport from bbox-limited Postgres rows instead of rebuilding ~80k global entities.
+
+    ``db_result`` carries rows already loaded for the padded bbox (the async endpoint
+    awaits them off-thread); otherwise they are read here on the sync pool.
+    """
     load_bbox = _expand_storage_bbox(bbox)
-    db_elements, db_fetched_at = _load_storage_terminals_from_db(bbox=load_bbox)
+    if db_result is None:
+        db_result = _load_storage_terminals_from_db(bbox=load_bbox)
+    db_elements, db_fetched_at = db_result
     if not db_elements:
         _debug_log_storage(
             "E",
@@ -1624,6 +1670,7 @@ def _try_viewport_fast_storage_response(
     fetched_at = db_fetched_at or _now_iso()
     warnings: list[str] = []
     all_entities: list[dict[str, Any]] = []
+    _prime_country_cache(db_elements)
     for element in db_elements:
         normalized = normalize_storage_terminal(element, fetched_at, trust_petroleum_layer=True)
         if normalized:
@@ -1716,6 +1763,7 @@ def get_storage_terminals(
                 bbox=bbox,
                 limit=limit,
                 cached=True,
+                index=_storage_index_for(entities) if bbox is not None else None,
             )
 
     if bbox is not None and not force_refresh:
@@ -1741,6 +1789,7 @@ def get_storage_terminals(
                     bbox=bbox,
                     limit=limit,
                     cached=True,
+                    index=_storage_index_for(entities) if bbox is not None else None,
                 )
 
         return _build_global_storage_terminals_response(
@@ -1753,6 +1802,38 @@ def get_storage_terminals(
         )
 
 
+async def get_storage_terminals_async(
+    force_refresh: bool = False,
+    *,
+    bbox: Optional[tuple[float, float, float, float]] = None,
+    limit: Optional[int] = None,
+) -> Optional[dict[str, Any]]:
+    """Map-endpoint entry: viewport rows are awaited on the async pool, the rest runs on the map lane.
+
+    Only the cold viewport path (bbox, no fresh cache) reads Postgres asynchronously;
+    cache hits, global builds and any async DB failure go through
+    ``get_storage_terminals`` on the lane, so responses match the sync path exactly.
+    """
+    try:
+        from backend.services.async_db import async_db_enabled
+        from backend.services.request_lanes import run_in_lane
+    except ImportError:
+        from services.async_db import async_db_enabled
+        from services.request_lanes import run_in_lane
+
+    if bbox is None or force_refresh or not async_db_enabled() or _fresh_cache() is not None:
+        return await run_in_lane("map", get_storage_terminals, force_refresh, bbox=bbox, limit=limit)
+    t0 = time.perf_counter()
+    try:
+        db_result = await _load_storage_terminals_from_db_async(_expand_storage_bbox(bbox))
+    except (psycopg2.Error, OSError, asyncio.TimeoutError) as exc:
+        logger.warning("storage viewport async read failed, using the map lane: %s", exc)
+        return await run_in_lane("map", get_storage_terminals, force_refresh, bbox=bbox, limit=limit)
+    return await run_in_lane(
+        "map", _try_viewport_fast_storage_response, bbox=bbox, limit=limit, t0=t0, db_result=db_result
+    )
+
+
 def _build_global_storage_terminals_response(
     *,
     force_refresh: bool,
@@ -1790,6 +1871,7 @@ def _build_global_storage_terminals_response(
     if use_db_only:
         data_source = "database"
         fetched_at = db_fetched_at or fetched_at
+        _prime_country_cache(db_elements)
         for element in db_elements:
             normalized = normalize_storage_terminal(element, fetched_at, trust_petroleum_layer=True)
             if normalized:
@@ -1821,6 +1903,7 @@ def _build_global_storage_terminals_response(
                 tile_name = futures[future]
                 try:
                     elements = future.result()
+                    _prime_country_cache(elements)
                     for element in elements:
                         normalized = normalize_storage_terminal(element, fetched_at)
                         if normalized:
@@ -1926,6 +2009,7 @@ def _build_global_storage_terminals_response(
     if _should_cache_storage_response(entities, warnings):
         _storage_cache["loaded_at"] = time.time()
         _storage_cache["response"] = response
+        _storage_cache["index"] = StorageSpatialIndex(entities)
     elif force_refresh and previous_cache:
         warnings.append(
             "Live refresh failed; serving previous in-memory storage snapshot without overwriting cache."
@@ -1955,7 +2039,8 @@ def _build_global_storage_terminals_response(
             "viewport_fast": False,
         },
     )
-    return _package_storage_response(response, entities, bbox=bbox, limit=limit)
+    index = _storage_cache.get("index") if bbox is not None else None
+    return _package_storage_response(response, entities, bbox=bbox, limit=limit, index=index)
 
 
 def _should_cache_storage_response(entities: list[dict[str, Any]], warnings: list[str]) -> bool:
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import json
-import os
 from typing import Any, Optional
 
 SOURCE_KIND = "oil_terminal_reference"
@@ -11,19 +10,12 @@ EXTERNAL_ID_PREFIX = "oil_terminal:"
 
 
 def _db_connect():
-    import psycopg2
-
-    database_url = os.getenv("DATABASE_URL", "").strip()
-    if database_url:
-        return psycopg2.connect(database_url, connect_timeout=5)
-    return psycopg2.connect(
-        host=os.getenv("DB_HOST", "localhost"),
-        port=int(os.getenv("DB_PORT", "5432")),
-        database=os.getenv("DB_NAME", "mining_db"),
-        user=os.getenv("DB_USER", "postgres"),
-        password=os.getenv("DB_PASSWORD", "password"),
-        connect_timeout=5,
-    )
+    try:
+        from backend.services.db_pool import get_pooled_connection
+    except ImportError:
+        from services.db_pool import get_pooled_connection
+
+    return get_pooled_connection()
 
 
 def _table_exists(cur: Any, table_name: str) -> bool:
@@ -10,7 +10,13 @@ import urllib.request
 from email.message import EmailMessage
 from typing import Any, Optional
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
 
+
+@schema_ready("sync_alerts")
 def ensure_sync_alert_tables(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
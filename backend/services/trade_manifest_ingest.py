@@ -9,6 +9,11 @@ import urllib.request
 from pathlib import Path
 from typing import Any
 
+try:
+    from backend.services.schema_registry import schema_ready
+except ImportError:
+    from services.schema_registry import schema_ready  # type: ignore[no-redef]
+
 UK_SYNC_ENABLED = (os.getenv("UK_TRADE_MANIFEST_SYNC_ENABLED") or "true").strip().lower() not in {
     "0",
     "false",
@@ -59,6 +64,7 @@ BRAZIL_MANIFEST_RECOMMENDED = frozenset(
 )
 
 
+@schema_ready("trade_manifests")
 def ensure_trade_manifest_table(conn: Any) -> None:
     with conn.cursor() as cur:
         cur.execute(
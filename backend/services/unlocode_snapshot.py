@@ -0,0 +1,244 @@
+"""Versioned on-disk UN/LOCODE port snapshot with a compact columnar in-memory form.
+
+The parsed port list used to live as ~100k Python dicts rebuilt from a network CSV
+download on every cold start and TTL expiry. The snapshot stores it as:
+
+* ``unlocode_ports.npy`` — one fixed-width record per port (lat, lng, country, location,
+  role code, text offsets), memory-mapped read-only at load;
+* ``unlocode_ports.text.npy`` — a UTF-8 byte blob holding the free-text columns (name,
+  ascii name, subdivision, status, function, remarks), also memory-mapped;
+* ``unlocode_ports.json`` — sidecar with the format number, dataset version (CSV
+  digest), source URLs, build time and sizes used to reject torn or foreign files.
+
+``UnlocodePortTable`` exposes the numeric columns as NumPy arrays and materializes the
+old row dict only for the rows a caller actually returns. Build offline with
+``python -m backend.scripts.build_unlocode_snapshot``; maritime_intel refreshes it in the
+background when it ages out.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+import numpy as np
+
+try:
+    from backend.services.spherical_index import SphericalIndex
+except ImportError:
+    from services.spherical_index import SphericalIndex  # type: ignore[no-redef]
+
+UNLOCODE_SNAPSHOT_PATH = Path(
+    os.getenv("UNLOCODE_SNAPSHOT_PATH") or Path(__file__).resolve().parent.parent / "data" / "unlocode_ports.npy"
+)
+SNAPSHOT_FORMAT = 1
+
+PORT_DTYPE = np.dtype(
+    [
+        ("lat", "<f8"),
+        ("lng", "<f8"),
+        ("country", "S2"),
+        ("location", "S3"),
+        ("role", "u1"),
+        ("text_start", "<u4"),
+        ("text_end", "<u4"),
+    ]
+)
+PORT_ROLES = ("port", "energy_port")
+TEXT_FIELDS = ("name", "name_ascii", "subdivision", "status", "function", "remarks")
+_TEXT_SEP = "\x1f"
+# Optional text columns are stored as "" and surfaced as None, like the CSV parser did.
+_OPTIONAL_TEXT = frozenset({"subdivision", "status", "remarks"})
+
+SOURCE_LABEL = "UN/LOCODE"
+
+
+def _text_path(path: Path) -> Path:
+    return path.with_name(path.stem + ".text.npy")
+
+
+def _columns_from_rows(rows: Sequence[dict[str, Any]]) -> tuple[np.ndarray, np.ndarray]:
+    records = np.zeros(len(rows), dtype=PORT_DTYPE)
+    chunks: list[bytes] = []
+    offset = 0
+    for pos, row in enumerate(rows):
+        unlocode = str(row["unlocode"])
+        country = str(row["country_iso2"])
+        text = _TEXT_SEP.join(
+            str(row.get(field) or "").replace(_TEXT_SEP, " ") for field in TEXT_FIELDS
+        ).encode("utf-8")
+        records[pos] = (
+            float(row["lat"]),
+            float(row["lng"]),
+            country.encode("ascii"),
+            unlocode[len(country):].encode("ascii"),
+            PORT_ROLES.index(row.get("role") or "port"),
+            offset,
+            offset + len(text),
+        )
+        chunks.append(text)
+        offset += len(text)
+    return records, np.frombuffer(b"".join(chunks), dtype=np.uint8)
+
+
+class UnlocodePortTable(Sequence[dict[str, Any]]):
+    """Read-only columnar port list; indexing returns a fresh row dict."""
+
+    def __init__(
+        self,
+        records: np.ndarray,
+        text: np.ndarray,
+        *,
+        version: str = "",
+        source_url: str = "",
+        built_at: str = "",
+    ) -> None:
+        self.records = records
+        self.text = text
+        self.version = version
+        self.source_url = source_url
+        self.built_at = built_at
+        self.lat = records["lat"]
+        self.lng = records["lng"]
+        self.role_codes = records["role"]
+        self.countries = records["country"]
+        self._index: Optional[SphericalIndex] = None
+        self._index_lock = threading.Lock()
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[dict[str, Any]], **meta: str) -> "UnlocodePortTable":
+        records, text = _columns_from_rows(rows)
+        return cls(records, text, **meta)
+
+    def __len__(self) -> int:
+        return int(self.records.shape[0])
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for pos in range(len(self)):
+            yield self.row(pos)
+
+    def __getitem__(self, pos):  # type: ignore[override]
+        if isinstance(pos, slice):
+            return [self.row(idx) for idx in range(*pos.indices(len(self)))]
+        return self.row(pos)
+
+    def text_fields(self, pos: int) -> list[str]:
+        record = self.records[pos]
+        raw = self.text[int(record["text_start"]):int(record["text_end"])].tobytes()
+        return raw.decode("utf-8").split(_TEXT_SEP)
+
+    def name(self, pos: int) -> str:
+        return self.text_fields(pos)[0]
+
+    def country(self, pos: int) -> str:
+        return self.countries[pos].decode("ascii")
+
+    def role(self, pos: int) -> str:
+        return PORT_ROLES[int(self.role_codes[pos])]
+
+    def unlocode(self, pos: int) -> str:
+        record = self.records[pos]
+        return (record["country"] + record["location"]).decode("ascii")
+
+    def positions(self, country_iso2: str = "") -> np.ndarray:
+        """Row positions, optionally restricted to one ISO2 country."""
+        if not country_iso2:
+            return np.arange(len(self), dtype=np.intp)
+        return np.flatnonzero(self.countries == country_iso2.encode("ascii", "ignore"))
+
+    def row(self, pos: int) -> dict[str, Any]:
+        pos = int(pos)
+        record = self.records[pos]
+        row: dict[str, Any] = {"unlocode": self.unlocode(pos), "country_iso2": self.country(pos)}
+        for field, value in zip(TEXT_FIELDS, self.text_fields(pos)):
+            row[field] = (value or None) if field in _OPTIONAL_TEXT else value
+        row["name_ascii"] = row["name_ascii"] or row["name"]
+        row.update(
+            {
+                "lat": float(record["lat"]),
+                "lng": float(record["lng"]),
+                "role": PORT_ROLES[int(record["role"])],
+                "source_label": SOURCE_LABEL,
+                "source_url": self.source_url,
+            }
+        )
+        return row
+
+    def spatial_index(self) -> SphericalIndex:
+        """Nearest-neighbour index over all ports, grouped by ISO2 country (built once)."""
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    groups = [code.decode("ascii") for code in self.countries.tolist()]
+                    self._index = SphericalIndex(self.lat, self.lng, groups=groups)
+        return self._index
+
+    def age_seconds(self, now: Optional[float] = None) -> float:
+        try:
+            built = datetime.fromisoformat(self.built_at).timestamp()
+        except (TypeError, ValueError):
+            return float("inf")
+        return max(0.0, (time.time() if now is None else now) - built)
+
+
+def write_unlocode_snapshot(
+    rows: Sequence[dict[str, Any]],
+    path: Path = UNLOCODE_SNAPSHOT_PATH,
+    *,
+    version: str,
+    source_url: str,
+    download_url: str = "",
+) -> Path:
+    """Write the three snapshot files; each is replaced atomically, sidecar last."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    records, text = _columns_from_rows(rows)
+    sidecar = {
+        "format": SNAPSHOT_FORMAT,
+        "version": version,
+        "source_url": source_url,
+        "download_url": download_url,
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "rows": int(records.shape[0]),
+        "text_bytes": int(text.shape[0]),
+    }
+    suffix = f".tmp{os.getpid()}-{threading.get_ident()}"
+    for target, array in ((path, records), (_text_path(path), text)):
+        tmp = target.with_name(target.name + suffix)
+        with open(tmp, "wb") as handle:
+            np.save(handle, array, allow_pickle=False)
+        os.replace(tmp, target)
+    sidecar_path = path.with_suffix(".json")
+    tmp = sidecar_path.with_name(sidecar_path.name + suffix)
+    tmp.write_text(json.dumps(sidecar, indent=1) + "\n", encoding="utf-8")
+    os.replace(tmp, sidecar_path)
+    return path
+
+
+def load_unlocode_snapshot(path: Path = UNLOCODE_SNAPSHOT_PATH) -> Optional[UnlocodePortTable]:
+    """Memory-map the snapshot; ``None`` when missing, from another format, or torn."""
+    path = Path(path)
+    try:
+        sidecar = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        if sidecar.get("format") != SNAPSHOT_FORMAT:
+            return None
+        records = np.load(path, mmap_mode="r", allow_pickle=False)
+        text = np.load(_text_path(path), mmap_mode="r", allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+    if records.dtype != PORT_DTYPE or text.dtype != np.uint8:
+        return None
+    if records.shape != (sidecar.get("rows"),) or text.shape != (sidecar.get("text_bytes"),):
+        return None
+    return UnlocodePortTable(
+        records,
+        text,
+        version=str(sidecar.get("version") or ""),
+        source_url=str(sidecar.get("source_url") or ""),
+        built_at=str(sidecar.get("built_at") or ""),
+    )
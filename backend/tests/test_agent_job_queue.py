@@ -0,0 +1,347 @@
+"""Agent job queue: SKIP LOCKED claims, retry/lease handling, worker dispatch and completion waits."""
+
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from backend.services import agent_intelligence, agent_job_queue
+from backend.services.agent_job_queue import (
+    AgentJobEvents,
+    AgentJobLeaseKeeper,
+    AgentJobWorkerPool,
+    agent_job_concurrency,
+    claim_agent_job,
+    claim_agent_job_by_id,
+    execute_claimed_agent_job,
+    renew_agent_job_lease,
+    retry_or_fail_agent_job,
+    wait_for_agent_job,
+)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append((" ".join(sql.split()), params))
+        self.rowcount = self.conn.rowcount
+
+    def fetchone(self):
+        return self.conn.rows.pop(0) if self.conn.rows else None
+
+    def fetchall(self):
+        rows, self.conn.rows = self.conn.rows, []
+        return rows
+
+
+class FakeConn:
+    def __init__(self, rows=None):
+        self.rows = list(rows or [])
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+        self.rowcount = 1
+
+    def cursor(self, **_kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+    def sql(self, needle):
+        return [(sql, params) for sql, params in self.statements if needle in sql]
+
+
+def _job(**overrides):
+    job = {
+        "job_id": "job-1",
+        "agent_type": "contact_enrichment",
+        "status": "running",
+        "entity_id": "lic-1",
+        "input_json": {"entity_id": "lic-1", "entity_kind": "license"},
+        "attempts": 1,
+        "max_attempts": 3,
+        "force_refresh": False,
+    }
+    job.update(overrides)
+    return job
+
+
+class ClaimAndRetryTests(unittest.TestCase):
+    def test_claim_skips_locked_rows_sets_lease_and_notifies(self):
+        conn = FakeConn([_job()])
+        job = claim_agent_job(conn, "contact_enrichment", "host:1:contact_enrichment:0", lease_sec=120)
+        self.assertEqual(job["job_id"], "job-1")
+        claim_sql, params = conn.statements[0]
+        self.assertIn("FOR UPDATE SKIP LOCKED", claim_sql)
+        self.assertIn("status = 'queued'", claim_sql)
+        self.assertEqual(params, ("host:1:contact_enrichment:0", 120, "contact_enrichment"))
+        self.assertEqual(conn.sql("pg_notify")[0][1], (agent_intelligence.AGENT_JOB_EVENTS_CHANNEL, "job-1"))
+        self.assertEqual(conn.commits, 1)
+
+    def test_idle_claim_returns_none_without_notify(self):
+        conn = FakeConn()
+        self.assertIsNone(claim_agent_job(conn, "route_intelligence", "w"))
+        self.assertEqual(conn.sql("pg_notify"), [])
+
+    def test_retry_backs_off_until_attempts_are_spent(self):
+        conn = FakeConn()
+        with patch.object(agent_job_queue, "AGENT_JOB_RETRY_BASE_SEC", 10.0):
+            self.assertEqual(retry_or_fail_agent_job(conn, _job(attempts=2), "timeout"), "queued")
+            self.assertEqual(retry_or_fail_agent_job(conn, _job(attempts=3), "timeout"), "failed")
+        updates = conn.sql("UPDATE agent_jobs")
+        self.assertEqual(updates[0][1], ("queued", "timeout", 20.0, "job-1"))
+        self.assertEqual(updates[1][1][0], "failed")
+        # Requeue wakes workers for the type; a final failure does not.
+        queued_notifies = [p for _, p in conn.sql("pg_notify") if p[0] == agent_intelligence.AGENT_JOBS_QUEUED_CHANNEL]
+        self.assertEqual(queued_notifies, [(agent_intelligence.AGENT_JOBS_QUEUED_CHANNEL, "contact_enrichment")])
+
+    def test_retry_only_lands_while_the_worker_holds_the_lease(self):
+        conn = FakeConn()
+        self.assertEqual(retry_or_fail_agent_job(conn, _job(), "timeout", worker_id="w0"), "queued")
+        update_sql, params = conn.sql("UPDATE agent_jobs")[0]
+        self.assertIn("WHERE job_id = %s AND lease_owner = %s", update_sql)
+        self.assertEqual(params[-2:], ("job-1", "w0"))
+
+        conn = FakeConn()
+        conn.rowcount = 0
+        self.assertEqual(retry_or_fail_agent_job(conn, _job(), "timeout", worker_id="w0"), "lease_lost")
+        self.assertEqual(conn.sql("pg_notify"), [])
+
+    def test_renew_extends_only_our_running_lease(self):
+        conn = FakeConn()
+        self.assertTrue(renew_agent_job_lease(conn, "job-1", "w0", lease_sec=90))
+        renew_sql, params = conn.statements[0]
+        self.assertIn("status = 'running' AND lease_owner = %s", renew_sql)
+        self.assertEqual(params, (90, "job-1", "w0"))
+        conn.rowcount = 0
+        self.assertFalse(renew_agent_job_lease(conn, "job-1", "w0"))
+
+    def test_claim_by_id_takes_lease_only_while_queued(self):
+        conn = FakeConn([_job()])
+        job = claim_agent_job_by_id(conn, "job-1", "inline:1", lease_sec=60)
+        self.assertEqual(job["job_id"], "job-1")
+        claim_sql, params = conn.statements[0]
+        self.assertIn("WHERE job_id = %s AND status = 'queued' FOR UPDATE SKIP LOCKED", claim_sql)
+        self.assertEqual(params, ("inline:1", 60, "job-1"))
+        # Already claimed by a worker (or finished): nothing to run inline.
+        self.assertIsNone(claim_agent_job_by_id(FakeConn(), "job-1", "inline:1"))
+
+    def test_embedded_workers_default_on_without_dedicated_worker(self):
+        with patch.dict("os.environ", {}, clear=False) as env:
+            env.pop("AGENT_JOB_EMBEDDED_WORKERS", None)
+            self.assertTrue(agent_job_queue.agent_job_embedded_workers())
+            env["AGENT_JOB_EMBEDDED_WORKERS"] = "false"
+            self.assertFalse(agent_job_queue.agent_job_embedded_workers())
+
+    def test_concurrency_parsing(self):
+        concurrency = agent_job_concurrency("contact_enrichment=6, route_intelligence=0,bogus=3,data_validation=x")
+        self.assertEqual(concurrency["contact_enrichment"], 6)
+        self.assertEqual(concurrency["route_intelligence"], 0)
+        self.assertEqual(concurrency["data_validation"], agent_job_queue.DEFAULT_AGENT_CONCURRENCY)
+        self.assertNotIn("bogus", concurrency)
+
+
+class ExecuteClaimedJobTests(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(agent_job_queue, "update_deal_rooms_for_job")
+        self.update_rooms = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_completed_run_updates_deal_rooms(self):
+        done = {"job_id": "job-1", "status": "completed", "output": {"contacts": []}}
+        with patch.object(agent_job_queue, "run_agent_job", return_value=done) as run:
+            result = execute_claimed_agent_job(FakeConn(), _job())
+        self.assertEqual(result, done)
+        self.assertEqual(run.call_args.args[1]["input"], {"entity_id": "lic-1", "entity_kind": "license"})
+        self.update_rooms.assert_called_once()
+
+    def test_producer_error_is_retried_not_failed(self):
+        conn = FakeConn()
+        with patch.object(agent_job_queue, "run_agent_job", side_effect=RuntimeError("AI deadline")), patch.object(
+            agent_intelligence, "get_agent_job", return_value={"job_id": "job-1", "status": "queued"}
+        ):
+            result = execute_claimed_agent_job(conn, _job())
+        self.assertEqual(result["status"], "queued")
+        self.assertEqual(conn.rollbacks, 1)
+        self.assertEqual(conn.sql("UPDATE agent_jobs")[0][1][:2], ("queued", "AI deadline"))
+        self.update_rooms.assert_not_called()
+
+    def test_rehashed_run_answers_the_claimed_job(self):
+        other = {"job_id": "job-2", "status": "completed", "output": {"score": 90}}
+        with patch.object(agent_job_queue, "run_agent_job", return_value=other), patch.object(
+            agent_intelligence, "_complete_job", return_value={"job_id": "job-1", "status": "completed"}
+        ) as complete:
+            result = execute_claimed_agent_job(FakeConn(), _job())
+        complete.assert_called_once()
+        self.assertEqual(complete.call_args.args[1:], ("job-1", {"score": 90}))
+        self.assertEqual(result["job_id"], "job-1")
+
+    def test_completion_is_conditional_on_the_claimed_lease(self):
+        conn = FakeConn([{"job_id": "job-1", "status": "completed"}])
+        job_token = agent_intelligence.claimed_agent_job_id.set("job-1")
+        owner_token = agent_intelligence.claimed_agent_job_owner.set("w0")
+        try:
+            agent_intelligence._complete_job(conn, "job-1", {"ok": True})
+        finally:
+            agent_intelligence.claimed_agent_job_owner.reset(owner_token)
+            agent_intelligence.claimed_agent_job_id.reset(job_token)
+        update_sql, params = conn.sql("UPDATE agent_jobs")[0]
+        self.assertIn("WHERE job_id = %s AND lease_owner = %s", update_sql)
+        self.assertEqual(params[1:], ("job-1", "w0"))
+
+        # Inline runs (no claimed owner) finish unconditionally.
+        conn = FakeConn([{"job_id": "job-1", "status": "completed"}])
+        agent_intelligence._complete_job(conn, "job-1", {"ok": True})
+        self.assertNotIn("lease_owner = %s", conn.sql("UPDATE agent_jobs")[0][0])
+
+    def test_claimed_job_producer_errors_propagate_only_for_that_job(self):
+        def boom(_hash):
+            raise RuntimeError("provider down")
+
+        patches = [
+            patch.object(agent_intelligence, "ensure_agent_jobs_table"),
+            patch.object(agent_intelligence, "_cached_completed_job", return_value=None),
+            patch.object(agent_intelligence, "_insert_job", return_value="job-1"),
+            patch.object(agent_intelligence, "_mark_job_running"),
+            patch.object(agent_intelligence, "_fail_job", return_value={"status": "failed"}),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        kwargs = {"agent_type": "data_validation", "input_json": {"x": 1}, "producer": boom}
+        self.assertEqual(agent_intelligence._run_cached_agent(FakeConn(), **kwargs)["status"], "failed")
+        token = agent_intelligence.claimed_agent_job_id.set("job-1")
+        try:
+            with self.assertRaises(RuntimeError):
+                agent_intelligence._run_cached_agent(FakeConn(), **kwargs)
+        finally:
+            agent_intelligence.claimed_agent_job_id.reset(token)
+
+
+class WorkerPoolTests(unittest.TestCase):
+    def test_run_one_claims_executes_and_returns_connection(self):
+        conns = []
+
+        def connect():
+            conns.append(FakeConn([_job()]))
+            return conns[-1]
+
+        pool = AgentJobWorkerPool({"contact_enrichment": 1}, connect=connect, listen=None)
+        with patch.object(
+            agent_job_queue, "execute_claimed_agent_job", return_value={"job_id": "job-1", "status": "completed"}
+        ), patch.object(agent_job_queue, "ensure_agent_jobs_table"):
+            self.assertEqual(pool.run_one("contact_enrichment", "w0")["status"], "completed")
+        self.assertTrue(conns[0].closed)
+        self.assertEqual((pool.stats["claimed"], pool.stats["completed"]), (1, 1))
+
+    def test_lease_keeper_renews_until_the_job_finishes(self):
+        conns = []
+
+        def connect():
+            conns.append(FakeConn())
+            return conns[-1]
+
+        keeper = AgentJobLeaseKeeper(connect, "job-1", "w0", lease_sec=30)
+        keeper.interval = 0.01
+        with keeper:
+            deadline = time.monotonic() + 2
+            while len(conns) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        renewals = len(conns)
+        time.sleep(0.05)
+        self.assertGreaterEqual(renewals, 2)
+        self.assertEqual(len(conns), renewals)
+        self.assertTrue(all(conn.closed for conn in conns))
+        self.assertEqual(conns[0].statements[0][1], (30, "job-1", "w0"))
+
+    def test_disabled_types_get_no_workers(self):
+        pool = AgentJobWorkerPool({"contact_enrichment": 2, "route_intelligence": 0}, listen=None)
+        self.assertEqual(pool.concurrency, {"contact_enrichment": 2})
+
+
+class FakeEvents(AgentJobEvents):
+    def __init__(self, listening=True):
+        super().__init__(connect=lambda: None)
+        self._listening = listening
+
+    async def ensure_listening(self):
+        return self._listening
+
+    @property
+    def listening(self):
+        return self._listening
+
+
+class WaitForJobTests(unittest.TestCase):
+    def test_notification_wakes_long_poll(self):
+        states = iter(["queued", "running", "completed"])
+        reads = []
+
+        async def scenario():
+            events = FakeEvents()
+
+            async def read(job_id):
+                reads.append(job_id)
+                return {"job_id": job_id, "status": next(states)}
+
+            async def notify_later():
+                for _ in range(2):
+                    await asyncio.sleep(0.01)
+                    events.dispatch("job-1")
+
+            notifier = asyncio.ensure_future(notify_later())
+            job = await wait_for_agent_job("job-1", read, timeout=5, events=events)
+            await notifier
+            return job, events
+
+        job, events = asyncio.run(scenario())
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(len(reads), 3)
+        self.assertEqual(events._waiters, {})
+
+    def test_timeout_returns_latest_state_and_missing_job_is_none(self):
+        async def scenario():
+            events = FakeEvents()
+
+            async def read(job_id):
+                return None if job_id == "gone" else {"job_id": job_id, "status": "queued"}
+
+            pending = await wait_for_agent_job("job-1", read, timeout=0.05, events=events)
+            missing = await wait_for_agent_job("gone", read, timeout=0.05, events=events)
+            return pending, missing
+
+        pending, missing = asyncio.run(scenario())
+        self.assertEqual(pending["status"], "queued")
+        self.assertIsNone(missing)
+
+    def test_polls_when_listen_is_unavailable(self):
+        states = iter(["queued", "completed"])
+
+        async def scenario():
+            async def read(job_id):
+                return {"job_id": job_id, "status": next(states)}
+
+            with patch.object(agent_job_queue, "AGENT_JOB_POLL_FALLBACK_SEC", 0.01):
+                return await wait_for_agent_job("job-1", read, timeout=5, events=FakeEvents(listening=False))
+
+        self.assertEqual(asyncio.run(scenario())["status"], "completed")
+
+
+if __name__ == "__main__":
+    unittest.main()
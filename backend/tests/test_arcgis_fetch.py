@@ -0,0 +1,202 @@
+"""Concurrent ArcGIS fetcher against a local stub FeatureServer serving fixture pages."""
+
+import functools
+import json
+import threading
+import unittest
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from backend.services.ingest.arcgis_fetch import ArcGISFetcher, HostBudget, HostBudgets, fetch_json
+
+
+@dataclass
+class _Source:
+    source_id: str
+    layer_url: str
+    where: str = "1=1"
+    order_by: Optional[str] = None
+    max_records: Optional[int] = None
+    page_size: int = 10
+    request_pause_seconds: float = 0.0
+    supports_result_offset: bool = True
+
+
+class _StubArcGIS:
+    """Layers: ``/<name>/query`` with ``total`` features, capped at ``max_record_count`` per page."""
+
+    def __init__(self):
+        self.layers = {
+            "mines": {"total": 23, "max_record_count": 5, "count": True},
+            "wells": {"total": 7, "max_record_count": 100, "count": False},
+            "broken": {"status": 400},
+        }
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                layer = stub.layers.get(parts.path.strip("/").split("/")[0])
+                query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+                with stub.lock:
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    stub.requests.append((parts.path, query))
+                try:
+                    threading.Event().wait(0.02)
+                    status, body = stub.respond(layer, query)
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def respond(self, layer, query):
+        if layer is None:
+            return 404, {"error": {"code": 404}}
+        if "status" in layer:
+            return layer["status"], {"error": {"code": layer["status"]}}
+        if query.get("returnCountOnly") == "true":
+            if not layer["count"]:
+                return 200, {"error": {"code": 400, "message": "count not supported"}}
+            return 200, {"count": layer["total"]}
+        offset = int(query.get("resultOffset", 0))
+        want = int(query.get("resultRecordCount", layer["total"]))
+        end = min(layer["total"], offset + min(want, layer["max_record_count"]))
+        features = [{"attributes": {"OBJECTID": idx}} for idx in range(offset, end)]
+        return 200, {"features": features, "exceededTransferLimit": end < layer["total"]}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class ArcGISFetcherTests(unittest.TestCase):
+    def setUp(self):
+        self.stub = _StubArcGIS()
+        self.addCleanup(self.stub.close)
+
+    def _source(self, name, **kwargs):
+        return _Source(source_id=name, layer_url=f"{self.stub.base_url}/{name}", **kwargs)
+
+    def _fetcher(self, **kwargs):
+        options = {"max_workers": 4, "budgets": HostBudgets(concurrency=2, rps=0)}
+        options.update(kwargs)
+        fetcher = ArcGISFetcher(**options)
+        self.addCleanup(fetcher.close)
+        return fetcher
+
+    def _ids(self, features):
+        return [feature["attributes"]["OBJECTID"] for feature in features]
+
+    def test_parallel_pages_keep_offset_order_and_fill_server_caps(self):
+        fetcher = self._fetcher()
+        features = list(fetcher.iter_features(self._source("mines")))
+        self.assertEqual(self._ids(features), list(range(23)))
+        offsets = sorted(int(q["resultOffset"]) for _, q in self.stub.requests if "resultOffset" in q)
+        # 10-row pages at 0/10/20, each re-paged in 5-row server chunks.
+        self.assertEqual(offsets, [0, 5, 10, 15, 20])
+
+    def test_host_concurrency_budget_is_enforced(self):
+        fetcher = self._fetcher(budgets=HostBudgets(concurrency=1, rps=0))
+        list(fetcher.iter_features(self._source("mines", page_size=5)))
+        self.assertEqual(self.stub.max_in_flight, 1)
+
+    def test_max_records_caps_total(self):
+        fetcher = self._fetcher()
+        features = list(fetcher.iter_features(self._source("mines", max_records=12)))
+        self.assertEqual(self._ids(features), list(range(12)))
+
+    def test_falls_back_to_sequential_paging_without_count(self):
+        fetcher = self._fetcher()
+        features = list(fetcher.iter_features(self._source("wells", page_size=3)))
+        self.assertEqual(self._ids(features), list(range(7)))
+
+    def test_single_request_for_sources_without_offset_support(self):
+        fetcher = self._fetcher()
+        features = list(fetcher.iter_features(self._source("wells", supports_result_offset=False)))
+        self.assertEqual(len(features), 7)
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_stream_sources_in_order_and_isolates_failures(self):
+        fetcher = self._fetcher(
+            max_sources=2,
+            page_window=1,
+            fetch=functools.partial(fetch_json, retries=2, backoff_seconds=0.01),
+        )
+        sources = [self._source("mines"), self._source("broken"), self._source("wells")]
+        seen = {}
+        for source, features in fetcher.stream_sources(sources):
+            try:
+                seen[source.source_id] = len(list(features))
+            except RuntimeError as exc:
+                seen[source.source_id] = str(exc)
+            finally:
+                features.close()
+        self.assertEqual(list(seen), ["mines", "broken", "wells"])
+        self.assertEqual(seen["mines"], 23)
+        self.assertIn("HTTP Error 400", seen["broken"])
+        self.assertEqual(seen["wells"], 7)
+
+    def test_abandoned_stream_releases_worker_for_later_sources(self):
+        fetcher = self._fetcher(max_sources=1, page_window=1)
+        sources = [self._source("mines", page_size=5), self._source("wells")]
+        results = []
+        for source, features in fetcher.stream_sources(sources):
+            results.append(next(iter(features))["attributes"]["OBJECTID"])
+            features.close()
+        self.assertEqual(results, [0, 0])
+
+    def test_closing_unstarted_stream_releases_worker(self):
+        fetcher = self._fetcher(max_sources=1, page_window=1)
+        sources = [self._source("mines", page_size=5), self._source("wells")]
+        results = {}
+        for source, features in fetcher.stream_sources(sources):
+            if source.source_id == "mines":
+                features.close()
+                continue
+            results[source.source_id] = len(list(features))
+        self.assertEqual(results, {"wells": 7})
+        with self.assertRaises(StopIteration):
+            next(features)
+
+
+class HostBudgetTests(unittest.TestCase):
+    def test_reserve_spaces_requests_by_rps_and_pause(self):
+        now = [100.0]
+        budget = HostBudget(concurrency=2, rps=4.0, clock=lambda: now[0])
+        self.assertEqual(budget.reserve(), 0.0)
+        self.assertAlmostEqual(budget.reserve(), 0.25)
+        budget.min_interval = 1.0
+        self.assertAlmostEqual(budget.reserve(), 0.5)
+        self.assertAlmostEqual(budget.reserve(), 1.5)
+
+    def test_budgets_are_shared_per_host(self):
+        budgets = HostBudgets(concurrency=3, rps=1.0)
+        first = budgets.for_url("https://gis.example.org/a/query?x=1")
+        second = budgets.for_url("https://GIS.example.org/b/query", min_interval=2.0)
+        self.assertIs(first, second)
+        self.assertEqual(first.min_interval, 2.0)
+        self.assertIsNot(first, budgets.for_url("https://other.example.org/query"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""Async DB pool over fake connections, plus the storage-terminal viewport fallback."""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import psycopg2
+
+from backend.services import storage_terminal_display, storage_terminals
+from backend.services.async_db import AsyncConnectionPool, AsyncPoolTimeout
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params))
+        self.description = [("name",), ("n",)]
+        self._rows = [("Tema", 1), ("Fujairah", 2)]
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+
+class FakeConn:
+    def __init__(self):
+        self.closed = 0
+        self.cancelled = False
+        self.hang = False
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def close(self):
+        self.closed = 1
+
+
+async def fake_wait(conn):
+    if conn.hang:
+        await asyncio.sleep(60)
+
+
+class AsyncConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.conns = []
+
+    def _pool(self, **kwargs):
+        def connect():
+            conn = FakeConn()
+            self.conns.append(conn)
+            return conn
+
+        return AsyncConnectionPool(connect, wait=fake_wait, **kwargs)
+
+    def test_connections_are_reused_and_rows_shaped(self):
+        async def scenario():
+            pool = self._pool(max_size=2)
+            rows = await pool.fetch("SELECT", (1,))
+            row = await pool.fetchrow("SELECT")
+            dicts = await pool.fetch_dicts("SELECT")
+            return pool, rows, row, dicts
+
+        pool, rows, row, dicts = asyncio.run(scenario())
+        self.assertEqual(rows, [("Tema", 1), ("Fujairah", 2)])
+        self.assertEqual(row, ("Tema", 1))
+        self.assertEqual(dicts[1], {"name": "Fujairah", "n": 2})
+        self.assertEqual(len(self.conns), 1)
+        self.assertEqual(self.conns[0].executed[0][1], (1,))
+        self.assertEqual((pool.stats()["queries"], pool.stats()["idle"], pool.stats()["in_use"]), (3, 1, 0))
+
+    def test_acquire_times_out_when_pool_is_exhausted(self):
+        async def scenario():
+            pool = self._pool(max_size=1, acquire_timeout=0.05)
+            held = await pool.acquire()
+            with self.assertRaises(AsyncPoolTimeout):
+                await pool.fetch("SELECT")
+            pool.release(held)
+            await pool.fetch("SELECT")
+            return pool
+
+        pool = asyncio.run(scenario())
+        self.assertEqual(pool.stats()["timeouts"], 1)
+
+    def test_query_timeout_cancels_and_discards_connection(self):
+        async def scenario():
+            pool = self._pool(max_size=1, query_timeout=0.05)
+            conn = await pool.acquire()
+            pool.release(conn)
+            conn.hang = True
+            with self.assertRaises(asyncio.TimeoutError):
+                await pool.fetch("SELECT pg_sleep(10)")
+            await pool.fetch("SELECT")
+            return pool, conn
+
+        pool, conn = asyncio.run(scenario())
+        self.assertTrue(conn.cancelled)
+        self.assertTrue(conn.closed)
+        self.assertEqual(len(self.conns), 2)
+        self.assertEqual((pool.stats()["discarded"], pool.stats()["query_errors"]), (1, 1))
+
+    def test_expired_idle_connection_is_recycled(self):
+        now = [0.0]
+
+        async def scenario():
+            pool = self._pool(max_lifetime=10.0, clock=lambda: now[0])
+            await pool.fetch("SELECT")
+            now[0] = 11.0
+            await pool.fetch("SELECT")
+
+        asyncio.run(scenario())
+        self.assertEqual(len(self.conns), 2)
+        self.assertTrue(self.conns[0].closed)
+
+
+class StorageViewportAsyncTests(unittest.TestCase):
+    bbox = (51.8, 4.0, 52.0, 4.4)
+
+    def setUp(self):
+        for target, attr in (
+            (storage_terminals, "_fresh_cache"),
+            (storage_terminal_display, "storage_display_read_enabled"),
+        ):
+            patcher = patch.object(target, attr, return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_async_rows_feed_viewport_fast_path(self):
+        with patch.object(
+            storage_terminals, "_load_storage_terminals_from_db_async", return_value=([], None)
+        ) as load, patch.object(
+            storage_terminals, "_load_storage_terminals_from_db", side_effect=AssertionError("sync DB read")
+        ):
+            body = asyncio.run(storage_terminals.get_storage_terminals_async(bbox=self.bbox, limit=50))
+        self.assertEqual(body["entities"], [])
+        self.assertEqual(body["data_source"], "database+curated+viewport")
+        load.assert_called_once_with(storage_terminals._expand_storage_bbox(self.bbox))
+
+    def test_async_db_error_falls_back_to_sync_path(self):
+        async def broken(_bbox):
+            raise psycopg2.OperationalError("relation petroleum_osm_features does not exist")
+
+        with patch.object(storage_terminals, "_load_storage_terminals_from_db_async", broken), patch.object(
+            storage_terminals, "get_storage_terminals", return_value={"entities": ["sync"]}
+        ) as sync:
+            body = asyncio.run(storage_terminals.get_storage_terminals_async(bbox=self.bbox))
+        self.assertEqual(body, {"entities": ["sync"]})
+        sync.assert_called_once_with(False, bbox=self.bbox, limit=None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+"""Bounded cache: LRU/TTL, single-flight loads, stale-while-revalidate, Redis tier, stats."""
+
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from backend.services import bounded_cache
+from backend.services.bounded_cache import BoundedCache, SingleFlight, cache_stats, single_flight
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.expiry = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.expiry[key] = ex
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+class BoundedCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+
+    def _cache(self, **kwargs):
+        kwargs.setdefault("max_entries", 3)
+        kwargs.setdefault("ttl_seconds", 10)
+        return BoundedCache("test_cache", clock=self.clock, **kwargs)
+
+    def test_lru_eviction_and_ttl(self):
+        cache = self._cache()
+        for key in "abc":
+            cache.set(key, key.upper())
+        self.assertEqual(cache.get("a"), "A")  # a becomes most recent
+        cache.set("d", "D")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 3)
+        self.clock.now += 11
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.peek("a"), "A")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 2, 1))
+
+    def test_max_bytes_evicts_oldest(self):
+        cache = self._cache(max_entries=10, max_bytes=250, sizeof=lambda value: 100)
+        for key in "abc":
+            cache.set(key, key)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()["bytes"], 200)
+        self.assertNotIn("a", cache)
+
+    def test_get_or_load_caches_and_respects_cache_if(self):
+        cache = self._cache()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return {} if len(calls) == 1 else {"ok": True}
+
+        self.assertEqual(cache.get_or_load("k", loader, cache_if=bool), {})
+        self.assertEqual(cache.get_or_load("k", loader, cache_if=bool), {"ok": True})
+        self.assertEqual(cache.get_or_load("k", loader, cache_if=bool), {"ok": True})
+        self.assertEqual(len(calls), 2)
+        cache.get_or_load("k", loader, force=True)
+        self.assertEqual(len(calls), 3)
+
+    def test_concurrent_misses_share_one_load(self):
+        cache = self._cache()
+        release = threading.Event()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            release.wait(5)
+            return "value"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while cache.stats()["coalesced"] < 7 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, ["value"] * 8)
+        self.assertEqual(len(calls), 1)
+
+    def test_loader_errors_are_not_remembered(self):
+        group = SingleFlight()
+        with self.assertRaises(RuntimeError):
+            group.do("k", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+        self.assertEqual(group.do("k", lambda: 5), (5, False))
+
+    def test_stale_while_revalidate(self):
+        cache = self._cache(stale_seconds=30)
+        cache.get_or_load("k", lambda: "old")
+        self.clock.now += 15
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return "new"
+
+        self.assertEqual(cache.get_or_load("k", loader), "old")
+        self.assertTrue(refreshed.wait(5))
+        cache.wait_for_refresh("k", 5)
+        self.assertEqual(cache.get_or_load("k", loader), "new")
+        self.assertEqual(cache.stats()["stale_hits"], 1)
+        # Beyond the stale window the load is synchronous again.
+        self.clock.now += 100
+        self.assertEqual(cache.get_or_load("k", lambda: "sync"), "sync")
+
+    def test_shared_tier_round_trip(self):
+        fake = _FakeRedis()
+        with patch.object(bounded_cache, "_shared_client", return_value=fake):
+            writer = self._cache(shared=True, stale_seconds=5)
+            writer.set("k", {"rows": [1, 2]})
+            self.assertEqual(fake.expiry["bcache:test_cache:k"], 15)
+            self.assertEqual(json.loads(fake.store["bcache:test_cache:k"])["v"], {"rows": [1, 2]})
+
+            reader = self._cache(shared=True)
+            self.assertEqual(reader.get_or_load("k", lambda: self.fail("should hit Redis")), {"rows": [1, 2]})
+            self.assertEqual(reader.stats()["redis_hits"], 1)
+            self.assertEqual(reader.get("k"), {"rows": [1, 2]})
+            self.assertEqual(reader.stats()["hits"], 1)
+
+    def test_single_flight_decorator_and_stats_registry(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        @single_flight(key=lambda x, *, deadline=None: x)
+        def slow(x, *, deadline=None):
+            calls.append(x)
+            started.set()
+            release.wait(5)
+            return x * 2
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(slow(3, deadline=1.0)))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(target=lambda: results.append(slow(3, deadline=2.0)))
+        second.start()
+        deadline = time.monotonic() + 5
+        while slow.single_flight_group.coalesced < 1 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        release.set()
+        first.join(5)
+        second.join(5)
+        self.assertEqual(results, [6, 6])
+        self.assertEqual(calls, [3])
+        self.assertEqual(slow([1]), [1, 1])  # unhashable key: runs uncoalesced
+
+        cache = self._cache()
+        cache.set("a", "x")
+        stats = cache_stats()
+        self.assertEqual(stats["caches"]["test_cache"]["entries"], 1)
+        self.assertTrue(any(name.endswith("<locals>.slow") for name in stats["single_flight"]))
+
+
+class AdoptionTests(unittest.TestCase):
+    def test_gleif_lookup_is_cached_per_name(self):
+        from backend.services import gleif_lookup
+
+        gleif_lookup._cache.clear()
+        self.addCleanup(gleif_lookup._cache.clear)
+        body = {"data": [{"id": "L1", "attributes": {"lei": "L1", "entity": {"legalName": {"name": "A"}}}}]}
+        with patch.object(gleif_lookup, "_fetch_lei_search", return_value=body) as fetch:
+            first = gleif_lookup.lookup_lei("Acme Mining")
+            gleif_lookup.lookup_lei("Other Co")
+            again = gleif_lookup.lookup_lei("ACME  mining")
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(first, again)
+
+    def test_osrm_cache_is_bounded(self):
+        from backend.services import routing_geometry
+
+        cache = routing_geometry._osrm_geometry_cache
+        previous = cache.max_entries
+        self.addCleanup(cache.resize, max_entries=previous)
+        self.addCleanup(cache.clear)
+        routing_geometry.configure_osrm_geometry_cache(max_entries=64)
+        geometry = routing_geometry.straight_line_geometry(0, 0, 1, 1, method="road")
+        for i in range(80):
+            routing_geometry._store_osrm_geometry_cache(f"k{i}", geometry)
+        stats = routing_geometry.osrm_cache_stats()
+        self.assertEqual((stats["entries"], stats["max_entries"]), (64, 64))
+
+    def test_goldbod_serves_previous_registry_when_refresh_fails(self):
+        from backend.services import goldbod
+
+        goldbod._registry_cache.clear()
+        self.addCleanup(goldbod._registry_cache.clear)
+        goldbod._registry_cache.set(goldbod._REGISTRY_CACHE_KEY, [{"business_name": "X"}], ttl=0)
+
+        def fail_open(req, timeout=25):
+            raise OSError("network down")
+
+        entries, error = goldbod.load_registry_entries(force_refresh=True, urlopen_fn=fail_open)
+        self.assertEqual(entries, [{"business_name": "X"}])
+        self.assertEqual(error, "network down")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+"""Vectorized point-in-country lookup against a scalar ray-casting reference."""
+
+import random
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from backend import country_lookup
+from backend.country_lookup import CountryPolygonIndex, resolve_countries, resolve_country_point
+
+
+def _square(x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+
+
+FEATURES = [
+    {
+        # Square with a lake (hole) in the middle.
+        "properties": {"ADMIN": "Lakeland", "ISO_A2": "LL"},
+        "geometry": {"type": "Polygon", "coordinates": [_square(0, 0, 10, 10), _square(4, 4, 6, 6)]},
+    },
+    {
+        # Island inside Lakeland's hole plus a triangle elsewhere.
+        "properties": {"name": "Islandia", "iso_a2": "is"},
+        "geometry": {
+            "type": "MultiPolygon",
+            "coordinates": [
+                [_square(4.5, 4.5, 5.5, 5.5)],
+                [[[20, 0], [30, 0], [25, 8], [20, 0]]],
+            ],
+        },
+    },
+    {
+        # Overlaps Lakeland's east edge; Lakeland wins where both contain a point.
+        "properties": {"NAME": "Eastmark"},
+        "geometry": {"type": "Polygon", "coordinates": [_square(8, -2, 14, 3)]},
+    },
+    {"properties": {"ADMIN": "Degenerate"}, "geometry": {"type": "Polygon", "coordinates": [[[50, 50], [51, 51]]]}},
+    {"properties": {"ADMIN": "NoGeometry"}, "geometry": None},
+]
+
+
+def _ring_contains(lng, lat, ring):
+    inside = False
+    if len(ring) < 3:
+        return False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if ((yi > lat) != (yj > lat)) and (lng < (xj - xi) * (lat - yi) / ((yj - yi) or 1e-12) + xi):
+            inside = not inside
+        j = i
+    return inside
+
+
+def _reference(lat, lng):
+    for feature in FEATURES:
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "Polygon":
+            polygons = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiPolygon":
+            polygons = geometry["coordinates"]
+        else:
+            continue
+        for polygon in polygons:
+            if _ring_contains(lng, lat, polygon[0]) and not any(_ring_contains(lng, lat, hole) for hole in polygon[1:]):
+                properties = feature["properties"]
+                name = properties.get("ADMIN") or properties.get("name") or properties.get("NAME")
+                iso2 = (properties.get("ISO_A2") or properties.get("iso_a2") or "").upper()
+                return name, iso2
+    return "Unknown", ""
+
+
+class CountryPolygonIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = CountryPolygonIndex(FEATURES)
+
+    def test_skips_features_without_polygons(self):
+        self.assertEqual(self.index.names, ["Lakeland", "Islandia", "Eastmark", "Degenerate"])
+        self.assertEqual(self.index.iso2, ["LL", "IS", "", ""])
+
+    def test_holes_islands_and_feature_order(self):
+        cases = {
+            (2.0, 2.0): ("Lakeland", "LL"),
+            (4.2, 4.2): ("Unknown", ""),
+            (5.0, 5.0): ("Islandia", "IS"),
+            (2.0, 25.0): ("Islandia", "IS"),
+            (1.0, 9.0): ("Lakeland", "LL"),
+            (1.0, 12.0): ("Eastmark", ""),
+            (50.5, 50.5): ("Unknown", ""),
+            (-40.0, 100.0): ("Unknown", ""),
+        }
+        lats = [lat for lat, _ in cases]
+        lngs = [lng for _, lng in cases]
+        self.assertEqual(self.index.resolve(lats, lngs), list(cases.values()))
+
+    def test_batch_matches_scalar_reference_on_random_points(self):
+        rng = random.Random(11)
+        points = [(rng.uniform(-5, 15), rng.uniform(-5, 35)) for _ in range(4000)]
+        # Exact vertices and edges too.
+        points += [(0.0, 0.0), (10.0, 10.0), (4.0, 5.0), (0.0, 25.0), (3.0, 14.0)]
+        resolved = self.index.resolve([p[0] for p in points], [p[1] for p in points], decimals=None)
+        self.assertEqual(resolved, [_reference(lat, lng) for lat, lng in points])
+
+    def test_small_blocks_give_same_answer(self):
+        rng = random.Random(5)
+        lats = np.array([rng.uniform(-5, 15) for _ in range(500)])
+        lngs = np.array([rng.uniform(-5, 35) for _ in range(500)])
+        expected = self.index.lookup(lats, lngs)
+        with patch.object(country_lookup, "MAX_BLOCK_CELLS", 7):
+            np.testing.assert_array_equal(self.index.lookup(lats, lngs), expected)
+
+    def test_non_finite_points_are_unknown(self):
+        self.assertEqual(
+            self.index.resolve([float("nan"), 2.0], [2.0, float("inf")]),
+            [("Unknown", ""), ("Unknown", "")],
+        )
+
+    def test_rounding_dedupes_to_grid(self):
+        # 5.996 sits inside Lakeland's hole; on the 0.01 grid it lands on the hole edge.
+        self.assertEqual(self.index.resolve([5.996], [5.0], decimals=None), [("Unknown", "")])
+        self.assertEqual(self.index.resolve([5.996], [5.0]), [_reference(6.0, 5.0)])
+        self.assertEqual(self.index.resolve([2.0, 2.001, 2.002], [2.0, 2.0, 2.0]), [("Lakeland", "LL")] * 3)
+        self.assertEqual(self.index.resolve([], []), [])
+
+
+class ModuleIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.payload = {"type": "FeatureCollection", "features": FEATURES}
+        patcher = patch.object(country_lookup, "get_country_borders_geojson", return_value=(self.payload, "etag"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        country_lookup._index_state.update({"payload": None, "index": None})
+        self.addCleanup(country_lookup._index_state.update, {"payload": None, "index": None})
+
+    def test_module_helpers_share_one_index(self):
+        self.assertEqual(resolve_country_point(5.0, 5.0), ("Islandia", "IS"))
+        index = country_lookup._index_state["index"]
+        self.assertEqual(resolve_countries([2.0, 1.0], [2.0, 12.0]), [("Lakeland", "LL"), ("Eastmark", "")])
+        self.assertIs(country_lookup._index_state["index"], index)
+
+    def test_storage_batch_resolution_fills_scalar_cache(self):
+        from backend.services import storage_terminals
+
+        storage_terminals._country_cache.clear()
+        self.addCleanup(storage_terminals._country_cache.clear)
+        self.assertEqual(
+            storage_terminals.resolve_countries([(2.0, 2.0), (5.0, 5.0), (2.001, 2.001)]),
+            [("Lakeland", "LL"), ("Islandia", "IS"), ("Lakeland", "LL")],
+        )
+        with patch.object(storage_terminals, "resolve_country_point") as scalar:
+            self.assertEqual(storage_terminals.resolve_country(5.001, 4.999), ("Islandia", "IS"))
+        scalar.assert_not_called()
+
+    def test_storage_country_cache_stays_bounded_under_concurrent_misses(self):
+        import threading
+
+        from backend.services import storage_terminals
+
+        storage_terminals._country_cache.clear()
+        self.addCleanup(storage_terminals._country_cache.clear)
+        errors = []
+
+        def hammer(offset):
+            try:
+                for i in range(400):
+                    storage_terminals.resolve_country(2.0 + (offset * 400 + i) / 100.0, 2.0)
+            except Exception as exc:  # pragma: no cover - the regression
+                errors.append(exc)
+
+        with patch.object(storage_terminals, "COUNTRY_CACHE_MAX_ENTRIES", 64):
+            threads = [threading.Thread(target=hammer, args=(n,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(storage_terminals._country_cache), 64)
+
+    def test_global_license_records_get_country_from_coordinates(self):
+        from backend.services.ingest.open_data_sync import fill_countries_from_coordinates
+
+        records = [
+            {"id": "a", "country": "Global", "lat": 2.0, "lng": 2.0},
+            {"id": "b", "country": "Global", "lat": 60.0, "lng": 60.0},
+            {"id": "c", "country": "Chile", "lat": 2.0, "lng": 2.0},
+            {"id": "d", "country": "Global", "lat": None, "lng": None},
+        ]
+        out = list(fill_countries_from_coordinates(iter(records), batch_size=3))
+        self.assertEqual([r["country"] for r in out], ["Lakeland", "Global", "Chile", "Global"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+"""Tests for the per-process Postgres connection pool (fake connections; no DB required)."""
+
+import os
+import unittest
+from unittest import mock
+
+import psycopg2.extensions
+
+from backend.services import db_pool
+from backend.services.db_pool import ConnectionPool, PoolTimeout
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if self.conn.broken:
+            raise RuntimeError("server closed the connection unexpectedly")
+        self.conn.pings += 1
+
+    def fetchone(self):
+        return (1,)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = False
+        self.broken = False
+        self.pings = 0
+        self.rollbacks = 0
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.created = []
+
+    def _connect(self):
+        conn = FakeConnection()
+        self.created.append(conn)
+        return conn
+
+    def _pool(self, **kwargs):
+        options = {"max_size": 2, "checkout_timeout": 0.0, "ping_after": 5.0, "clock": self.clock}
+        options.update(kwargs)
+        return ConnectionPool(self._connect, **options)
+
+    def test_reuses_returned_connection(self):
+        pool = self._pool()
+        first = pool.getconn()
+        pool.putconn(first)
+        second = pool.getconn()
+        self.assertIs(first, second)
+        self.assertEqual(len(self.created), 1)
+        stats = pool.stats()
+        self.assertEqual(stats["checkouts"], 2)
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual(stats["in_use"], 1)
+
+    def test_bounded_and_times_out_when_saturated(self):
+        pool = self._pool()
+        held = [pool.getconn(), pool.getconn()]
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        stats = pool.stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["saturation"], 1.0)
+        pool.putconn(held[0])
+        self.assertIs(pool.getconn(), held[0])
+
+    def test_release_rolls_back_and_resets_autocommit(self):
+        pool = self._pool()
+        conn = pool.getconn()
+        conn.status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        pool.putconn(conn)
+        self.assertEqual(conn.rollbacks, 1)
+
+        conn = pool.getconn()
+        conn.autocommit = True
+        pool.putconn(conn)
+        self.assertFalse(conn.autocommit)
+        self.assertEqual(pool.stats()["idle"], 1)
+
+    def test_release_discards_unknown_transaction_state(self):
+        pool = self._pool()
+        conn = pool.getconn()
+        conn.status = psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+        pool.putconn(conn)
+        self.assertEqual(conn.closed, 1)
+        self.assertEqual(pool.stats()["idle"], 0)
+        self.assertEqual(pool.stats()["discarded_unhealthy"], 1)
+
+    def test_checkout_pings_idle_connection_and_replaces_dead_one(self):
+        pool = self._pool()
+        conn = pool.getconn()
+        pool.putconn(conn)
+        self.clock.now += 10
+        conn.broken = True
+        fresh = pool.getconn()
+        self.assertIsNot(fresh, conn)
+        self.assertEqual(conn.closed, 1)
+        self.assertEqual(pool.stats()["discarded_unhealthy"], 1)
+
+    def test_recently_returned_connection_skips_ping(self):
+        pool = self._pool()
+        conn = pool.getconn()
+        pool.putconn(conn)
+        self.clock.now += 1
+        pool.getconn()
+        self.assertEqual(conn.pings, 0)
+
+    def test_recycles_after_max_lifetime(self):
+        pool = self._pool(max_lifetime=60.0)
+        conn = pool.getconn()
+        self.clock.now += 61
+        pool.putconn(conn)
+        self.assertEqual(conn.closed, 1)
+        self.assertEqual(pool.stats()["recycled"], 1)
+        self.assertIsNot(pool.getconn(), conn)
+
+    def test_double_close_is_ignored(self):
+        pool = self._pool()
+        conn = pool.getconn()
+        pool.putconn(conn)
+        pool.putconn(conn)
+        self.assertEqual(pool.stats()["idle"], 1)
+
+
+class PoolConfigTests(unittest.TestCase):
+    def tearDown(self):
+        db_pool.close_all_pools()
+
+    def test_connect_kwargs_prefers_database_url(self):
+        with mock.patch.dict(os.environ, {"DATABASE_URL": "postgresql://u:p@db/x"}, clear=False):
+            self.assertEqual(db_pool.db_connect_kwargs()["dsn"], "postgresql://u:p@db/x")
+
+    def test_disabled_pool_connects_directly(self):
+        with mock.patch.dict(os.environ, {"DB_POOL_ENABLED": "0"}, clear=False), mock.patch(
+            "backend.services.db_pool.psycopg2.connect", return_value="direct"
+        ) as connect:
+            self.assertEqual(db_pool.get_pooled_connection({"dsn": "postgresql://x"}), "direct")
+        connect.assert_called_once_with(dsn="postgresql://x")
+
+    def test_pool_shared_per_process_and_reported(self):
+        with mock.patch.dict(os.environ, {"DB_POOL_ENABLED": "1", "DB_POOL_MAX_SIZE": "4"}, clear=False):
+            first = db_pool.get_pool({"dsn": "postgresql://shared"})
+            second = db_pool.get_pool({"dsn": "postgresql://shared"})
+            self.assertIs(first, second)
+            stats = db_pool.pool_stats()
+        self.assertEqual(stats["pools"], 1)
+        self.assertEqual(stats["max_size"], 4)
+        self.assertEqual(stats["in_use"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
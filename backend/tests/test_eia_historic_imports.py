@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import os
 import shutil
 import tempfile
@@ -43,7 +44,143 @@ class EiaHistoricMappingTests(unittest.TestCase):
         self.assertEqual(rec["commodity_family"], "crude")
 
 
+def _mixed_sheet():
+    import pandas as pd
+
+    return pd.DataFrame(
+        [
+            ["Petroleum imports report", None, None, None, None, None, None, None],
+            ["RPT_PERIOD", "R_S_NAME", "CNTRY_NAME", "QUANTITY", "PROD_NAME", "PROD_CODE", "LINE_NUM", "PCOMP_RNAM"],
+            ["2020-03-31 00:00:00", " ACME ", "CANADA", "12", "Distillate fuel oil", None, "3.0", None],
+            ["03/31/1995", "Beta", "MEXICO", 5.5, "MOTOR GASOLINE BLEND", "", 2, "PEMEX"],
+            ["1987-06", "Gamma", "VENEZUELA", "4", "RESIDUAL", None, 1, None],
+            ["1987-07", "Gamma", "VENEZUELA", "-4", "RESIDUAL", None, 1, None],
+            ["bad", "Delta", "NIGERIA", "7", "unknown", 51, None, ""],
+            [None, "nan", "NIGERIA", "7", "unknown", 51, None, ""],
+            ["1999-12", "Eps", "KUWAIT", "x", "JET", 51, None, None],
+            ["2001-01-15", "Zeta", "IRAQ", 3, None, "051", None, None],
+            ["2001-01-15", "Zeta", "IRAQ", 3, "Propane/propylene", None, None, None],
+        ],
+        dtype=object,
+    )
+
+
+class EiaHistoricVectorizedTests(unittest.TestCase):
+    def test_vectorized_normalize_matches_row_path(self):
+        import pandas as pd
+
+        df = eia_mod._frame_with_header(_mixed_sheet())
+        frame = eia_mod._normalize_import_frame(df, source_file="impa95d.xls", source_sheet="IMPORTS")
+        expected = [
+            rec
+            for _, row in df.iterrows()
+            if (rec := eia_mod._row_to_record(row, source_file="impa95d.xls", source_sheet="IMPORTS"))
+        ]
+        self.assertEqual(len(frame), len(expected))
+        self.assertEqual(list(frame.columns), list(eia_mod._INSERT_COLUMNS))
+        for rec, (_, got) in zip(expected, frame.iterrows()):
+            for col in eia_mod._INSERT_COLUMNS:
+                if col == "raw":
+                    continue
+                value = None if pd.isna(got[col]) else got[col]
+                self.assertEqual(value, rec[col], col)
+        self.assertEqual(frame["period_year"].tolist()[:3], [2020, 1995, 1987])
+        self.assertEqual(json.loads(frame["raw"][0])["R_S_NAME"], " ACME ")
+
+    def test_copy_load_replaces_file_rows_with_one_merge(self):
+        if not FIXTURE.is_file():
+            self.skipTest("fixture missing")
+        parsed = eia_mod.parse_eia_workbook(str(FIXTURE))
+        self.assertEqual(len(parsed["csv"].splitlines()), parsed["rows_parsed"])
+
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = [("IMPORTS", parsed["rows_parsed"] - 1)]
+        stats = eia_mod._load_parsed_workbook(conn, parsed, data_source="eia_file_upload")
+
+        statements = [call.args[0] for call in cur.execute.call_args_list]
+        self.assertIn("DELETE FROM eia_historic_imports", statements[0])
+        self.assertEqual(sum("INSERT INTO eia_historic_imports" in sql for sql in statements), 1)
+        copy_sql, buf = cur.copy_expert.call_args.args
+        self.assertIn("FROM STDIN WITH (FORMAT csv)", copy_sql)
+        self.assertEqual(buf.getvalue(), parsed["csv"])
+        self.assertEqual(stats["rows_upserted"], parsed["rows_parsed"] - 1)
+        self.assertEqual(stats["sheets"][0]["rows_inserted"], parsed["rows_parsed"] - 1)
+        merge_at = next(i for i, sql in enumerate(statements) if "INSERT INTO eia_historic_imports" in sql)
+        self.assertIn("DELETE FROM eia_historic_rollup", statements[merge_at + 1])
+        self.assertIn("INSERT INTO eia_historic_rollup", statements[merge_at + 2])
+        self.assertEqual(cur.execute.call_args_list[merge_at + 2].args[1], (FIXTURE.name, "eia_file_upload"))
+
+
+class EiaHistoricRollupTests(unittest.TestCase):
+    def setUp(self):
+        patcher = unittest.mock.patch.object(eia_mod, "_rollup_complete", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run_summary(self, rollup_ready):
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchone.side_effect = [(1,) if rollup_ready else None, (2000, 2024, 10, 3)]
+        cur.fetchall.return_value = []
+        out = eia_mod.query_summary(conn, importer="Chevron U.S.A.")
+        statements = [call for call in cur.execute.call_args_list if "GROUP BY period_year" in call.args[0]]
+        return out, statements[0]
+
+    def test_importer_key_normalizes_punctuation_and_case(self):
+        self.assertEqual(eia_mod._importer_key(" Chevron U.S.A., Inc. "), "CHEVRON U S A INC")
+        self.assertEqual(eia_mod._importer_key(None), "")
+
+    def test_summary_reads_rollup_with_importer_key(self):
+        out, call = self._run_summary(True)
+        self.assertIn("FROM eia_historic_rollup", call.args[0])
+        self.assertIn("SUM(row_count)", call.args[0])
+        self.assertIn("importer_key LIKE %s", call.args[0])
+        self.assertEqual(call.args[1], ["%CHEVRON U S A%"])
+        self.assertEqual(out["row_count"], 10)
+
+    def test_summary_falls_back_to_raw_rows_until_rollup_is_built(self):
+        _, call = self._run_summary(False)
+        self.assertIn("FROM eia_historic_imports", call.args[0])
+        self.assertIn(f"{eia_mod._IMPORTER_KEY_SQL} LIKE %s", call.args[0])
+        self.assertEqual(call.args[1], ["%CHEVRON U S A%"])
+
+    def test_rows_drill_down_matches_importer_key(self):
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = []
+        with unittest.mock.patch.object(eia_mod, "ensure_eia_historic_imports_table"):
+            eia_mod.query_rows(conn, year=2019, importer="Chevron U.S.A.")
+        sql, params = cur.execute.call_args.args
+        self.assertIn(f"{eia_mod._IMPORTER_KEY_SQL} LIKE %s", sql)
+        self.assertEqual(params[:2], [2019, "%CHEVRON U S A%"])
+
+    def test_backfill_writes_marker_once_then_skips_the_scan(self):
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchone.return_value = None
+        cur.fetchall.return_value = [("impa19d.xlsx", "eia_file_upload")]
+        with unittest.mock.patch.object(eia_mod, "ensure_eia_historic_imports_table"):
+            self.assertEqual(eia_mod.backfill_eia_historic_rollups(conn), 1)
+            statements = [call.args[0] for call in cur.execute.call_args_list]
+            self.assertIn("INSERT INTO eia_historic_file_state", statements[-1])
+            self.assertEqual(cur.execute.call_args_list[-1].args[1], eia_mod._ROLLUP_BACKFILL_MARKER)
+            conn.commit.assert_called_once()
+
+            cur.reset_mock()
+            cur.fetchone.return_value = (1,)
+            self.assertEqual(eia_mod.backfill_eia_historic_rollups(conn), 0)
+            self.assertEqual(eia_mod._fact_table(conn), ("eia_historic_rollup", "SUM(row_count)"))
+        self.assertFalse(any("SELECT DISTINCT" in call.args[0] for call in cur.execute.call_args_list))
+        self.assertEqual(cur.execute.call_count, 1)
+
+
 class EiaHistoricIngestTests(unittest.TestCase):
+    def setUp(self):
+        patcher = unittest.mock.patch.object(eia_mod, "_rollup_complete", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_read_fixture_sheet(self):
         if not FIXTURE.is_file():
             self.skipTest("fixture missing")
@@ -82,6 +219,25 @@ class EiaHistoricIngestTests(unittest.TestCase):
         finally:
             shutil.rmtree(tmp, ignore_errors=True)
 
+    def test_ingest_folder_parses_on_process_pool(self):
+        if not FIXTURE.is_file():
+            self.skipTest("fixture missing")
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("impa19d.xlsx", "impa20d.xlsx"):
+                shutil.copy(FIXTURE, Path(tmp) / name)
+            conn = MagicMock()
+            with unittest.mock.patch.dict(os.environ, {"EIA_HISTORIC_PARSE_WORKERS": "2"}):
+                summary = eia_mod.ingest_eia_downloads_folder(conn, tmp)
+        self.assertEqual(summary["status"], "ok", summary["errors"])
+        self.assertEqual(summary["parse_workers"], 2)
+        self.assertEqual([f["file"] for f in summary["files"]], ["impa19d.xlsx", "impa20d.xlsx"])
+        self.assertEqual(conn.commit.call_count, 2)
+
+    def test_parse_pool_is_opt_in(self):
+        with unittest.mock.patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("EIA_HISTORIC_PARSE_WORKERS", None)
+            self.assertEqual(eia_mod._parse_workers(), 0)
+
 
 class EiaHistoricAutoIngestTests(unittest.TestCase):
     def test_auto_ingest_skips_when_folder_empty(self):
@@ -0,0 +1,149 @@
+"""Chunked contact/relationship derivation: keyset reads, one batched upsert per chunk, state and workers."""
+
+import json
+import unittest
+from unittest.mock import patch
+
+from backend.services import entity_derivation
+from backend.services.entity_derivation import derive_license_chunk, derive_license_entities
+
+
+def _license(idx, *, company="Company {idx} Ltd", payload=None):
+    return {
+        "id": f"kenya:{idx:03d}",
+        "company": company.format(idx=idx) if company else None,
+        "sector": "mining",
+        "phone_number": f"+254 700 000 {idx:03d}",
+        "record_origin": "open_data",
+        "source_name": "Kenya Mining Cadastre Portal",
+        "source_url": "https://example.com/source",
+        "source_record_url": None,
+        "source_updated_at": None,
+        "date_issued": None,
+        "raw_payload": json.dumps(payload or {"operator": f"Operator {idx} Ltd", "email": f"ops{idx}@example.com"}),
+        "last_synced_at": None,
+        "derivation_fingerprint": f"fp-{idx}",
+    }
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append((sql, params))
+        if "FROM licenses l" in sql:
+            after_id, limit = params
+            self._rows = [dict(row) for row in self.conn.licenses if row["id"] > after_id][:limit]
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConn:
+    def __init__(self, licenses):
+        self.licenses = sorted(licenses, key=lambda row: row["id"])
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self, **_kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class DeriveChunkTests(unittest.TestCase):
+    def test_chunk_builds_both_kinds_and_skips_companyless_relationships(self):
+        rows = [_license(1), _license(2, company=None)]
+        chunk = derive_license_chunk(rows)
+        self.assertEqual(chunk.contact_ids, ["kenya:001", "kenya:002"])
+        self.assertEqual(chunk.relationship_ids, ["kenya:001"])
+        self.assertEqual({item["contact_type"] for item in chunk.contacts}, {"phone", "email"})
+        pairs = {(item["relationship_type"], item["target_name"]) for item in chunk.relationships}
+        self.assertIn(("operator", "Operator 1 Ltd"), pairs)
+
+    def test_contacts_only_leaves_relationships_empty(self):
+        chunk = derive_license_chunk([_license(1)], ("contacts",))
+        self.assertTrue(chunk.contacts)
+        self.assertEqual((chunk.relationship_ids, chunk.relationships), ([], []))
+
+
+class DeriveLicenseEntitiesTests(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+        for module in ("entity_contacts", "entity_relationships", "entity_derivation"):
+            patcher = patch(f"backend.services.{module}.execute_values", side_effect=self._record_batch)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _record_batch(self, cur, sql, values, **_kwargs):
+        table = sql.split("INSERT INTO", 1)[1].split()[0]
+        # Json wrappers compare by identity; keep the adapted payload instead.
+        self.batches.append((table, [tuple(getattr(v, "adapted", v) for v in row) for row in values]))
+
+    def _tables(self):
+        return [table for table, _ in self.batches]
+
+    def test_one_upsert_per_table_per_chunk_and_state_recorded(self):
+        conn = FakeConn([_license(idx) for idx in range(5)])
+        summary = derive_license_entities(conn, chunk_rows=2, workers=0)
+
+        self.assertEqual((summary["licenses"], summary["chunks"]), (5, 3))
+        self.assertEqual(
+            self._tables(),
+            ["entity_contacts", "entity_relationships", "license_derivation_state"] * 3,
+        )
+        keyset = [params[0] for sql, params in conn.statements if "FROM licenses l" in sql]
+        self.assertEqual(keyset, ["", "kenya:001", "kenya:003", "kenya:004"])
+        state = [row for table, values in self.batches if table == "license_derivation_state" for row in values]
+        self.assertEqual(state[0], ("kenya:000", "fp-0", "fp-0"))
+        self.assertEqual(summary["contacts"], sum(len(v) for t, v in self.batches if t == "entity_contacts"))
+        self.assertEqual(conn.commits, 4)  # state-table DDL + one per chunk
+
+    def test_incremental_filters_on_fingerprint_and_keeps_other_kind_state(self):
+        conn = FakeConn([_license(1)])
+        derive_license_entities(conn, kinds=("relationships",), incremental=True)
+        select = next(sql for sql, _ in conn.statements if "FROM licenses l" in sql)
+        self.assertIn("s.relationships_fingerprint IS DISTINCT FROM c.derivation_fingerprint", select)
+        self.assertNotIn("s.contacts_fingerprint", select)
+        # verified_at is built from source_updated_at, so a newer source timestamp re-derives.
+        self.assertIn("l.source_updated_at", entity_derivation._FINGERPRINT_SQL)
+        self.assertNotIn("last_synced_at", entity_derivation._FINGERPRINT_SQL)
+        self.assertEqual(self._tables(), ["entity_relationships", "license_derivation_state"])
+        self.assertEqual(self.batches[-1][1], [("kenya:001", None, "fp-1")])
+
+    def test_failed_chunk_rolls_back(self):
+        conn = FakeConn([_license(1)])
+        with patch.object(entity_derivation, "_record_state", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                derive_license_entities(conn, workers=0)
+        self.assertEqual(conn.rollbacks, 1)
+
+    def test_process_pool_matches_inline_derivation(self):
+        licenses = [_license(idx) for idx in range(7)]
+        derive_license_entities(FakeConn(licenses), chunk_rows=3, workers=0)
+        inline = list(self.batches)
+        self.batches.clear()
+        summary = derive_license_entities(FakeConn(licenses), chunk_rows=3, workers=2)
+        self.assertEqual(summary["chunks"], 3)
+        self.assertEqual(self.batches, inline)
+
+    def test_rejects_unknown_kinds(self):
+        with self.assertRaises(ValueError):
+            derive_license_entities(FakeConn([]), kinds=("vessels",))
+
+
+if __name__ == "__main__":
+    unittest.main()
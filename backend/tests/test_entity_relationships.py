@@ -1,7 +1,11 @@
 import json
 import unittest
+from unittest.mock import MagicMock, patch
 
-from backend.services.entity_relationships import build_license_relationship_candidates
+from backend.services.entity_relationships import (
+    build_license_relationship_candidates,
+    sync_license_relationships_for_rows,
+)
 from backend.services.maritime_intel import build_maritime_relationships
 
 
@@ -81,5 +85,34 @@ class EntityRelationshipTests(unittest.TestCase):
         )
 
 
+    def test_sync_relationships_for_rows_prunes_stale_rows_in_one_delete(self):
+        conn = MagicMock()
+        cursor = MagicMock()
+        conn.cursor.return_value.__enter__.return_value = cursor
+        rows = [
+            {
+                "id": f"kenya:test-{idx}",
+                "company": f"Company {idx}",
+                "record_origin": "open_data",
+                "source_name": "Kenya Mining Cadastre Portal",
+                "source_url": "https://example.com/source",
+                "raw_payload": json.dumps({"operator": f"Operator {idx} Ltd"}),
+            }
+            for idx in range(3)
+        ]
+
+        with patch("backend.services.entity_relationships.execute_values") as batch:
+            written = sync_license_relationships_for_rows(conn, rows)
+
+        deletes = [call for call in cursor.execute.call_args_list if "DELETE FROM entity_relationships" in call[0][0]]
+        self.assertEqual(len(deletes), 1)
+        entity_ids, _, fingerprints = deletes[0][0][1]
+        self.assertEqual(entity_ids, ["kenya:test-0", "kenya:test-1", "kenya:test-2"])
+        self.assertEqual(len(fingerprints), written)
+        self.assertEqual(cursor.execute.call_count, 1)
+        batch.assert_called_once()
+        self.assertEqual(len(batch.call_args[0][2]), written)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -39,9 +39,7 @@ class GoldbodParseTests(unittest.TestCase):
 
 class GoldbodVerifyTests(unittest.TestCase):
     def setUp(self):
-        svc._REGISTRY_CACHE["fetched_at"] = 0.0
-        svc._REGISTRY_CACHE["entries"] = []
-        svc._REGISTRY_CACHE["error"] = None
+        svc._registry_cache.clear()
 
     def _mock_urlopen(self, html: str = REGISTRY_HTML):
         resp = MagicMock()
@@ -0,0 +1,207 @@
+"""Streaming license export: server-side cursor, CSV chunks, gzip and Parquet bodies."""
+
+import csv
+import gzip
+import io
+import os
+import sys
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-32b!")
+os.environ["ADMIN_TOKEN"] = "test-admin-token"
+
+from backend.services.license_export import (  # noqa: E402
+    ADMIN_LICENSE_EXPORT_COLUMNS,
+    admin_license_export_query,
+    gzip_chunks,
+    iter_csv_chunks,
+    iter_cursor_rows,
+    iter_parquet_chunks,
+    license_export_columns,
+    open_export_cursor,
+    parquet_export_available,
+)
+
+
+class _NamedCursor:
+    def __init__(self, rows, name):
+        self.rows = rows
+        self.name = name
+        self.itersize = None
+        self.executed = None
+        self.closed = False
+
+    def execute(self, sql, params=None):
+        assert sql.count("%s") == len(params or ()), (sql, params)
+        self.executed = (sql, params)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def close(self):
+        self.closed = True
+
+
+class _Conn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.cursors = []
+        self.closed = False
+
+    def cursor(self, name=None, cursor_factory=None):
+        cur = _NamedCursor(self.rows, name)
+        self.cursors.append(cur)
+        return cur
+
+    def close(self):
+        self.closed = True
+
+
+def _rows(n):
+    return [
+        {
+            "id": f"lic-{i}",
+            "company": f"Company {i}, Ltd",
+            "country": "Ghana",
+            "lat": 5.0 + i / 100,
+            "lng": -1.0,
+            "manually_edited": i % 2 == 0,
+            "last_synced_at": datetime(2026, 1, 2, 3, 4, 5),
+        }
+        for i in range(n)
+    ]
+
+
+def test_open_export_cursor_is_named_with_itersize():
+    conn = _Conn([])
+    query, params = admin_license_export_query(sector=" oil ", country="Ghana")
+    cur = open_export_cursor(conn, query, params, itersize=250)
+    assert cur.name.startswith("license_export_")
+    assert cur.itersize == 250
+    assert cur.executed[1] == ("oil", "Ghana")
+
+
+def test_iter_cursor_rows_closes_cursor_and_connection_when_abandoned():
+    conn = _Conn(_rows(5))
+    cur = open_export_cursor(conn, "SELECT 1", ())
+    rows = iter_cursor_rows(conn, cur)
+    assert next(rows)["id"] == "lic-0"
+    rows.close()
+    assert cur.closed and conn.closed
+
+
+def test_csv_chunks_are_bounded_and_round_trip():
+    columns = ["id", "company", "lat", "region"]
+    chunks = list(iter_csv_chunks(_rows(25), columns, chunk_rows=10))
+    # header + 10 rows, 10 rows, 5 rows
+    assert len(chunks) == 3
+    parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert parsed[0] == columns
+    assert parsed[1] == ["lic-0", "Company 0, Ltd", "5.0", ""]
+    assert len(parsed) == 26
+
+
+def test_gzip_chunks_produce_single_valid_member():
+    raw = b"".join(iter_csv_chunks(_rows(50), ["id", "company"], chunk_rows=7))
+    compressed = b"".join(gzip_chunks(iter_csv_chunks(_rows(50), ["id", "company"], chunk_rows=7)))
+    assert gzip.decompress(compressed) == raw
+
+
+def test_license_export_columns_provenance():
+    assert license_export_columns()[-1] == "date_issued"
+    assert license_export_columns(include_provenance=True)[-1] == "manually_edited"
+
+
+@pytest.mark.skipif(not parquet_export_available(), reason="pyarrow not installed")
+def test_parquet_chunks_round_trip_with_typed_columns():
+    import pyarrow.parquet as pq
+
+    columns = ["id", "lat", "manually_edited", "last_synced_at", "region"]
+    chunks = list(iter_parquet_chunks(_rows(30), columns, row_group_rows=8))
+    assert len(chunks) > 1
+    table = pq.read_table(io.BytesIO(b"".join(chunks)))
+    assert table.num_rows == 30
+    assert table.schema.field("lat").type == "double"
+    assert table.schema.field("manually_edited").type == "bool"
+    first = table.slice(0, 1).to_pylist()[0]
+    assert first == {
+        "id": "lic-0",
+        "lat": 5.0,
+        "manually_edited": True,
+        "last_synced_at": "2026-01-02T03:04:05",
+        "region": None,
+    }
+
+
+def test_admin_export_streams_gzip_csv_from_named_cursor():
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    conn = _Conn(_rows(3))
+    with patch("backend.main._license_export_connect", return_value=conn):
+        res = TestClient(app).get(
+            "/api/admin/licenses/export",
+            params={"gzip": "true", "country": "Ghana"},
+            headers={"X-Admin-Token": "test-admin-token", "Accept-Encoding": "identity"},
+        )
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/gzip"
+    assert "licenses_admin_export.csv.gz" in res.headers["content-disposition"]
+    parsed = list(csv.reader(io.StringIO(gzip.decompress(res.content).decode("utf-8"))))
+    assert parsed[0] == ADMIN_LICENSE_EXPORT_COLUMNS
+    assert len(parsed) == 4
+    assert conn.cursors[0].name.startswith("license_export_")
+    assert conn.closed
+
+
+def test_admin_export_rejects_unknown_format():
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    with patch("backend.main._license_export_connect") as get_conn:
+        res = TestClient(app).get(
+            "/api/admin/licenses/export",
+            params={"format": "xlsx"},
+            headers={"X-Admin-Token": "test-admin-token"},
+        )
+    assert res.status_code == 400
+    get_conn.assert_not_called()
+
+
+def test_export_connections_are_bounded_and_released_on_close():
+    import threading
+
+    import psycopg2
+    from fastapi import HTTPException
+
+    import backend.main as main_mod
+
+    slots = threading.BoundedSemaphore(1)
+    raw = _Conn([])
+    with patch.object(main_mod, "_license_export_slots", slots), patch.object(
+        main_mod, "LICENSE_EXPORT_SLOT_WAIT_SEC", 0
+    ), patch.object(main_mod.psycopg2, "connect", return_value=raw):
+        conn = main_mod._license_export_connect()
+        with pytest.raises(HTTPException) as busy:
+            main_mod._license_export_connect()
+        assert busy.value.status_code == 503
+        conn.close()
+        conn.close()
+        assert raw.closed
+        main_mod._license_export_connect().close()
+
+    with patch.object(main_mod, "_license_export_slots", slots), patch.object(
+        main_mod.psycopg2, "connect", side_effect=psycopg2.OperationalError("db down")
+    ), patch.object(main_mod.time, "sleep"):
+        with pytest.raises(HTTPException) as down:
+            main_mod._license_export_connect()
+    assert down.value.status_code == 503
+    assert slots.acquire(blocking=False)
@@ -1,15 +1,61 @@
 """Unit tests for license map LOD helpers."""
 
 from backend.services.license_map_perf import (
+    LICENSE_GRID_STEPS,
+    LICENSE_SECTOR_KEY_SQL,
+    ensure_license_country_origin_summary,
     license_cluster_limit_for_zoom,
     license_cluster_min_count,
     license_grid_degrees,
+    license_open_data_preference_sql,
+    mark_license_map_cells_stale,
     merge_license_clusters,
     pipeline_geojson_limit_for_zoom,
+    query_license_clusters,
+    query_license_clusters_from_cells,
+    rebuild_license_map_cells,
+    refresh_license_country_origin_summary,
     simplify_tolerance_for_zoom,
 )
 
 
+class _RecordingCursor:
+    def __init__(self, rows=None, fetchone=None):
+        self.rows = rows or []
+        self.one = fetchone
+        self.calls = []
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        placeholders = sql.count("%s")
+        assert placeholders == len(params or ()), (placeholders, params)
+        self.calls.append((sql, params))
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.one
+
+
+class _RecordingConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+
 def test_license_grid_degrees_low_zoom():
     assert license_grid_degrees(2) == 16.0
     assert license_grid_degrees(3) == 12.0
@@ -75,3 +121,132 @@ def test_simplify_tolerance_increases_when_zoomed_out():
     low = simplify_tolerance_for_zoom(4)
     mid = simplify_tolerance_for_zoom(7)
     assert low > mid > 0
+
+
+def test_grid_steps_cover_every_cluster_zoom():
+    assert {license_grid_degrees(z) for z in range(0, 8)} == set(LICENSE_GRID_STEPS)
+
+
+def test_query_clusters_from_cells_binds_params_in_order():
+    cur = _RecordingCursor(rows=[(5.0, -1.0, 12, "Ghana", "mining")])
+    clusters = query_license_clusters_from_cells(
+        cur,
+        sector_sql=f"{LICENSE_SECTOR_KEY_SQL} = %s",
+        sector_params=["mining"],
+        country_sql="country = ANY(%s) OR LOWER(country) = ANY(%s)",
+        country_params=[["Ghana"], ["ghana"]],
+        min_lat=-35.0,
+        max_lat=38.0,
+        min_lng=-20.0,
+        max_lng=55.0,
+        grid_deg=12.0,
+        prefer_open_data=True,
+        limit=800,
+        zoom=3,
+    )
+    sql, params = cur.calls[0]
+    assert "FROM license_map_cells c" in sql
+    assert "FROM license_country_origin_summary s" in sql
+    # grid_deg, then fixed-origin bucket ranges for the viewport.
+    assert list(params[:5]) == [12.0, -3, 3, -2, 4]
+    assert params.count("mining") == 2
+    assert clusters[0]["mapClusterCount"] == 12
+    assert clusters[0]["country"] == "Ghana"
+
+
+def test_query_clusters_from_cells_without_open_preference():
+    cur = _RecordingCursor()
+    query_license_clusters_from_cells(
+        cur,
+        sector_sql="TRUE",
+        sector_params=[],
+        country_sql="TRUE",
+        country_params=[],
+        min_lat=0.0,
+        max_lat=10.0,
+        min_lng=0.0,
+        max_lng=10.0,
+        grid_deg=8.0,
+        prefer_open_data=False,
+    )
+    assert "license_country_origin_summary" not in cur.calls[0][0]
+
+
+def test_rebuild_license_map_cells_inserts_every_grid_step():
+    cur = _RecordingCursor(fetchone=(40, 1234))
+    conn = _RecordingConnection(cur)
+    stats = rebuild_license_map_cells(conn)
+    inserts = [params for sql, params in cur.calls if "INSERT INTO license_map_cells (" in sql]
+    assert [params[0] for params in inserts] == list(LICENSE_GRID_STEPS)
+    assert any("DELETE FROM license_map_cells" in sql for sql, _ in cur.calls)
+    assert stats["cell_rows"] == 40
+    assert stats["source_rows"] == 1234
+    assert conn.commits == 1
+
+
+def test_mark_license_map_cells_stale_clears_built_at_in_savepoint():
+    cur = _RecordingCursor()
+    mark_license_map_cells_stale(cur)
+    sqls = [sql for sql, _ in cur.calls]
+    assert sqls[0] == "SAVEPOINT license_map_cells_stale"
+    assert "SET built_at = NULL" in sqls[1]
+    assert sqls[-1] == "RELEASE SAVEPOINT license_map_cells_stale"
+
+
+def test_refresh_country_origin_summary_scopes_to_countries():
+    cur = _RecordingCursor()
+    conn = _RecordingConnection(cur)
+    refresh_license_country_origin_summary(conn, ["Ghana", None, "Ghana", "Mali"])
+    (delete_sql, delete_params), (insert_sql, insert_params) = cur.calls
+    assert "country = ANY(%s)" in delete_sql
+    assert delete_params == (["Ghana", "Mali"],)
+    assert "GROUP BY 1, 2" in insert_sql
+    assert insert_params == (["Ghana", "Mali"],)
+    assert conn.commits == 1
+
+
+def test_refresh_country_origin_summary_full_and_empty_scope():
+    cur = _RecordingCursor()
+    conn = _RecordingConnection(cur)
+    assert refresh_license_country_origin_summary(conn, []) == 0
+    assert cur.calls == []
+    refresh_license_country_origin_summary(conn)
+    assert all("ANY(" not in sql for sql, _ in cur.calls)
+    assert len(cur.calls) == 2
+
+
+def test_ensure_country_origin_summary_seeds_empty_table_without_commit():
+    cur = _RecordingCursor(fetchone=None)
+    conn = _RecordingConnection(cur)
+    ensure_license_country_origin_summary(conn)
+    assert any("INSERT INTO license_country_origin_summary" in sql for sql, _ in cur.calls)
+    assert conn.commits == 0
+
+    seeded = _RecordingCursor(fetchone=(1,))
+    ensure_license_country_origin_summary(_RecordingConnection(seeded))
+    assert not any("INSERT INTO" in sql for sql, _ in seeded.calls)
+
+
+def test_live_clusters_bind_open_params_after_bbox():
+    cur = _RecordingCursor()
+    sector_sql = f"{LICENSE_SECTOR_KEY_SQL} = %s"
+    open_clause = license_open_data_preference_sql(sector_sql)
+    assert "NOT IN" not in open_clause
+    query_license_clusters(
+        cur,
+        sector_sql=sector_sql,
+        sector_params=["mining"],
+        country_sql="TRUE",
+        country_params=[],
+        min_lat=0.0,
+        max_lat=10.0,
+        min_lng=-5.0,
+        max_lng=5.0,
+        grid_deg=8.0,
+        open_clause=open_clause,
+        open_params=["mining"],
+    )
+    sql, params = cur.calls[0]
+    assert "license_country_origin_summary" in sql
+    bbox_end = list(params).index(5.0)
+    assert params[bbox_end + 1] == "mining"
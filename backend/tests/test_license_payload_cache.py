@@ -0,0 +1,80 @@
+"""Tests for pre-serialized /licenses payload caching (ETag, gzip, 304)."""
+
+import gzip
+import json
+import unittest
+from datetime import datetime
+from decimal import Decimal
+
+from backend.services.license_payload_cache import (
+    LicensePayload,
+    accepts_gzip,
+    encode_license_payload,
+    etag_matches,
+    license_payload_response,
+)
+
+
+class LicensePayloadCacheTests(unittest.TestCase):
+    def test_encode_is_compact_and_deterministic(self):
+        rows = [{"id": "a", "lat": Decimal("5.5"), "date": datetime(2024, 1, 2, 3, 4, 5)}]
+        first = encode_license_payload(rows, max_age=120)
+        second = encode_license_payload(rows, max_age=120)
+        self.assertEqual(first, second)
+        body = first.body()
+        self.assertEqual(json.loads(body), [{"id": "a", "lat": 5.5, "date": "2024-01-02T03:04:05"}])
+        self.assertNotIn(b" ", body)
+        self.assertEqual(gzip.decompress(first.gzip_body), body)
+
+    def test_blob_round_trip(self):
+        prepared = encode_license_payload({"mode": "clusters", "clusters": []}, max_age=180)
+        restored = LicensePayload.from_blob(prepared.to_blob())
+        self.assertEqual(restored, prepared)
+        no_age = encode_license_payload([])
+        self.assertIsNone(LicensePayload.from_blob(no_age.to_blob()).max_age)
+
+    def test_from_blob_rejects_legacy_json_strings(self):
+        self.assertIsNone(LicensePayload.from_blob(None))
+        self.assertIsNone(LicensePayload.from_blob('[{"id": "a"}]'))
+        self.assertIsNone(LicensePayload.from_blob(b'[{"id": "a"}]'))
+
+    def test_accepts_gzip(self):
+        self.assertTrue(accepts_gzip("gzip, deflate, br"))
+        self.assertTrue(accepts_gzip("br;q=1.0, gzip;q=0.8"))
+        self.assertFalse(accepts_gzip("gzip;q=0"))
+        self.assertFalse(accepts_gzip("identity"))
+        self.assertFalse(accepts_gzip(None))
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"abc"', '"abc"'))
+        self.assertTrue(etag_matches('W/"abc", "def"', '"abc"'))
+        self.assertTrue(etag_matches("*", '"abc"'))
+        self.assertFalse(etag_matches('"def"', '"abc"'))
+        self.assertFalse(etag_matches(None, '"abc"'))
+
+    def test_response_serves_gzip_bytes_with_etag(self):
+        prepared = encode_license_payload([{"id": "a"}], max_age=120)
+        res = license_payload_response(prepared, accept_encoding="gzip")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.body, prepared.gzip_body)
+        self.assertEqual(res.headers["content-encoding"], "gzip")
+        self.assertEqual(res.headers["etag"], prepared.etag)
+        self.assertEqual(res.headers["cache-control"], "public, max-age=120")
+
+    def test_response_decompresses_for_plain_clients(self):
+        prepared = encode_license_payload([{"id": "a"}])
+        res = license_payload_response(prepared, accept_encoding="identity")
+        self.assertNotIn("content-encoding", res.headers)
+        self.assertNotIn("cache-control", res.headers)
+        self.assertEqual(json.loads(res.body), [{"id": "a"}])
+
+    def test_if_none_match_returns_304(self):
+        prepared = encode_license_payload([{"id": "a"}], max_age=120)
+        res = license_payload_response(prepared, if_none_match=prepared.etag, accept_encoding="gzip")
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.body, b"")
+        self.assertEqual(res.headers["etag"], prepared.etag)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -54,6 +54,16 @@ class LicenseSyncStoreTests(unittest.TestCase):
         )
         self.assertEqual(rows[0]["id"], 2)
         self.assertEqual(rows[0]["status"], "success")
+        self.assertIsNone(rows[0]["rows_per_sec"])
+
+    def test_list_runs_from_rows_includes_throughput(self):
+        started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        rows = list_license_sync_runs_from_rows(
+            [(3, "usgs_mrds", started, started, "success", 900, 900, 2, None, None, 1500, 600.0)]
+        )
+        self.assertEqual(rows[0]["duration_ms"], 1500)
+        self.assertEqual(rows[0]["rows_per_sec"], 600.0)
+        self.assertEqual(rows[0]["records_skipped_manual"], 2)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,142 @@
+"""Unit tests for license vector tiles (tile math, cluster/point queries, MVT encoding)."""
+
+import mapbox_vector_tile
+import pytest
+
+from backend.services.license_map_perf import LICENSE_SECTOR_KEY_SQL
+from backend.services.license_payload_cache import encode_license_bytes, license_payload_response
+from backend.services.license_tiles import (
+    LICENSE_TILE_CLUSTER_LAYER,
+    LICENSE_TILE_EXTENT,
+    LICENSE_TILE_MEDIA_TYPE,
+    LICENSE_TILE_POINT_LAYER,
+    LICENSE_TILE_POINT_LIMIT,
+    build_license_tile,
+    encode_license_tile,
+    tile_bounds,
+    tile_pixel,
+    valid_tile,
+)
+
+
+class _Cursor:
+    def __init__(self, rows, *more_rows):
+        self.results = [rows, *more_rows]
+        self.calls = []
+
+    def execute(self, sql, params=None):
+        assert sql.count("%s") == len(params or ()), (sql, params)
+        self.calls.append((sql, params))
+
+    def fetchall(self):
+        return self.results[min(len(self.calls), len(self.results)) - 1]
+
+
+_FILTERS = {
+    "sector_sql": f"{LICENSE_SECTOR_KEY_SQL} = %s",
+    "sector_params": ["mining"],
+    "country_sql": "TRUE",
+    "country_params": [],
+    "prefer_open_data": True,
+}
+
+
+def _decode(pbf):
+    return mapbox_vector_tile.decode(pbf, default_options={"y_coord_down": True})
+
+
+def test_valid_tile_range():
+    assert valid_tile(0, 0, 0)
+    assert valid_tile(3, 7, 7)
+    assert not valid_tile(3, 8, 0)
+    assert not valid_tile(-1, 0, 0)
+    assert not valid_tile(23, 0, 0)
+
+
+def test_tile_bounds_and_pixel_projection():
+    min_lat, max_lat, min_lng, max_lng = tile_bounds(1, 1, 0)
+    assert (min_lng, max_lng) == (0.0, 180.0)
+    assert min_lat == pytest.approx(0.0, abs=1e-9)
+    assert max_lat == pytest.approx(85.0511, abs=1e-4)
+    assert tile_pixel(0.0, 0.0, 1, 1, 0) == (0, LICENSE_TILE_EXTENT)
+    assert tile_pixel(0.0, 0.0, 0, 0, 0) == (LICENSE_TILE_EXTENT // 2, LICENSE_TILE_EXTENT // 2)
+
+
+def test_cluster_tile_keeps_only_centres_inside_tile():
+    # z2 tile 2/1/1 covers lng -90..0, lat 0..66.5; the 16-degree grid query is cell-aligned.
+    cur = _Cursor(
+        [
+            {"lat": 7.9, "lng": -1.0, "cnt": 40, "country": "Ghana", "sector": "mining"},
+            {"lat": 7.9, "lng": 10.0, "cnt": 40, "country": "Nigeria", "sector": "mining"},
+        ]
+    )
+    pbf, count = build_license_tile(cur, 2, 1, 1, use_cells=True, **_FILTERS)
+    sql, params = cur.calls[0]
+    assert "FROM license_map_cells c" in sql
+    assert params[0] == 16.0
+    assert count == 1
+    features = _decode(pbf)[LICENSE_TILE_CLUSTER_LAYER]["features"]
+    assert features[0]["properties"]["country"] == "Ghana"
+    assert features[0]["properties"]["count"] == 40
+
+
+def test_cluster_tile_live_path_binds_open_params():
+    cur = _Cursor([])
+    build_license_tile(cur, 3, 3, 3, use_cells=False, **_FILTERS)
+    sql, params = cur.calls[0]
+    assert "license_country_origin_summary" in sql
+    assert list(params).count("mining") == 2
+
+
+def test_point_tile_encodes_licenses_layer():
+    cur = _Cursor(
+        [
+            ("lic-1", "Acme Gold", "Mining Lease", "Gold", "Active", "Ghana", None, 5.6, -0.2),
+        ]
+    )
+    pbf, count = build_license_tile(cur, 10, 511, 496, **_FILTERS)
+    sql, params = cur.calls[0]
+    assert "LIMIT %s" in sql
+    assert count == 1
+    feature = _decode(pbf)[LICENSE_TILE_POINT_LAYER]["features"][0]
+    assert feature["properties"] == {
+        "id": "lic-1",
+        "company": "Acme Gold",
+        "licenseType": "Mining Lease",
+        "commodity": "Gold",
+        "status": "Active",
+        "country": "Ghana",
+        "sector": "mining",
+    }
+    px, py = feature["geometry"]["coordinates"]
+    assert 0 <= px <= LICENSE_TILE_EXTENT and 0 <= py <= LICENSE_TILE_EXTENT
+
+
+def test_dense_point_tile_falls_back_to_grid_cells():
+    point = ("lic", "Acme", None, "Gold", "Active", "Ghana", "mining", 5.6, -0.2)
+    cur = _Cursor(
+        [point] * (LICENSE_TILE_POINT_LIMIT + 1),
+        [
+            {"lat": 5.6, "lng": -0.2, "cnt": 4000, "country": "Ghana", "sector": "mining"},
+            {"lat": 5.61, "lng": -0.19, "cnt": 1, "country": "Ghana", "sector": "mining"},
+        ],
+    )
+    pbf, count = build_license_tile(cur, 10, 511, 496, **_FILTERS)
+    assert cur.calls[0][1][-1] == LICENSE_TILE_POINT_LIMIT + 1
+    assert "GROUP BY" in cur.calls[1][0] and "HAVING" not in cur.calls[1][0]
+    assert count == 2
+    layers = _decode(pbf)
+    assert LICENSE_TILE_POINT_LAYER not in layers
+    counts = sorted(f["properties"]["count"] for f in layers[LICENSE_TILE_CLUSTER_LAYER]["features"])
+    assert counts == [1, 4000]
+
+
+def test_tile_response_uses_mvt_media_type_and_etag():
+    prepared = encode_license_bytes(encode_license_tile(0, 0, 0, clusters=[]), max_age=180)
+    res = license_payload_response(prepared, accept_encoding="gzip", media_type=LICENSE_TILE_MEDIA_TYPE)
+    assert res.headers["content-type"] == LICENSE_TILE_MEDIA_TYPE
+    assert res.headers["content-encoding"] == "gzip"
+    not_modified = license_payload_response(
+        prepared, if_none_match=prepared.etag, media_type=LICENSE_TILE_MEDIA_TYPE
+    )
+    assert not_modified.status_code == 304
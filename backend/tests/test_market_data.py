@@ -0,0 +1,170 @@
+"""Market-data poller: rendered rows, keep-last-good quotes, versioning, Redis sharing and SSE."""
+
+import asyncio
+import json
+import unittest
+
+from backend.services import market_data
+from backend.services.market_data import (
+    FALLBACK_PRICES,
+    MarketDataPoller,
+    MarketSnapshot,
+    render_market_price_rows,
+    render_ticker_rows,
+)
+
+QUOTES = {
+    "GC=F": {"price": 2350.4, "chg_pct": 0.5},
+    "SI=F": {"price": 29.1, "chg_pct": -1.25},
+    "BTC": {"price": 64000.0, "chg_pct": 2.0},
+    "BZ=F": {"price": 82.15, "chg_pct": None},
+    "CL=F": {"price": 78.0, "chg_pct": -0.1},
+    "HO=F": {"price": 2.4567, "chg_pct": 0.0},
+    "HG=F": {"price": 4.5, "chg_pct": 1.0},
+    "SB=F": {"price": 0.1923, "chg_pct": 0.3},
+    "KC=F": {"price": 2.25, "chg_pct": -0.3},
+}
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+
+def _fetchers(quotes, failing=()):
+    def make(symbol):
+        def fetch():
+            if symbol in failing:
+                raise RuntimeError(f"{symbol} blocked")
+            return quotes.get(symbol)
+
+        return fetch
+
+    return {symbol: make(symbol) for symbol in market_data.YAHOO_SYMBOLS + (market_data.BTC_SYMBOL,)}
+
+
+class RenderTests(unittest.TestCase):
+    def test_ticker_rows_match_endpoint_formats(self):
+        rows = {row["symbol"]: row for row in render_ticker_rows(QUOTES)}
+        self.assertEqual(rows["GOLD/oz"], {"symbol": "GOLD/oz", "price": "$2,350.40", "category": "Metal", "up": True, "change": "+0.50%"})
+        self.assertEqual(rows["BTC/USD"]["price"], "$64,000.00")
+        self.assertEqual((rows["BRENT"]["price"], rows["BRENT"]["change"]), ("$82.15/bbl", "LIVE"))
+        self.assertEqual(rows["HEATING OIL"]["price"], "$2.457/gal")
+        self.assertEqual(rows["SUGAR #11"]["price"], "19.23¢/lb")
+        self.assertEqual(list(rows)[:3], ["GOLD/oz", "SILVER/oz", "BTC/USD"])
+
+    def test_missing_quotes_use_dashes_and_fallbacks(self):
+        self.assertEqual(
+            [row["symbol"] for row in render_ticker_rows({})],
+            ["GOLD/oz", "SILVER/oz"],
+        )
+        prices = render_market_price_rows({})
+        self.assertEqual(prices, FALLBACK_PRICES)
+        self.assertEqual(render_market_price_rows(QUOTES)[-1], {"symbol": "WTI", "price": "78.00", "change": "-0.10%", "up": False})
+
+    def test_snapshot_json_round_trip_keeps_rendering(self):
+        snapshot = MarketSnapshot.build(3, 1000.0, QUOTES)
+        restored = MarketSnapshot.from_json(snapshot.to_json())
+        self.assertEqual((restored.version, restored.ticker_json), (3, snapshot.ticker_json))
+        self.assertIsNone(MarketSnapshot.from_json("{not json"))
+
+
+class PollerTests(unittest.TestCase):
+    def setUp(self):
+        self.now = [1000.0]
+
+    def _poller(self, quotes, *, redis=None, failing=()):
+        return MarketDataPoller(
+            _fetchers(quotes, failing), interval=60, redis_client=lambda: redis, clock=lambda: self.now[0]
+        )
+
+    def test_failed_symbol_keeps_last_good_quote(self):
+        quotes = dict(QUOTES)
+        poller = self._poller(quotes)
+        first = poller.refresh_once()
+        poller._fetchers = _fetchers(quotes, failing=("GC=F",))
+        self.now[0] = 1060.0
+        second = poller.refresh_once()
+        self.assertEqual(second.quotes["GC=F"]["as_of"], 1000.0)
+        self.assertIn("GC=F", second.errors)
+        self.assertEqual(second.ticker_json, first.ticker_json)
+
+    def test_all_failed_cycle_does_not_refresh_as_of(self):
+        poller = self._poller(QUOTES, failing=tuple(QUOTES))
+        snapshot = poller.refresh_once()
+        self.assertEqual((snapshot.version, snapshot.fetched_at), (1, 0.0))
+        self.assertTrue(snapshot.is_stale())
+        self.assertEqual(len(snapshot.errors), len(QUOTES))
+
+    def test_version_bumps_only_when_prices_change(self):
+        quotes = dict(QUOTES)
+        poller = self._poller(quotes)
+        self.assertEqual(poller.refresh_once().version, 1)
+        self.assertEqual(poller.refresh_once().version, 1)
+        quotes["BZ=F"] = {"price": 83.0, "chg_pct": 1.0}
+        self.assertEqual(poller.refresh_once().version, 2)
+
+    def test_staleness_metadata(self):
+        poller = self._poller(QUOTES)
+        snapshot = poller.refresh_once()
+        self.assertFalse(snapshot.is_stale(now=1010.0))
+        self.assertTrue(snapshot.is_stale(now=1000.0 + market_data.MARKET_STALE_AFTER_SEC + 1))
+        self.assertEqual(snapshot.headers(now=1010.0)["X-Market-Age-Seconds"], "10")
+        self.assertTrue(MarketSnapshot.empty().meta()["stale"])
+
+    def test_second_worker_adopts_shared_snapshot_instead_of_polling(self):
+        redis = FakeRedis()
+        leader = self._poller(QUOTES, redis=redis)
+        leader.refresh_once()
+        polled = []
+        follower = MarketDataPoller(
+            {"GC=F": lambda: polled.append(1)}, interval=60, redis_client=lambda: redis, clock=lambda: self.now[0]
+        )
+        follower.refresh_once()  # cold follower polls once, then takes its cue from the lease
+        leader.refresh_once()
+        polled.clear()
+        adopted = follower.refresh_once()
+        self.assertEqual(polled, [])
+        self.assertEqual(adopted.ticker_json, leader.snapshot.ticker_json)
+
+    def test_sse_stream_pushes_new_versions(self):
+        quotes = dict(QUOTES)
+        poller = self._poller(quotes)
+        poller.refresh_once()
+        original = market_data._poller
+        market_data._poller = poller
+        self.addCleanup(setattr, market_data, "_poller", original)
+
+        async def scenario():
+            async def connected():
+                return False
+
+            stream = market_data.market_event_stream(connected, keepalive=0.05)
+            first = await stream.__anext__()
+            keepalive = await stream.__anext__()
+            quotes["CL=F"] = {"price": 79.5, "chg_pct": 1.9}
+            await asyncio.get_running_loop().run_in_executor(None, poller.refresh_once)
+            pushed = await stream.__anext__()
+            await stream.aclose()
+            return first, keepalive, pushed
+
+        first, keepalive, pushed = asyncio.run(scenario())
+        self.assertTrue(first.startswith("id: 1\nevent: ticker\n"))
+        self.assertEqual(keepalive, ": keepalive\n\n")
+        body = json.loads(pushed.split("data: ", 1)[1])
+        self.assertEqual(body["version"], 2)
+        self.assertIn({"symbol": "WTI", "price": "79.50", "change": "+1.90%", "up": True}, body["prices"])
+        self.assertEqual(poller.subscriber_count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
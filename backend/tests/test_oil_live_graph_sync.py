@@ -130,6 +130,20 @@ def test_graph_sync_summary_includes_census_step(monkeypatch):
         },
         "_sync_eia_refinery_throughput": {"status": "skipped"},
         "_sync_eia_padd_storage": {"status": "skipped"},
+        "_sync_eia_historic_downloads": {"status": "skipped"},
+        "_sync_gem_extraction_tracker": {"status": "skipped"},
+        "_sync_gem_goit_pipelines": {"status": "skipped"},
+        "_sync_gem_gogpt_plants": {"status": "skipped"},
+        "_sync_gem_ggit_lng": {"status": "skipped"},
+        "_sync_gem_ggit_gas_pipelines": {"status": "skipped"},
+        "_sync_bunker_fuel_suppliers": {"status": "skipped"},
+        "_sync_eurostat_trade_flows": {"status": "skipped"},
+        "_sync_jodi_validation": {"status": "skipped"},
+        "_sync_commodity_trade_comtrade": {"status": "skipped"},
+        "_sync_uk_trade_manifests": {"status": "skipped"},
+        "_sync_brazil_trade_manifests": {"status": "skipped"},
+        "_port_authority_tenants_step": {"companies": 0},
+        "_barentswatch_ais_step": {"status": "skipped"},
         "_run_gleif_batch": {"status": "skipped", "skipped_missing_columns": True},
         "_run_wikidata_batch": {"status": "skipped", "skipped_missing_columns": True},
         "_run_opensanctions_batch": {
@@ -147,13 +161,20 @@ def test_graph_sync_summary_includes_census_step(monkeypatch):
         "_trigger_synthetic_bol_rebuild": {"status": "ok"},
         "_table_exists": True,
         "_record_graph_sync_at": None,
+        "_record_graph_sync_steps": None,
     }
 
     with ExitStack() as stack:
-        for attr, return_value in patches.items():
-            stack.enter_context(patch(f"{mod}.{attr}", return_value=return_value))
+        mocks = {
+            attr: stack.enter_context(patch(f"{mod}.{attr}", return_value=return_value))
+            for attr, return_value in patches.items()
+        }
         summary = graph_sync_mod.run_full_graph_sync(conn, rebuild_synthetic_bol=True)
 
+    recorded = mocks["_record_graph_sync_steps"].call_args.args[1]
+    assert recorded["synthetic_bol"] == {"status": "ok"}
+    assert "synthetic_bol" not in summary["steps"]
+
     assert summary["census_api_key_configured"] is True
     assert summary["steps"]["census_trade"]["rows_upserted"] == 42
     # Phase 4a/4b/4c hook surface area
@@ -1,5 +1,6 @@
 import unittest
 from datetime import datetime
+from unittest import mock
 
 from backend.services.ingest.open_data_sync import (
     OPEN_DATA_SOURCES,
@@ -8,7 +9,9 @@ from backend.services.ingest.open_data_sync import (
     _normalize_date,
     AFRICA_COVERAGE_OVERRIDES,
     WORLD_COVERAGE_OVERRIDES,
+    _copy_text,
     arcgis_geometry_centroid,
+    bulk_upsert_open_data_records,
     describe_license_source_record,
     get_source_registry_index,
     infer_world_macro_region,
@@ -264,5 +267,145 @@ class OpenDataSyncTests(unittest.TestCase):
         self.assertEqual(peru.max_records, 2000)
 
 
+class _BulkCursor:
+    def __init__(self, merged_ids, unique_ids, licenses=None):
+        self.merged_ids = merged_ids
+        self.unique_ids = unique_ids
+        self.licenses = licenses or {}
+        self.sql = []
+        self.params = []
+        self.copied = []
+        self._last = ""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.sql.append(sql)
+        self.params.append(params)
+        self._last = sql
+
+    def copy_expert(self, sql, buffer):
+        self.sql.append(sql)
+        self.params.append(None)
+        self.copied.extend(buffer.read().splitlines())
+
+    def fetchone(self):
+        return (self.unique_ids,)
+
+    def fetchall(self):
+        if "WHERE id = ANY(%s)" in self._last:
+            return [self.licenses[record_id] for record_id in self.params[-1][0] if record_id in self.licenses]
+        return [(record_id, origin) for record_id, origin in self.merged_ids]
+
+
+class _BulkConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self, **_kwargs):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def _record(record_id, **overrides):
+    record = {
+        "id": record_id,
+        "company": "Acme",
+        "country": "Ghana",
+        "region": None,
+        "commodity": "Gold",
+        "license_type": "Mining Lease",
+        "status": "Active",
+        "lat": 5.5,
+        "lng": -1.25,
+        "date_issued": None,
+        "sector": "mining",
+        "record_origin": "open_data",
+        "source_id": "ghana",
+        "source_name": "Ghana Minerals Commission",
+        "source_url": "https://example.gov.gh",
+        "source_record_url": None,
+        "source_updated_at": None,
+        "raw_payload": '{"note": "a\\tb"}',
+    }
+    record.update(overrides)
+    return record
+
+
+class BulkUpsertTests(unittest.TestCase):
+    def test_copy_text_escapes_separators_and_nulls(self):
+        self.assertEqual(_copy_text(None), "\\N")
+        self.assertEqual(_copy_text("a\tb\nc\\d\x00"), "a\\tb\\nc\\\\d")
+        self.assertEqual(_copy_text(1.5), "1.5")
+        self.assertEqual(_copy_text(datetime(2026, 1, 2, 3, 4)), "2026-01-02T03:04:00")
+
+    def test_stages_with_copy_and_merges_once(self):
+        cur = _BulkCursor(
+            merged_ids=[("a", "open_data"), ("b", "open_data")],
+            unique_ids=3,
+            licenses={"a": {"id": "a", "company": "Acme 2"}, "b": {"id": "b", "company": "Acme"}},
+        )
+        conn = _BulkConnection(cur)
+        records = [_record("a"), _record("b"), _record("c"), _record("a", company="Acme 2")]
+        with mock.patch(
+            "backend.services.ingest.open_data_sync.sync_license_contacts_for_rows", return_value=4
+        ) as contacts, mock.patch(
+            "backend.services.ingest.open_data_sync.sync_license_relationships_for_rows", return_value=1
+        ) as relationships, mock.patch(
+            "backend.services.ingest.open_data_sync._refresh_country_origin_summary"
+        ) as refresh:
+            stats = bulk_upsert_open_data_records(conn, records)
+
+        self.assertEqual(len(cur.copied), 4)
+        self.assertEqual(cur.copied[0].split("\t")[9], "\\N")
+        merges = [sql for sql in cur.sql if "ON CONFLICT (id) DO UPDATE" in sql]
+        self.assertEqual(len(merges), 1)
+        self.assertIn("DISTINCT ON (id)", merges[0])
+        self.assertIn("manually_edited IS NOT TRUE", merges[0])
+        self.assertEqual((stats.written, stats.merged, stats.skipped_manual), (4, 2, 1))
+        self.assertEqual((stats.contacts, stats.relationships), (4, 1))
+        # Derivation runs once for the merged rows only, re-read from licenses by id.
+        derived = contacts.call_args[0][1]
+        self.assertEqual(sorted(row["id"] for row in derived), ["a", "b"])
+        self.assertEqual(next(row for row in derived if row["id"] == "a")["company"], "Acme 2")
+        selects = [params for sql, params in zip(cur.sql, cur.params) if "WHERE id = ANY(%s)" in sql]
+        self.assertEqual(selects, [(["a", "b"],)])
+        relationships.assert_called_once()
+        refresh.assert_called_once_with(conn, {"Ghana"})
+        self.assertEqual(conn.commits, 1)
+        self.assertIn("rows_per_sec", stats.as_dict())
+
+    def test_skips_derivation_when_disabled_or_fallback(self):
+        cur = _BulkCursor(merged_ids=[("a", "open_data")], unique_ids=1)
+        fallback = _BulkCursor(merged_ids=[("a", "global_open_fallback")], unique_ids=1)
+        with mock.patch(
+            "backend.services.ingest.open_data_sync.sync_license_contacts_for_rows"
+        ) as contacts, mock.patch("backend.services.ingest.open_data_sync._refresh_country_origin_summary"):
+            bulk_upsert_open_data_records(_BulkConnection(cur), [_record("a")], sync_contacts=False)
+            bulk_upsert_open_data_records(
+                _BulkConnection(fallback), [_record("a", record_origin="global_open_fallback")]
+            )
+        contacts.assert_not_called()
+        self.assertFalse(any("WHERE id = ANY(%s)" in sql for sql in cur.sql + fallback.sql))
+
+    def test_empty_input_commits_without_merge(self):
+        cur = _BulkCursor(merged_ids=[], unique_ids=0)
+        conn = _BulkConnection(cur)
+        stats = bulk_upsert_open_data_records(conn, [])
+        self.assertEqual(stats.written, 0)
+        self.assertFalse(any("ON CONFLICT" in sql for sql in cur.sql))
+        self.assertEqual(conn.commits, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -45,13 +45,15 @@ class OpenDataVerificationApiTests(unittest.TestCase):
         self.assertEqual(body["status"], "success")
         self.assertEqual(body["count"], 1)
 
+    @patch("backend.main._licenses_changed")
     @patch("backend.main.get_db_connection")
-    def test_manual_edit_marks_license(self, mock_conn):
+    def test_manual_edit_marks_license(self, mock_conn, licenses_changed):
         conn = MagicMock()
         cursor = MagicMock()
         mock_conn.return_value = conn
         conn.cursor.return_value = cursor
         cursor.fetchone.return_value = {"id": "lic-1"}
+        cursor.fetchall.return_value = [{"country": "Ghana"}]
 
         res = self.client.patch(
             "/api/licenses/lic-1/manual-edit",
@@ -61,6 +63,28 @@ class OpenDataVerificationApiTests(unittest.TestCase):
         self.assertEqual(res.status_code, 200)
         self.assertTrue(res.json()["manually_edited"])
         conn.commit.assert_called_once()
+        licenses_changed.assert_called_once_with(["Ghana"])
+
+    @patch("backend.main._schedule_license_map_cells_rebuild")
+    @patch("backend.main.cache")
+    @patch("backend.main.get_db_connection")
+    def test_licenses_changed_refreshes_summary_and_marks_grid_stale(self, mock_conn, cache, rebuild):
+        conn = MagicMock()
+        cursor = MagicMock()
+        mock_conn.return_value = conn
+        conn.cursor.return_value = cursor
+        cursor.__enter__.return_value = cursor
+        cursor.rowcount = 1
+
+        from backend import main
+
+        main._licenses_changed(["Ghana"])
+        cache.delete_pattern.assert_called_once_with("licenses:*")
+        sqls = [call.args[0] for call in cursor.execute.call_args_list]
+        self.assertTrue(any("DELETE FROM license_country_origin_summary" in sql for sql in sqls))
+        self.assertTrue(any("SET built_at = NULL" in sql for sql in sqls))
+        self.assertEqual(conn.commit.call_count, 2)
+        rebuild.assert_called_once_with(force=True)
 
     def test_annotations_put_requires_auth(self):
         res = self.client.put(
@@ -110,7 +134,7 @@ class OpenDataVerificationApiTests(unittest.TestCase):
             res = self.client.get("/licenses/export")
         self.assertEqual(res.status_code, 401)
 
-    @patch("backend.main.get_db_connection")
+    @patch("backend.main._license_export_connect")
     def test_export_with_auth(self, mock_conn):
         conn = MagicMock()
         cursor = MagicMock()
@@ -125,7 +149,7 @@ class OpenDataVerificationApiTests(unittest.TestCase):
         self.assertEqual(res.status_code, 200)
         self.assertIn("text/csv", res.headers.get("content-type", ""))
 
-    @patch("backend.main.get_db_connection")
+    @patch("backend.main._license_export_connect")
     def test_export_with_provenance_flag(self, mock_conn):
         conn = MagicMock()
         cursor = MagicMock()
@@ -114,6 +114,20 @@ class PlatformHealthTests(unittest.TestCase):
         self.assertEqual(body["status"], "degraded")
         self.assertFalse(body["ai_providers"]["ready"])
 
+    @mock.patch(
+        "backend.services.platform_health.get_ai_provider_status",
+        return_value={"ready": True, "env": {}},
+    )
+    def test_build_platform_health_includes_db_pool_stats(self, _mock_ai):
+        body = build_platform_health(
+            redis_enabled=False,
+            redis_ping=lambda: None,
+            get_maritime_stats=lambda: {"worker": {"status": "ok"}},
+            get_db_pool_stats=lambda: {"enabled": True, "in_use": 3, "max_size": 10, "saturation": 0.3},
+        )
+        self.assertEqual(body["db_pool"]["in_use"], 3)
+        self.assertEqual(body["db_pool"]["saturation"], 0.3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -65,6 +65,59 @@ class RateLimitTests(unittest.TestCase):
         self.assertTrue(rate_limit.allow_request(key, "agents", 2))
         self.assertFalse(rate_limit.allow_request(key, "agents", 2))
 
+    def test_memory_window_slides_instead_of_resetting(self):
+        allow = rate_limit._memory_allow
+        self.assertTrue(allow("k", 2, 60, now=0.0))
+        self.assertTrue(allow("k", 2, 60, now=30.0))
+        self.assertFalse(allow("k", 2, 60, now=59.0))
+        # At the boundary the full previous window still counts.
+        self.assertFalse(allow("k", 2, 60, now=60.0))
+        # Halfway through, the previous window weighs 1 of 2.
+        self.assertTrue(allow("k", 2, 60, now=90.0))
+        self.assertFalse(allow("k", 2, 60, now=90.0))
+        # A skipped window clears history.
+        self.assertTrue(allow("k", 2, 60, now=200.0))
+
+    def test_memory_wheel_is_bounded_per_window(self):
+        wheel = rate_limit._WindowWheel(60, max_keys=3)
+        for idx in range(10):
+            self.assertTrue(wheel.allow(f"k{idx}", 1, now=5.0))
+        self.assertEqual(list(wheel.current), ["k7", "k8", "k9"])
+        self.assertTrue(wheel.allow("k9", 2, now=6.0))
+        self.assertEqual(wheel.current["k9"], 2)
+
+    def test_redis_path_is_one_script_call_and_falls_back_on_error(self):
+        calls = []
+
+        class _Client:
+            def __init__(self, fail=False):
+                self.fail = fail
+
+            def register_script(self, source):
+                def script(keys, args):
+                    if self.fail:
+                        raise ConnectionError("down")
+                    calls.append((keys, args))
+                    return 1 if len(calls) <= 2 else 0
+
+                return script
+
+        client = _Client()
+        with mock.patch.object(rate_limit, "_redis_client", return_value=client):
+            results = [rate_limit.allow_request("ip:x", "agents", 2) for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+        keys, args = calls[0]
+        self.assertEqual(len(keys), 2)
+        self.assertTrue(keys[0].startswith("rl:agents:ip:x:"))
+        self.assertEqual(args[:2], [2, 120])
+
+        with mock.patch.object(rate_limit, "_redis_client", return_value=_Client(fail=True)), mock.patch.object(
+            rate_limit, "drop_shared_redis_client"
+        ) as drop:
+            self.assertTrue(rate_limit.allow_request("ip:y", "agents", 1))
+            self.assertFalse(rate_limit.allow_request("ip:y", "agents", 1))
+        self.assertEqual(drop.call_count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
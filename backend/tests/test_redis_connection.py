@@ -4,7 +4,14 @@ import os
 import unittest
 from unittest import mock
 
-from backend.services.redis_connection import redis_client_kwargs, redis_password
+from backend.services import redis_connection
+from backend.services.redis_connection import (
+    drop_shared_redis_client,
+    redis_client_kwargs,
+    redis_password,
+    reset_shared_redis_clients,
+    shared_redis_client,
+)
 
 
 class RedisConnectionTests(unittest.TestCase):
@@ -19,5 +26,34 @@ class RedisConnectionTests(unittest.TestCase):
             self.assertNotIn("password", redis_client_kwargs())
 
 
+class SharedRedisClientTests(unittest.TestCase):
+    def setUp(self):
+        reset_shared_redis_clients()
+        self.addCleanup(reset_shared_redis_clients)
+
+    def test_client_is_pooled_and_reused(self):
+        with mock.patch.dict(os.environ, {"REDIS_HOST": "redis", "REDIS_PORT": "6379"}, clear=False):
+            client = shared_redis_client()
+            self.assertIs(shared_redis_client(), client)
+            pool = client.connection_pool
+            self.assertEqual(pool.max_connections, redis_connection.REDIS_MAX_CONNECTIONS)
+            self.assertTrue(pool.connection_kwargs["decode_responses"])
+            binary = shared_redis_client(decode_responses=False)
+            self.assertIsNot(binary, client)
+            self.assertFalse(binary.connection_pool.connection_kwargs["decode_responses"])
+            with mock.patch.dict(os.environ, {"REDIS_PORT": "6380"}):
+                self.assertIsNot(shared_redis_client(), client)
+
+    def test_no_host_or_recent_failure_returns_none(self):
+        with mock.patch.dict(os.environ, {"REDIS_HOST": ""}, clear=False):
+            self.assertIsNone(shared_redis_client())
+        with mock.patch.dict(os.environ, {"REDIS_HOST": "redis"}, clear=False):
+            self.assertIsNotNone(shared_redis_client())
+            drop_shared_redis_client()
+            self.assertIsNone(shared_redis_client())
+            with mock.patch.object(redis_connection, "REDIS_RETRY_SECONDS", 0.0):
+                self.assertIsNotNone(shared_redis_client())
+
+
 if __name__ == "__main__":
     unittest.main()
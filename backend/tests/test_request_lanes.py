@@ -0,0 +1,88 @@
+"""Request lanes: bounded admission, context propagation and the FastAPI offload wrapper."""
+
+import asyncio
+import contextvars
+import threading
+import unittest
+from typing import Optional
+
+from fastapi import FastAPI, Header
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from backend.services import request_lanes
+from backend.services.request_lanes import LaneSaturated, RequestLane, offload
+
+request_id = contextvars.ContextVar("request_id", default="")
+
+
+class RequestLaneTests(unittest.TestCase):
+    def setUp(self):
+        self.lane = RequestLane("test", workers=1, queue_limit=1)
+        self.addCleanup(self.lane.shutdown)
+
+    def test_runs_on_lane_thread_with_caller_context(self):
+        async def call():
+            request_id.set("req-7")
+            return await self.lane.run(lambda: (threading.current_thread().name, request_id.get()))
+
+        name, seen = asyncio.run(call())
+        self.assertTrue(name.startswith("lane-test"))
+        self.assertEqual(seen, "req-7")
+
+    def test_rejects_beyond_workers_plus_queue_and_recovers(self):
+        release = threading.Event()
+
+        async def scenario():
+            blocked = [asyncio.ensure_future(self.lane.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            with self.assertRaises(LaneSaturated):
+                await self.lane.run(lambda: None)
+            stats = self.lane.stats()
+            release.set()
+            await asyncio.gather(*blocked)
+            return stats
+
+        stats = asyncio.run(scenario())
+        self.assertEqual((stats["running"], stats["queued"], stats["rejected"]), (1, 1, 1))
+        self.assertEqual(asyncio.run(self.lane.run(lambda: 5)), 5)
+        self.assertEqual(self.lane.stats()["completed"], 3)
+
+
+class OffloadEndpointTests(unittest.TestCase):
+    def setUp(self):
+        request_lanes.shutdown_lanes()
+        self.addCleanup(request_lanes.shutdown_lanes)
+        self.app = FastAPI()
+        self.app.add_exception_handler(LaneSaturated, lambda request, exc: JSONResponse({}, status_code=503))
+
+        @self.app.get("/items/{item_id}")
+        @offload("slow")
+        def read_item(item_id: int, q: str = "", x_admin_token: Optional[str] = Header(None)):
+            return {"item_id": item_id, "q": q, "token": x_admin_token, "thread": threading.current_thread().name}
+
+        self.client = TestClient(self.app)
+
+    def test_signature_is_preserved_and_work_runs_on_slow_lane(self):
+        body = self.client.get("/items/4?q=x", headers={"x-admin-token": "t"}).json()
+        self.assertEqual((body["item_id"], body["q"], body["token"]), (4, "x", "t"))
+        self.assertTrue(body["thread"].startswith("lane-slow"))
+        self.assertEqual(self.client.get("/items/nope").status_code, 422)
+        self.assertEqual(request_lanes.lane_stats()["slow"]["completed"], 1)
+
+    def test_saturated_lane_maps_to_503(self):
+        lane = request_lanes.get_lane("slow")
+        lane._admitted = lane.workers + lane.queue_limit
+        self.assertEqual(self.client.get("/items/1").status_code, 503)
+        lane._admitted = 0
+
+    def test_async_endpoints_are_rejected(self):
+        async def already_async():
+            return None
+
+        with self.assertRaises(TypeError):
+            offload("map")(already_async)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,244 @@
+"""Persistent route geometry cache: store round-trip, backoff, fetch_* integration, hub pairs."""
+
+import json
+import threading
+import unittest
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+from backend.services import routing_geometry
+from backend.services.route_geometry_store import RouteGeometryStore
+
+
+class _Cursor:
+    def __init__(self, db):
+        self.db = db
+        self.row = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        if "INSERT INTO route_geometry_cache" in sql:
+            self.db.rows[tuple(params[:6])] = params[6:]
+        elif "FROM route_geometry_cache" in sql:
+            stored = self.db.rows.get(tuple(params[:6]))
+            if stored is not None:
+                path, distance_km, duration_hours, source, notes = stored
+                self.row = (json.loads(path), distance_km, duration_hours, source, json.loads(notes))
+
+    def fetchone(self):
+        return self.row
+
+
+class _Conn:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return _Cursor(self.db)
+
+    def commit(self):
+        self.db.commits += 1
+
+    def close(self):
+        self.db.closed += 1
+
+
+class _Database:
+    def __init__(self):
+        self.rows = {}
+        self.commits = 0
+        self.closed = 0
+        self.connects = 0
+
+    def connect(self):
+        self.connects += 1
+        return _Conn(self)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _DictStore:
+    def __init__(self):
+        self.rows = {}
+
+    def get(self, method, version, key):
+        return self.rows.get((method, version, key))
+
+    def put(self, method, version, key, geometry):
+        self.rows[(method, version, key)] = geometry
+        return True
+
+    def stats(self):
+        return {"rows": len(self.rows)}
+
+
+KEY = (-6.823, 39.289, -4.043, 39.668)
+
+
+class RouteGeometryStoreTests(unittest.TestCase):
+    def test_round_trip_and_counters(self):
+        db = _Database()
+        store = RouteGeometryStore(connect=db.connect, enabled=True)
+        self.assertIsNone(store.get("road", "v1", KEY))
+        geometry = {
+            "path": ((-6.823, 39.289), (-4.043, 39.668)),
+            "distance_km": 310.0,
+            "duration_hours": 5.6,
+            "source": "osrm",
+            "notes": ["Road geometry from OSRM driving network."],
+        }
+        self.assertTrue(store.put("road", "v1", KEY, geometry))
+        row = store.get("road", "v1", KEY)
+        self.assertEqual(row["path"], [(-6.823, 39.289), (-4.043, 39.668)])
+        self.assertEqual((row["distance_km"], row["source"]), (310.0, "osrm"))
+        self.assertIsNone(store.get("road", "v2", KEY))
+        stats = store.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["writes"]), (1, 2, 1))
+        self.assertEqual(db.closed, db.connects)
+
+    def test_connection_failure_backs_off(self):
+        clock = _Clock()
+        calls = []
+
+        def connect():
+            calls.append(1)
+            raise OSError("connection refused")
+
+        store = RouteGeometryStore(connect=connect, enabled=True, retry_seconds=60, clock=clock)
+        self.assertIsNone(store.get("sea", "v1", KEY))
+        self.assertFalse(store.put("sea", "v1", KEY, {"path": [], "distance_km": 0, "duration_hours": 0, "source": "x"}))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(store.stats()["last_error"], "connection refused")
+        clock.now += 61
+        store.get("sea", "v1", KEY)
+        self.assertEqual(len(calls), 2)
+
+    def test_disabled_store_never_connects(self):
+        store = RouteGeometryStore(connect=lambda: self.fail("should not connect"), enabled=False)
+        self.assertIsNone(store.get("road", "v1", KEY))
+        self.assertFalse(store.stats()["available"])
+
+
+class FetchIntegrationTests(unittest.TestCase):
+    def setUp(self):
+        self.store = _DictStore()
+        patcher = patch.object(routing_geometry, "_geometry_store", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        routing_geometry._osrm_geometry_cache.clear()
+        routing_geometry._sea_geometry_cache.clear()
+        self.addCleanup(routing_geometry._osrm_geometry_cache.clear)
+        self.addCleanup(routing_geometry._sea_geometry_cache.clear)
+
+    def test_osrm_result_is_persisted_and_served_to_a_cold_process(self):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {
+            "routes": [
+                {
+                    "geometry": {"coordinates": [[39.289, -6.823], [39.5, -5.5], [39.668, -4.043]]},
+                    "distance": 320000.0,
+                    "duration": 18000.0,
+                }
+            ]
+        }
+        http_get = MagicMock(return_value=response)
+        first = routing_geometry.fetch_osrm_route(-6.823, 39.289, -4.043, 39.668, http_get=http_get)
+        self.assertEqual(first.source, "osrm")
+        self.assertEqual(len(self.store.rows), 1)
+        (method, version, key), = self.store.rows
+        self.assertEqual((method, key), ("road", KEY))
+        self.assertEqual(version, routing_geometry.route_network_version("road"))
+
+        routing_geometry._osrm_geometry_cache.clear()  # simulate another worker
+        again = routing_geometry.fetch_osrm_route(-6.8231, 39.2892, -4.0429, 39.6681, http_get=http_get)
+        self.assertEqual(http_get.call_count, 1)
+        self.assertEqual((again.path, again.distance_km), (first.path, first.distance_km))
+
+    def test_osrm_fallback_is_not_persisted(self):
+        http_get = MagicMock(side_effect=OSError("down"))
+        resolved = routing_geometry.fetch_osrm_route(0.0, 0.0, 1.0, 1.0, http_get=http_get)
+        self.assertEqual(resolved.source, "straight_line_fallback")
+        self.assertEqual(self.store.rows, {})
+
+    @patch.object(routing_geometry, "SEAROUTE_ENABLED", True)
+    def test_stored_sea_route_skips_corridor_and_searoute(self):
+        self.store.put(
+            "sea",
+            routing_geometry.route_network_version("sea"),
+            KEY,
+            {
+                "path": [(-6.823, 39.289), (-5.0, 40.5), (-4.043, 39.668)],
+                "distance_km": 330.0,
+                "duration_hours": 9.4,
+                "source": "searoute",
+                "notes": ["Sea geometry from searoute marine network."],
+            },
+        )
+        corridor = MagicMock(return_value=[(-6.823, 39.289), (-4.043, 39.668)])
+        resolved = routing_geometry.fetch_sea_route(
+            -6.823, 39.289, -4.043, 39.668, corridor_fallback=corridor, deadline=0.0
+        )
+        self.assertEqual(resolved.source, "searoute")
+        self.assertEqual(resolved.path[1], (-5.0, 40.5))
+        corridor.assert_not_called()
+        self.assertIn(KEY, [key for _, _, key in self.store.rows])
+        self.assertEqual(len(routing_geometry._sea_geometry_cache), 1)
+
+    def test_network_version_tracks_override(self):
+        with patch.dict("os.environ", {"ROUTE_GEOMETRY_NETWORK_VERSION": "2"}):
+            bumped = routing_geometry.route_network_version("sea")
+        self.assertNotEqual(bumped, routing_geometry.route_network_version("sea"))
+        self.assertTrue(routing_geometry.route_network_version("road").startswith("osrm:"))
+
+
+class HubPrecomputeTests(unittest.TestCase):
+    def test_hub_pairs_cover_catalogs_and_skip_ocean_crossings(self):
+        from backend.services.route_planner import MARITIME_HUBS, hub_geometry_pairs
+
+        pairs = hub_geometry_pairs()
+        counts = Counter(method for _, _, method in pairs)
+        self.assertEqual(counts["sea"], len(MARITIME_HUBS) * (len(MARITIME_HUBS) - 1))
+        self.assertGreater(counts["road"], 0)
+        self.assertGreater(counts["rail"], 0)
+        overland = {(a.name, b.name) for a, b, method in pairs if method != "sea"}
+        self.assertNotIn(("Lagos Rail Terminal", "Rotterdam Rail Terminal"), overland)
+        self.assertIn(("Frankfurt Rail Terminal", "Munich Rail Terminal"), overland)
+
+    def test_precompute_resolves_each_pair(self):
+        from backend.services import route_planner
+
+        fake = routing_geometry.straight_line_geometry(0, 0, 1, 1, method="sea", source="searoute")
+        seen = []
+        calls = []
+        # Mock call counting is not thread-safe; record worker calls explicitly.
+        calls_lock = threading.Lock()
+
+        def resolve(*args, **kwargs):
+            with calls_lock:
+                calls.append(kwargs)
+            return fake, "sea"
+
+        with patch.object(route_planner, "_geometry_for_leg", resolve):
+            summary = route_planner.precompute_hub_geometry(
+                ("sea",), workers=2, on_leg=lambda a, b, method, geometry: seen.append(method)
+            )
+        expected = len(route_planner.hub_geometry_pairs(("sea",)))
+        self.assertEqual(summary, {"sea": {"pairs": expected, "searoute": expected}})
+        self.assertEqual(len(calls), expected)
+        self.assertEqual(len(seen), expected)
+        self.assertIsNotNone(calls[-1]["corridor_fallback"])
+
+
+if __name__ == "__main__":
+    unittest.main()
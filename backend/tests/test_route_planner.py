@@ -786,5 +786,49 @@ class RoutePlannerTests(unittest.TestCase):
         self.assertNotIn("Durban", import_port)
 
 
+class RoutePlanBatchTests(unittest.TestCase):
+    LANE = {
+        "product": "Gold concentrate",
+        "quantity_tons": 100,
+        "origin": {"name": "Tema", "lat": 5.64, "lng": 0.018, "kind": "port", "metadata": {"country": "Ghana"}},
+        "destination": {"name": "Haifa", "lat": 32.819, "lng": 34.99, "kind": "port", "metadata": {"country": "Israel"}},
+        "preferred_methods": ["sea"],
+    }
+
+    def test_batch_yields_each_request_and_shares_identical_legs(self):
+        from backend.services import route_planner
+
+        calls = []
+        real_resolve = route_planner._resolve_geometry_for_leg
+
+        def counting_resolve(*args, **kwargs):
+            calls.append(args[2])
+            return real_resolve(*args, **kwargs)
+
+        requests = [{**self.LANE, "id": f"lane-{i}"} for i in range(3)]
+        requests.append({"product": "bad", "quantity_tons": 1})
+        with patch.object(route_planner, "_resolve_geometry_for_leg", side_effect=counting_resolve):
+            items = list(route_planner.plan_route_batch(requests, max_workers=3))
+
+        summary = items[-1]["summary"]
+        results = sorted(items[:-1], key=lambda item: item["index"])
+        self.assertEqual([item["index"] for item in results], [0, 1, 2, 3])
+        self.assertEqual([item["status"] for item in results], ["ok", "ok", "ok", "error"])
+        self.assertEqual(results[1]["id"], "lane-1")
+        self.assertIn("Invalid route request", results[3]["error"])
+        self.assertEqual((summary["ok"], summary["failed"]), (3, 1))
+        self.assertEqual(len(calls), summary["legs_resolved"])
+        self.assertGreater(summary["legs_shared"], 0)
+        legs = [item["plan"]["route"]["legs"] for item in results[:3]]
+        self.assertEqual(legs[0], legs[1])
+
+    def test_single_plans_do_not_use_batch_memo(self):
+        from backend.services import route_planner
+
+        self.assertIsNone(route_planner._leg_memo.get())
+        plan_route(dict(self.LANE))
+        self.assertIsNone(route_planner._leg_memo.get())
+
+
 if __name__ == "__main__":
     unittest.main()
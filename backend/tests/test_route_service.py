@@ -45,6 +45,38 @@ class RouteServiceTests(unittest.TestCase):
         plan_route_mock.assert_called_once()
         self.assertIn("recommended", result)
 
+    @patch("route_service.app.plan_route_batch")
+    def test_batch_endpoint_streams_ndjson(self, batch_mock) -> None:
+        import json
+
+        from fastapi.testclient import TestClient
+        from route_service.app import app
+
+        batch_mock.return_value = iter(
+            [
+                {"index": 1, "id": "b", "status": "ok", "plan": {"route": {"legs": []}}},
+                {"index": 0, "id": "a", "status": "error", "error": "Invalid route request: 'origin'"},
+                {"summary": {"requests": 2, "ok": 1, "failed": 1}},
+            ]
+        )
+        lane = {
+            "product": "gold",
+            "quantity_tons": 50,
+            "origin": {"name": "Tema", "lat": 5.64, "lng": 0.018, "kind": "port"},
+            "destination": {"name": "Haifa", "lat": 32.819, "lng": 34.99, "kind": "port"},
+        }
+        client = TestClient(app)
+        response = client.post("/plan/batch", json={"requests": [{**lane, "id": "a"}, {**lane, "id": "b"}]})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([line.get("index") for line in lines[:2]], [1, 0])
+        self.assertEqual(lines[-1]["summary"]["requests"], 2)
+        sent = batch_mock.call_args.args[0]
+        self.assertEqual([item["id"] for item in sent], ["a", "b"])
+
+        self.assertEqual(client.post("/plan/batch", json={"requests": []}).status_code, 400)
+
 
 if __name__ == "__main__":
     unittest.main()
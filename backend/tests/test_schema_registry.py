@@ -0,0 +1,176 @@
+"""Schema readiness registry: stamp checks, once-per-process DDL, transactions and reset."""
+
+import unittest
+from types import SimpleNamespace
+
+import psycopg2
+import psycopg2.extensions
+
+from backend.services.schema_registry import SchemaRegistry, format_schema_report
+
+IDLE = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+INTRANS = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+
+
+class _Database:
+    def __init__(self):
+        self.committed = {}
+        self.has_versions_table = False
+
+
+class _Cursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.row = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, sql, params=None):
+        conn = self.conn
+        conn.statements.append(sql.strip().split()[0].upper())
+        if not conn.autocommit:
+            conn.info.transaction_status = INTRANS
+        if "SELECT version FROM schema_versions" in sql:
+            if not conn.db.has_versions_table:
+                raise psycopg2.ProgrammingError("relation schema_versions does not exist")
+            versions = {**conn.db.committed, **conn.pending}
+            self.row = (versions[params[0]],) if params[0] in versions else None
+        elif "CREATE TABLE IF NOT EXISTS schema_versions" in sql:
+            conn.db.has_versions_table = True
+        elif "INSERT INTO schema_versions" in sql:
+            if conn.autocommit:
+                conn.db.committed[params[0]] = params[1]
+            else:
+                conn.pending[params[0]] = params[1]
+
+    def fetchone(self):
+        return self.row
+
+    def close(self):
+        pass
+
+
+class _Conn:
+    def __init__(self, db, *, autocommit=False, dsn="dbname=test"):
+        self.db = db
+        self.dsn = dsn
+        self.autocommit = autocommit
+        self.info = SimpleNamespace(transaction_status=IDLE)
+        self.pending = {}
+        self.statements = []
+
+    def cursor(self):
+        return _Cursor(self)
+
+    def commit(self):
+        self.db.committed.update(self.pending)
+        self.pending = {}
+        self.info.transaction_status = IDLE
+
+    def rollback(self):
+        self.pending = {}
+        self.info.transaction_status = IDLE
+
+
+class SchemaRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.registry = SchemaRegistry(is_connection=lambda conn: isinstance(conn, _Conn))
+        self.registry.register("widgets", "v1")
+        self.db = _Database()
+        self.ddl_calls = []
+
+    def _ensure(self, conn):
+        def ddl(c):
+            self.ddl_calls.append(c)
+            with c.cursor() as cur:
+                cur.execute("CREATE TABLE IF NOT EXISTS widgets (id INT)")
+
+        return self.registry.ensure("widgets", ddl, conn)
+
+    def test_fresh_database_runs_ddl_once_then_skips(self):
+        conn = _Conn(self.db)
+        self._ensure(conn)
+        self.assertEqual(len(self.ddl_calls), 1)
+        # Same open transaction: no repeat DDL, but not ready until the stamp commits.
+        self._ensure(conn)
+        self.assertEqual(len(self.ddl_calls), 1)
+        self.assertFalse(self.registry.is_ready(conn, "widgets"))
+        conn.commit()
+
+        other = _Conn(self.db)
+        self._ensure(other)
+        self.assertTrue(self.registry.is_ready(other, "widgets"))
+        before = len(other.statements)
+        self._ensure(other)
+        self.assertEqual(len(other.statements), before)
+        self.assertEqual(len(self.ddl_calls), 1)
+
+    def test_rolled_back_ddl_runs_again(self):
+        conn = _Conn(self.db)
+        self._ensure(conn)
+        conn.rollback()
+        self._ensure(conn)
+        self.assertEqual(len(self.ddl_calls), 2)
+
+    def test_matching_stamp_skips_ddl_and_new_version_reruns(self):
+        self.db.has_versions_table = True
+        self.db.committed["widgets"] = "v1"
+        self._ensure(_Conn(self.db))
+        self.assertEqual(self.ddl_calls, [])
+
+        self.registry.register("widgets", "v2")
+        self.registry.reset()
+        self._ensure(_Conn(self.db, autocommit=True))
+        self.assertEqual(len(self.ddl_calls), 1)
+        self.assertEqual(self.db.committed["widgets"], "v2")
+
+    def test_autocommit_is_ready_immediately(self):
+        conn = _Conn(self.db, autocommit=True)
+        self._ensure(conn)
+        self.assertTrue(self.registry.is_ready(conn, "widgets"))
+        self.assertFalse(self.registry.is_ready(_Conn(self.db, dsn="dbname=other"), "widgets"))
+
+    def test_reset_ignoring_stamps_forces_ddl(self):
+        self.db.has_versions_table = True
+        self.db.committed["widgets"] = "v1"
+        self.registry.reset(ignore_stamps=True)
+        self._ensure(_Conn(self.db, autocommit=True))
+        self._ensure(_Conn(self.db, autocommit=True))
+        self.assertEqual(len(self.ddl_calls), 1)
+
+    def test_non_connections_pass_through(self):
+        sentinel = object()
+        self.assertIs(self.registry.ensure("widgets", lambda c: c, sentinel), sentinel)
+        self.assertIs(self.registry.ensure("widgets", lambda c: c, sentinel), sentinel)
+
+    def test_report_counts_checks_and_skips(self):
+        conn = _Conn(self.db, autocommit=True)
+        self._ensure(conn)
+        self._ensure(conn)
+        report = self.registry.report()
+        entry = report["tables"]["widgets"]
+        self.assertEqual((entry["ddl_runs"], entry["stamp_checks"], entry["skipped"]), (1, 1, 1))
+        self.assertEqual((report["registered"], report["ready"]), (1, 1))
+        self.assertNotIn("tables", self.registry.report(include_tables=False))
+        self.assertIn("1/1 ready", format_schema_report(report))
+
+
+class SchemaReadyDecoratorTests(unittest.TestCase):
+    def test_decorated_helpers_keep_their_names_and_mocks_still_run_ddl(self):
+        from unittest.mock import MagicMock
+
+        from backend.services.deal_rooms import ensure_deal_rooms_table
+
+        self.assertEqual(ensure_deal_rooms_table.__name__, "ensure_deal_rooms_table")
+        self.assertEqual(ensure_deal_rooms_table.schema_name, "deal_rooms")
+        conn = MagicMock()
+        ensure_deal_rooms_table(conn)
+        self.assertTrue(conn.cursor.return_value.__enter__.return_value.execute.called)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Sea-lane matrix: build/write/mmap load, stale sidecars, chokepoint flags, export-port ranking."""
+
+import math
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from backend.services import route_planner
+from backend.services.route_planner import MARITIME_HUBS, RoutePoint, TransportHub
+from backend.services.sea_lane_matrix import (
+    CHOKEPOINT_FLAGS,
+    FLAG_SEAROUTE,
+    SeaLaneMatrix,
+    build_sea_lane_matrix,
+    chokepoint_flags,
+    decode_chokepoint_flags,
+    get_sea_lane_matrix,
+    write_sea_lane_matrix,
+)
+
+HUBS = (
+    TransportHub("A", 0.0, 0.0, "X", "port"),
+    TransportHub("B", 10.0, 10.0, "Y", "port"),
+    TransportHub("C", -5.0, 20.0, "Z", "port"),
+)
+
+
+def _fake_resolve(a, b):
+    return (abs(a.lat - b.lat) + abs(a.lng - b.lng)) * 100.0, 1.5, FLAG_SEAROUTE
+
+
+class SeaLaneMatrixTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "lanes.npy"
+
+    def test_round_trip_is_memory_mapped(self):
+        write_sea_lane_matrix(build_sea_lane_matrix(HUBS, _fake_resolve), HUBS, self.path, network_version="t1")
+        matrix = SeaLaneMatrix.load(HUBS, self.path)
+        self.assertIsInstance(matrix.matrix, np.memmap)
+        self.assertEqual(matrix.network_version, "t1")
+        lane = matrix.lookup("A", "B")
+        self.assertEqual((lane.distance_km, lane.duration_hours, lane.flags), (2000.0, 1.5, FLAG_SEAROUTE))
+        self.assertIsNone(matrix.lookup("A", "A"))
+        self.assertIsNone(matrix.lookup("A", "missing"))
+        distances = matrix.distances_to(["A", "missing", "C"], "B")
+        self.assertEqual(distances[0], 2000.0)
+        self.assertTrue(math.isnan(distances[1]))
+        self.assertEqual(distances[2], 2500.0)
+
+    def test_stale_or_missing_matrix_is_ignored(self):
+        self.assertIsNone(SeaLaneMatrix.load(HUBS, self.path))
+        write_sea_lane_matrix(build_sea_lane_matrix(HUBS, _fake_resolve), HUBS, self.path)
+        moved = (HUBS[0], TransportHub("B", 11.0, 10.0, "Y", "port"), HUBS[2])
+        self.assertIsNone(SeaLaneMatrix.load(moved, self.path))
+        self.assertIsNone(SeaLaneMatrix.load(HUBS[:2], self.path))
+
+    def test_chokepoint_flags(self):
+        suez_path = [(31.26, 32.30), (30.0, 32.55), (12.6, 43.3)]
+        flags = chokepoint_flags(suez_path, source="searoute", gibraltar_guard=True)
+        self.assertEqual(decode_chokepoint_flags(flags), ["suez", "bab_el_mandeb"])
+        self.assertTrue(flags & FLAG_SEAROUTE)
+        self.assertEqual(chokepoint_flags([(0.0, 0.0), (1.0, 1.0)]), 0)
+
+    def test_shipped_matrix_matches_hub_catalog(self):
+        matrix = get_sea_lane_matrix(MARITIME_HUBS)
+        self.assertIsNotNone(matrix, "run python -m backend.scripts.build_sea_lane_matrix")
+        lane = matrix.lookup("Port of Durban", "Port of Rotterdam")
+        self.assertGreater(lane.distance_km, 10000)
+        self.assertIn("cape", decode_chokepoint_flags(lane.flags))
+        via_suez = matrix.lookup("Port of Mombasa", "Port Said")
+        self.assertIn("bab_el_mandeb", decode_chokepoint_flags(via_suez.flags))
+
+
+class ExportHubRankingTests(unittest.TestCase):
+    def test_ranking_prefers_cheaper_trunk_and_pins_domestic_gateway(self):
+        beira = next(hub for hub in MARITIME_HUBS if hub.name == "Port of Beira")
+        dar = next(hub for hub in MARITIME_HUBS if hub.name == "Dar es Salaam Port")
+        walvis = next(hub for hub in MARITIME_HUBS if hub.name == "Port of Walvis Bay")
+        rotterdam = next(hub for hub in MARITIME_HUBS if hub.name == "Port of Rotterdam")
+        zambia = RoutePoint("Mine", -12.57, 31.31, "origin", {"country": "Zambia"})
+
+        class _Matrix:
+            def distances_to(self, names, to_name):
+                table = {"Dar es Salaam Port": 12000.0, "Port of Beira": 13000.0, "Port of Walvis Bay": 2000.0}
+                return np.array([table.get(name, np.nan) for name in names])
+
+        with patch.object(route_planner, "get_sea_lane_matrix", return_value=_Matrix()):
+            ranked = route_planner._rank_export_hubs(zambia, rotterdam, [dar, beira, walvis], ["sea", "road"])
+            self.assertEqual(ranked[0], walvis)
+
+            tanzania = RoutePoint("Mine", -8.9, 33.4, "origin", {"country": "Tanzania"})
+            ranked = route_planner._rank_export_hubs(tanzania, rotterdam, [dar, beira, walvis], ["sea", "road"])
+            self.assertEqual(ranked[:2], [dar, walvis])
+
+    def test_missing_matrix_falls_back_to_corridor_estimate(self):
+        dar = next(hub for hub in MARITIME_HUBS if hub.name == "Dar es Salaam Port")
+        rotterdam = next(hub for hub in MARITIME_HUBS if hub.name == "Port of Rotterdam")
+        with patch.object(route_planner, "get_sea_lane_matrix", return_value=None):
+            estimate = route_planner._sea_lane_estimate(dar, rotterdam)
+        self.assertEqual(estimate["source"], "corridor_estimate")
+        self.assertGreater(estimate["distance_km"], 8000)
+
+
+if __name__ == "__main__":
+    unittest.main()
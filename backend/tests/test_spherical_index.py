@@ -0,0 +1,106 @@
+"""Spherical nearest-neighbour index: brute-force equivalence and the call sites built on it."""
+
+import random
+import unittest
+from unittest.mock import patch
+
+from backend.services import maritime_intel
+from backend.services.route_planner import MARITIME_HUBS, RoutePoint, TransportHub, _nearest_hub
+from backend.services.routing_geometry import haversine_km, rank_trade_hubs, select_nearest_trade_hub
+from backend.services.spherical_index import SphericalIndex, index_for
+from backend.services.unlocode_snapshot import UnlocodePortTable
+
+
+def _brute(lats, lngs, lat, lng, positions=None):
+    positions = range(len(lats)) if positions is None else positions
+    return sorted((haversine_km(lat, lng, lats[pos], lngs[pos]), pos) for pos in positions)
+
+
+class SphericalIndexTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.lats = [rng.uniform(-89.0, 89.0) for _ in range(3000)]
+        self.lngs = [rng.uniform(-180.0, 180.0) for _ in range(3000)]
+        self.groups = [pos % 7 for pos in range(3000)]
+        self.index = SphericalIndex(self.lats, self.lngs, groups=self.groups, leaf_size=8)
+        self.queries = [(rng.uniform(-90.0, 90.0), rng.uniform(-180.0, 180.0)) for _ in range(40)]
+        self.queries += [(0.0, 179.99), (0.0, -179.99), (89.9, 0.0)]
+
+    def test_knn_matches_brute_force(self):
+        for lat, lng in self.queries:
+            expected = _brute(self.lats, self.lngs, lat, lng)[:6]
+            got = self.index.query(lat, lng, 6)
+            self.assertEqual([pos for pos, _ in got], [pos for _, pos in expected])
+            for (_, km), (want_km, _) in zip(got, expected):
+                self.assertAlmostEqual(km, want_km, places=6)
+
+    def test_radius_matches_brute_force(self):
+        for lat, lng in self.queries:
+            expected = [pos for km, pos in _brute(self.lats, self.lngs, lat, lng) if km <= 800.0]
+            self.assertEqual([pos for pos, _ in self.index.query_radius(lat, lng, 800.0)], expected)
+
+    def test_group_queries_stay_in_group(self):
+        for lat, lng in self.queries[:10]:
+            members = [pos for pos, group in enumerate(self.groups) if group == 3]
+            expected = [pos for _, pos in _brute(self.lats, self.lngs, lat, lng, members)[:4]]
+            self.assertEqual([pos for pos, _ in self.index.query(lat, lng, 4, group=3)], expected)
+        self.assertEqual(self.index.query(0.0, 0.0, 3, group="missing"), [])
+
+    def test_ties_break_by_position_and_small_inputs(self):
+        index = SphericalIndex([1.0, 1.0, 1.0], [2.0, 2.0, 2.0])
+        self.assertEqual([pos for pos, _ in index.query(1.0, 2.0, 2)], [0, 1])
+        self.assertEqual(len(index.query(0.0, 0.0, 10)), 3)
+        self.assertEqual(SphericalIndex([], []).query(0.0, 0.0, 3), [])
+
+    def test_index_for_reuses_tree_per_sequence(self):
+        hubs = (TransportHub("A", 0.0, 0.0, "X", "port"), TransportHub("B", 1.0, 1.0, "Y", "port"))
+        self.assertIs(index_for(hubs), index_for(hubs))
+        self.assertIsNot(index_for(hubs), index_for(list(hubs)))
+
+
+class NearestPortsTests(unittest.TestCase):
+    def test_find_nearest_ports_orders_by_rounded_distance_then_name(self):
+        rows = UnlocodePortTable.from_rows(
+            [
+                {"unlocode": "TZZZZ", "country_iso2": "TZ", "name": "Zeta", "lat": -6.80, "lng": 39.30},
+                {
+                    "unlocode": "TZAAA",
+                    "country_iso2": "TZ",
+                    "name": "Alpha",
+                    "lat": -6.80,
+                    "lng": 39.30,
+                    "role": "energy_port",
+                },
+                {"unlocode": "KEMBA", "country_iso2": "KE", "name": "Mombasa", "lat": -4.04, "lng": 39.67},
+                {"unlocode": "TZTGT", "country_iso2": "TZ", "name": "Tanga", "lat": -5.07, "lng": 39.10},
+            ]
+        )
+        with patch.object(maritime_intel, "_cached_unlocode_ports", return_value=rows):
+            nearest = maritime_intel.find_nearest_ports(lat=-6.80, lng=39.30, limit=3)
+            self.assertEqual([row["name"] for row in nearest], ["Alpha", "Zeta", "Tanga"])
+            self.assertEqual(nearest[0]["confidence"], 0.65)
+            kenya = maritime_intel.find_nearest_ports(country_iso2="ke", lat=-6.80, lng=39.30, limit=3)
+            self.assertEqual([row["name"] for row in kenya], ["Mombasa"])
+            self.assertEqual(kenya[0]["distance_km"], round(haversine_km(-6.80, 39.30, -4.04, 39.67), 1))
+
+
+class TradeHubSelectionTests(unittest.TestCase):
+    def test_hub_selection_matches_linear_scan(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            lat, lng = rng.uniform(-45.0, 60.0), rng.uniform(-120.0, 150.0)
+            linear = sorted(MARITIME_HUBS, key=lambda hub: haversine_km(lat, lng, hub.lat, hub.lng))
+            point = RoutePoint("P", lat, lng, "origin", {})
+            self.assertEqual(_nearest_hub(point, MARITIME_HUBS), linear[0])
+            self.assertEqual(rank_trade_hubs(lat, lng, MARITIME_HUBS, limit=3), linear[:3])
+
+    def test_domestic_gateways_rank_first(self):
+        ranked = rank_trade_hubs(-12.57, 31.31, MARITIME_HUBS, country="Tanzania", limit=3)
+        self.assertEqual(ranked[0].name, "Dar es Salaam Port")
+        self.assertEqual(len({hub.name for hub in ranked}), 3)
+        hub, _ = select_nearest_trade_hub(-8.9, 33.4, MARITIME_HUBS, country="Tanzania")
+        self.assertEqual(hub.name, "Dar es Salaam Port")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+"""Step DAG runner: dependency order, groups, per-step connections, retry, timeout, critical path."""
+
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from backend.services import oil_live_graph_sync
+from backend.services.step_dag import DagStep, critical_path, run_step_dag, select_steps, validate_steps
+
+
+class FakeConn:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+        self.cancelled = False
+        self.closed = False
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def cancel(self):
+        self.cancelled = True
+
+    def close(self):
+        self.closed = True
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+        self.conns = []
+
+    def connect(self):
+        conn = FakeConn()
+        with self.lock:
+            self.conns.append(conn)
+        return conn
+
+    def step(self, name, delay=0.0, result=None):
+        def run(_conn):
+            with self.lock:
+                self.events.append(("start", name))
+            time.sleep(delay)
+            with self.lock:
+                self.events.append(("end", name))
+            return result if result is not None else {"status": "ok", "step": name}
+
+        return run
+
+    def index(self, kind, name):
+        return self.events.index((kind, name))
+
+
+class RunStepDagTests(unittest.TestCase):
+    def test_independent_steps_overlap_and_dependencies_wait(self):
+        rec = Recorder()
+        steps = [
+            DagStep("a", rec.step("a", 0.15)),
+            DagStep("b", rec.step("b", 0.15)),
+            DagStep("c", rec.step("c", 0.15)),
+            DagStep("mirror", rec.step("mirror"), after=("a", "b")),
+        ]
+        started = time.monotonic()
+        results, timings = run_step_dag(steps, connect=rec.connect, max_workers=4)
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual(list(results), ["a", "b", "c", "mirror"])
+        self.assertGreater(rec.index("start", "mirror"), max(rec.index("end", "a"), rec.index("end", "b")))
+        self.assertEqual({t["status"] for t in timings.values()}, {"ok"})
+        self.assertEqual(len(rec.conns), 4)
+        self.assertTrue(all(conn.closed and conn.commits == 1 for conn in rec.conns))
+
+    def test_group_members_never_overlap(self):
+        rec = Recorder()
+        steps = [DagStep(name, rec.step(name, 0.05), group="graph") for name in ("x", "y", "z")]
+        run_step_dag(steps, connect=rec.connect, max_workers=3)
+        kinds = [kind for kind, _ in rec.events]
+        self.assertEqual(kinds, ["start", "end"] * 3)
+
+    def test_error_result_is_retried_then_reported(self):
+        calls = []
+
+        def flaky(conn):
+            calls.append(conn)
+            if len(calls) == 1:
+                raise RuntimeError("503 from upstream")
+            return {"status": "ok"}
+
+        def broken(_conn):
+            return {"status": "error", "message": "bad key"}
+
+        rec = Recorder()
+        steps = [DagStep("flaky", flaky, retries=1), DagStep("broken", broken, retries=2)]
+        results, timings = run_step_dag(steps, connect=rec.connect, retry_base_sec=0.01)
+        self.assertEqual((timings["flaky"]["status"], timings["flaky"]["attempts"]), ("ok", 2))
+        self.assertEqual(calls[0].rollbacks, 1)
+        self.assertEqual((timings["broken"]["status"], timings["broken"]["attempts"]), ("error", 3))
+        self.assertEqual(results["broken"]["message"], "bad key")
+
+    def test_timeout_cancels_query_and_releases_dependents(self):
+        rec = Recorder()
+        steps = [
+            DagStep("slow", rec.step("slow", 0.3), timeout=0.05, group="graph"),
+            DagStep("after_slow", rec.step("after_slow"), after=("slow",)),
+            DagStep("sibling", rec.step("sibling"), after=("slow",), group="graph"),
+        ]
+        results, timings = run_step_dag(steps, connect=rec.connect)
+        self.assertEqual(results["slow"], {"status": "timeout", "timeout_sec": 0.05})
+        self.assertTrue(rec.conns[0].cancelled)
+        self.assertEqual(timings["after_slow"]["status"], "ok")
+        self.assertEqual(timings["after_slow"]["upstream_errors"], ["slow"])
+        self.assertLess(rec.index("start", "after_slow"), rec.index("end", "slow"))
+        # The group stays busy until the timed-out thread actually exits.
+        self.assertGreater(rec.index("start", "sibling"), rec.index("end", "slow"))
+
+    def test_shared_connection_runs_in_dependency_order(self):
+        rec = Recorder()
+        conn = FakeConn()
+        steps = [DagStep("late", rec.step("late"), after=("early",)), DagStep("early", rec.step("early"))]
+        results, _ = run_step_dag(steps, conn=conn)
+        self.assertEqual([name for kind, name in rec.events if kind == "start"], ["early", "late"])
+        self.assertEqual(list(results), ["late", "early"])
+        self.assertEqual(conn.commits, 2)
+
+
+class DagShapeTests(unittest.TestCase):
+    def test_validation_rejects_cycles_and_unknown_dependencies(self):
+        noop = lambda conn: None  # noqa: E731
+        with self.assertRaises(ValueError):
+            validate_steps([DagStep("a", noop, after=("b",)), DagStep("b", noop, after=("a",))])
+        with self.assertRaises(ValueError):
+            validate_steps([DagStep("a", noop, after=("missing",))])
+
+    def test_select_drops_edges_to_unselected_steps(self):
+        noop = lambda conn: None  # noqa: E731
+        steps = [DagStep("a", noop), DagStep("b", noop, after=("a",), group="g")]
+        (only_b,) = select_steps(steps, ["b"])
+        self.assertEqual((only_b.after, only_b.group), ((), "g"))
+        with self.assertRaises(ValueError):
+            select_steps(steps, ["nope"])
+
+    def test_critical_path_follows_dependency_and_group_waits(self):
+        steps = [
+            DagStep("fetch", None),
+            DagStep("other_fetch", None),
+            DagStep("index", None, group="graph"),
+            DagStep("mirror", None, after=("fetch",), group="graph"),
+        ]
+        timings = {
+            "fetch": {"start_ms": 0, "duration_ms": 400},
+            "other_fetch": {"start_ms": 0, "duration_ms": 300},
+            "index": {"start_ms": 0, "duration_ms": 500},
+            "mirror": {"start_ms": 500, "duration_ms": 200},
+        }
+        path = critical_path(steps, timings)
+        self.assertEqual(path["steps"], ["index", "mirror"])
+        self.assertEqual((path["path_ms"], path["wall_ms"], path["serial_ms"]), (700, 700, 1400))
+        self.assertEqual(path["parallelism"], 2.0)
+
+    def test_critical_path_with_instant_group_members_terminates(self):
+        steps = [DagStep(name, None, group="graph") for name in ("a", "b", "c")]
+        timings = {name: {"start_ms": 0, "duration_ms": 0} for name in ("a", "b", "c")}
+        self.assertEqual(critical_path(steps, timings)["steps"], ["a", "b", "c"])
+
+
+class GraphSyncDagTests(unittest.TestCase):
+    def test_graph_sync_steps_form_a_valid_dag(self):
+        for rebuild in (True, False):
+            steps = validate_steps(oil_live_graph_sync.graph_sync_steps(rebuild_synthetic_bol=rebuild))
+            names = [step.name for step in steps]
+            self.assertIn("census_trade", names)
+            self.assertEqual("mcr_party_denormalize" in names, rebuild)
+        order = [step.name for step in validate_steps(oil_live_graph_sync.graph_sync_steps())]
+        self.assertLess(order.index("census_trade"), order.index("trade_flows"))
+        self.assertLess(order.index("licenses"), order.index("gleif_batch"))
+        self.assertEqual(order[-1], "mcr_party_denormalize")
+
+    def test_since_selects_missing_failed_and_old_steps(self):
+        now = datetime(2026, 10, 18, 12, tzinfo=timezone.utc)
+        since = oil_live_graph_sync.parse_graph_sync_since("6h", now=now)
+        self.assertEqual(since, now - timedelta(hours=6))
+        self.assertEqual(
+            oil_live_graph_sync.parse_graph_sync_since("2026-10-18T00:00:00Z"),
+            datetime(2026, 10, 18, tzinfo=timezone.utc),
+        )
+        with self.assertRaises(ValueError):
+            oil_live_graph_sync.parse_graph_sync_since("yesterday")
+        steps = [DagStep(name, None) for name in ("fresh", "failed", "old", "never")]
+        state = {
+            "fresh": {"status": "ok", "updated_at": now},
+            "failed": {"status": "error", "updated_at": now},
+            "old": {"status": "ok", "updated_at": now - timedelta(days=1)},
+        }
+        self.assertEqual(
+            oil_live_graph_sync._steps_stale_since(steps, state, since),
+            ["failed", "old", "never"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,13 @@
+import random
 import unittest
 
+from backend.services import storage_terminals as module
 from backend.services.storage_terminals import (
+    StorageSpatialIndex,
     _apply_viewport_filter,
     _entity_in_bbox,
     _parse_storage_bbox,
+    _storage_index_for,
 )
 
 
@@ -46,5 +50,61 @@ class StorageTerminalsBboxTests(unittest.TestCase):
         self.assertEqual(len(filtered), 0)
 
 
+
+class StorageSpatialIndexTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.entities = []
+        for i in range(3000):
+            if i % 97 == 0:
+                lat, lng = None, None
+            elif i % 101 == 0:
+                lat, lng = "51.95", "4.45"
+            elif i % 2:
+                lat, lng = 51.9 + rng.gauss(0, 0.4), 4.3 + rng.gauss(0, 0.4)
+            else:
+                lat, lng = rng.uniform(-60, 75), rng.uniform(-180, 180)
+            self.entities.append({"id": f"osm:node:{i}", "lat": lat, "lng": lng})
+        # Points exactly on cell edges and bbox edges.
+        self.entities.append({"id": "edge:1", "lat": 52.0, "lng": 4.0})
+        self.entities.append({"id": "edge:2", "lat": "51.5", "lng": "5.0"})
+
+    def _linear(self, bbox):
+        return [entity for entity in self.entities if _entity_in_bbox(entity, bbox)]
+
+    def test_query_matches_linear_scan_in_order(self):
+        index = StorageSpatialIndex(self.entities, cell_deg=0.25)
+        for bbox in [
+            (51.5, 4.0, 52.0, 5.0),
+            (-60.0, -180.0, 75.0, 180.0),
+            (10.0, 10.0, 10.5, 10.5),
+            (51.88, 4.29, 51.91, 4.33),
+        ]:
+            self.assertEqual(index.query(bbox), self._linear(bbox), bbox)
+
+    def test_viewport_filter_with_index_matches_limit_and_gap(self):
+        index = StorageSpatialIndex(self.entities)
+        for bbox, limit in [((51.0, 3.5, 53.0, 5.5), 50), ((-60.0, -180.0, 75.0, 180.0), 10), ((0.0, 0.0, 0.01, 0.01), 5)]:
+            self.assertEqual(
+                _apply_viewport_filter(self.entities, bbox=bbox, limit=limit, index=index),
+                _apply_viewport_filter(self.entities, bbox=bbox, limit=limit),
+            )
+
+    def test_index_for_other_list_is_ignored(self):
+        index = StorageSpatialIndex([])
+        filtered, gap = _apply_viewport_filter(
+            self.entities, bbox=(51.5, 4.0, 52.0, 5.0), limit=5000, index=index
+        )
+        self.assertFalse(gap)
+        self.assertEqual(filtered, self._linear((51.5, 4.0, 52.0, 5.0)))
+
+    def test_cached_index_reused_until_entity_list_changes(self):
+        self.addCleanup(module._storage_cache.__setitem__, "index", module._storage_cache.get("index"))
+        module._storage_cache["index"] = None
+        first = _storage_index_for(self.entities)
+        self.assertIs(_storage_index_for(self.entities), first)
+        self.assertIsNot(_storage_index_for(list(self.entities)), first)
+
+
 if __name__ == "__main__":
     unittest.main()
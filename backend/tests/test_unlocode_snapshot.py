@@ -0,0 +1,129 @@
+"""UN/LOCODE snapshot: columnar round-trip, torn/foreign files, bootstrap and background refresh."""
+
+import json
+import tempfile
+import unittest
+from functools import partial
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from backend.services import maritime_intel
+from backend.services.unlocode_snapshot import (
+    UnlocodePortTable,
+    load_unlocode_snapshot,
+    write_unlocode_snapshot,
+)
+
+CSV_TEXT = (
+    "Country,Location,Name,NameWoDiacritics,Subdivision,Status,Function,Date,IATA,Coordinates,Remarks\n"
+    "AE,FJR,Fujairah,Fujairah,FU,AI,1-------,,,2507N 05620E,Oil terminal\n"
+    "GH,TEM,Tema,Tema,,AI,1-------,,,0538N 00001E,\n"
+    "CI,ABJ,Abidjan,Abidjan,,AI,--3-----,,,0519N 00402W,\n"
+    "TR,IST,İstanbul,Istanbul,34,AI,1-------,,,4100N 02858E,\n"
+)
+
+
+class SnapshotFormatTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "unlocode_ports.npy"
+        self.rows = maritime_intel._parse_unlocode_ports(CSV_TEXT)
+
+    def _write(self):
+        return write_unlocode_snapshot(
+            self.rows, self.path, version="v1", source_url=maritime_intel.UNLOCODE_OFFICIAL_SOURCE_URL
+        )
+
+    def test_round_trip_matches_parsed_rows(self):
+        self._write()
+        table = load_unlocode_snapshot(self.path)
+        self.assertIsInstance(table.records, np.memmap)
+        self.assertEqual(table.version, "v1")
+        self.assertEqual(list(table), self.rows)
+        self.assertEqual(table[-1]["name"], "İstanbul")
+        self.assertIsNone(table[1]["subdivision"])
+        self.assertEqual(table.positions("GH").tolist(), [1])
+        self.assertEqual(table.role(0), "energy_port")
+        self.assertLess(table.age_seconds(), 60)
+
+    def test_torn_or_foreign_snapshot_is_ignored(self):
+        self.assertIsNone(load_unlocode_snapshot(self.path))
+        self._write()
+        sidecar_path = self.path.with_suffix(".json")
+        sidecar = json.loads(sidecar_path.read_text())
+        sidecar_path.write_text(json.dumps({**sidecar, "rows": sidecar["rows"] + 1}))
+        self.assertIsNone(load_unlocode_snapshot(self.path))
+        sidecar_path.write_text(json.dumps({**sidecar, "format": 0}))
+        self.assertIsNone(load_unlocode_snapshot(self.path))
+
+    def test_in_memory_table_serves_port_queries(self):
+        table = UnlocodePortTable.from_rows(self.rows, source_url="x")
+        with patch.object(maritime_intel, "_cached_unlocode_ports", return_value=table):
+            matched = maritime_intel.match_destination_to_port("FUJAIRAH")
+            self.assertEqual((matched["unlocode"], matched["confidence"]), ("AEFJR", 1.0))
+            self.assertEqual(maritime_intel.match_destination_to_port("istanbul", "TR")["unlocode"], "TRIST")
+            ghana = maritime_intel.find_nearest_ports(country_iso2="gh", limit=3)
+            self.assertEqual([row["name"] for row in ghana], ["Tema"])
+            self.assertIsNone(ghana[0]["distance_km"])
+            energy_first = maritime_intel.find_nearest_ports(limit=2)
+            self.assertEqual([row["name"] for row in energy_first], ["Fujairah", "Tema"])
+
+
+class SnapshotLoadingTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        path = Path(self.tmp.name) / "unlocode_ports.npy"
+        for fn in (load_unlocode_snapshot, write_unlocode_snapshot):
+            patcher = patch.object(maritime_intel, fn.__name__, partial(fn, path=path))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        maritime_intel._unlocode_cache.clear()
+        self.addCleanup(maritime_intel._unlocode_cache.clear)
+
+    def test_missing_snapshot_serves_empty_table_and_bootstraps_in_background(self):
+        with patch.object(
+            maritime_intel, "_fetch_text", side_effect=AssertionError("no download on the request path")
+        ), patch.object(maritime_intel, "schedule_unlocode_snapshot_refresh") as schedule:
+            self.assertEqual(len(maritime_intel._cached_unlocode_ports()), 0)
+        schedule.assert_called_once_with()
+        with patch.object(maritime_intel, "_fetch_text", return_value=CSV_TEXT) as fetch:
+            maritime_intel._refresh_unlocode_snapshot()
+            table = maritime_intel._cached_unlocode_ports()
+            self.assertEqual(len(table), 3)
+            maritime_intel._unlocode_cache.clear()
+            again = maritime_intel._cached_unlocode_ports()
+        self.assertEqual(fetch.call_count, 1)
+        self.assertIsInstance(again.records, np.memmap)
+        self.assertEqual(again.version, table.version)
+
+    def test_failed_refresh_backs_off(self):
+        with patch.object(maritime_intel, "_unlocode_refresh_failed_at", maritime_intel.time.time()), patch.object(
+            maritime_intel.threading, "Thread", side_effect=AssertionError("refresh retried during back-off")
+        ):
+            self.assertFalse(maritime_intel.schedule_unlocode_snapshot_refresh())
+
+    def test_stale_snapshot_is_served_while_refresh_runs_in_background(self):
+        with patch.object(maritime_intel, "_fetch_text", return_value=CSV_TEXT):
+            maritime_intel._refresh_unlocode_snapshot()
+        maritime_intel._unlocode_cache.clear()
+        with patch.object(maritime_intel, "UNLOCODE_SNAPSHOT_MAX_AGE_DAYS", -1.0), patch.object(
+            maritime_intel, "_fetch_text", side_effect=AssertionError("no download on the request path")
+        ), patch.object(maritime_intel, "schedule_unlocode_snapshot_refresh") as schedule:
+            table = maritime_intel._cached_unlocode_ports()
+        self.assertEqual(len(table), 3)
+        schedule.assert_called_once_with()
+
+    def test_failed_bootstrap_returns_empty_table(self):
+        with patch.object(maritime_intel, "_fetch_text", side_effect=OSError("offline")), patch.object(
+            maritime_intel, "schedule_unlocode_snapshot_refresh"
+        ):
+            self.assertEqual(maritime_intel.find_nearest_ports(lat=5.0, lng=0.0), [])
+            self.assertIsNone(maritime_intel.match_destination_to_port("Tema"))
+
+
+if __name__ == "__main__":
+    unittest.main()
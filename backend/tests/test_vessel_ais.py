@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 
 from backend.services.vessel_ais import (
     finalize_vessel_record,
@@ -14,7 +15,9 @@ from backend.services.maritime_intel import (
 
 
 class VesselAisTests(unittest.TestCase):
-    def test_merge_position_report_and_ship_static(self):
+    # No snapshot on disk in tests: port lookups come back empty instead of downloading one.
+    @patch("backend.services.maritime_intel.schedule_unlocode_snapshot_refresh")
+    def test_merge_position_report_and_ship_static(self, _schedule_refresh):
         acc = new_vessel_accumulator("259000420")
         merge_ais_stream_message(
             acc,
@@ -60,6 +60,23 @@ export type EiaHistoricMapOrigin = {
   by_commodity: { commodity_family: string; volume_bbl: number; row_count: number }[];
 };
 
+export type EiaHistoricRow = {
+  year: number;
+  month: number | null;
+  line_num: number | null;
+  importer_name: string;
+  origin_country: string;
+  origin_name: string | null;
+  product: string | null;
+  commodity_family: string;
+  volume_bbl: number;
+  port_code: string | null;
+  port_city: string | null;
+  port_state: string | null;
+  port_label: string;
+  source_file: string;
+};
+
 async function getJson<T>(path: string): Promise<T> {
   const res = await fetch(`${API_BASE}${path}`);
   if (!res.ok) throw new Error(`EIA historic API ${res.status}`);
@@ -105,3 +122,23 @@ export function getEiaHistoricMap(params: {
   if (params.limit != null) q.set('limit', String(params.limit));
   return getJson(`/api/eia-historic-imports/map?${q}`);
 }
+
+/** Line-level rows behind a summary / map aggregate (reads raw imports, not the rollup). */
+export function getEiaHistoricRows(params: {
+  year: number;
+  importer?: string;
+  origin_country?: string;
+  port_code?: string;
+  commodity_family?: string;
+  limit?: number;
+  offset?: number;
+}): Promise<{ year: number; rows: EiaHistoricRow[]; limit: number; offset: number; provenance?: string }> {
+  const q = new URLSearchParams({ year: String(params.year) });
+  if (params.importer) q.set('importer', params.importer);
+  if (params.origin_country) q.set('origin_country', params.origin_country);
+  if (params.port_code) q.set('port_code', params.port_code);
+  if (params.commodity_family) q.set('commodity_family', params.commodity_family);
+  if (params.limit != null) q.set('limit', String(params.limit));
+  if (params.offset != null) q.set('offset', String(params.offset));
+  return getJson(`/api/eia-historic-imports/rows?${q}`);
+}
@@ -139,6 +139,8 @@ import {
   type LicenseMarkerClusterGroup,
 } from '../lib/markerClusterTypes';
 import LicenseMapPopupController from './map/LicenseMapPopupController';
+import LicenseVectorTileLayer from './map/LicenseVectorTileLayer';
+import { licenseTileSectorForView, licenseTileUrl, licenseVectorTilesEnabled } from '../lib/licenseVectorTiles';
 import MapOverlayStatusPanel from './map/MapOverlayStatusPanel';
 import MapEmptyStateOverlay from './map/MapEmptyStateOverlay';
 import MapCoverageBanners from './map/MapCoverageBanners';
@@ -1451,6 +1453,20 @@ export default function MapComponent({
       (!isLiveDataView || countryFocusActive);
     const showLicenseMarkers = onGroundVisible && !hideLicenseMarkers && !dimLicenseMarkersForLens;
     const useCanvasLicenseMarkers = isLicenseMapView && !suppressLicenseClusters;
+    // Behind VITE_LICENSE_VECTOR_TILES the licenses paint from /api/licenses/tiles instead of
+    // the canvas / marker layers below (which then stay unmounted).
+    const useLicenseVectorTiles = isLicenseMapView && !suppressLicenseClusters && licenseVectorTilesEnabled();
+    const licenseVectorTileUrl = useMemo(
+        () =>
+            licenseTileUrl(
+                {
+                    sector: licenseTileSectorForView(viewModeKey),
+                    countries: countryFocusCountry?.trim() ? [countryFocusCountry.trim()] : [],
+                },
+                typeof window !== 'undefined' ? window.location.origin : '',
+            ),
+        [viewModeKey, countryFocusCountry],
+    );
 
     const { mapDisplayData, licenseMarkersCapped, licenseServerClusterMode } = useLicenseDisplayData({
         displayData,
@@ -2814,10 +2830,16 @@ export default function MapComponent({
                     eating clicks meant for the spiderfied markers beneath them.
                     showCoverageOnHover:false removes the coverage polygon overlay that can
                     also intercept pointer events in dense areas. */}
-                {showLicenseMarkers && serverClusterMarkers && (
+                <LicenseVectorTileLayer
+                    enabled={useLicenseVectorTiles && showLicenseMarkers}
+                    tileUrl={licenseVectorTileUrl}
+                    isDark={isDark}
+                    onLicenseClick={(item) => handleLicenseMarkerClick(item, false)}
+                />
+                {!useLicenseVectorTiles && showLicenseMarkers && serverClusterMarkers && (
                     <LayerGroup>{serverClusterMarkers}</LayerGroup>
                 )}
-                {licenseCanvasFeatures.length > 0 && (
+                {!useLicenseVectorTiles && licenseCanvasFeatures.length > 0 && (
                     <CanvasLiveDealLayer
                         features={licenseCanvasFeatures}
                         mapZoom={liveCanvasMapZoom}
@@ -2832,6 +2854,7 @@ export default function MapComponent({
                 )}
                 {showLicenseMarkers &&
                     !useCanvasLicenseMarkers &&
+                    !useLicenseVectorTiles &&
                     licensePointMarkers &&
                     (suppressLicenseClusters ? (
                         <LayerGroup>{licensePointMarkers}</LayerGroup>
@@ -0,0 +1,109 @@
+import { createElementObject, createLayerComponent } from '@react-leaflet/core';
+import type { Layer, LeafletMouseEvent } from 'leaflet';
+import L from 'leaflet';
+import '@maplibre/maplibre-gl-leaflet';
+import 'maplibre-gl/dist/maplibre-gl.css';
+import type { MiningLicense } from '../../types';
+import {
+  buildLicenseVectorTileStyle,
+  licenseFromTileFeature,
+  LICENSE_MVT_CLUSTER_LAYER_ID,
+  LICENSE_MVT_POINT_LAYER_ID,
+} from '../../lib/licenseVectorTiles';
+
+const LICENSE_VECTOR_PANE = 'licenseVectorTiles';
+/** Click tolerance around the pointer, in screen pixels. */
+const CLICK_RADIUS_PX = 6;
+
+type MaplibreGLLayer = L.MaplibreGL & {
+  options: L.LeafletMaplibreGLOptions & { interactive?: boolean };
+};
+
+export interface LicenseVectorTileLayerProps {
+  enabled: boolean;
+  /** Template from ``licenseTileUrl`` (filters in the query string). */
+  tileUrl: string;
+  isDark?: boolean;
+  onLicenseClick: (item: MiningLicense) => void;
+}
+
+function ensureLicenseVectorPane(map: L.Map): void {
+  if (!map.getPane(LICENSE_VECTOR_PANE)) {
+    map.createPane(LICENSE_VECTOR_PANE);
+  }
+  const pane = map.getPane(LICENSE_VECTOR_PANE);
+  if (pane) {
+    pane.style.zIndex = '420';
+    pane.style.pointerEvents = 'none';
+  }
+}
+
+function createLicenseVectorLayer(
+  props: LicenseVectorTileLayerProps,
+  context: Parameters<typeof createElementObject>[1],
+) {
+  ensureLicenseVectorPane(context.map);
+  const glLayer = L.maplibreGL({
+    style: buildLicenseVectorTileStyle(props.tileUrl, props.isDark),
+    interactive: false,
+    padding: 0,
+    pane: LICENSE_VECTOR_PANE,
+  } as L.LeafletMaplibreGLOptions & { interactive?: boolean }) as MaplibreGLLayer;
+  const handlers = { onLicenseClick: props.onLicenseClick };
+  (glLayer as MaplibreGLLayer & { licenseHandlers?: typeof handlers }).licenseHandlers = handlers;
+
+  // The GL canvas ignores pointer events so Leaflet keeps panning; hits are resolved by
+  // projecting the Leaflet click into the MapLibre map and querying rendered features.
+  const onClick = (event: LeafletMouseEvent) => {
+    const gl = glLayer.getMaplibreMap?.();
+    if (!gl || !gl.loaded()) return;
+    const pt = gl.project([event.latlng.lng, event.latlng.lat]);
+    const hits = gl.queryRenderedFeatures(
+      [
+        [pt.x - CLICK_RADIUS_PX, pt.y - CLICK_RADIUS_PX],
+        [pt.x + CLICK_RADIUS_PX, pt.y + CLICK_RADIUS_PX],
+      ],
+      { layers: [LICENSE_MVT_POINT_LAYER_ID, LICENSE_MVT_CLUSTER_LAYER_ID] },
+    );
+    const hit = hits[0];
+    if (!hit) return;
+    const [lng, lat] =
+      hit.geometry.type === 'Point' ? (hit.geometry.coordinates as [number, number]) : [event.latlng.lng, event.latlng.lat];
+    if (hit.layer.id === LICENSE_MVT_CLUSTER_LAYER_ID) {
+      const map = context.map;
+      map.flyTo([lat, lng], Math.min(map.getZoom() + 2, map.getMaxZoom()));
+      return;
+    }
+    const item = licenseFromTileFeature(hit.properties ?? {}, lat, lng);
+    if (item) handlers.onLicenseClick(item);
+  };
+  glLayer.on('add', () => context.map.on('click', onClick));
+  glLayer.on('remove', () => context.map.off('click', onClick));
+
+  return createElementObject(glLayer, context);
+}
+
+function updateLicenseVectorLayer(
+  layer: MaplibreGLLayer,
+  props: LicenseVectorTileLayerProps,
+  prevProps: LicenseVectorTileLayerProps,
+) {
+  const handlers = (layer as MaplibreGLLayer & { licenseHandlers?: { onLicenseClick: LicenseVectorTileLayerProps['onLicenseClick'] } })
+    .licenseHandlers;
+  if (handlers) handlers.onLicenseClick = props.onLicenseClick;
+  if (props.tileUrl === prevProps.tileUrl && props.isDark === prevProps.isDark) return;
+  const map = layer.getMaplibreMap?.();
+  if (!map) return;
+  map.setStyle(buildLicenseVectorTileStyle(props.tileUrl, props.isDark));
+}
+
+const LicenseVectorTileMapLayer = createLayerComponent<Layer, LicenseVectorTileLayerProps>(
+  createLicenseVectorLayer,
+  updateLicenseVectorLayer,
+);
+
+/** License markers / clusters from ``/api/licenses/tiles`` (VITE_LICENSE_VECTOR_TILES). */
+export default function LicenseVectorTileLayer(props: LicenseVectorTileLayerProps) {
+  if (!props.enabled) return null;
+  return <LicenseVectorTileMapLayer {...props} />;
+}
@@ -1,4 +1,4 @@
-import { API_BASE } from '../../lib/api';
+import { API_BASE, waitForAgentJob } from '../../lib/api';
 import { mockResponseForPayload } from './mockRoute';
 import type {
   CostLineItem,
@@ -650,9 +650,10 @@ export async function fetchRoutePlan(payload: RoutePlannerFormPayload): Promise<
 export async function analyzeRouteRisk(
   route: RoutePlannerApiResponse,
 ): Promise<AgentJobResponse<RouteRiskAnalysis>> {
-  return postJson<AgentJobResponse<RouteRiskAnalysis>>(
+  const job = await postJson<AgentJobResponse<RouteRiskAnalysis>>(
     `${API_BASE}/api/agents/route-intelligence`,
     { route },
     20_000,
   );
+  return waitForAgentJob(job);
 }
@@ -124,13 +124,14 @@ export interface RouteRiskAnalysis {
 export interface AgentJobResponse<TOutput> {
   job_id: string;
   agent_type: string;
-  status: 'running' | 'completed' | 'failed' | string;
+  status: 'queued' | 'running' | 'completed' | 'failed' | string;
   input_hash: string;
   entity_id?: string | null;
   route_hash?: string | null;
   output?: TOutput | null;
   error?: string | null;
   cached?: boolean;
+  attempts?: number;
 }
 
 export interface RoutePlannerFormPayload {
@@ -881,7 +881,7 @@ export async function runContactEnrichmentAgent(
       entity_kind: entityKind,
     },
   );
-  return data;
+  return waitForAgentJob(data);
 }
 
 export async function runOperatorValidationAgent(
@@ -895,18 +895,37 @@ export async function runOperatorValidationAgent(
       entity_kind: entityKind,
     },
   );
-  return data;
+  return waitForAgentJob(data);
 }
 
 export async function getAgentJob<TOutput = Record<string, unknown>>(
   jobId: string,
+  waitSeconds = 0,
 ): Promise<AgentJobResponse<TOutput>> {
   const { data } = await apiClient.get<AgentJobResponse<TOutput>>(
     `/api/agents/jobs/${encodeURIComponent(jobId)}`,
+    waitSeconds > 0
+      ? { params: { wait: waitSeconds }, timeout: (waitSeconds + 15) * 1000 }
+      : undefined,
   );
   return data;
 }
 
+const AGENT_JOB_LONG_POLL_SECONDS = 25;
+const AGENT_JOB_MAX_WAIT_MS = 10 * 60_000;
+
+/** Agent endpoints answer 202 with a queued job; long-poll until a worker completes or fails it. */
+export async function waitForAgentJob<TOutput>(
+  job: AgentJobResponse<TOutput>,
+): Promise<AgentJobResponse<TOutput>> {
+  const deadline = Date.now() + AGENT_JOB_MAX_WAIT_MS;
+  let current = job;
+  while (current.status !== 'completed' && current.status !== 'failed' && Date.now() < deadline) {
+    current = await getAgentJob<TOutput>(current.job_id, AGENT_JOB_LONG_POLL_SECONDS);
+  }
+  return current;
+}
+
 export async function listDealRooms(options: {
   entityId?: string;
   entityKind?: string;
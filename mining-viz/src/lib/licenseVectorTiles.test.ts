@@ -0,0 +1,50 @@
+import { describe, expect, it } from 'vitest';
+import {
+  buildLicenseVectorTileStyle,
+  licenseFromTileFeature,
+  licenseTileSectorForView,
+  licenseTileUrl,
+  LICENSE_MVT_CLUSTER_SOURCE_LAYER,
+  LICENSE_MVT_POINT_SOURCE_LAYER,
+} from './licenseVectorTiles';
+
+describe('licenseVectorTiles', () => {
+  it('builds tile url template without filters', () => {
+    expect(licenseTileUrl({}, 'http://localhost:5173/')).toBe(
+      'http://localhost:5173/api/licenses/tiles/{z}/{x}/{y}.pbf',
+    );
+  });
+
+  it('encodes sector, countries and open-data preference', () => {
+    expect(licenseTileUrl({ sector: ' Mining ', countries: ['Ghana', ' ', 'South Africa'], preferOpenData: false })).toBe(
+      '/api/licenses/tiles/{z}/{x}/{y}.pbf?sector=mining&countries=Ghana%2CSouth+Africa&prefer_open_data=false',
+    );
+  });
+
+  it('maps views to tile sectors', () => {
+    expect(licenseTileSectorForView('oil_and_gas')).toBe('oil_and_gas');
+    expect(licenseTileSectorForView('global')).toBeNull();
+  });
+
+  it('paints cluster and point source layers from the tile url', () => {
+    const style = buildLicenseVectorTileStyle('/api/licenses/tiles/{z}/{x}/{y}.pbf?sector=mining');
+    const source = Object.values(style.sources)[0] as { tiles: string[] };
+    expect(source.tiles).toEqual(['/api/licenses/tiles/{z}/{x}/{y}.pbf?sector=mining']);
+    expect(style.layers.map((layer) => (layer as { 'source-layer'?: string })['source-layer'])).toEqual([
+      LICENSE_MVT_CLUSTER_SOURCE_LAYER,
+      LICENSE_MVT_POINT_SOURCE_LAYER,
+    ]);
+  });
+
+  it('rebuilds a selectable license from tile feature properties', () => {
+    expect(licenseFromTileFeature({ id: 42, company: 'Acme', country: 'Ghana' }, 5.6, -0.2)).toMatchObject({
+      id: '42',
+      company: 'Acme',
+      country: 'Ghana',
+      sector: 'mining',
+      lat: 5.6,
+      lng: -0.2,
+    });
+    expect(licenseFromTileFeature({ company: 'No id' }, 0, 0)).toBeNull();
+  });
+});
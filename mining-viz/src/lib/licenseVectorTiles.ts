@@ -0,0 +1,106 @@
+import type { StyleSpecification } from 'maplibre-gl';
+import type { MiningLicense } from '../types';
+
+export const LICENSE_MVT_TILE_URL_TEMPLATE = '/api/licenses/tiles/{z}/{x}/{y}.pbf';
+/** Grid clusters below z8 (properties: id, count, country, sector, grid_deg). */
+export const LICENSE_MVT_CLUSTER_SOURCE_LAYER = 'license_clusters';
+/** Individual markers from z8 (properties: id, company, licenseType, commodity, status, country, sector). */
+export const LICENSE_MVT_POINT_SOURCE_LAYER = 'licenses';
+
+export interface LicenseTileFilters {
+  sector?: string | null;
+  countries?: string[];
+  preferOpenData?: boolean;
+}
+
+/** Build the MapLibre tile URL template for license vector tiles (filters go in the query string). */
+export function licenseTileUrl(filters: LicenseTileFilters = {}, origin = ''): string {
+  const base = origin.replace(/\/$/, '');
+  const params = new URLSearchParams();
+  const sector = (filters.sector ?? '').trim().toLowerCase();
+  if (sector) params.set('sector', sector);
+  const countries = (filters.countries ?? []).map((country) => country.trim()).filter(Boolean);
+  if (countries.length) params.set('countries', countries.join(','));
+  if (filters.preferOpenData === false) params.set('prefer_open_data', 'false');
+  const query = params.toString();
+  return `${base}${LICENSE_MVT_TILE_URL_TEMPLATE}${query ? `?${query}` : ''}`;
+}
+
+/** License MVT rendering on the map is opt-in (VITE_LICENSE_VECTOR_TILES=1); off keeps the canvas / marker layers. */
+export function licenseVectorTilesEnabled(): boolean {
+  const env = import.meta.env.VITE_LICENSE_VECTOR_TILES;
+  return env === '1' || env === 'true' || env === 'on';
+}
+
+export const LICENSE_MVT_SOURCE_ID = 'license-tiles';
+export const LICENSE_MVT_CLUSTER_LAYER_ID = 'license-tiles-clusters';
+export const LICENSE_MVT_POINT_LAYER_ID = 'license-tiles-points';
+/** Server tiles stop at this zoom; MapLibre overzooms beyond it. */
+export const LICENSE_MVT_MAX_ZOOM = 14;
+
+/** Tile-layer sector filter for a map view (views without a single sector show every license). */
+export function licenseTileSectorForView(viewModeKey: string): string | null {
+  return viewModeKey === 'mining' || viewModeKey === 'oil_and_gas' ? viewModeKey : null;
+}
+
+/** MapLibre style painting the license tiles: grid clusters (also dense detail tiles) and markers. */
+export function buildLicenseVectorTileStyle(tileUrl: string, isDark = false): StyleSpecification {
+  const stroke = isDark ? '#0f172a' : '#ffffff';
+  return {
+    version: 8,
+    sources: {
+      [LICENSE_MVT_SOURCE_ID]: { type: 'vector', tiles: [tileUrl], maxzoom: LICENSE_MVT_MAX_ZOOM },
+    },
+    layers: [
+      {
+        id: LICENSE_MVT_CLUSTER_LAYER_ID,
+        type: 'circle',
+        source: LICENSE_MVT_SOURCE_ID,
+        'source-layer': LICENSE_MVT_CLUSTER_SOURCE_LAYER,
+        paint: {
+          'circle-color': ['match', ['get', 'sector'], 'oil_and_gas', '#f59e0b', '#0ea5e9'],
+          'circle-opacity': 0.78,
+          'circle-radius': ['interpolate', ['linear'], ['ln', ['max', ['get', 'count'], 1]], 0, 6, 10, 26],
+          'circle-stroke-color': stroke,
+          'circle-stroke-width': 1.5,
+        },
+      },
+      {
+        id: LICENSE_MVT_POINT_LAYER_ID,
+        type: 'circle',
+        source: LICENSE_MVT_SOURCE_ID,
+        'source-layer': LICENSE_MVT_POINT_SOURCE_LAYER,
+        paint: {
+          'circle-color': ['match', ['get', 'sector'], 'oil_and_gas', '#d97706', '#0284c7'],
+          'circle-radius': ['interpolate', ['linear'], ['zoom'], 8, 3.5, 14, 7],
+          'circle-stroke-color': stroke,
+          'circle-stroke-width': 1,
+        },
+      },
+    ],
+  };
+}
+
+/** Map a clicked ``licenses`` tile feature back to the license shape the selection panels use. */
+export function licenseFromTileFeature(
+  properties: Record<string, unknown>,
+  lat: number,
+  lng: number,
+): MiningLicense | null {
+  const id = properties.id;
+  if (id == null || id === '') return null;
+  const text = (key: string) => (properties[key] == null ? '' : String(properties[key]));
+  return {
+    id: String(id),
+    company: text('company'),
+    licenseType: text('licenseType'),
+    commodity: text('commodity'),
+    status: text('status'),
+    country: text('country'),
+    sector: text('sector') || 'mining',
+    region: '',
+    date: null,
+    lat,
+    lng,
+  };
+}
@@ -145,13 +145,14 @@ export interface EntityContact {
 export interface AgentJobResponse<TOutput> {
   job_id: string;
   agent_type: string;
-  status: 'running' | 'completed' | 'failed' | string;
+  status: 'queued' | 'running' | 'completed' | 'failed' | string;
   entity_id?: string | null;
   route_hash?: string | null;
   input_hash: string;
   output?: TOutput | null;
   error?: string | null;
   cached?: boolean;
+  attempts?: number;
 }
 
 export interface ContactEnrichmentOutput {
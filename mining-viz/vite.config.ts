@@ -71,13 +71,14 @@ export default defineConfig({
         timeout: 120000,
         proxyTimeout: 120000,
         router(req) {
-          if ((req.url ?? '').includes('/annotations')) {
+          const url = req.url ?? '';
+          if (url.includes('/annotations') || url.startsWith('/api/licenses/tiles/')) {
             return backendProxyTarget;
           }
           return oilIntelProxyTarget;
         },
         rewrite(path) {
-          if (path.includes('/annotations')) {
+          if (path.includes('/annotations') || path.startsWith('/api/licenses/tiles/')) {
             return path;
           }
           return path.replace(/^\/api\/licenses/, '/api/oil-live/licenses');
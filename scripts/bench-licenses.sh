@@ -32,3 +32,16 @@ curl -sS -o /tmp/bench-licenses.json -w "http_code=%{http_code} size_bytes=%{siz
 if [[ -f /tmp/bench-licenses.json ]]; then
   wc -c /tmp/bench-licenses.json | awk '{print "saved_bytes:", $1}'
 fi
+
+echo ""
+echo "== Clustered viewports (z < 8) via ${BASE}/licenses?map=1 =="
+for vp in "2 -60 75 -180 180" "3 -36 38 -20 55" "5 3 18 -18 5" "7 4.5 11.5 -3.5 1.5"; do
+  read -r z min_lat max_lat min_lng max_lng <<<"$vp"
+  curl -sS -o /dev/null -w "zoom=${z} http_code=%{http_code} size_bytes=%{size_download} time_total_sec=%{time_total}\n" \
+    --max-time 60 -H "Cache-Control: no-cache" \
+    "${BASE}/licenses?prefer_open_data=true&sector=mining&map=1&zoom=${z}&min_lat=${min_lat}&max_lat=${max_lat}&min_lng=${min_lng}&max_lng=${max_lng}" || true
+done
+
+echo ""
+echo "== SQL p50/p95: live GROUP BY vs license_map_cells (needs DATABASE_URL or DB_*) =="
+echo "python -m backend.scripts.bench_license_clusters --runs 30"